@@ -4,9 +4,33 @@ Add a standard HTML comment header to MIND specification markdown files.
 
 - Adds the header only if it's not already present.
 - Skips obvious meta files like README.md and license-related docs.
+- Only the first HEAD_BYTES of each file are read to decide; a file is read
+  in full only when it is rewritten, and rewrites are atomic (temporary file
+  plus rename).
+- A manifest (MANIFEST_NAME in the root) records the mtime, size and head
+  digest of files known to carry the header, so unchanged files are skipped
+  without being opened on the next run.
+- Files are processed by a thread pool (--jobs).
+
+    python tools/add_spec_headers.py [ROOT] [--jobs N] [--check] [--no-manifest]
+
+--check is a dry run: it reports how many files would be updated and exits
+with status 1 if any would.
 """
 
+import argparse
+import codecs
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
 
 APACHE_MARKER = "Licensed under the Apache License, Version 2.0"
 OLD_MARKER_SPEC = "MIND Language Specification — Community Edition"
@@ -47,6 +71,16 @@ SKIP_DIRS = {
     "__pycache__",
 }
 
+# Bytes read to decide whether a file needs the header; markers are looked
+# for in the first HEAD_LINES lines of that prefix.
+HEAD_BYTES = 16 * 1024
+HEAD_LINES = 40
+
+MANIFEST_NAME = ".spec-headers-manifest.json"
+MANIFEST_VERSION = 1
+
+Stamp = Dict[str, object]
+
 def should_skip(path: Path) -> bool:
     # Exact path-part matches, not substrings
     if any(skip_dir in path.parts for skip_dir in SKIP_DIRS):
@@ -55,31 +89,96 @@ def should_skip(path: Path) -> bool:
         return True
     return False
 
-def add_header_to_file(path: Path) -> None:
-    """Add the spec header to a single markdown file, if not already present."""
-    try:
-        text = path.read_text(encoding="utf-8")
-    except (OSError, UnicodeDecodeError) as e:
-        print(f"Error reading {path}: {e}")
-        return
+def iter_markdown(root: Path) -> Iterator[Path]:
+    """Yield the markdown files under ``root`` in sorted order, never entering SKIP_DIRS."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(name for name in dirnames if name not in SKIP_DIRS)
+        for name in sorted(filenames):
+            path = Path(dirpath, name)
+            if name.endswith(".md") and not should_skip(path):
+                yield path
 
-    if text.lstrip().startswith(HEADER):
-        return
+def read_head(path: Path, limit: int = HEAD_BYTES) -> bytes:
+    with open(path, "rb") as handle:
+        return handle.read(limit)
 
-    first_lines = "\n".join(text.splitlines()[:40])
+def classify(head: str) -> str:
+    """Return "current", "legacy" (old header to replace) or "missing" for a file's leading text."""
+    if head.lstrip().startswith(HEADER):
+        return "current"
+
+    first_lines = "\n".join(head.splitlines()[:HEAD_LINES])
 
     if OLD_MARKER_SPEC in first_lines or OLD_MARKER_MIT in first_lines:
-        text = remove_existing_header(text)
-    elif APACHE_MARKER in first_lines:
+        return "legacy"
+    if APACHE_MARKER in first_lines:
         # Already on the new header; leave untouched
-        return
+        return "current"
+    return "missing"
+
+def atomic_write(path: Path, text: str) -> None:
+    """Replace ``path`` with ``text`` via a temporary file in the same directory."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        if path.exists():
+            shutil.copymode(path, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+def make_stamp(stat: os.stat_result, head: bytes) -> Stamp:
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": hashlib.sha256(head).hexdigest()}
+
+@dataclass
+class FileResult:
+    """Outcome for one file.
+
+    ``status`` is "unchanged" (skipped via the manifest), "current", "updated",
+    "outdated" (would be updated; --check only) or "error". ``stamp`` is the
+    manifest entry for files known to carry the header.
+    """
+
+    path: Path
+    status: str
+    stamp: Optional[Stamp] = None
+    message: str = ""
+
+def add_header_to_file(path: Path, previous: Optional[Stamp] = None, check: bool = False) -> FileResult:
+    """Add the spec header to a single markdown file, if not already present.
+
+    ``previous`` is the file's manifest entry from an earlier run. The file is
+    not opened when its mtime and size still match, and not decoded when the
+    digest of its head still matches. With ``check`` nothing is written.
+    """
+    try:
+        stat = path.stat()
+        if previous and (previous["mtime_ns"], previous["size"]) == (stat.st_mtime_ns, stat.st_size):
+            return FileResult(path, "unchanged", previous)
+        head = read_head(path)
+        stamp = make_stamp(stat, head)
+        if previous and previous["sha256"] == stamp["sha256"]:
+            return FileResult(path, "unchanged", stamp)
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        kind = classify(decoder.decode(head, final=len(head) < HEAD_BYTES))
+        if kind == "current":
+            return FileResult(path, "current", stamp)
+        if check:
+            return FileResult(path, "outdated")
+        text = path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError) as e:
+        return FileResult(path, "error", message=f"Error reading {path}: {e}")
+
+    if kind == "legacy":
+        text = remove_existing_header(text)
 
-    new_text = HEADER + text
     try:
-        path.write_text(new_text, encoding="utf-8")
-        print(f"Updated: {path}")
+        atomic_write(path, HEADER + text)
+        return FileResult(path, "updated", make_stamp(path.stat(), read_head(path)))
     except OSError as e:
-        print(f"Error writing {path}: {e}")
+        return FileResult(path, "error", message=f"Error writing {path}: {e}")
 
 
 def remove_existing_header(text: str) -> str:
@@ -106,12 +205,75 @@ def remove_existing_header(text: str) -> str:
 
     return stripped.lstrip("\n")
 
-def main() -> None:
-    root = Path(".").resolve()
-    for md in root.rglob("*.md"):
-        if should_skip(md):
-            continue
-        add_header_to_file(md)
+def header_digest() -> str:
+    return hashlib.sha256(HEADER.encode("utf-8")).hexdigest()
+
+def load_manifest(path: Path) -> Dict[str, Stamp]:
+    """Return the file stamps recorded in ``path``, or none if it is missing, unreadable or stale."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION or data.get("header") != header_digest():
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+def save_manifest(path: Path, files: Dict[str, Stamp]) -> None:
+    data = {"version": MANIFEST_VERSION, "header": header_digest(), "files": dict(sorted(files.items()))}
+    atomic_write(path, json.dumps(data, indent=1) + "\n")
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("root", nargs="?", type=Path, default=Path("."))
+    parser.add_argument("--jobs", "-j", type=int, default=min(32, (os.cpu_count() or 1) + 4))
+    parser.add_argument("--check", action="store_true", help="report what would change without writing anything")
+    parser.add_argument("--manifest", type=Path, help=f"manifest path (default: ROOT/{MANIFEST_NAME})")
+    parser.add_argument("--no-manifest", action="store_true", help="neither read nor write the manifest")
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    start = time.perf_counter()
+    root = args.root.resolve()
+    manifest_path = args.manifest or root / MANIFEST_NAME
+    manifest = {} if args.no_manifest else load_manifest(manifest_path)
+
+    paths = list(iter_markdown(root))
+    keys = [path.relative_to(root).as_posix() for path in paths]
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        results: List[FileResult] = list(
+            pool.map(lambda path, key: add_header_to_file(path, manifest.get(key), args.check), paths, keys)
+        )
+
+    counts = {status: 0 for status in ("updated", "outdated", "current", "unchanged", "error")}
+    for result in results:
+        counts[result.status] += 1
+        if result.status == "updated":
+            print(f"Updated: {result.path}")
+        elif result.status == "outdated":
+            print(f"Would update: {result.path}")
+        elif result.status == "error":
+            print(result.message)
+
+    if not args.check and not args.no_manifest:
+        stamps = {key: result.stamp for key, result in zip(keys, results) if result.stamp is not None}
+        if stamps != manifest:
+            try:
+                save_manifest(manifest_path, stamps)
+            except OSError as e:
+                print(f"Error writing {manifest_path}: {e}")
+
+    changed = "would update" if args.check else "updated"
+    print(
+        f"{len(results)} files: {counts['outdated'] + counts['updated']} {changed}, {counts['current']} current, "
+        f"{counts['unchanged']} unchanged since last run, {counts['error']} errors "
+        f"in {time.perf_counter() - start:.2f}s",
+        file=sys.stderr,
+    )
+    if counts["error"] or (args.check and counts["outdated"]):
+        return 1
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Report the memory saved by gradient checkpointing on Relu MLPs.
+
+For each depth, differentiates a module with and without checkpointing and
+prints the liveness-based peak memory of both gradient modules together
+with the extra operations spent on recomputation.
+
+    python -m tools.benchmarks.bench_autodiff --layers 2 8 32 --width 256 --batch 64
+"""
+
+import argparse
+from typing import Sequence
+
+from tools.core_ir.autodiff import checkpoint_savings
+from tools.core_ir.core_ir import CoreIR
+
+
+def build_mlp(layers: int, width: int, batch: int) -> CoreIR:
+    ir = CoreIR()
+    hidden = f"tensor<f32[{batch}, {width}]>"
+    h = ir.declare_input("x", hidden)
+    for layer in range(layers):
+        w = ir.declare_input(f"w{layer}", f"tensor<f32[{width}, {width}]>")
+        b = ir.declare_input(f"b{layer}", f"tensor<f32[{width}]>")
+        z = ir.add_operation("MatMul", [h, w], result_type=hidden)
+        z = ir.add_operation("Add", [z, b], result_type=hidden)
+        h = ir.add_operation("Relu", [z], result_type=hidden)
+    ir.mark_output(ir.add_operation("Mean", [h], {"axes": [0, 1]}, "tensor<f32[]>"))
+    return ir
+
+
+def run(layer_counts: Sequence[int], width: int, batch: int) -> None:
+    print(f"{'layers':>7} {'peak KB':>10} {'ckpt KB':>10} {'saved':>7} {'ops':>7} {'ckpt ops':>9}")
+    for layers in layer_counts:
+        report = checkpoint_savings(build_mlp(layers, width, batch))
+        saved = report["saved_bytes"] / report["peak_live_bytes"]
+        print(
+            f"{layers:>7} {report['peak_live_bytes'] / 1024:>10.1f} {report['checkpoint_peak_live_bytes'] / 1024:>10.1f} "
+            f"{saved:>7.1%} {report['ops']:>7} {report['checkpoint_ops']:>9}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--layers", type=int, nargs="+", default=[2, 8, 32])
+    parser.add_argument("--width", type=int, default=256)
+    parser.add_argument("--batch", type=int, default=64)
+    args = parser.parse_args()
+    run(args.layers, args.width, args.batch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Compare the memory footprint of ``CoreIR`` and ``CompactCoreIR``.
+
+Builds synthetic modules of 10^4 to 10^6 operations and reports the bytes
+held by each representation, as measured by ``tracemalloc``.
+
+    python -m tools.benchmarks.bench_compact --sizes 10000 100000 1000000
+"""
+
+import argparse
+import gc
+import random
+import tracemalloc
+from typing import Callable, Sequence, Tuple
+
+from tools.core_ir.compact import CompactCoreIR
+from tools.core_ir.core_ir import CoreIR
+
+OPCODES = ("Add", "Sub", "Mul", "MatMul", "Relu")
+RESULT_TYPES = ("tensor<f32[64, 64]>", "tensor<f32[64]>", "tensor<f32[]>")
+
+
+def build_module(size: int, seed: int = 0) -> CoreIR:
+    """Build a random topologically ordered module with ``size`` operations."""
+
+    rng = random.Random(seed)
+    ir = CoreIR()
+    for i in range(min(8, size)):
+        ir.declare_input(f"x{i}", result_type=RESULT_TYPES[0])
+    while len(ir.operations) < size:
+        opcode = rng.choice(OPCODES)
+        arity = 1 if opcode == "Relu" else 2
+        operands = [rng.randrange(ir._next_value_id) for _ in range(arity)]
+        ir.add_operation(opcode, operands, result_type=rng.choice(RESULT_TYPES))
+    ir.mark_output(ir._next_value_id - 1)
+    return ir
+
+
+def measure(factory: Callable[[], object]) -> Tuple[int, object]:
+    """Return the bytes still allocated by ``factory()``'s result."""
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = factory()
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current, result
+
+
+def run(sizes: Sequence[int], seed: int) -> None:
+    print(f"{'ops':>10} {'CoreIR bytes':>14} {'compact bytes':>14} {'B/op':>7} {'B/op':>7} {'ratio':>6}")
+    for size in sizes:
+        ir = build_module(size, seed)
+        ir_bytes, ir_copy = measure(lambda: build_module(size, seed))
+        compact_bytes, _ = measure(lambda: CompactCoreIR.from_core_ir(ir))
+        del ir_copy
+        print(
+            f"{size:>10} {ir_bytes:>14} {compact_bytes:>14} "
+            f"{ir_bytes / size:>7.1f} {compact_bytes / size:>7.1f} {ir_bytes / compact_bytes:>6.1f}x"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.sizes, args.seed)
+
+
+if __name__ == "__main__":
+    main()
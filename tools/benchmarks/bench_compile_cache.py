@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Measure the compilation cache in front of ``LanguageConstruct.to_ir``.
+
+For ``Add`` chains of each depth, reports an uncached compile, the cost of
+computing the structural key alone, a memory-tier hit, a disk-tier hit (fresh
+cache over a warm directory) and a ``to_text`` hit, which skips both lowering
+and formatting.
+
+    python -m tools.benchmarks.bench_compile_cache --depths 100 1000 10000
+"""
+
+import argparse
+import tempfile
+import time
+from typing import Callable, Sequence
+
+from tools.benchmarks.bench_lowering import build_chain, make_type_system
+from tools.core_ir.compile_cache import CompilationCache, structural_key
+from tools.core_ir.language import LanguageConstruct
+
+
+def best_of(repeat: int, fn: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(depths: Sequence[int], repeat: int) -> None:
+    print(
+        f"{'depth':>8} {'compile ms':>11} {'key ms':>8} {'memory ms':>10} {'disk ms':>8} {'text ms':>8} {'speedup':>8}"
+    )
+    for depth in depths:
+        expression = build_chain(depth)
+        type_system = make_type_system()
+        compile_s = best_of(repeat, lambda: LanguageConstruct(expression, type_system).to_ir())
+        key_s = best_of(repeat, lambda: structural_key(expression, type_system))
+
+        with tempfile.TemporaryDirectory() as directory:
+            memory = CompilationCache(directory=directory)
+            construct = LanguageConstruct(expression, type_system, compile_cache=memory)
+            construct.to_ir()
+            memory_s = best_of(repeat, construct.to_ir)
+            text_s = best_of(repeat, construct.to_text)
+
+            def disk_hit() -> None:
+                LanguageConstruct(expression, type_system, compile_cache=CompilationCache(directory=directory)).to_ir()
+
+            disk_s = best_of(repeat, disk_hit)
+
+        print(
+            f"{depth:>8} {compile_s * 1e3:>11.2f} {key_s * 1e3:>8.2f} {memory_s * 1e3:>10.2f} "
+            f"{disk_s * 1e3:>8.2f} {text_s * 1e3:>8.2f} {compile_s / memory_s:>7.1f}x"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--depths", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.depths, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
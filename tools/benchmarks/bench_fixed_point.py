@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Compare Q16.16 fixed-point execution with float execution and a scalar loop.
+
+The module is a small MLP, ``mean(relu(x @ w1 + b) @ w2, axis 1)``, with
+``x: [size, size]`` and square weights. For each ``--size`` it reports the
+median run time of:
+
+- the float32 reference Executor;
+- the vectorised Q16Executor;
+- a per-element Python loop applying the same Q16.16 rules, for sizes up to
+  ``--scalar-max-size``.
+
+The scalar result must equal the Q16Executor output bit for bit. The
+digest column is the Tier 3 SHA-256 of the run, which should be the same on
+every machine for the same ``--seed``.
+
+    python -m tools.benchmarks.bench_fixed_point --size 16 64 256
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, List, Sequence
+
+from tools.core_ir.core_ir import CoreIR
+from tools.core_ir.executor import Executor
+from tools.core_ir.fixed_point import Q16Executor, from_q16, random_inputs
+
+
+def mlp_module(size: int) -> CoreIR:
+    shape = f"tensor<f32[{size}, {size}]>"
+    ir = CoreIR()
+    x, w1, b, w2 = (ir.declare_input(name, shape) for name in ("x", "w1", "b", "w2"))
+    h = ir.add_operation("MatMul", [x, w1], result_type=shape)
+    h = ir.add_operation("Add", [h, b], result_type=shape)
+    h = ir.add_operation("Relu", [h], result_type=shape)
+    h = ir.add_operation("MatMul", [h, w2], result_type=shape)
+    ir.mark_output(ir.add_operation("Mean", [h], {"axes": [1]}, f"tensor<f32[{size}]>"))
+    return ir
+
+
+def wrap32(value: int) -> int:
+    return (value + 2**31) % 2**32 - 2**31
+
+
+def scalar_mlp(x: List[List[int]], w1: List[List[int]], b: List[List[int]], w2: List[List[int]]) -> List[int]:
+    def matmul(a: List[List[int]], m: List[List[int]]) -> List[List[int]]:
+        columns = list(zip(*m))
+        return [[wrap32(sum((p * q) >> 16 for p, q in zip(row, column))) for column in columns] for row in a]
+
+    h = [[max(wrap32(v + c), 0) for v, c in zip(row, bias)] for row, bias in zip(matmul(x, w1), b)]
+    return [wrap32(sum(row) // len(row)) for row in matmul(h, w2)]
+
+
+def median_time(fn: Callable[[], object], repeat: int) -> float:
+    fn()
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def run(sizes: Sequence[int], scalar_max_size: int, repeat: int, seed: int) -> None:
+    print(f"{'size':>6} {'f32 ms':>9} {'q16 ms':>9} {'scalar ms':>10} {'vs scalar':>9}  digest")
+    for size in sizes:
+        ir = mlp_module(size)
+        inputs = random_inputs(ir, seed, scale=1.0)
+        floats = {name: from_q16(value).astype("float32") for name, value in inputs.items()}
+        reference = Executor(ir)
+        executor = Q16Executor(ir)
+        (result,) = executor.run(inputs)
+        float_s = median_time(lambda: reference.run(floats), repeat)
+        q16_s = median_time(lambda: executor.run(inputs), repeat)
+
+        scalar = "-"
+        speedup = "-"
+        if size <= scalar_max_size:
+            lists = [inputs[name].tolist() for name in ("x", "w1", "b", "w2")]
+            if scalar_mlp(*lists) != result.tolist():
+                raise AssertionError(f"Q16Executor differs from the scalar loop at size {size}")
+            scalar_s = median_time(lambda: scalar_mlp(*lists), 1)
+            scalar = f"{scalar_s * 1e3:.2f}"
+            speedup = f"{scalar_s / q16_s:.0f}x"
+        print(
+            f"{size:>6} {float_s * 1e3:>9.3f} {q16_s * 1e3:>9.3f} {scalar:>10} {speedup:>9}  {executor.digest[:16]}",
+            flush=True,
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, nargs="+", default=[16, 64, 256])
+    parser.add_argument("--scalar-max-size", type=int, default=128)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.size, args.scalar_max_size, args.repeat, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Measure elementwise fusion on scaled-up versions of the examples/ir modules.
+
+Each module is rebuilt with every ``[2, 3]`` tensor scaled to
+``[2 * scale, 3 * scale]``, then executed with the NumPy reference executor
+before and after ``fuse_elementwise``. Reports operation counts, median run
+time and the executor's peak live bytes.
+
+    python -m tools.benchmarks.bench_fusion --scale 256 512 1024
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from tools.core_ir.core_ir import CoreIR
+from tools.core_ir.executor import Executor
+from tools.core_ir.passes import fuse_elementwise
+
+
+def simple_module(shape: str) -> CoreIR:
+    """examples/ir/simple_module.ir: (a + b) * c."""
+
+    ir = CoreIR()
+    a, b, c = (ir.declare_input(name, shape) for name in "abc")
+    total = ir.add_operation("Add", [a, b], result_type=shape)
+    ir.mark_output(ir.add_operation("Mul", [c, total], result_type=shape))
+    return ir
+
+
+def autodiff_module(shape: str) -> CoreIR:
+    """examples/ir/autodiff_output.ir: sum(x * y + x) and its gradients."""
+
+    ir = CoreIR()
+    x = ir.declare_input("x", shape)
+    y = ir.declare_input("y", shape)
+    product = ir.add_operation("Mul", [x, y], result_type=shape)
+    total = ir.add_operation("Add", [x, product], result_type=shape)
+    loss = ir.add_operation("Sum", [total], {"axes": []}, result_type="tensor<f32[]>")
+    seed = ir.add_operation("ConstF32", [], {"value": 1.0}, "tensor<f32[]>")
+    dims = tuple(int(d) for d in shape[shape.index("[") + 1 : shape.index("]")].split(","))
+    ones = ir.add_operation("ConstTensor", [], {"value": 1.0, "shape": dims, "dtype": "f32"}, shape)
+    upstream = ir.add_operation("Mul", [seed, ones], result_type=shape)
+    grad_x_mul = ir.add_operation("Mul", [y, upstream], result_type=shape)
+    grad_y = ir.add_operation("Mul", [x, upstream], result_type=shape)
+    grad_x = ir.add_operation("Add", [upstream, grad_x_mul], result_type=shape)
+    for output in (loss, grad_x, grad_y):
+        ir.mark_output(output)
+    return ir
+
+
+def activation_module(shape: str) -> CoreIR:
+    """Bias, activation and scale epilogue: Mul(Relu(Add(x, b)), s) - Exp(Neg(x))."""
+
+    ir = CoreIR()
+    x, b, s = (ir.declare_input(name, shape) for name in ("x", "b", "s"))
+    act = ir.add_operation("Relu", [ir.add_operation("Add", [x, b], result_type=shape)], result_type=shape)
+    scaled = ir.add_operation("Mul", [act, s], result_type=shape)
+    decay = ir.add_operation("Exp", [ir.add_operation("Neg", [x], result_type=shape)], result_type=shape)
+    ir.mark_output(ir.add_operation("Sub", [scaled, decay], result_type=shape))
+    return ir
+
+
+MODULES: Dict[str, Callable[[str], CoreIR]] = {
+    "simple_module": simple_module,
+    "autodiff_output": autodiff_module,
+    "activation": activation_module,
+}
+
+
+def measure(ir: CoreIR, inputs: Dict[str, np.ndarray], repeat: int) -> Tuple[float, int]:
+    executor = Executor(ir)
+    executor.run(inputs)
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        executor.run(inputs)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), executor.peak_live_bytes
+
+
+def run(scales: Sequence[int], repeat: int, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    print(
+        f"{'module':<16} {'shape':>12} {'ops':>4} {'fused':>5} {'ms':>8} {'fused ms':>9} "
+        f"{'speedup':>8} {'peak MB':>8} {'fused MB':>9}"
+    )
+    for scale in scales:
+        dims = (2 * scale, 3 * scale)
+        shape = f"tensor<f32[{dims[0]}, {dims[1]}]>"
+        for name, build in MODULES.items():
+            ir = build(shape)
+            inputs = {
+                op.attributes["name"]: rng.standard_normal(dims, dtype=np.float32)
+                for op in ir.operations
+                if op.opcode == "Input"
+            }
+            ops = len(ir.operations)
+            base_s, base_peak = measure(ir, inputs, repeat)
+            fuse_elementwise(ir)
+            fused_s, fused_peak = measure(ir, inputs, repeat)
+            print(
+                f"{name:<16} {'x'.join(map(str, dims)):>12} {ops:>4} {len(ir.operations):>5} "
+                f"{base_s * 1e3:>8.2f} {fused_s * 1e3:>9.2f} {base_s / fused_s:>8.2f} "
+                f"{base_peak / 2**20:>8.1f} {fused_peak / 2**20:>9.1f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, nargs="+", default=[256, 512, 1024])
+    parser.add_argument("--repeat", type=int, default=11)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.scale, args.repeat, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Measure the overhead of the core_ir instrumentation layer.
+
+Times ``LanguageConstruct.to_ir().compile()`` on an ``Add`` chain before any
+profiler has run, under a ``Profiler`` in each mode (timing only, with trace
+events, with tracemalloc) and again after the profiler has stopped, which
+should match the first row since the hooks are removed on exit.
+
+    python -m tools.benchmarks.bench_instrument --depth 10000
+"""
+
+import argparse
+import time
+from typing import Callable, Optional
+
+from tools.benchmarks.bench_lowering import build_chain, make_type_system
+from tools.core_ir.instrument import Profiler
+from tools.core_ir.language import LanguageConstruct
+
+
+def best_of(repeat: int, fn: Callable[[], object], profiler: Optional[Profiler] = None) -> float:
+    timings = []
+    for _ in range(repeat):
+        if profiler is not None:
+            profiler.start()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+        if profiler is not None:
+            profiler.stop()
+    return min(timings)
+
+
+def run(depth: int, repeat: int) -> None:
+    expression = build_chain(depth)
+
+    def workload() -> None:
+        LanguageConstruct(expression, type_system=make_type_system()).to_ir().compile()
+
+    baseline = best_of(repeat, workload)
+    rows = [("disabled", baseline)]
+    for mode, profiler in (
+        ("timing", Profiler()),
+        ("trace", Profiler(trace=True)),
+        ("memory", Profiler(memory=True)),
+    ):
+        rows.append((mode, best_of(repeat, workload, profiler)))
+    rows.append(("after stop", best_of(repeat, workload)))
+
+    print(f"{'mode':<11} {'ms':>9} {'overhead':>9}")
+    for mode, seconds in rows:
+        print(f"{mode:<11} {seconds * 1e3:>9.1f} {seconds / baseline:>8.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--depth", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.depth, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Measure parsing throughput for the reference .ir text encoding.
+
+Writes synthetic modules in the examples/ir encoding to a temporary file and
+loads them back with ``load_ir`` (memory-mapped) and with ``parse_ir`` on a
+bytes buffer already in memory. Reports file size, best-of-N time, MB/s and
+instructions per second.
+
+    python -m tools.benchmarks.bench_ir_parser --sizes 10000 100000 1000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable, Sequence
+
+from tools.benchmarks.bench_compact import build_module
+from tools.core_ir.ir_parser import format_ir, load_ir, parse_ir
+
+
+def best_of(repeat: int, fn: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(sizes: Sequence[int], repeat: int, seed: int) -> None:
+    print(f"{'ops':>9} {'MB':>8} {'mmap ms':>10} {'mmap MB/s':>10} {'bytes ms':>10} {'bytes MB/s':>11} {'kops/s':>8}")
+    for size in sizes:
+        data = format_ir(build_module(size, seed)).encode("utf-8")
+        fd, path = tempfile.mkstemp(suffix=".ir")
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                fp.write(data)
+            mmap_s = best_of(repeat, lambda: load_ir(path))
+            bytes_s = best_of(repeat, lambda: parse_ir(data))
+        finally:
+            os.unlink(path)
+        megabytes = len(data) / 1e6
+        print(
+            f"{size:>9} {megabytes:>8.1f} {mmap_s * 1e3:>10.1f} {megabytes / mmap_s:>10.2f} "
+            f"{bytes_s * 1e3:>10.1f} {megabytes / bytes_s:>11.2f} {size / mmap_s / 1e3:>8.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark iterative versus recursive lowering of deep expression trees.
+
+Builds left-leaning ``Add`` chains and times ``LanguageConstruct.to_ir``
+(iterative) against ``Expression.emit`` (recursive). The recursive path is
+only measured up to ``--max-recursive-depth`` since deeper trees exhaust the
+interpreter stack.
+
+    python -m tools.benchmarks.bench_lowering --depths 1000 10000 100000
+"""
+
+import argparse
+import sys
+import time
+from typing import Optional, Sequence
+
+from tools.core_ir.core_ir import CoreIR
+from tools.core_ir.language import BinaryOperation, Expression, LanguageConstruct, Literal, Variable
+from tools.core_ir.type_system import TensorType, TypeSystem
+
+
+def build_chain(depth: int) -> Expression:
+    expression: Expression = Variable("x")
+    for i in range(depth):
+        rhs: Expression = Variable("y") if i % 2 else Literal(float(i), "f32")
+        expression = BinaryOperation("Add", expression, rhs)
+    return expression
+
+
+def make_type_system() -> TypeSystem:
+    type_system = TypeSystem()
+    type_system.add_symbol("x", TensorType("f32", (16, 16)))
+    type_system.add_symbol("y", TensorType("f32", (16,)))
+    return type_system
+
+
+def time_iterative(expression: Expression) -> float:
+    start = time.perf_counter()
+    LanguageConstruct(expression, type_system=make_type_system()).to_ir()
+    return time.perf_counter() - start
+
+
+def time_recursive(expression: Expression, depth: int) -> Optional[float]:
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, 4 * depth + 1000))
+    try:
+        start = time.perf_counter()
+        expression.emit(CoreIR(), make_type_system())
+        return time.perf_counter() - start
+    except RecursionError:
+        return None
+    finally:
+        sys.setrecursionlimit(limit)
+
+
+def run(depths: Sequence[int], max_recursive_depth: int) -> None:
+    print(f"{'depth':>8} {'iterative ms':>13} {'recursive ms':>13} {'us/node':>8}")
+    for depth in depths:
+        expression = build_chain(depth)
+        iterative = time_iterative(expression)
+        recursive = time_recursive(expression, depth) if depth <= max_recursive_depth else None
+        recursive_text = f"{recursive * 1e3:>13.1f}" if recursive is not None else f"{'n/a':>13}"
+        print(f"{depth:>8} {iterative * 1e3:>13.1f} {recursive_text} {iterative / depth * 1e6:>8.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--depths", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--max-recursive-depth", type=int, default=5_000)
+    args = parser.parse_args()
+    run(args.depths, args.max_recursive_depth)
+
+
+if __name__ == "__main__":
+    main()
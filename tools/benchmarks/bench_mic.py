@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Compare the mic@1 and mic@2 text formats against the reference encoding.
+
+For each module, reports encoded bytes and tokens for ``CoreIR.compile()``,
+mic@1 and mic@2, together with emit time and streaming parse throughput
+(parsing line by line from an in-memory text stream). Tokens are counted
+with ``tiktoken`` (cl100k_base) when it is installed and otherwise estimated
+as runs of word characters plus individual punctuation marks.
+
+Two module families are measured: ``random`` (the synthetic modules from
+bench_compact) and ``mlp-grad`` (a Relu MLP with its autodiff gradient
+graph, whose constants and attributes exercise the MAP block).
+
+    python -m tools.benchmarks.bench_mic --sizes 1000 10000 90000
+"""
+
+import argparse
+import io
+import re
+import time
+from typing import Callable, Dict, Sequence
+
+from tools.benchmarks.bench_autodiff import build_mlp
+from tools.benchmarks.bench_compact import build_module
+from tools.core_ir import mic
+from tools.core_ir.autodiff import differentiate
+from tools.core_ir.core_ir import CoreIR
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+_APPROX_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+
+def count_tokens(text: str) -> int:
+    if tiktoken is not None:
+        return len(tiktoken.get_encoding("cl100k_base").encode(text, disallowed_special=()))
+    return len(_APPROX_TOKEN.findall(text))
+
+
+def gradient_module(size: int, seed: int) -> CoreIR:
+    # About 17 operations per layer once the gradient graph is appended.
+    ir = build_mlp(max(1, size // 17), width=64, batch=32)
+    differentiate(ir)
+    return ir
+
+
+MODULES: Dict[str, Callable[[int, int], CoreIR]] = {"random": build_module, "mlp-grad": gradient_module}
+
+
+def best_of(repeat: int, fn: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(sizes: Sequence[int], repeat: int, seed: int) -> None:
+    print(
+        f"{'module':<9} {'ops':>7} {'format':<7} {'KB':>9} {'tokens':>9} {'tok/op':>7} "
+        f"{'vs text':>8} {'emit ms':>9} {'parse ms':>9} {'parse MB/s':>11}"
+    )
+    for size in sizes:
+        for name, build in MODULES.items():
+            ir = build(size, seed)
+            ops = len(ir.operations)
+            limits = mic.MicLimits(max_input_size=1 << 40, max_line_count=1 << 40, max_value_count=ops)
+            text = ir.compile()
+            text_tokens = count_tokens(text)
+            rows = [("text", text, best_of(repeat, ir.compile), None)]
+            for version in (1, 2):
+                encoded = mic.emit(ir, version)
+                emit_s = best_of(repeat, lambda: mic.emit(ir, version))
+                parse_s = best_of(repeat, lambda: mic.parse(io.StringIO(encoded), limits))
+                rows.append((f"mic@{version}", encoded, emit_s, parse_s))
+            for fmt, encoded, emit_s, parse_s in rows:
+                size_bytes = len(encoded.encode("utf-8"))
+                tokens = count_tokens(encoded)
+                parse_cols = (
+                    f"{parse_s * 1e3:>9.2f} {size_bytes / parse_s / 1e6:>11.2f}" if parse_s else f"{'-':>9} {'-':>11}"
+                )
+                print(
+                    f"{name:<9} {ops:>7} {fmt:<7} {size_bytes / 1024:>9.1f} {tokens:>9} {tokens / ops:>7.2f} "
+                    f"{text_tokens / tokens:>7.2f}x {emit_s * 1e3:>9.2f} {parse_cols}"
+                )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 90_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Compare MIC-B serialisation against the reference text encoding.
+
+Reports encoded size and throughput for ``CoreIR.compile()`` versus
+``micb.encode``/``micb.decode`` on synthetic modules.
+
+    python -m tools.benchmarks.bench_micb --sizes 1000 10000 90000
+"""
+
+import argparse
+import time
+from typing import Callable, Sequence
+
+from tools.benchmarks.bench_compact import build_module
+from tools.core_ir import micb
+
+
+def best_of(repeat: int, fn: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(sizes: Sequence[int], repeat: int, seed: int) -> None:
+    print(
+        f"{'ops':>8} {'text KB':>9} {'micb KB':>9} {'compile ms':>11} "
+        f"{'encode ms':>10} {'decode ms':>10} {'decode MB/s':>12}"
+    )
+    for size in sizes:
+        ir = build_module(size, seed)
+        text = ir.compile().encode("utf-8")
+        data = micb.encode(ir)
+        limits = micb.MicbLimits(max_input_size=max(len(data), micb.DEFAULT_LIMITS.max_input_size), max_value_count=size)
+
+        compile_s = best_of(repeat, ir.compile)
+        encode_s = best_of(repeat, lambda: micb.encode(ir))
+        decode_s = best_of(repeat, lambda: micb.decode(data, limits))
+        print(
+            f"{size:>8} {len(text) / 1024:>9.1f} {len(data) / 1024:>9.1f} {compile_s * 1e3:>11.2f} "
+            f"{encode_s * 1e3:>10.2f} {decode_s * 1e3:>10.2f} {len(data) / decode_s / 1e6:>12.2f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 90_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat, args.seed)
+
+
+if __name__ == "__main__":
+    main()
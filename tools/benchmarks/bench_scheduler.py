@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Compare serial and dependency-level parallel execution of wide CoreIR modules.
+
+Each module has ``--branches`` independent chains of ``--depth`` MatMuls on
+``[size, size]`` f32 tensors, joined by a tree of Adds. The serial Executor
+and the ParallelExecutor at each worker count run the same inputs; the
+outputs are checked for bit-for-bit equality. Reports median run time,
+speed-up over serial execution, the measured critical path and the bound on
+speed-up it implies (total kernel time / critical path).
+
+Run with the BLAS thread count pinned so the module's own width is what
+gets parallelised:
+
+    OPENBLAS_NUM_THREADS=1 OMP_NUM_THREADS=1 python -m tools.benchmarks.bench_scheduler --workers 1 2 4 8
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+
+from tools.core_ir.core_ir import CoreIR
+from tools.core_ir.executor import Executor
+from tools.core_ir.scheduler import ParallelExecutor
+
+
+def wide_module(branches: int, depth: int, size: int) -> CoreIR:
+    shape = f"tensor<f32[{size}, {size}]>"
+    ir = CoreIR()
+    x = ir.declare_input("x", shape)
+    tails = []
+    for branch in range(branches):
+        value = x
+        for layer in range(depth):
+            weight = ir.declare_input(f"w{branch}_{layer}", shape)
+            value = ir.add_operation("MatMul", [value, weight], result_type=shape)
+        tails.append(value)
+    while len(tails) > 1:
+        joined = [ir.add_operation("Add", [a, b], result_type=shape) for a, b in zip(tails[::2], tails[1::2])]
+        tails = joined + tails[len(joined) * 2 :]
+    ir.mark_output(tails[0])
+    return ir
+
+
+def median_time(fn: Callable[[], object], repeat: int) -> float:
+    fn()
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def run(branches: int, depth: int, sizes: Sequence[int], workers: Sequence[int], repeat: int, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    print(
+        f"{'size':>6} {'ops':>5} {'workers':>7} {'ms':>9} {'speedup':>8} {'crit ms':>8} {'bound':>6} {'levels':>6}"
+    )
+    for size in sizes:
+        ir = wide_module(branches, depth, size)
+        inputs: Dict[str, np.ndarray] = {
+            op.attributes["name"]: rng.standard_normal((size, size), dtype=np.float32) / np.sqrt(size)
+            for op in ir.operations
+            if op.opcode == "Input"
+        }
+        serial = Executor(ir)
+        (expected,) = serial.run(inputs)
+        serial_s = median_time(lambda: serial.run(inputs), repeat)
+        print(f"{size:>6} {len(ir.operations):>5} {'serial':>7} {serial_s * 1e3:>9.2f} {1.0:>8.2f}")
+        for count in workers:
+            executor = ParallelExecutor(ir, max_workers=count)
+            (actual,) = executor.run(inputs)
+            if actual.tobytes() != expected.tobytes():
+                raise AssertionError(f"parallel output differs from serial at size {size}, {count} workers")
+            parallel_s = median_time(lambda: executor.run(inputs), repeat)
+            critical_s, _ = executor.critical_path()
+            busy_s = sum(t.duration_s for t in executor.timings if t is not None)
+            print(
+                f"{size:>6} {len(ir.operations):>5} {count:>7} {parallel_s * 1e3:>9.2f} "
+                f"{serial_s / parallel_s:>8.2f} {critical_s * 1e3:>8.2f} {busy_s / critical_s:>6.1f} "
+                f"{len(executor.levels):>6}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--branches", type=int, default=8)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--size", type=int, nargs="+", default=[128, 256, 512])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.branches, args.depth, args.size, args.workers, args.repeat, args.seed)
+
+
+if __name__ == "__main__":
+    main()
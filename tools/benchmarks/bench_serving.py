@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Closed-loop load generator for the dynamic-batching inference server.
+
+Builds a two-layer MLP with a symbolic batch dimension
+(``relu(x @ w1 + b1) @ w2`` with x: ``[N, --features]``), starts
+``python -m tools.core_ir.serving`` on a Unix domain socket in a temporary
+directory and drives it from ``--concurrency`` keep-alive clients, each
+sending single-row requests back to back for ``--duration`` seconds.
+Everything stays on localhost. Each configuration reports client-side
+throughput and p50/p99 latency together with the server's mean batch size
+and batch-size histogram, once without batching (``--max-batch-size 1``)
+and once per ``--max-batch-size`` value.
+
+    python -m tools.benchmarks.bench_serving --concurrency 1 8 32 --max-batch-size 1 32
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from tools.core_ir.core_ir import CoreIR
+from tools.core_ir.ir_parser import format_ir
+from tools.core_ir.serving import Client
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def mlp_module(features: int, hidden: int, outputs: int, seed: int) -> CoreIR:
+    rng = np.random.default_rng(seed)
+    ir = CoreIR()
+    x = ir.declare_input("x", f"tensor<f32[N, {features}]>")
+
+    def const(shape: Tuple[int, ...]) -> int:
+        value = (rng.standard_normal(shape) / math.sqrt(shape[0])).astype(np.float32).tolist()
+        result_type = f"tensor<f32[{', '.join(map(str, shape))}]>"
+        return ir.add_operation("ConstTensor", [], {"value": value, "shape": shape, "dtype": "f32"}, result_type)
+
+    w1, b1, w2 = const((features, hidden)), const((hidden,)), const((hidden, outputs))
+    h = ir.add_operation("MatMul", [x, w1], result_type=f"tensor<f32[N, {hidden}]>")
+    h = ir.add_operation("Add", [h, b1], result_type=f"tensor<f32[N, {hidden}]>")
+    h = ir.add_operation("Relu", [h], result_type=f"tensor<f32[N, {hidden}]>")
+    ir.mark_output(ir.add_operation("MatMul", [h, w2], result_type=f"tensor<f32[N, {outputs}]>"))
+    return ir
+
+
+async def client_loop(path: str, features: int, deadline: float, latencies: List[float], seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    client = await Client.connect(path)
+    row = rng.standard_normal((1, features), dtype=np.float32)
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await client.infer({"x": row})
+            latencies.append(time.perf_counter() - start)
+    finally:
+        await client.close()
+
+
+async def drive(path: str, features: int, concurrency: int, duration: float) -> Tuple[float, List[float], dict]:
+    latencies: List[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(client_loop(path, features, start + duration, latencies, seed) for seed in range(concurrency))
+    )
+    elapsed = time.perf_counter() - start
+    client = await Client.connect(path)
+    _, body = await client.request("GET", "/v1/metrics")
+    await client.close()
+    return elapsed, latencies, json.loads(body)
+
+
+def start_server(module: Path, socket_path: str, max_batch_size: int, max_wait_ms: float) -> subprocess.Popen:
+    command = [
+        sys.executable, "-m", "tools.core_ir.serving", str(module), "--unix", socket_path,
+        "--max-batch-size", str(max_batch_size), "--max-wait-ms", str(max_wait_ms),
+    ]  # fmt: skip
+    server = subprocess.Popen(command, cwd=REPO_ROOT, stdout=subprocess.PIPE, text=True)
+    line = server.stdout.readline()
+    if not line.startswith("Serving on"):
+        server.kill()
+        raise RuntimeError(f"server failed to start: {line!r}")
+    return server
+
+
+def run(
+    concurrency: Sequence[int],
+    batch_sizes: Sequence[int],
+    max_wait_ms: float,
+    duration: float,
+    features: int,
+    seed: int,
+) -> None:
+    print(
+        f"{'max batch':>9} {'clients':>7} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'mean batch':>10}  batch sizes"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        module = Path(directory, "mlp.ir")
+        module.write_text(format_ir(mlp_module(features, 4 * features, 16, seed)), encoding="utf-8")
+        for max_batch_size in batch_sizes:
+            for clients in concurrency:
+                socket_path = os.path.join(directory, f"serving-{max_batch_size}-{clients}.sock")
+                server = start_server(module, socket_path, max_batch_size, max_wait_ms)
+                try:
+                    elapsed, latencies, metrics = asyncio.run(drive(socket_path, features, clients, duration))
+                finally:
+                    server.terminate()
+                    server.wait()
+                latencies.sort()
+                p50 = latencies[len(latencies) // 2]
+                p99 = latencies[max(0, math.ceil(0.99 * len(latencies)) - 1)]
+                histogram = " ".join(f"{size}:{count}" for size, count in metrics["batch_size_histogram"].items())
+                print(
+                    f"{max_batch_size:>9} {clients:>7} {len(latencies) / elapsed:>9.0f} {p50 * 1e3:>8.2f} "
+                    f"{p99 * 1e3:>8.2f} {metrics['mean_batch_size']:>10.1f}  {histogram}",
+                    flush=True,
+                )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--max-batch-size", type=int, nargs="+", default=[1, 32])
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--features", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.concurrency, args.max_batch_size, args.max_wait_ms, args.duration, args.features, args.seed)
+
+
+if __name__ == "__main__":
+    main()
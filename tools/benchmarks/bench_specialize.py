@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Compare recompiling per batch size with specialising a symbolic module.
+
+Builds a stack of ``MatMul`` + bias layers whose input has a symbolic batch
+dimension ``N``. For each batch size, times a full compile against a concrete
+symbol table, a first specialisation (one substitution pass) and a repeat
+specialisation served from the ``SpecializationCache``.
+
+    python -m tools.benchmarks.bench_specialize --layers 1000 --batches 1 8 32 128
+"""
+
+import argparse
+import time
+from typing import Callable, Sequence, Union
+
+from tools.core_ir.language import BinaryOperation, Expression, LanguageConstruct, Variable
+from tools.core_ir.type_system import TensorType, TypeSystem
+
+
+def build_stack(layers: int) -> Expression:
+    expression: Expression = Variable("x")
+    for i in range(layers):
+        expression = BinaryOperation("MatMul", expression, Variable(f"w{i}"))
+        expression = BinaryOperation("Add", expression, Variable(f"b{i}"))
+    return expression
+
+
+def make_type_system(layers: int, batch: Union[int, str], width: int) -> TypeSystem:
+    type_system = TypeSystem()
+    type_system.add_symbol("x", TensorType("f32", (batch, width)))
+    for i in range(layers):
+        type_system.add_symbol(f"w{i}", TensorType("f32", (width, width)))
+        type_system.add_symbol(f"b{i}", TensorType("f32", (width,)))
+    return type_system
+
+
+def timed(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(layers: int, batches: Sequence[int], width: int) -> None:
+    expression = build_stack(layers)
+    compile_s = timed(lambda: LanguageConstruct(expression, make_type_system(layers, "N", width)).specialize())
+    specializations = LanguageConstruct(expression, make_type_system(layers, "N", width)).specialize()
+    print(f"symbolic compile: {compile_s * 1e3:.1f} ms for {layers} layers")
+    print(f"{'batch':>7} {'recompile ms':>13} {'specialise ms':>14} {'hit us':>8}")
+    for batch in batches:
+        recompile_s = timed(lambda: LanguageConstruct(expression, make_type_system(layers, batch, width)).to_ir())
+        first_s = timed(lambda: specializations.specialize({"N": batch}))
+        hit_s = timed(lambda: specializations.specialize({"N": batch}))
+        print(f"{batch:>7} {recompile_s * 1e3:>13.2f} {first_s * 1e3:>14.2f} {hit_s * 1e6:>8.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--layers", type=int, default=1_000)
+    parser.add_argument("--batches", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--width", type=int, default=64)
+    args = parser.parse_args()
+    run(args.layers, args.batches, args.width)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Measure verifier throughput on large well-typed modules.
+
+Builds random modules of elementwise, reduction, reshape and matmul
+operations that pass verification and reports time per operation, which
+should stay flat as the module grows if verification is linear.
+
+    python -m tools.benchmarks.bench_verifier --sizes 10000 100000 1000000
+"""
+
+import argparse
+import random
+import time
+from typing import Sequence
+
+from tools.core_ir.core_ir import CoreIR
+from tools.core_ir.verifier import diagnose
+
+MATRIX = "tensor<f32[64, 64]>"
+VECTOR = "tensor<f32[64]>"
+
+
+def build_valid_module(size: int, seed: int = 0) -> CoreIR:
+    """Build a random module of ``size`` operations that verifies cleanly."""
+
+    rng = random.Random(seed)
+    ir = CoreIR()
+    matrices = [ir.declare_input(f"m{i}", MATRIX) for i in range(4)]
+    vectors = [ir.declare_input(f"v{i}", VECTOR) for i in range(4)]
+    while len(ir.operations) < size:
+        choice = rng.randrange(6)
+        if choice == 0:
+            matrices.append(ir.add_operation("MatMul", [rng.choice(matrices), rng.choice(matrices)], result_type=MATRIX))
+        elif choice == 1:
+            operands = [rng.choice(matrices), rng.choice(vectors)]
+            matrices.append(ir.add_operation(rng.choice(("Add", "Sub", "Mul")), operands, result_type=MATRIX))
+        elif choice == 2:
+            matrices.append(ir.add_operation("Relu", [rng.choice(matrices)], result_type=MATRIX))
+        elif choice == 3:
+            vectors.append(ir.add_operation("Sum", [rng.choice(matrices)], {"axes": [0]}, VECTOR))
+        elif choice == 4:
+            matrices.append(ir.add_operation("Transpose", [rng.choice(matrices)], {"permutation": [1, 0]}, MATRIX))
+        else:
+            reshaped = ir.add_operation("Reshape", [rng.choice(matrices)], {"new_shape": [4096]}, "tensor<f32[4096]>")
+            matrices.append(ir.add_operation("Reshape", [reshaped], {"new_shape": [64, -1]}, MATRIX))
+    ir.mark_output(matrices[-1])
+    return ir
+
+
+def run(sizes: Sequence[int], repeat: int, seed: int) -> None:
+    print(f"{'ops':>9} {'best ms':>10} {'ns/op':>8} {'Mops/s':>8} {'errors':>7}")
+    for size in sizes:
+        ir = build_valid_module(size, seed)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            diagnostics = diagnose(ir)
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        ops = len(ir.operations)
+        print(f"{ops:>9} {best * 1e3:>10.1f} {best / ops * 1e9:>8.0f} {ops / best / 1e6:>8.2f} {len(diagnostics):>7}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat, args.seed)
+
+
+if __name__ == "__main__":
+    main()
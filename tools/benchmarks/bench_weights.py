@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Measure opening and binding a large memory-mapped SafeTensors checkpoint.
+
+Writes a sparse ``--size-gb`` checkpoint with HuggingFace-style tensor names
+(``model.layers.{N}.mlp.up_proj.weight`` and friends, f32) into a temporary
+directory, so creating it costs no disk bandwidth. It then reports:
+
+- the time to open it and parse its header;
+- the time to bind every tensor to a CoreIR module of ``Input`` and
+  ``ConstTensor`` declarations;
+- the process RSS after opening, after binding, and after reading one layer.
+
+Linux only (RSS comes from /proc/self/statm).
+
+    python -m tools.benchmarks.bench_weights --size-gb 4
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Sequence, Tuple
+
+from tools.core_ir.core_ir import CoreIR
+from tools.core_ir.weights import bind_weights, encode_header, open_checkpoint
+
+LAYER_TENSORS = ("q_proj", "k_proj", "v_proj", "o_proj", "gate_proj", "up_proj", "down_proj")
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as handle:
+        return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def layout(size_gb: float, hidden: int) -> Dict[str, Tuple[str, Sequence[int]]]:
+    per_layer = len(LAYER_TENSORS) * hidden * hidden * 4
+    tensors: Dict[str, Tuple[str, Sequence[int]]] = {"model.embed_tokens.weight": ("F32", (32_000, hidden))}
+    for layer in range(max(1, int(size_gb * 2**30 // per_layer))):
+        for projection in LAYER_TENSORS:
+            group = "mlp" if projection in ("gate_proj", "up_proj", "down_proj") else "self_attn"
+            tensors[f"model.layers.{layer}.{group}.{projection}.weight"] = ("F32", (hidden, hidden))
+        tensors[f"model.layers.{layer}.input_layernorm.weight"] = ("F32", (hidden,))
+    tensors["model.norm.weight"] = ("F32", (hidden,))
+    return tensors
+
+
+def module_for(tensors: Dict[str, Tuple[str, Sequence[int]]]) -> CoreIR:
+    ir = CoreIR()
+    for name, (_, shape) in tensors.items():
+        result_type = f"tensor<f32[{', '.join(map(str, shape))}]>"
+        if name.endswith("norm.weight"):
+            ir.add_operation("ConstTensor", [], {"name": name}, result_type)
+        else:
+            ir.declare_input(name, result_type)
+    return ir
+
+
+def run(size_gb: float, hidden: int) -> None:
+    tensors = layout(size_gb, hidden)
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory, "model.safetensors")
+        prefix, offsets = encode_header(tensors, {"format": "pt"})
+        with open(path, "wb") as handle:
+            handle.write(prefix)
+            handle.truncate(len(prefix) + max(end for _, end in offsets.values()))
+        ir = module_for(tensors)
+        size = path.stat().st_size
+
+        baseline = rss_mb()
+        start = time.perf_counter()
+        checkpoint = open_checkpoint(path)
+        opened = time.perf_counter() - start
+        opened_rss = rss_mb()
+
+        start = time.perf_counter()
+        inputs = bind_weights(ir, checkpoint)
+        bound = time.perf_counter() - start
+        bound_rss = rss_mb()
+
+        layer = [array for name, array in inputs.items() if name.startswith("model.layers.0.")]
+        start = time.perf_counter()
+        checksum = sum(float(array.sum()) for array in layer)
+        touched = time.perf_counter() - start
+        touched_mb = sum(array.nbytes for array in layer) / 2**20
+
+        print(f"checkpoint        {size / 2**30:8.2f} GiB, {len(tensors)} tensors, header {len(prefix) / 1024:.0f} KiB")
+        print(f"open + header     {opened * 1e3:8.2f} ms   RSS +{opened_rss - baseline:.1f} MiB")
+        print(f"bind {len(tensors):>5} tensors {bound * 1e3:8.2f} ms   RSS +{bound_rss - baseline:.1f} MiB")
+        print(
+            f"read layer 0      {touched * 1e3:8.2f} ms   RSS +{rss_mb() - baseline:.1f} MiB "
+            f"({touched_mb:.0f} MiB touched, sum {checksum:g})"
+        )
+        del inputs, layer
+        checkpoint.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-gb", type=float, default=2.0)
+    parser.add_argument("--hidden", type=int, default=2048)
+    args = parser.parse_args()
+    run(args.size_gb, args.hidden)
+
+
+if __name__ == "__main__":
+    main()
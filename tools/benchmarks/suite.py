@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the Python Core IR toolchain.
+
+Follows the measurement protocol of spec/v1.0/performance.md: every case
+runs warmup iterations, then timed iterations (10 and 100 by default; the
+largest cases use fewer, recorded per result), and reports median and 95th
+percentile latency plus throughput. Inputs come from synthetic generators
+seeded with ``--seed``, so every run measures the same graphs.
+
+Cases:
+
+  lowering/{deep,wide,dag}/N   LanguageConstruct.to_ir on chains, balanced
+                               trees and DAGs with shared subexpressions
+  compile/N                    CoreIR.compile() on random modules, 10^3-10^6 ops
+  typesystem/*                 broadcast_shapes and validate_matmul over random
+                               shape pairs, with cold and warm shape caches
+  startup/*                    interpreter start and importing tools.core_ir
+
+Results print as a table and are written as JSON with ``--json``.
+``--save-baseline`` stores them; ``--baseline`` compares medians against a
+stored run and exits non-zero when any case is slower than its category's
+acceptable variance (micro 3%, kernel 5%, model and startup 10%) or than
+``--threshold`` when given.
+
+    python -m tools.benchmarks.suite --save-baseline baseline.json
+    python -m tools.benchmarks.suite --baseline baseline.json --filter 'lowering|compile/1000$'
+"""
+
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from tools.benchmarks.bench_compact import build_module
+from tools.benchmarks.bench_lowering import build_chain, make_type_system
+from tools.core_ir.language import BinaryOperation, Expression, LanguageConstruct, Literal, Variable
+from tools.core_ir.type_system import TensorType, TypeSystem
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Acceptable variance per category (performance.md, "Acceptable variance").
+TOLERANCES: Dict[str, float] = {"micro": 0.03, "kernel": 0.05, "model": 0.10, "startup": 0.10}
+
+DEFAULT_WARMUP = 10
+DEFAULT_ITERATIONS = 100
+
+
+@dataclass(frozen=True)
+class Case:
+    """One benchmark. ``setup`` builds the inputs and returns the timed callable.
+
+    ``units`` counts the work items one call processes (``unit`` names them)
+    for throughput. ``warmup``/``iterations`` override the protocol defaults
+    for cases too expensive to repeat 100 times.
+    """
+
+    name: str
+    category: str
+    setup: Callable[[], Callable[[], object]]
+    units: int = 1
+    unit: str = "calls"
+    warmup: Optional[int] = None
+    iterations: Optional[int] = None
+
+
+@dataclass
+class Result:
+    benchmark: str
+    category: str
+    warmup: int
+    iterations: int
+    median_s: float
+    p95_s: float
+    mean_s: float
+    min_s: float
+    max_s: float
+    units: int
+    unit: str
+    throughput: float
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of ``samples``."""
+
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def build_wide(leaves: int, seed: int) -> Expression:
+    """Balanced binary tree over ``leaves`` operands."""
+
+    rng = random.Random(seed)
+    operands = (lambda i: Variable("x"), lambda i: Variable("y"), lambda i: Literal(float(i), "f32"))
+    level: List[Expression] = [operands[i % 3](i) for i in range(leaves)]
+    while len(level) > 1:
+        pairs = [BinaryOperation(rng.choice(("Add", "Mul", "Sub")), a, b) for a, b in zip(level[::2], level[1::2])]
+        level = pairs + level[len(pairs) * 2 :]
+    return level[0]
+
+
+def build_dag(nodes: int, seed: int) -> Expression:
+    """Random DAG in which each node combines two earlier ones, so subtrees are shared."""
+
+    rng = random.Random(seed)
+    pool: List[Expression] = [Variable("x"), Variable("y"), Literal(1.0, "f32")]
+    for _ in range(nodes):
+        lhs = pool[-1] if rng.random() < 0.5 else rng.choice(pool)
+        pool.append(BinaryOperation(rng.choice(("Add", "Mul", "Sub")), lhs, rng.choice(pool)))
+    return pool[-1]
+
+
+def _random_shape(rng: random.Random, rank: int) -> Tuple[int, ...]:
+    return tuple(rng.choice((1, 2, 3, 4, 8, 16, 32, 64)) for _ in range(rank))
+
+
+def broadcast_pairs(count: int, seed: int) -> List[Tuple[Tuple[int, ...], Tuple[int, ...]]]:
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(count):
+        lhs = _random_shape(rng, rng.randint(1, 4))
+        rhs = tuple(1 if rng.random() < 0.3 else dim for dim in lhs[rng.randint(0, len(lhs) - 1) :])
+        pairs.append((lhs, rhs) if rng.random() < 0.5 else (rhs, lhs))
+    return pairs
+
+
+def matmul_pairs(count: int, seed: int) -> List[Tuple[TensorType, TensorType]]:
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(count):
+        batch = _random_shape(rng, rng.randint(0, 2))
+        m, k, n = _random_shape(rng, 3)
+        pairs.append((TensorType("f32", batch + (m, k)), TensorType("f32", batch + (k, n))))
+    return pairs
+
+
+def _lowering(expression_of: Callable[[], Expression]) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        expression = expression_of()
+        return lambda: LanguageConstruct(expression, type_system=make_type_system()).to_ir()
+
+    return setup
+
+
+def _compile(size: int, seed: int) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        return build_module(size, seed).compile
+
+    return setup
+
+
+def _broadcast(seed: int, warm: bool) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        pairs = broadcast_pairs(1000, seed)
+        shared = TypeSystem()
+
+        def run() -> None:
+            ts = shared if warm else TypeSystem(shape_cache_size=0)
+            for lhs, rhs in pairs:
+                ts.broadcast_shapes(lhs, rhs)
+
+        return run
+
+    return setup
+
+
+def _matmul(seed: int, warm: bool) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        pairs = matmul_pairs(1000, seed)
+        shared = TypeSystem()
+
+        def run() -> None:
+            ts = shared if warm else TypeSystem(shape_cache_size=0)
+            for lhs, rhs in pairs:
+                ts.validate_matmul(lhs, rhs)
+
+        return run
+
+    return setup
+
+
+def _startup(code: str) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        command = [sys.executable, "-c", code]
+        return lambda: subprocess.run(command, cwd=REPO_ROOT, check=True)
+
+    return setup
+
+
+def build_cases(seed: int) -> List[Case]:
+    cases: List[Case] = []
+    for depth in (1_000, 10_000):
+        setup = _lowering(lambda d=depth: build_chain(d))
+        cases.append(Case(f"lowering/deep/{depth}", "kernel", setup, depth, "nodes"))
+    for leaves in (1_024, 8_192):
+        setup = _lowering(lambda n=leaves: build_wide(n, seed))
+        cases.append(Case(f"lowering/wide/{leaves}", "kernel", setup, 2 * leaves - 1, "nodes"))
+    for nodes in (1_000, 10_000):
+        setup = _lowering(lambda n=nodes: build_dag(n, seed))
+        cases.append(Case(f"lowering/dag/{nodes}", "kernel", setup, nodes, "nodes"))
+    for size, warmup, iterations in ((1_000, None, None), (10_000, None, None), (100_000, 3, 20), (1_000_000, 1, 5)):
+        cases.append(Case(f"compile/{size}", "kernel", _compile(size, seed), size, "ops", warmup, iterations))
+    for warm in (False, True):
+        suffix = "warm" if warm else "cold"
+        cases.append(Case(f"typesystem/broadcast/{suffix}", "micro", _broadcast(seed, warm), 1000, "checks"))
+        cases.append(Case(f"typesystem/matmul/{suffix}", "micro", _matmul(seed, warm), 1000, "checks"))
+    imports = "import tools.core_ir.language, tools.core_ir.verifier, tools.core_ir.ir_parser"
+    cases.append(Case("startup/interpreter", "startup", _startup("pass"), warmup=2, iterations=20))
+    cases.append(Case("startup/import_core_ir", "startup", _startup(imports), warmup=2, iterations=20))
+    return cases
+
+
+def measure(case: Case, warmup: int, iterations: int) -> Result:
+    fn = case.setup()
+    warmup = case.warmup if case.warmup is not None else warmup
+    iterations = case.iterations if case.iterations is not None else iterations
+    for _ in range(warmup):
+        fn()
+    samples = []
+    gc.collect()
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(iterations):
+            start = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    median = percentile(samples, 50)
+    return Result(
+        benchmark=case.name,
+        category=case.category,
+        warmup=warmup,
+        iterations=iterations,
+        median_s=median,
+        p95_s=percentile(samples, 95),
+        mean_s=sum(samples) / len(samples),
+        min_s=min(samples),
+        max_s=max(samples),
+        units=case.units,
+        unit=case.unit,
+        throughput=case.units / median if median > 0 else math.inf,
+    )
+
+
+def compare(
+    results: Sequence[Result], baseline: Dict[str, Any], threshold: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """Compare medians with ``baseline`` (a saved report); see the module docstring."""
+
+    previous = {entry["benchmark"]: entry for entry in baseline.get("results", [])}
+    comparisons = []
+    for result in results:
+        tolerance = threshold if threshold is not None else TOLERANCES.get(result.category, TOLERANCES["model"])
+        entry: Dict[str, Any] = {"benchmark": result.benchmark, "tolerance": tolerance}
+        old = previous.get(result.benchmark)
+        if old is None:
+            entry.update(status="new", ratio=None)
+        else:
+            ratio = result.median_s / old["median_s"]
+            if ratio > 1 + tolerance:
+                status = "regressed"
+            elif ratio < 1 - tolerance:
+                status = "improved"
+            else:
+                status = "ok"
+            entry.update(status=status, ratio=ratio, baseline_median_s=old["median_s"])
+        comparisons.append(entry)
+    return comparisons
+
+
+def hardware() -> Dict[str, Any]:
+    return {
+        "machine": platform.machine(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "os": f"{platform.system()} {platform.release()}",
+        "python": f"{platform.python_implementation()} {platform.python_version()}",
+    }
+
+
+def run(
+    cases: Sequence[Case],
+    warmup: int,
+    iterations: int,
+    seed: int,
+    baseline: Optional[Dict[str, Any]] = None,
+    threshold: Optional[float] = None,
+    out: Any = sys.stdout,
+) -> Dict[str, Any]:
+    results = []
+    comparisons: Dict[str, Dict[str, Any]] = {}
+    print(
+        f"{'benchmark':<30} {'category':<8} {'iters':>5} {'median ms':>10} {'p95 ms':>10} "
+        f"{'throughput':>19} {'vs base':>8} {'status':>9}",
+        file=out,
+    )
+    for case in cases:
+        result = measure(case, warmup, iterations)
+        results.append(result)
+        line = (
+            f"{result.benchmark:<30} {result.category:<8} {result.iterations:>5} {result.median_s * 1e3:>10.3f} "
+            f"{result.p95_s * 1e3:>10.3f} {result.throughput:>10.0f} {result.unit + '/s':<8}"
+        )
+        if baseline is not None:
+            (comparison,) = compare([result], baseline, threshold)
+            comparisons[result.benchmark] = comparison
+            ratio = f"{comparison['ratio']:.2f}x" if comparison["ratio"] is not None else "-"
+            line += f" {ratio:>8} {comparison['status']:>9}"
+        print(line, file=out, flush=True)
+
+    report: Dict[str, Any] = {
+        "suite": "mind-core-ir-python",
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "hardware": hardware(),
+        "protocol": {"warmup": warmup, "iterations": iterations, "seed": seed},
+        "results": [asdict(result) for result in results],
+    }
+    if baseline is not None:
+        report["comparison"] = list(comparisons.values())
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", help="only run cases whose name matches this regular expression")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP)
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="write the report as JSON")
+    parser.add_argument("--save-baseline", type=Path, help="write the report as a baseline for later runs")
+    parser.add_argument("--baseline", type=Path, help="compare medians against this saved report")
+    parser.add_argument("--threshold", type=float, help="allowed slowdown as a fraction, overriding the category")
+    parser.add_argument("--list", action="store_true", help="list case names and exit")
+    args = parser.parse_args(argv)
+
+    cases = build_cases(args.seed)
+    if args.filter:
+        pattern = re.compile(args.filter)
+        cases = [case for case in cases if pattern.search(case.name)]
+    if args.list:
+        for case in cases:
+            print(f"{case.name:<30} {case.category}")
+        return 0
+    if not cases:
+        parser.error("no benchmark matches --filter")
+    if args.threshold is not None and args.threshold < 0:
+        parser.error("--threshold must not be negative")
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline else None
+    report = run(cases, args.warmup, args.iterations, args.seed, baseline, args.threshold)
+    for path in (args.json, args.save_baseline):
+        if path is not None:
+            path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    regressed = [entry["benchmark"] for entry in report.get("comparison", []) if entry["status"] == "regressed"]
+    if regressed:
+        print(f"{len(regressed)} benchmark(s) regressed: {', '.join(regressed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Run the YAML conformance corpus against an implementation in parallel.
+
+Cases are discovered by path only; each worker process parses its own YAML
+files, runs the implementation on the case input and compares the outcome
+with ``expected``. An implementation is either an external command, which
+receives the case as JSON on stdin and prints an outcome as JSON on stdout,
+or a Python callable named as ``module:attribute``. Outcomes have the form
+
+    {"status": "success", "result": {"dtype": "f32", "shape": [2], "values": [1.0, 2.0]}}
+    {"status": "error", "error": {"code": "E3001", "message": "...", "location": {"line": 8, "column": 9}}}
+    {"status": "skipped", "reason": "..."}
+
+and success outcomes may carry ``ir`` or ``gradient_module`` text instead of
+``result``.
+
+    python -m tools.conformance tests/conformance --command "mindc conformance" --junit report.xml
+"""
+
+import argparse
+import importlib
+import json
+import math
+import os
+import shlex
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+Outcome = Dict[str, Any]
+Implementation = Callable[[Dict[str, Any]], Outcome]
+
+# Patterns accepted by ``expected.output.result.values_pattern``.
+VALUE_PATTERNS: Dict[str, Callable[[float], bool]] = {
+    "all_zeros": lambda value: value == 0,
+    "all_ones": lambda value: value == 1,
+    "all_finite": lambda value: math.isfinite(value),
+}
+
+
+@dataclass
+class CaseResult:
+    """Verdict for one case. ``status`` is passed, failed, skipped or error."""
+
+    name: str
+    category: str
+    status: str
+    seconds: float
+    failures: List[str] = field(default_factory=list)
+
+
+class CommandImplementation:
+    """Runs an external implementation once per case.
+
+    The case mapping is written to the command's stdin as JSON and the
+    outcome is read from its stdout. A case that exceeds ``timeout`` seconds
+    raises ``subprocess.TimeoutExpired`` instead of stalling the run, so it is
+    reported with status ``error`` (not ``failed``) like any other crash.
+    """
+
+    def __init__(self, argv: Sequence[str], timeout: float = 60.0) -> None:
+        self.argv = list(argv)
+        self.timeout = timeout
+
+    def __call__(self, case: Dict[str, Any]) -> Outcome:
+        completed = subprocess.run(
+            self.argv,
+            input=json.dumps(case),
+            capture_output=True,
+            text=True,
+            timeout=self.timeout,
+        )
+        if completed.returncode != 0 and not completed.stdout.strip():
+            raise RuntimeError(f"exit status {completed.returncode}: {completed.stderr.strip()[-500:]}")
+        return json.loads(completed.stdout)
+
+
+def load_adapter(spec: str) -> Implementation:
+    """Import a ``module:attribute`` implementation callable."""
+
+    module_name, _, attribute = spec.partition(":")
+    if not attribute:
+        raise ValueError(f"Adapter '{spec}' must have the form module:attribute")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def discover(paths: Iterable[Path]) -> List[Path]:
+    """Return every ``*.yaml`` case under ``paths`` in sorted order."""
+
+    found = set()
+    for path in paths:
+        if path.is_dir():
+            found.update(path.rglob("*.yaml"))
+        else:
+            found.add(path)
+    return sorted(found)
+
+
+def load_case(path: Path) -> Dict[str, Any]:
+    import yaml
+
+    with path.open(encoding="utf-8") as handle:
+        case = yaml.safe_load(handle)
+    if not isinstance(case, dict) or "expected" not in case:
+        raise ValueError(f"{path} is not a conformance case: missing 'expected'")
+    return case
+
+
+def _flatten(values: Any) -> List[Any]:
+    flat: List[Any] = []
+    stack = [values]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, (list, tuple)):
+            stack.extend(reversed(item))
+        else:
+            flat.append(item)
+    return flat
+
+
+def _close(actual: Any, expected: Any, tolerance: float) -> bool:
+    if isinstance(expected, bool) or isinstance(actual, bool):
+        return actual == expected
+    try:
+        actual, expected = float(actual), float(expected)
+    except (TypeError, ValueError):
+        return actual == expected
+    if math.isnan(expected):
+        return math.isnan(actual)
+    return actual == expected or abs(actual - expected) <= tolerance
+
+
+def _compare_result(expected: Dict[str, Any], actual: Dict[str, Any]) -> List[str]:
+    failures: List[str] = []
+    if "dtype" in expected and actual.get("dtype") != expected["dtype"]:
+        failures.append(f"dtype: expected {expected['dtype']}, got {actual.get('dtype')}")
+    if "shape" in expected and list(actual.get("shape") or []) != list(expected["shape"]):
+        failures.append(f"shape: expected {list(expected['shape'])}, got {actual.get('shape')}")
+    # PyYAML reads exponent-only floats such as ``1e-6`` as strings.
+    tolerance = float(expected.get("tolerance", 0.0))
+    values = _flatten(actual.get("values"))
+    if "values" in expected:
+        wanted = _flatten(expected["values"])
+        if len(values) != len(wanted):
+            failures.append(f"values: expected {len(wanted)} elements, got {len(values)}")
+        else:
+            for i, (got, want) in enumerate(zip(values, wanted)):
+                if not _close(got, want, tolerance):
+                    failures.append(f"values[{i}]: expected {want}, got {got} (tolerance {tolerance:g})")
+                    break
+    if "values_pattern" in expected:
+        pattern = VALUE_PATTERNS.get(expected["values_pattern"])
+        if pattern is None:
+            failures.append(f"values_pattern: unknown pattern {expected['values_pattern']!r}")
+        elif not values or not all(pattern(float(v)) for v in values):
+            failures.append(f"values: do not match pattern {expected['values_pattern']!r}")
+    return failures
+
+
+def _normalize_ir(text: str) -> List[str]:
+    return [line.strip() for line in text.splitlines() if line.strip() and not line.lstrip().startswith("#")]
+
+
+def compare(expected: Dict[str, Any], outcome: Outcome) -> List[str]:
+    """Return the mismatches between a case's ``expected`` block and an outcome."""
+
+    status = outcome.get("status")
+    if status != expected.get("status"):
+        detail = outcome.get("error") or {}
+        suffix = f" ({detail.get('code')}: {detail.get('message')})" if detail else ""
+        return [f"status: expected {expected.get('status')}, got {status}{suffix}"]
+
+    failures: List[str] = []
+    if status == "error":
+        wanted = expected.get("error") or {}
+        actual = outcome.get("error") or {}
+        if "code" in wanted and actual.get("code") != wanted["code"]:
+            failures.append(f"error code: expected {wanted['code']}, got {actual.get('code')}")
+        if "message_contains" in wanted and wanted["message_contains"] not in (actual.get("message") or ""):
+            failures.append(f"error message: {actual.get('message')!r} lacks {wanted['message_contains']!r}")
+        for key, value in (wanted.get("location") or {}).items():
+            got = (actual.get("location") or {}).get(key)
+            if got != value:
+                failures.append(f"error location {key}: expected {value}, got {got}")
+        return failures
+
+    output = expected.get("output") or {}
+    for key in ("ir", "gradient_module"):
+        if key in output and _normalize_ir(outcome.get(key) or "") != _normalize_ir(output[key]):
+            failures.append(f"{key}: text differs from expected")
+    if "result" in output:
+        failures.extend(_compare_result(output["result"], outcome.get("result") or {}))
+    return failures
+
+
+def run_case(path: Path, root: Path, implementation: Implementation, profile: Optional[str] = None) -> CaseResult:
+    """Load, execute and check one case, timing the whole round trip."""
+
+    start = time.perf_counter()
+    name = path.relative_to(root).as_posix() if path.is_relative_to(root) else path.as_posix()
+    category = path.parent.name
+    try:
+        case = load_case(path)
+        category = case.get("category", category)
+        if profile is not None and case.get("profile", "cpu") not in ("cpu", profile):
+            return CaseResult(name, category, "skipped", time.perf_counter() - start, [f"requires {case['profile']}"])
+        outcome = implementation(case)
+        if outcome.get("status") == "skipped":
+            reason = outcome.get("reason", "skipped by implementation")
+            return CaseResult(name, category, "skipped", time.perf_counter() - start, [reason])
+        failures = compare(case["expected"], outcome)
+        status = "failed" if failures else "passed"
+    except NotImplementedError as exc:
+        return CaseResult(name, category, "skipped", time.perf_counter() - start, [str(exc) or "not implemented"])
+    except Exception as exc:  # noqa: BLE001 - any crash is a reportable verdict
+        failures = [f"{type(exc).__name__}: {exc}"]
+        status = "error"
+    return CaseResult(name, category, status, time.perf_counter() - start, failures)
+
+
+def _run_chunk(args: tuple) -> List[CaseResult]:
+    paths, root, implementation, profile = args
+    return [run_case(path, root, implementation, profile) for path in paths]
+
+
+def run(
+    paths: Sequence[Path],
+    implementation: Implementation,
+    root: Path = Path("."),
+    workers: Optional[int] = None,
+    profile: Optional[str] = None,
+) -> List[CaseResult]:
+    """Run ``paths`` on a process pool and return results in path order.
+
+    Cases are sent to workers in contiguous chunks, several per worker, so
+    per-task overhead stays small for large corpora while slow cases still
+    balance across the pool. ``workers=1`` runs in-process. ``implementation``
+    must be picklable when more than one worker is used.
+    """
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(paths) <= 1:
+        return _run_chunk((paths, root, implementation, profile))
+    chunk = max(1, len(paths) // (workers * 4))
+    chunks = [(paths[i : i + chunk], root, implementation, profile) for i in range(0, len(paths), chunk)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [result for results in pool.map(_run_chunk, chunks) for result in results]
+
+
+def summarize(results: Sequence[CaseResult]) -> Dict[str, int]:
+    counts = {"total": len(results), "passed": 0, "failed": 0, "error": 0, "skipped": 0}
+    for result in results:
+        counts[result.status] += 1
+    return counts
+
+
+def write_json(results: Sequence[CaseResult], fp: IO[str]) -> None:
+    json.dump({"summary": summarize(results), "cases": [asdict(r) for r in results]}, fp, indent=2)
+    fp.write("\n")
+
+
+def write_junit(results: Sequence[CaseResult], fp: IO[bytes], suite_name: str = "conformance") -> None:
+    """Write a JUnit XML report with one ``testsuite`` per category."""
+
+    root = ET.Element("testsuites", name=suite_name)
+    suites: Dict[str, ET.Element] = {}
+    for result in results:
+        suite = suites.get(result.category)
+        if suite is None:
+            suite = suites[result.category] = ET.SubElement(root, "testsuite", name=result.category)
+        case = ET.SubElement(suite, "testcase", name=result.name, classname=result.category)
+        case.set("time", f"{result.seconds:.6f}")
+        message = "; ".join(result.failures)
+        if result.status == "failed":
+            ET.SubElement(case, "failure", message=message).text = "\n".join(result.failures)
+        elif result.status == "error":
+            ET.SubElement(case, "error", message=message).text = "\n".join(result.failures)
+        elif result.status == "skipped":
+            ET.SubElement(case, "skipped", message=message)
+    for suite in [root, *suites.values()]:
+        members = [r for r in results if suite is root or r.category == suite.get("name")]
+        counts = summarize(members)
+        suite.set("tests", str(counts["total"]))
+        suite.set("failures", str(counts["failed"]))
+        suite.set("errors", str(counts["error"]))
+        suite.set("skipped", str(counts["skipped"]))
+        suite.set("time", f"{sum(r.seconds for r in members):.6f}")
+    ET.ElementTree(root).write(fp, encoding="utf-8", xml_declaration=True)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", type=Path, default=[Path("tests/conformance")])
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--command", help="implementation command line (case JSON on stdin)")
+    target.add_argument("--adapter", help="Python implementation as module:attribute")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-case timeout for --command, seconds")
+    parser.add_argument("--profile", choices=("cpu", "gpu"), default="cpu", help="claimed conformance profile")
+    parser.add_argument("--junit", type=Path, help="write a JUnit XML report")
+    parser.add_argument("--json", type=Path, help="write a JSON report")
+    parser.add_argument("--verbose", action="store_true", help="list every case, not only failures")
+    args = parser.parse_args(argv)
+
+    if args.command:
+        implementation: Implementation = CommandImplementation(shlex.split(args.command), args.timeout)
+    else:
+        implementation = load_adapter(args.adapter)
+
+    paths = discover(args.paths)
+    start = time.perf_counter()
+    results = run(paths, implementation, root=Path.cwd(), workers=args.workers, profile=args.profile)
+    elapsed = time.perf_counter() - start
+
+    for result in results:
+        if args.verbose or result.status in ("failed", "error"):
+            print(f"{result.status.upper():<8} {result.name} ({result.seconds * 1e3:.1f} ms)")
+            for failure in result.failures:
+                print(f"         {failure}")
+    counts = summarize(results)
+    print(
+        f"{counts['passed']} passed, {counts['failed']} failed, {counts['error']} errors, "
+        f"{counts['skipped']} skipped of {counts['total']} in {elapsed:.2f}s"
+    )
+
+    if args.junit:
+        with args.junit.open("wb") as fp:
+            write_junit(results, fp)
+    if args.json:
+        with args.json.open("w", encoding="utf-8") as fp:
+            write_json(results, fp)
+    return 1 if counts["failed"] or counts["error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,369 @@
+from __future__ import annotations
+
+import copy
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .core_ir import CoreIR, CoreOperation
+from .liveness import plan_memory
+from .passes import CONSTANT_OPCODES, canonicalize_operands
+from .type_system import FLOAT_DTYPES, TensorType
+
+
+# Forward values that checkpointing recomputes in the backward pass instead
+# of keeping alive: constants, elementwise arithmetic and shape changes.
+# Everything else (inputs, MatMul, reductions) is a checkpoint and is kept.
+RECOMPUTABLE_OPCODES = CONSTANT_OPCODES | frozenset(
+    {"Add", "Sub", "Mul", "Neg", "Relu", "Exp", "Log", "Reshape", "Transpose", "ExpandDims", "Squeeze"}
+)
+
+
+class AutodiffError(ValueError):
+    """Autodiff failure carrying an E5xxx code from the error catalog."""
+
+    def __init__(self, code: str, message: str) -> None:
+        super().__init__(f"{code}: {message}")
+        self.code = code
+        self.message = message
+
+
+@dataclass
+class GradientResult:
+    """Outcome of ``differentiate``.
+
+    ``gradients`` maps every differentiated primal ``ValueId`` to its gradient
+    ``ValueId``; ``outputs`` lists the gradients of ``wrt`` in order, as
+    appended to the module outputs. ``recomputed`` counts forward operations
+    re-emitted by checkpointing.
+    """
+
+    loss: int
+    gradients: Dict[int, int] = field(default_factory=dict)
+    outputs: List[int] = field(default_factory=list)
+    recomputed: int = 0
+
+
+class _Builder:
+    """Emits typed backward operations and accumulates gradient contributions."""
+
+    def __init__(self, ir: CoreIR, types: Dict[int, TensorType], checkpoint: bool) -> None:
+        self.ir = ir
+        self.types = types
+        self.checkpoint = checkpoint
+        self.gradients: Dict[int, int] = {}
+        self.definitions: Dict[int, CoreOperation] = {op.value_id: op for op in ir.operations}
+        self.protected = set(ir.outputs)
+        self.recomputed: Dict[int, int] = {}
+
+    def emit(self, opcode: str, operands: Sequence[int], attributes: Dict[str, Any], result: TensorType) -> int:
+        value_id = self.ir.add_operation(opcode, operands, attributes, str(result))
+        self.types[value_id] = result
+        return value_id
+
+    def constant(self, value: float, like: TensorType, shape: Optional[tuple] = None) -> int:
+        shape = like.shape if shape is None else shape
+        attributes = {"value": value, "shape": shape, "dtype": like.dtype}
+        return self.emit("ConstTensor", [], attributes, TensorType(like.dtype, shape))
+
+    def accumulate(self, value_id: int, gradient: int) -> None:
+        existing = self.gradients.get(value_id)
+        if existing is None:
+            self.gradients[value_id] = gradient
+        else:
+            self.gradients[value_id] = self.emit("Add", [existing, gradient], {}, self.types[value_id])
+
+    def primal(self, value_id: int) -> int:
+        """Return a forward value for use in the backward pass.
+
+        With checkpointing, a recomputable value is re-emitted here together
+        with any recomputable ancestors, from the nearest kept values, so the
+        original stays live only during the forward pass.
+        """
+
+        if not self.checkpoint or not self._recomputable(value_id):
+            return value_id
+        if value_id in self.recomputed:
+            return self.recomputed[value_id]
+
+        pending: List[int] = []
+        stack = [value_id]
+        seen = {value_id}
+        while stack:
+            current = stack.pop()
+            pending.append(current)
+            for operand in self.definitions[current].operands:
+                if operand not in seen and operand not in self.recomputed and self._recomputable(operand):
+                    seen.add(operand)
+                    stack.append(operand)
+        # Value ids follow definition order, so sorting re-emits in a valid order.
+        for current in sorted(pending):
+            op = self.definitions[current]
+            operands = [self.recomputed.get(operand, operand) for operand in op.operands]
+            self.recomputed[current] = self.emit(op.opcode, operands, dict(op.attributes), self.types[current])
+        return self.recomputed[value_id]
+
+    def _recomputable(self, value_id: int) -> bool:
+        op = self.definitions.get(value_id)
+        return op is not None and op.opcode in RECOMPUTABLE_OPCODES and value_id not in self.protected
+
+    def unbroadcast(self, gradient: int, target: TensorType) -> int:
+        """Sum ``gradient`` over the axes along which ``target`` was broadcast."""
+
+        source = self.types[gradient]
+        if source.shape == target.shape:
+            return gradient
+        lead = source.rank - target.rank
+        axes = list(range(lead)) + [
+            lead + i for i, dim in enumerate(target.shape) if dim == 1 and source.shape[lead + i] != 1
+        ]
+        if axes:
+            reduced = tuple(dim for i, dim in enumerate(source.shape) if i not in axes)
+            attributes = {"axes": axes, "keepdims": False}
+            gradient = self.emit("Sum", [gradient], attributes, TensorType(source.dtype, reduced))
+        if self.types[gradient].shape != target.shape:
+            gradient = self.emit("Reshape", [gradient], {"new_shape": list(target.shape)}, target)
+        return gradient
+
+    def broadcast_to(self, gradient: int, target: TensorType) -> int:
+        if self.types[gradient].shape == target.shape:
+            return gradient
+        return self.emit("Add", [gradient, self.constant(0.0, target)], {}, target)
+
+
+def _transpose_last(builder: _Builder, value_id: int) -> int:
+    tensor = builder.types[value_id]
+    permutation = list(range(tensor.rank - 2)) + [tensor.rank - 1, tensor.rank - 2]
+    shape = tensor.shape[:-2] + (tensor.shape[-1], tensor.shape[-2])
+    return builder.emit("Transpose", [value_id], {"permutation": permutation}, TensorType(tensor.dtype, shape))
+
+
+def _reduced_axes(op: CoreOperation, rank: int) -> List[int]:
+    axes = op.attributes.get("axes") or ()
+    normalized = sorted(axis + rank if axis < 0 else axis for axis in axes)
+    if any(not 0 <= axis < rank for axis in normalized):
+        raise AutodiffError("E5003", f"{op.opcode} gradient invalid axis in {list(axes)} for rank-{rank} tensor")
+    return normalized
+
+
+# A VJP rule receives the builder, the forward operation and the upstream
+# gradient, and returns one gradient ValueId (or None) per operand.
+VJP = Callable[[_Builder, CoreOperation, int], List[Optional[int]]]
+
+
+def _vjp_add(b: _Builder, op: CoreOperation, g: int) -> List[Optional[int]]:
+    return [b.unbroadcast(g, b.types[x]) for x in op.operands]
+
+
+def _vjp_sub(b: _Builder, op: CoreOperation, g: int) -> List[Optional[int]]:
+    lhs, rhs = op.operands
+    rhs_grad = b.unbroadcast(g, b.types[rhs])
+    return [b.unbroadcast(g, b.types[lhs]), b.emit("Neg", [rhs_grad], {}, b.types[rhs_grad])]
+
+
+def _vjp_mul(b: _Builder, op: CoreOperation, g: int) -> List[Optional[int]]:
+    lhs, rhs = op.operands
+    g_type = b.types[g]
+    return [
+        b.unbroadcast(b.emit("Mul", [g, b.primal(rhs)], {}, g_type), b.types[lhs]),
+        b.unbroadcast(b.emit("Mul", [g, b.primal(lhs)], {}, g_type), b.types[rhs]),
+    ]
+
+
+def _vjp_reduction(b: _Builder, op: CoreOperation, g: int) -> List[Optional[int]]:
+    (x,) = op.operands
+    x_type = b.types[x]
+    axes = _reduced_axes(op, x_type.rank)
+    if axes and not op.attributes.get("keepdims", False):
+        kept = tuple(1 if i in axes else dim for i, dim in enumerate(x_type.shape))
+        g = b.emit("ExpandDims", [g], {"axes": axes}, TensorType(x_type.dtype, kept))
+    g = b.broadcast_to(g, x_type)
+    if op.opcode == "Mean":
+        count = 1
+        for axis in axes or range(x_type.rank):
+            count *= x_type.shape[axis]
+        g = b.emit("Mul", [g, b.constant(1.0 / count, x_type, ())], {}, x_type)
+    return [g]
+
+
+def _vjp_reshape(b: _Builder, op: CoreOperation, g: int) -> List[Optional[int]]:
+    x_type = b.types[op.operands[0]]
+    return [b.emit("Reshape", [g], {"new_shape": list(x_type.shape)}, x_type)]
+
+
+def _vjp_transpose(b: _Builder, op: CoreOperation, g: int) -> List[Optional[int]]:
+    x_type = b.types[op.operands[0]]
+    permutation = op.attributes.get("permutation")
+    if permutation is None:
+        permutation = list(reversed(range(x_type.rank)))
+    inverse = [0] * len(permutation)
+    for i, axis in enumerate(permutation):
+        inverse[axis] = i
+    return [b.emit("Transpose", [g], {"permutation": inverse}, x_type)]
+
+
+def _vjp_expand_dims(b: _Builder, op: CoreOperation, g: int) -> List[Optional[int]]:
+    x_type = b.types[op.operands[0]]
+    return [b.emit("Squeeze", [g], {"axes": sorted(op.attributes.get("axes", ()))}, x_type)]
+
+
+def _vjp_squeeze(b: _Builder, op: CoreOperation, g: int) -> List[Optional[int]]:
+    x_type = b.types[op.operands[0]]
+    return [b.emit("ExpandDims", [g], {"axes": sorted(op.attributes.get("axes", ()))}, x_type)]
+
+
+def _vjp_matmul(b: _Builder, op: CoreOperation, g: int) -> List[Optional[int]]:
+    lhs, rhs = op.operands
+    g_type = b.types[g]
+    rhs_t = _transpose_last(b, b.primal(rhs))
+    lhs_t = _transpose_last(b, b.primal(lhs))
+    lhs_type, rhs_type = b.types[lhs], b.types[rhs]
+    lhs_grad = b.emit("MatMul", [g, rhs_t], {}, TensorType(g_type.dtype, g_type.shape[:-1] + (lhs_type.shape[-1],)))
+    rhs_grad = b.emit(
+        "MatMul", [lhs_t, g], {}, TensorType(g_type.dtype, g_type.shape[:-2] + (rhs_type.shape[-2], g_type.shape[-1]))
+    )
+    return [b.unbroadcast(lhs_grad, lhs_type), b.unbroadcast(rhs_grad, rhs_type)]
+
+
+def _vjp_relu(b: _Builder, op: CoreOperation, g: int) -> List[Optional[int]]:
+    return [b.emit("ReluGrad", [g, b.primal(op.operands[0])], {}, b.types[g])]
+
+
+def _vjp_neg(b: _Builder, op: CoreOperation, g: int) -> List[Optional[int]]:
+    return [b.emit("Neg", [g], {}, b.types[g])]
+
+
+def _vjp_exp(b: _Builder, op: CoreOperation, g: int) -> List[Optional[int]]:
+    return [b.emit("Mul", [g, b.primal(op.value_id)], {}, b.types[g])]
+
+
+def _vjp_log(b: _Builder, op: CoreOperation, g: int) -> List[Optional[int]]:
+    return [b.emit("Div", [g, b.primal(op.operands[0])], {}, b.types[g])]
+
+
+VJPS: Dict[str, VJP] = {
+    "Add": _vjp_add,
+    "Sub": _vjp_sub,
+    "Mul": _vjp_mul,
+    "Sum": _vjp_reduction,
+    "Mean": _vjp_reduction,
+    "Reshape": _vjp_reshape,
+    "Transpose": _vjp_transpose,
+    "ExpandDims": _vjp_expand_dims,
+    "Squeeze": _vjp_squeeze,
+    "MatMul": _vjp_matmul,
+    "Relu": _vjp_relu,
+    "Neg": _vjp_neg,
+    "Exp": _vjp_exp,
+    "Log": _vjp_log,
+}
+
+
+def differentiate(
+    ir: CoreIR,
+    loss: Optional[int] = None,
+    wrt: Optional[Sequence[int]] = None,
+    checkpoint: bool = False,
+    verify: bool = True,
+) -> GradientResult:
+    """Append the reverse-mode gradient of ``loss`` to ``ir`` in place.
+
+    ``loss`` defaults to the first module output and ``wrt`` to every
+    ``Input``; the gradient of each ``wrt`` value is appended to the module
+    outputs, as a zero tensor if the loss does not depend on it. A
+    non-scalar loss is seeded with ones, i.e. the gradient of its sum.
+    Instructions are visited in reverse and only those on a path from
+    ``wrt`` to ``loss`` are differentiated, so ``Div`` and other operations
+    without a rule in ``VJPS`` raise ``AutodiffError`` (E5001) only when a
+    gradient has to flow through them.
+
+    With ``checkpoint=True``, forward values of ``RECOMPUTABLE_OPCODES`` that
+    the backward pass reads are recomputed next to their use instead of
+    being kept alive across the whole forward pass. With ``verify=True`` the
+    module is verified before and after; a malformed gradient module raises
+    E5002. The result is canonicalised.
+    """
+
+    from .verifier import diagnose
+
+    if verify:
+        ir.verify()
+    if loss is None:
+        if not ir.outputs:
+            raise ValueError("Module has no outputs to differentiate")
+        loss = ir.outputs[0]
+    inputs = [op.value_id for op in ir.operations if op.opcode == "Input"]
+    wrt = list(inputs if wrt is None else wrt)
+
+    types: Dict[int, TensorType] = {}
+    for op in ir.operations:
+        if op.result_type is None:
+            raise AutodiffError("E5004", f"%{op.value_id} has no result type to shape its gradient")
+        types[op.value_id] = TensorType.parse(op.result_type)
+    for value_id in wrt:
+        if value_id not in types:
+            raise ValueError(f"Cannot differentiate with respect to undefined value %{value_id}")
+        if types[value_id].dtype not in FLOAT_DTYPES:
+            raise AutodiffError(
+                "E5005", f"Cannot differentiate with respect to {types[value_id].dtype} tensor at %{value_id}"
+            )
+    if types[loss].dtype not in FLOAT_DTYPES:
+        raise AutodiffError("E5005", f"Cannot differentiate {types[loss].dtype} loss %{loss}")
+
+    # Forward sweep: which values depend on a differentiated input.
+    active = set(wrt)
+    forward = list(ir.operations)
+    for op in forward:
+        if any(operand in active for operand in op.operands):
+            active.add(op.value_id)
+
+    builder = _Builder(ir, types, checkpoint)
+    if loss in active:
+        builder.gradients[loss] = builder.constant(1.0, types[loss])
+    for op in reversed(forward):
+        gradient = builder.gradients.get(op.value_id)
+        if gradient is None or op.opcode == "Input":
+            continue
+        vjp = VJPS.get(op.opcode)
+        if vjp is None:
+            raise AutodiffError("E5001", f"Autodiff unsupported operation '{op.opcode}' at %{op.value_id}")
+        for operand, operand_gradient in zip(op.operands, vjp(builder, op, gradient)):
+            if operand_gradient is not None and operand in active:
+                builder.accumulate(operand, operand_gradient)
+
+    result = GradientResult(loss=loss, recomputed=len(builder.recomputed))
+    for value_id in wrt:
+        if value_id not in builder.gradients:
+            builder.gradients[value_id] = builder.constant(0.0, types[value_id])
+        result.outputs.append(builder.gradients[value_id])
+        ir.mark_output(builder.gradients[value_id])
+    result.gradients = dict(sorted(builder.gradients.items()))
+
+    canonicalize_operands(ir)
+    if verify:
+        diagnostics = diagnose(ir, collect_all=False)
+        if diagnostics:
+            raise AutodiffError("E5002", f"Gradient module verification failed: {diagnostics[0]}")
+    return result
+
+
+def checkpoint_savings(ir: CoreIR, loss: Optional[int] = None, wrt: Optional[Sequence[int]] = None) -> Dict[str, int]:
+    """Compare liveness-based peak memory of plain and checkpointed gradients.
+
+    ``ir`` is left untouched; each variant is built on a copy and sized with
+    ``liveness.plan_memory``.
+    """
+
+    plain = copy.deepcopy(ir)
+    differentiate(plain, loss, wrt)
+    checkpointed = copy.deepcopy(ir)
+    result = differentiate(checkpointed, loss, wrt, checkpoint=True)
+    plain_peak = plan_memory(plain).peak_live_bytes
+    checkpoint_peak = plan_memory(checkpointed).peak_live_bytes
+    return {
+        "peak_live_bytes": plain_peak,
+        "checkpoint_peak_live_bytes": checkpoint_peak,
+        "saved_bytes": plain_peak - checkpoint_peak,
+        "recomputed_ops": result.recomputed,
+        "ops": len(plain.operations),
+        "checkpoint_ops": len(checkpointed.operations),
+    }
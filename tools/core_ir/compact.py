@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from .core_ir import CoreIR, CoreOperation
+
+
+class CompactCoreIR:
+    """Columnar, array-backed storage for large Core IR modules.
+
+    ``CoreIR`` keeps one ``CoreOperation`` object (plus an operand list and an
+    attribute dict) per instruction. This representation stores the same
+    module as parallel columns instead, mirroring the string/type/value tables
+    of the MIC formats:
+
+    - opcodes are interned into ``opcode_table`` and stored as small ints;
+    - operands live in one flat ``array('q')`` sliced by ``operand_offsets``;
+    - result types are indices into ``type_table`` (``-1`` when absent);
+    - attributes are kept only for the instructions that carry any, as
+      shallow copies: replacing a key does not touch the source module, but
+      mutable values inside (lists, arrays) are still shared.
+
+    Conversion with ``CoreIR`` is lossless in both directions.
+    """
+
+    def __init__(self) -> None:
+        self.opcode_table: List[str] = []
+        self.type_table: List[str] = []
+        self.value_ids = array("q")
+        self.opcodes = array("H")
+        self.result_types = array("q")
+        self.operand_data = array("q")
+        self.operand_offsets = array("q", [0])
+        self.attributes: Dict[int, Dict[str, Any]] = {}
+        self.outputs = array("q")
+        self._opcode_index: Dict[str, int] = {}
+        self._type_index: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.opcodes)
+
+    def _intern_opcode(self, opcode: str) -> int:
+        index = self._opcode_index.get(opcode)
+        if index is None:
+            index = len(self.opcode_table)
+            self.opcode_table.append(opcode)
+            self._opcode_index[opcode] = index
+        return index
+
+    def _intern_type(self, result_type: Optional[str]) -> int:
+        if result_type is None:
+            return -1
+        index = self._type_index.get(result_type)
+        if index is None:
+            index = len(self.type_table)
+            self.type_table.append(result_type)
+            self._type_index[result_type] = index
+        return index
+
+    def append(
+        self,
+        value_id: int,
+        opcode: str,
+        operands: Sequence[int] = (),
+        attributes: Optional[Dict[str, Any]] = None,
+        result_type: Optional[str] = None,
+    ) -> None:
+        index = len(self.opcodes)
+        self.value_ids.append(value_id)
+        self.opcodes.append(self._intern_opcode(opcode))
+        self.result_types.append(self._intern_type(result_type))
+        self.operand_data.extend(operands)
+        self.operand_offsets.append(len(self.operand_data))
+        if attributes:
+            self.attributes[index] = dict(attributes)
+
+    def opcode(self, index: int) -> str:
+        return self.opcode_table[self.opcodes[index]]
+
+    def operands(self, index: int) -> array:
+        return self.operand_data[self.operand_offsets[index] : self.operand_offsets[index + 1]]
+
+    def result_type(self, index: int) -> Optional[str]:
+        type_index = self.result_types[index]
+        return None if type_index < 0 else self.type_table[type_index]
+
+    def operation(self, index: int) -> CoreOperation:
+        """Materialise instruction ``index`` as a standalone ``CoreOperation``."""
+
+        return CoreOperation(
+            value_id=self.value_ids[index],
+            opcode=self.opcode(index),
+            operands=self.operands(index).tolist(),
+            attributes=dict(self.attributes.get(index, {})),
+            result_type=self.result_type(index),
+        )
+
+    def iter_operations(self) -> Iterator[CoreOperation]:
+        for index in range(len(self)):
+            yield self.operation(index)
+
+    @classmethod
+    def from_core_ir(cls, ir: CoreIR) -> "CompactCoreIR":
+        compact = cls()
+        for op in ir.operations:
+            compact.append(op.value_id, op.opcode, op.operands, op.attributes, op.result_type)
+        compact.outputs.extend(ir.outputs)
+        return compact
+
+    def to_core_ir(self) -> CoreIR:
+        ir = CoreIR()
+        ir.operations = list(self.iter_operations())
+        ir.outputs = self.outputs.tolist()
+        ir._next_value_id = max(self.value_ids, default=-1) + 1
+        return ir
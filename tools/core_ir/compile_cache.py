@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, Union
+
+from . import mic
+from .core_ir import CoreIR
+from .type_system import Equations, TypeSystem
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .language import Expression
+
+# Bumped whenever lowering or the key format changes, so stale disk entries
+# written by an older prototype are never returned.
+CACHE_FORMAT = "mind-core-ir-cache/1"
+
+_DISK_SUFFIX = ".mic"
+
+
+def structural_key(expression: "Expression", type_system: TypeSystem) -> Optional[str]:
+    """Return a stable content hash of ``expression`` compiled against ``type_system``.
+
+    The expression graph is serialised in the post-order ``lower`` uses, each
+    node as its class name, its ``structure_key`` and the post-order indices of
+    its children, so shared subexpressions (which ``lower`` emits once) hash
+    differently from equal but distinct subtrees. The symbol table and known
+    dtypes are appended in sorted order, followed by the dimension equations
+    already recorded in ``type_system.dims``. Returns ``None`` when some node cannot
+    be keyed, e.g. a ``Literal`` whose value has no exact text form.
+    """
+
+    parts: List[str] = [CACHE_FORMAT]
+    index: Dict[int, int] = {}
+    in_progress = set()
+    stack: List[Tuple["Expression", bool]] = [(expression, False)]
+    while stack:
+        node, expanded = stack.pop()
+        node_id = id(node)
+        if node_id in index:
+            continue
+        children = node.children()
+        if expanded or not children:
+            in_progress.discard(node_id)
+            token = node.structure_key()
+            if token is None:
+                return None
+            refs = [index[id(child)] for child in children]
+            parts.append(f"{type(node).__qualname__} {token} {refs}")
+            index[node_id] = len(index)
+            continue
+        if node_id in in_progress:
+            raise ValueError("Expression graph contains a cycle")
+        in_progress.add(node_id)
+        stack.append((node, True))
+        for child in reversed(children):
+            stack.append((child, False))
+
+    parts.append("--")
+    parts.extend(f"{name!r} {tensor_type}" for name, tensor_type in sorted(type_system.symbols.items()))
+    parts.append(" ".join(sorted(type_system.known_dtypes)))
+    parts.append(repr(type_system.dims.equations()))
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+class _Entry:
+    __slots__ = ("ir", "text", "equations", "aliases")
+
+    def __init__(self, ir: CoreIR, equations: Equations) -> None:
+        self.ir = ir
+        self.text: Optional[str] = None
+        self.equations = equations
+        self.aliases: List[str] = []
+
+
+class CompilationCache:
+    """Content-addressed cache of lowered ``CoreIR`` modules.
+
+    Entries are keyed by ``structural_key``; value numbering is deterministic,
+    so a module compiled once is valid for every structurally equal expression
+    compiled against an equal symbol table. The memory tier is an LRU of
+    ``maxsize`` modules. When ``directory`` is given, modules are also written
+    there as checksummed mic@1 text (one file per key, replaced atomically)
+    and the disk tier is trimmed to ``max_disk_bytes`` by evicting the least
+    recently used files. Every memory miss looks for the key's file, so
+    entries written by other processes sharing ``directory`` are found; a
+    file that cannot be written leaves the module in memory only. Failed
+    compilations are never cached. Dimension
+    equations recorded while compiling are stored with the module and
+    replayed into ``type_system.dims`` on every hit. Those equations become
+    part of the key of the next compilation against the same type system, so
+    that key is recorded as an alias of the memory entry: recompiling an
+    expression whose dimensions it constrains itself is a hit.
+
+    ``hits``/``disk_hits`` count lookups served from each tier, ``misses``
+    counts compilations, ``evictions``/``disk_evictions`` count entries dropped
+    from each tier and ``bypasses`` counts expressions that could not be keyed
+    and modules whose disk entry could not be written.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        directory: Union[str, Path, None] = None,
+        max_disk_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        self.maxsize = maxsize
+        self.directory = Path(directory) if directory is not None else None
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        self.bypasses = 0
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._aliases: Dict[str, str] = {}
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._scan_disk()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Drop the memory tier; files on disk are kept."""
+
+        self._entries.clear()
+        self._aliases.clear()
+
+    def get_ir(self, expression: "Expression", type_system: TypeSystem, build: Callable[[], CoreIR]) -> CoreIR:
+        """Return the module for ``expression``, calling ``build`` on a miss.
+
+        Each call returns a fresh copy, so callers may extend the module.
+        """
+
+        key = structural_key(expression, type_system)
+        if key is None:
+            self.bypasses += 1
+            return build()
+        return self._lookup(key, expression, type_system, build).ir.copy()
+
+    def get_text(self, expression: "Expression", type_system: TypeSystem, build: Callable[[], CoreIR]) -> str:
+        """Return ``CoreIR.compile()`` of the module for ``expression``."""
+
+        key = structural_key(expression, type_system)
+        if key is None:
+            self.bypasses += 1
+            return build().compile()
+        entry = self._lookup(key, expression, type_system, build)
+        if entry.text is None:
+            entry.text = entry.ir.compile()
+        return entry.text
+
+    def _lookup(
+        self, key: str, expression: "Expression", type_system: TypeSystem, build: Callable[[], CoreIR]
+    ) -> _Entry:
+        key = self._aliases.get(key, key)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            self._replay(entry.equations, type_system)
+            return entry
+
+        before = type_system.dims.equations()
+        entry = self._read_disk(key)
+        if entry is not None:
+            self.disk_hits += 1
+            self._replay(entry.equations, type_system)
+        else:
+            self.misses += 1
+            entry = _Entry(build().copy(), type_system.dims.equations())
+            self._write_disk(key, entry)
+        if self.maxsize > 0:
+            self._entries[key] = entry
+            if type_system.dims.equations() != before:
+                settled = structural_key(expression, type_system)
+                if settled is not None and settled != key:
+                    entry.aliases.append(settled)
+                    self._aliases[settled] = key
+            while len(self._entries) > self.maxsize:
+                _, evicted = self._entries.popitem(last=False)
+                for alias in evicted.aliases:
+                    self._aliases.pop(alias, None)
+                self.evictions += 1
+        return entry
+
+    @staticmethod
+    def _replay(equations: Equations, type_system: TypeSystem) -> None:
+        for name, dim in equations:
+            type_system.dims.unify(name, dim)
+
+    def _path(self, key: str) -> Path:
+        assert self.directory is not None
+        return self.directory / f"{key}{_DISK_SUFFIX}"
+
+    def _scan_disk(self) -> None:
+        assert self.directory is not None
+        found = []
+        for item in os.scandir(self.directory):
+            if item.name.endswith(_DISK_SUFFIX) and item.is_file():
+                stat = item.stat()
+                found.append((stat.st_mtime_ns, item.name[: -len(_DISK_SUFFIX)], stat.st_size))
+        for _, key, size in sorted(found):
+            self._disk[key] = size
+            self._disk_bytes += size
+        self._trim_disk()
+
+    def _read_disk(self, key: str) -> Optional[_Entry]:
+        if self.directory is None or self.max_disk_bytes <= 0:
+            return None
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            header, _, body = data.decode("utf-8").partition("\n")
+            if header != f"{key} {hashlib.sha256(body.encode('utf-8')).hexdigest()}":
+                raise ValueError("cache entry checksum mismatch")
+            equations, _, text = body.partition("\n")
+            entry = _Entry(mic.loads(text), mic.parse_literal(equations))
+            os.utime(path)
+        except FileNotFoundError:
+            # Never written, or removed by another process.
+            self._disk_bytes -= self._disk.pop(key, 0)
+            return None
+        except (OSError, ValueError):
+            # Unreadable or corrupted; recompile instead.
+            self._forget_disk(key)
+            return None
+        # The file may have been written by another process since the scan.
+        self._disk_bytes -= self._disk.pop(key, 0)
+        self._disk[key] = len(data)
+        self._disk_bytes += len(data)
+        self._trim_disk()
+        return entry
+
+    def _write_disk(self, key: str, entry: _Entry) -> None:
+        if self.directory is None or self.max_disk_bytes <= 0:
+            return
+        try:
+            body = f"{mic.format_literal(entry.equations)}\n{mic.emit(entry.ir, 1)}".encode("utf-8")
+        except ValueError:
+            # Attribute values without a MIC literal form stay memory-only.
+            return
+        # The first line names the key and checksums the rest: the dimension
+        # equations on one line, then the mic@1 module.
+        data = f"{key} {hashlib.sha256(body).hexdigest()}\n".encode("utf-8") + body
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        except OSError:
+            self.bypasses += 1
+            return
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                fp.write(data)
+            os.replace(tmp, self._path(key))
+        except BaseException as exc:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            if not isinstance(exc, OSError):
+                raise
+            # A full or read-only disk costs the disk tier, not the compilation.
+            self.bypasses += 1
+            return
+        if key in self._disk:
+            self._disk_bytes -= self._disk.pop(key)
+        self._disk[key] = len(data)
+        self._disk_bytes += len(data)
+        self._trim_disk()
+
+    def _trim_disk(self) -> None:
+        while self._disk_bytes > self.max_disk_bytes and self._disk:
+            key = next(iter(self._disk))
+            self._forget_disk(key)
+            self.disk_evictions += 1
+
+    def _forget_disk(self, key: str) -> None:
+        self._disk_bytes -= self._disk.pop(key, 0)
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
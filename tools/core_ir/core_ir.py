@@ -1,7 +1,31 @@
 from __future__ import annotations
 
+import io
+import struct
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Sequence
+from typing import IO, Any, Collection, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
+
+# Opcodes whose operands may be reordered without changing semantics. The
+# specification's canonicalisation rules order these by ascending ``ValueId``.
+COMMUTATIVE_OPCODES = frozenset({"Add", "Mul"})
+
+# Opcodes that must never be merged by structural interning because each
+# occurrence denotes a distinct value even when the records look identical.
+IMPURE_OPCODES = frozenset({"Input"})
+
+
+def _freeze(value: Any) -> Hashable:
+    """Convert attribute payloads into a hashable, order-stable key."""
+
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(_freeze(v) for v in value))
+    if isinstance(value, float):
+        # Key on the bits: 0.0 == -0.0 would merge constants that differ under 1/x.
+        return (type(value).__name__, struct.pack("<d", value))
+    hash(value)
+    return (type(value).__name__, value)
 
 
 @dataclass
@@ -20,6 +44,10 @@ class CoreOperation:
     result_type: Optional[str] = None
 
     def format(self) -> str:
+        for key, value in self.attributes.items():
+            # Array printing elides large arrays, so the text would not identify the module.
+            if getattr(value, "ndim", 0):
+                raise ValueError(f"Attribute '{key}' of %{self.value_id} is an array, which compile() cannot encode")
         attr_items = [f"{k}={v}" for k, v in sorted(self.attributes.items())]
         attr_suffix = f" {{{', '.join(attr_items)}}}" if attr_items else ""
         operand_suffix = f" ({', '.join(f'%{op}' for op in self.operands)})" if self.operands else ""
@@ -34,12 +62,22 @@ class CoreIR:
     objects with deterministic ``value_id`` assignment. Inputs are encoded as
     `Input` operations to keep ordering canonical with the specification's
     single-definition rule.
+
+    When ``intern`` is enabled, ``add_operation`` hash-conses pure operations:
+    a request structurally identical to an existing operation (same opcode,
+    operands, attributes and result type) returns the existing ``ValueId``
+    instead of appending a duplicate. Operands of commutative opcodes are
+    ordered by ascending ``ValueId`` first, so ``Add(%1, %0)`` and
+    ``Add(%0, %1)`` share a node. ``deduplicated`` counts the merged requests.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, intern: bool = False) -> None:
         self.operations: List[CoreOperation] = []
         self.outputs: List[int] = []
+        self.intern = intern
+        self.deduplicated: int = 0
         self._next_value_id: int = 0
+        self._intern_index: Dict[Tuple[Hashable, ...], int] = {}
 
     def _fresh_value(self) -> int:
         value_id = self._next_value_id
@@ -65,20 +103,125 @@ class CoreIR:
         attributes: Optional[Dict[str, Any]] = None,
         result_type: Optional[str] = None,
     ) -> int:
+        operand_list = list(operands or [])
+        attributes = attributes or {}
+
+        key: Optional[Tuple[Hashable, ...]] = None
+        if self.intern and opcode not in IMPURE_OPCODES:
+            if opcode in COMMUTATIVE_OPCODES:
+                operand_list.sort()
+            key = self._intern_key(opcode, operand_list, attributes, result_type)
+            if key is not None:
+                existing = self._intern_index.get(key)
+                if existing is not None:
+                    self.deduplicated += 1
+                    return existing
+
         value_id = self._fresh_value()
         op = CoreOperation(
             value_id=value_id,
             opcode=opcode,
-            operands=list(operands or []),
-            attributes=attributes or {},
+            operands=operand_list,
+            attributes=attributes,
             result_type=result_type,
         )
         self.operations.append(op)
+        if key is not None:
+            self._intern_index[key] = value_id
         return value_id
 
+    @staticmethod
+    def _intern_key(
+        opcode: str,
+        operands: Sequence[int],
+        attributes: Dict[str, Any],
+        result_type: Optional[str],
+    ) -> Optional[Tuple[Hashable, ...]]:
+        try:
+            frozen_attributes = _freeze(attributes)
+        except TypeError:
+            # Attributes that cannot be hashed are never merged.
+            return None
+        return (opcode, tuple(operands), frozen_attributes, result_type)
+
+    def copy(self) -> "CoreIR":
+        """Return a module with fresh operation records; attribute values are shared.
+
+        An interning module's copy keeps interning against its own copy of the
+        table, so requests for existing operations still return their ``ValueId``.
+        """
+
+        copy = CoreIR(intern=self.intern)
+        copy.operations = [
+            CoreOperation(op.value_id, op.opcode, list(op.operands), dict(op.attributes), op.result_type)
+            for op in self.operations
+        ]
+        copy.outputs = list(self.outputs)
+        copy._next_value_id = self._next_value_id
+        copy._intern_index = dict(self._intern_index)
+        return copy
+
+    def remove_operations(self, value_ids: Collection[int]) -> None:
+        """Drop the operations defining ``value_ids`` and forget their interned keys."""
+
+        self.operations = [op for op in self.operations if op.value_id not in value_ids]
+        if self._intern_index:
+            self._intern_index = {key: vid for key, vid in self._intern_index.items() if vid not in value_ids}
+
     def mark_output(self, value_id: int) -> None:
         self.outputs.append(value_id)
 
+    def iter_compiled(self) -> Iterator[str]:
+        """Yield the reference encoding in chunks, one instruction at a time.
+
+        Concatenating the chunks reproduces ``compile()`` exactly: instruction
+        lines are newline-separated and the ``outputs:`` section, when present,
+        follows without a trailing newline.
+        """
+
+        separator = ""
+        for op in self.operations:
+            yield separator + op.format()
+            separator = "\n"
+        if self.outputs:
+            yield "\noutputs: " + ", ".join(f"%{oid}" for oid in self.outputs)
+
+    def write_to(self, fp: IO[Any], buffer_size: int = 1 << 16) -> int:
+        """Stream the reference encoding to ``fp`` and return the characters written.
+
+        ``fp`` may be a text sink (``io.TextIOBase``) or a binary sink such as a
+        file opened in ``"wb"`` mode, ``io.BytesIO`` or a pipe; binary sinks
+        receive UTF-8. At most roughly ``buffer_size`` characters are held
+        before each write, so peak memory is independent of module size.
+        """
+
+        binary = not isinstance(fp, io.TextIOBase) and "b" in getattr(fp, "mode", "b")
+        pending: List[str] = []
+        pending_size = 0
+        written = 0
+
+        def flush() -> None:
+            chunk = "".join(pending)
+            fp.write(chunk.encode("utf-8") if binary else chunk)
+            pending.clear()
+
+        for chunk in self.iter_compiled():
+            pending.append(chunk)
+            pending_size += len(chunk)
+            written += len(chunk)
+            if pending_size >= buffer_size:
+                flush()
+                pending_size = 0
+        if pending:
+            flush()
+        return written
+
     def compile(self) -> str:
-        output_section = "" if not self.outputs else "\noutputs: " + ", ".join(f"%{oid}" for oid in self.outputs)
-        return "\n".join(op.format() for op in self.operations) + output_section
+        return "".join(self.iter_compiled())
+
+    def verify(self, collect_all: bool = False) -> None:
+        """Raise ``verifier.VerificationError`` if the module is malformed."""
+
+        from .verifier import verify
+
+        verify(self, collect_all=collect_all)
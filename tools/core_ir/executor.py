@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+import numpy as np
+
+from .core_ir import CoreIR, CoreOperation
+from .type_system import TensorType
+
+DTYPES: Dict[str, Any] = {
+    "f16": np.float16,
+    "f32": np.float32,
+    "f64": np.float64,
+    "i8": np.int8,
+    "i16": np.int16,
+    "i32": np.int32,
+    "i64": np.int64,
+    "u8": np.uint8,
+    "u16": np.uint16,
+    "u32": np.uint32,
+    "u64": np.uint64,
+    "bool": np.bool_,
+}
+
+Kernel = Callable[[CoreOperation, List[np.ndarray]], np.ndarray]
+
+
+def _reduction_axes(op: CoreOperation, rank: int) -> Optional[tuple[int, ...]]:
+    axes = op.attributes.get("axes") or ()
+    if not axes:
+        return None
+    return tuple(axis + rank if axis < 0 else axis for axis in axes)
+
+
+def _reduce(op: CoreOperation, x: np.ndarray, reducer: Callable[..., np.ndarray]) -> np.ndarray:
+    axes = _reduction_axes(op, x.ndim)
+    # Empty axes denote a full reduction to a scalar regardless of keepdims.
+    keepdims = bool(op.attributes.get("keepdims", False)) and axes is not None
+    return np.asarray(reducer(x, axis=axes, keepdims=keepdims)).astype(x.dtype, copy=False)
+
+
+def _mean(x: np.ndarray, axis: Optional[tuple[int, ...]], keepdims: bool) -> np.ndarray:
+    if np.issubdtype(x.dtype, np.floating):
+        return np.mean(x, axis=axis, keepdims=keepdims, dtype=x.dtype)
+    return np.mean(x, axis=axis, keepdims=keepdims)
+
+
+def _constant(op: CoreOperation, args: List[np.ndarray]) -> np.ndarray:
+    dtype = op.attributes.get("dtype")
+    if dtype is None and op.result_type is not None:
+        dtype = TensorType.parse(op.result_type).dtype
+    dtype = dtype or {"ConstI64": "i64", "ConstF32": "f32", "ConstF64": "f64"}.get(op.opcode, "f32")
+    value = np.asarray(op.attributes.get("value"), dtype=DTYPES[dtype])
+    shape = op.attributes.get("shape")
+    if shape is not None and value.shape != tuple(shape):
+        value = np.broadcast_to(value, tuple(shape)) if value.ndim == 0 else value.reshape(tuple(shape))
+    return value
+
+
+def _expand_dims(op: CoreOperation, args: List[np.ndarray]) -> np.ndarray:
+    x = args[0]
+    for axis in sorted(op.attributes.get("axes", ())):
+        x = np.expand_dims(x, axis)
+    return x
+
+
+def _slice(op: CoreOperation, args: List[np.ndarray]) -> np.ndarray:
+    starts = op.attributes["starts"]
+    ends = op.attributes["ends"]
+    steps = op.attributes.get("steps") or [1] * len(starts)
+    # Negative starts/ends clamp to zero rather than counting from the end.
+    index = tuple(slice(max(s, 0), max(e, 0), st) for s, e, st in zip(starts, ends, steps))
+    return args[0][index]
+
+
+def _dot(op: CoreOperation, args: List[np.ndarray]) -> np.ndarray:
+    return np.asarray(np.dot(args[0], args[1]))
+
+
+def _conv2d(op: CoreOperation, args: List[np.ndarray]) -> np.ndarray:
+    x, w = args
+    stride_h, stride_w = op.attributes.get("strides", (1, 1))
+    k_h, k_w = w.shape[0], w.shape[1]
+    padding = op.attributes.get("padding", "Valid")
+    if padding == "Same":
+        out_h = -(-x.shape[1] // stride_h)
+        out_w = -(-x.shape[2] // stride_w)
+        pad_h = max((out_h - 1) * stride_h + k_h - x.shape[1], 0)
+        pad_w = max((out_w - 1) * stride_w + k_w - x.shape[2], 0)
+        pads = ((pad_h // 2, pad_h - pad_h // 2), (pad_w // 2, pad_w - pad_w // 2))
+    elif padding == "Valid":
+        pads = ((0, 0), (0, 0))
+    else:
+        pads = tuple(tuple(pair) for pair in padding)
+    if any(p for pair in pads for p in pair):
+        x = np.pad(x, ((0, 0), pads[0], pads[1], (0, 0)))
+    # windows: [N, H_out, W_out, C_in, H_k, W_k]
+    windows = np.lib.stride_tricks.sliding_window_view(x, (k_h, k_w), axis=(1, 2))
+    windows = windows[:, ::stride_h, ::stride_w]
+    return np.einsum("nhwcij,ijcf->nhwf", windows, w).astype(x.dtype, copy=False)
+
+
+# Fused region steps write through ``out=`` with these ufuncs.
+UFUNCS: Dict[str, Any] = {
+    "Add": np.add,
+    "Sub": np.subtract,
+    "Mul": np.multiply,
+    "Div": np.divide,
+    "Neg": np.negative,
+    "Exp": np.exp,
+    "Log": np.log,
+}
+
+
+def _fused(op: CoreOperation, args: List[np.ndarray]) -> np.ndarray:
+    """Evaluate a ``Fused`` region step by step into reusable buffers.
+
+    Every step writes its result through ``out=``. Step results are read
+    exactly once, so a step's buffer returns to a per-(shape, dtype) pool as
+    soon as its consumer runs and the consumer may write into it in place. A
+    chain of same-shaped steps therefore runs in a single buffer.
+    """
+
+    values: List[Optional[np.ndarray]] = list(args)
+    first_step = len(args)
+    pool: Dict[tuple, List[np.ndarray]] = {}
+    for opcode, operands, result_type in op.attributes["body"]:
+        inputs = [values[i] for i in operands]
+        for i in operands:
+            if i >= first_step:
+                buffer = values[i]
+                values[i] = None
+                pool.setdefault((buffer.shape, buffer.dtype), []).append(buffer)
+        result = TensorType.parse(result_type)
+        dtype = np.dtype(DTYPES[result.dtype])
+        free = pool.get((result.shape, dtype))
+        out = free.pop() if free else np.empty(result.shape, dtype)
+        if opcode == "Relu":
+            np.maximum(inputs[0], dtype.type(0), out=out)
+        else:
+            UFUNCS[opcode](*inputs, out=out)
+        values.append(out)
+    return values[-1]
+
+
+KERNELS: Dict[str, Kernel] = {
+    "ConstI64": _constant,
+    "ConstF32": _constant,
+    "ConstF64": _constant,
+    "ConstTensor": _constant,
+    "Add": lambda op, a: np.add(a[0], a[1]),
+    "Sub": lambda op, a: np.subtract(a[0], a[1]),
+    "Mul": lambda op, a: np.multiply(a[0], a[1]),
+    "Div": lambda op, a: np.divide(a[0], a[1]).astype(np.result_type(a[0], a[1]), copy=False),
+    "Sum": lambda op, a: _reduce(op, a[0], np.sum),
+    "Mean": lambda op, a: _reduce(op, a[0], _mean),
+    "Max": lambda op, a: _reduce(op, a[0], np.max),
+    "Reshape": lambda op, a: np.reshape(a[0], tuple(op.attributes["new_shape"])),
+    "Transpose": lambda op, a: np.transpose(a[0], op.attributes.get("permutation")),
+    "ExpandDims": _expand_dims,
+    "Squeeze": lambda op, a: np.squeeze(a[0], axis=tuple(op.attributes.get("axes", ()))),
+    "Index": lambda op, a: np.asarray(a[0][tuple(op.attributes["indices"])]),
+    "Slice": _slice,
+    "Gather": lambda op, a: np.take(a[0], a[1], axis=0),
+    "Dot": _dot,
+    "MatMul": lambda op, a: np.matmul(a[0], a[1]),
+    "Conv2d": _conv2d,
+    "Relu": lambda op, a: np.maximum(a[0], a[0].dtype.type(0)),
+    "ReluGrad": lambda op, a: np.where(a[1] > 0, a[0], a[0].dtype.type(0)),
+    "Neg": lambda op, a: np.negative(a[0]),
+    "Exp": lambda op, a: np.exp(a[0]),
+    "Log": lambda op, a: np.log(a[0]),
+    "Fused": _fused,
+}
+
+
+class Executor:
+    """Reference NumPy interpreter for ``CoreIR`` modules.
+
+    Each opcode from the Core v1 instruction set maps to a vectorised NumPy
+    kernel in ``KERNELS``. The last use of every value is computed once when
+    the executor is built; during ``run`` each intermediate buffer is released
+    as soon as its last consumer has executed, so peak memory tracks the live
+    set rather than the whole module. ``peak_live_bytes`` records the high
+    water mark of the most recent run.
+    """
+
+    def __init__(self, ir: CoreIR, kernels: Optional[Mapping[str, Kernel]] = None) -> None:
+        self.ir = ir
+        self.kernels: Dict[str, Kernel] = dict(KERNELS)
+        if kernels:
+            self.kernels.update(kernels)
+        self.peak_live_bytes = 0
+
+        for op in ir.operations:
+            if op.opcode != "Input" and op.opcode not in self.kernels:
+                raise NotImplementedError(f"No kernel for opcode '{op.opcode}'")
+
+        outputs = set(ir.outputs)
+        last_use: Dict[int, int] = {}
+        for index, op in enumerate(ir.operations):
+            last_use.setdefault(op.value_id, index)
+            for operand in op.operands:
+                last_use[operand] = index
+        # Values released after each instruction; outputs are never released.
+        self.release_after: List[List[int]] = [[] for _ in ir.operations]
+        for value_id, index in last_use.items():
+            if value_id not in outputs:
+                self.release_after[index].append(value_id)
+
+    def bind_inputs(self, inputs: Mapping[str, Any]) -> Dict[int, np.ndarray]:
+        """Convert named inputs to arrays, checking them against declared types."""
+
+        values: Dict[int, np.ndarray] = {}
+        for op in self.ir.operations:
+            if op.opcode != "Input":
+                continue
+            name = op.attributes.get("name")
+            if name not in inputs:
+                raise KeyError(f"Missing value for input '{name}'")
+            declared = TensorType.parse(op.result_type) if op.result_type else None
+            array = np.asarray(inputs[name], dtype=DTYPES[declared.dtype] if declared else None)
+            if declared is not None and array.shape != declared.shape:
+                raise ValueError(f"Input '{name}' has shape {array.shape}, expected {declared.shape}")
+            values[op.value_id] = array
+        return values
+
+    def run(self, inputs: Mapping[str, Any]) -> List[np.ndarray]:
+        """Execute the module and return the output arrays in declaration order."""
+
+        values = self.bind_inputs(inputs)
+        live_bytes = sum(v.nbytes for v in values.values())
+        peak = live_bytes
+        kernels = self.kernels
+
+        for index, op in enumerate(self.ir.operations):
+            if op.opcode != "Input":
+                result = np.asarray(kernels[op.opcode](op, [values[operand] for operand in op.operands]))
+                values[op.value_id] = result
+                live_bytes += result.nbytes
+                peak = max(peak, live_bytes)
+            for value_id in self.release_after[index]:
+                live_bytes -= values.pop(value_id).nbytes
+
+        self.peak_live_bytes = peak
+        return [values[output] for output in self.ir.outputs]
+
+
+def execute(ir: CoreIR, inputs: Optional[Mapping[str, Any]] = None) -> List[np.ndarray]:
+    return Executor(ir).run(inputs or {})
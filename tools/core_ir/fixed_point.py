@@ -0,0 +1,303 @@
+"""
+Q16.16 fixed-point execution of Core IR modules (spec/v1.0/performance.md, Tier 3).
+
+Every floating-point value of the module is held as a Q16.16 number: an
+``int32`` whose low 16 bits are the fraction, so the real value is
+``q / 65536``. Kernels work on whole arrays with ``int64`` intermediates, and
+follow the rules of the reference ``dot_q16`` / ``dot_q16_v`` kernels
+(docs/changelog.md, v0.6.4):
+
+- ``Add``, ``Sub``, ``Neg`` and ``Sum`` add exactly and wrap to 32 bits.
+- ``Mul`` widens to 64 bits, multiplies and shifts right by 16. The
+  arithmetic shift rounds toward negative infinity.
+- ``MatMul`` and ``Dot`` shift every product before accumulating, exactly
+  as ``dot_q16`` does. They then add the shifted products in ``int64`` and
+  truncate the sum to 32 bits.
+- ``Div`` computes ``floor((a << 16) / b)``. A zero divisor raises
+  ``ZeroDivisionError``.
+- ``Mean`` is ``floor(sum / count)`` over the exact ``int64`` sum.
+- ``Relu`` and ``Max`` compare the raw integers.
+
+Every result wraps modulo 2**32, the ``trunci`` of the reference lowering.
+Wrapping addition is associative, so reductions give the same bits in any
+order and with any vector width. Float inputs and constants enter through
+``to_q16``, which rounds half to even and saturates to the ``int32`` range.
+The IEEE-754 multiply by 65536 in ``to_q16`` is exact, so conversion is
+deterministic too. Values with integer dtypes keep their normal kernels.
+
+``Q16Executor.digest`` is the SHA-256 of the ``(operation_id, q16_output)``
+stream of the most recent run, the value the Tier 3 gate compares across
+substrates. The command line prints it for a module run on seeded random
+inputs:
+
+    python -m tools.core_ir.fixed_point examples/ir/matmul_module.ir --seed 0 --runs 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .core_ir import CoreIR, CoreOperation
+from .executor import DTYPES, Executor, Kernel, _constant, _reduction_axes
+from .ir_parser import load_ir
+from .type_system import TensorType
+
+FRACTION_BITS = 16
+ONE = 1 << FRACTION_BITS
+Q16_MIN = -(2**31)
+Q16_MAX = 2**31 - 1
+
+FLOAT_DTYPES = frozenset({"f16", "f32", "f64"})
+
+# Elements of the int64 product block MatMul materialises at once (256 KiB, so it stays in cache).
+MATMUL_BLOCK_ELEMENTS = 1 << 15
+
+# Opcodes whose NumPy kernels move, select or compare int32 values without arithmetic on them.
+STRUCTURAL_OPCODES = frozenset(
+    {"Input", "Reshape", "Transpose", "ExpandDims", "Squeeze", "Index", "Slice", "Gather", "Max", "ReluGrad"}
+)
+
+CONSTANT_OPCODES = frozenset({"ConstI64", "ConstF32", "ConstF64", "ConstTensor"})
+
+
+def to_q16(values: Any) -> np.ndarray:
+    """Round real ``values`` to the nearest Q16.16 number, ties to even, saturating at the int32 range."""
+
+    scaled = np.asarray(values, dtype=np.float64) * ONE
+    if np.isnan(scaled).any():
+        raise ValueError("NaN has no Q16.16 representation")
+    return np.clip(np.rint(scaled), Q16_MIN, Q16_MAX).astype(np.int32)
+
+
+def from_q16(q: Any) -> np.ndarray:
+    """The real value of each Q16.16 number, exactly, as float64."""
+
+    return np.asarray(q, dtype=np.int32).astype(np.float64) / ONE
+
+
+def wrap(x: np.ndarray) -> np.ndarray:
+    """Reduce ``int64`` values modulo 2**32 into the two's-complement ``int32`` range."""
+
+    return np.asarray(np.bitwise_and(x, 0xFFFFFFFF).astype(np.uint32)).view(np.int32)
+
+
+def _wide(x: np.ndarray) -> np.ndarray:
+    return x.astype(np.int64)
+
+
+def _mul(op: CoreOperation, args: List[np.ndarray]) -> np.ndarray:
+    return wrap((_wide(args[0]) * _wide(args[1])) >> FRACTION_BITS)
+
+
+def _div(op: CoreOperation, args: List[np.ndarray]) -> np.ndarray:
+    if not np.all(args[1]):
+        raise ZeroDivisionError(f"Q16.16 division by zero in %{op.value_id} = Div")
+    return wrap(np.floor_divide(_wide(args[0]) << FRACTION_BITS, _wide(args[1])))
+
+
+def _reduce(op: CoreOperation, x: np.ndarray, mean: bool) -> np.ndarray:
+    axes = _reduction_axes(op, x.ndim)
+    # Empty axes denote a full reduction to a scalar regardless of keepdims.
+    keepdims = bool(op.attributes.get("keepdims", False)) and axes is not None
+    total = np.sum(x, axis=axes, keepdims=keepdims, dtype=np.int64)
+    if mean:
+        count = x.size if axes is None else int(np.prod([x.shape[axis] for axis in axes]))
+        total = np.floor_divide(total, max(count, 1))
+    return wrap(total)
+
+
+def _matmul(op: CoreOperation, args: List[np.ndarray]) -> np.ndarray:
+    """Sum of per-product ``>> 16`` terms, vectorised over blocks of the contracting dimension."""
+
+    a, b = args
+    lhs = _wide(a)[..., :, :, None]
+    rhs = _wide(b)[..., None, :, :]
+    batch = np.broadcast_shapes(a.shape[:-2], b.shape[:-2])
+    rows, depth, columns = a.shape[-2], a.shape[-1], b.shape[-1]
+    total = np.zeros(batch + (rows, columns), dtype=np.int64)
+    step = max(1, MATMUL_BLOCK_ELEMENTS // max(1, int(np.prod(batch)) * rows * columns))
+    for start in range(0, depth, step):
+        products = lhs[..., start : start + step, :] * rhs[..., start : start + step, :]
+        products >>= FRACTION_BITS
+        total += products.sum(axis=-2)
+    return wrap(total)
+
+
+def _dot(op: CoreOperation, args: List[np.ndarray]) -> np.ndarray:
+    a, b = args
+    result = _matmul(op, [a if a.ndim == 2 else a[None, :], b if b.ndim == 2 else b[:, None]])
+    if b.ndim == 1:
+        result = result[..., 0]
+    if a.ndim == 1:
+        result = result[0]
+    return result
+
+
+Q16_KERNELS: Dict[str, Kernel] = {
+    "Add": lambda op, a: wrap(_wide(a[0]) + _wide(a[1])),
+    "Sub": lambda op, a: wrap(_wide(a[0]) - _wide(a[1])),
+    "Mul": _mul,
+    "Div": _div,
+    "Neg": lambda op, a: wrap(-_wide(a[0])),
+    "Sum": lambda op, a: _reduce(op, a[0], mean=False),
+    "Mean": lambda op, a: _reduce(op, a[0], mean=True),
+    "MatMul": _matmul,
+    "Dot": _dot,
+    "Relu": lambda op, a: np.maximum(a[0], np.int32(0)),
+}
+
+
+def _is_q16(op: CoreOperation) -> bool:
+    return op.result_type is None or TensorType.parse(op.result_type).dtype in FLOAT_DTYPES
+
+
+class Q16Executor(Executor):
+    """Runs a ``CoreIR`` module in Q16.16 fixed point with vectorised integer kernels.
+
+    Operations with a floating-point result use ``Q16_KERNELS``. All other
+    operations run the regular kernels: those with integer results, and the
+    data-movement opcodes in ``STRUCTURAL_OPCODES``. Any other floating-point
+    operation (``Exp``, ``Conv2d``, ``Fused``, ...) is rejected when the
+    executor is built. Constants are converted with ``to_q16`` once, at
+    construction.
+
+    Inputs declared with a float dtype accept float arrays, which are
+    converted with ``to_q16``, or ``int32`` arrays, which are taken as raw
+    Q16.16 values. Outputs are raw ``int32``; ``from_q16`` gives their real
+    values. After each run, ``digest`` holds the hex SHA-256 of every
+    operation result in program order. Each record is the operation's value
+    id and the byte length of its output, both as little-endian ``u64``,
+    followed by the output as little-endian ``int32`` in C order.
+    """
+
+    def __init__(self, ir: CoreIR, kernels: Optional[Mapping[str, Kernel]] = None) -> None:
+        super().__init__(ir, kernels)
+        self.digest: Optional[str] = None
+        self.q16_values = {op.value_id for op in ir.operations if _is_q16(op)}
+        self.constants: Dict[int, np.ndarray] = {}
+        for op in ir.operations:
+            if op.opcode in CONSTANT_OPCODES:
+                value = _constant(op, [])
+                self.constants[op.value_id] = to_q16(value) if op.value_id in self.q16_values else value
+            elif op.value_id in self.q16_values and op.opcode not in STRUCTURAL_OPCODES:
+                if op.opcode not in Q16_KERNELS:
+                    raise NotImplementedError(f"No Q16.16 kernel for opcode '{op.opcode}'")
+
+        base = dict(self.kernels)
+        for opcode in CONSTANT_OPCODES:
+            self.kernels[opcode] = lambda op, a: self.constants[op.value_id]
+        for opcode, kernel in Q16_KERNELS.items():
+            self.kernels[opcode] = self._dispatch(kernel, base[opcode])
+
+    def _dispatch(self, q16_kernel: Kernel, kernel: Kernel) -> Kernel:
+        q16_values = self.q16_values
+
+        def run(op: CoreOperation, args: List[np.ndarray]) -> np.ndarray:
+            return (q16_kernel if op.value_id in q16_values else kernel)(op, args)
+
+        return run
+
+    def bind_inputs(self, inputs: Mapping[str, Any]) -> Dict[int, np.ndarray]:
+        """Convert named inputs to arrays: Q16.16 ``int32`` for float declarations, the declared dtype otherwise."""
+
+        values: Dict[int, np.ndarray] = {}
+        for op in self.ir.operations:
+            if op.opcode != "Input":
+                continue
+            name = op.attributes.get("name")
+            if name not in inputs:
+                raise KeyError(f"Missing value for input '{name}'")
+            declared = TensorType.parse(op.result_type) if op.result_type else None
+            array = np.asarray(inputs[name])
+            if op.value_id in self.q16_values:
+                array = array if array.dtype == np.int32 else to_q16(array)
+            else:
+                array = array.astype(DTYPES[declared.dtype], copy=False)
+            if declared is not None and array.shape != declared.shape:
+                raise ValueError(f"Input '{name}' has shape {array.shape}, expected {declared.shape}")
+            values[op.value_id] = array
+        return values
+
+    def run(self, inputs: Mapping[str, Any]) -> List[np.ndarray]:
+        """Execute the module and return the outputs, recording the Tier 3 digest of every result."""
+
+        values = self.bind_inputs(inputs)
+        live_bytes = sum(v.nbytes for v in values.values())
+        peak = live_bytes
+        kernels = self.kernels
+        digest = hashlib.sha256()
+
+        for index, op in enumerate(self.ir.operations):
+            if op.opcode != "Input":
+                result = np.asarray(kernels[op.opcode](op, [values[operand] for operand in op.operands]))
+                values[op.value_id] = result
+                data = np.ascontiguousarray(result, dtype=result.dtype.newbyteorder("<")).tobytes()
+                digest.update(op.value_id.to_bytes(8, "little") + len(data).to_bytes(8, "little"))
+                digest.update(data)
+                live_bytes += result.nbytes
+                peak = max(peak, live_bytes)
+            for value_id in self.release_after[index]:
+                live_bytes -= values.pop(value_id).nbytes
+
+        self.peak_live_bytes = peak
+        self.digest = digest.hexdigest()
+        return [values[output] for output in self.ir.outputs]
+
+
+def execute_q16(ir: CoreIR, inputs: Optional[Mapping[str, Any]] = None) -> List[np.ndarray]:
+    return Q16Executor(ir).run(inputs or {})
+
+
+def random_inputs(ir: CoreIR, seed: int = 0, scale: float = 4.0) -> Dict[str, np.ndarray]:
+    """Seeded inputs for every declared input: raw Q16.16 values in ``[-scale, scale)`` for float inputs.
+
+    The integers come straight from PCG64, whose output is the same on every
+    platform, so the same seed yields the same bits everywhere.
+    """
+
+    rng = np.random.default_rng(seed)
+    bound = int(scale * ONE)
+    inputs: Dict[str, np.ndarray] = {}
+    for op in ir.operations:
+        if op.opcode != "Input":
+            continue
+        name = op.attributes.get("name")
+        declared = TensorType.parse(op.result_type)
+        if not declared.is_static:
+            raise ValueError(f"Input '{name}' has a symbolic shape; specialize the module first")
+        if declared.dtype in FLOAT_DTYPES:
+            inputs[name] = rng.integers(-bound, bound, declared.shape, dtype=np.int32)
+        else:
+            inputs[name] = rng.integers(0, 2, declared.shape, dtype=np.int64)
+    return inputs
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="+", help="Core IR modules (.ir)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--runs", type=int, default=1, help="run each module this many times and compare digests")
+    args = parser.parse_args(argv)
+    status = 0
+    for path in args.modules:
+        ir = load_ir(path)
+        executor = Q16Executor(ir)
+        inputs = random_inputs(ir, args.seed)
+        digests = set()
+        for _ in range(max(1, args.runs)):
+            executor.run(inputs)
+            digests.add(executor.digest)
+        if len(digests) != 1:
+            print(f"{path}: digest changed between runs: {', '.join(sorted(digests))}")
+            status = 1
+            continue
+        print(f"{digests.pop()}  {path}")
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Opt-in instrumentation for the core_ir pipeline.
+
+``Profiler`` wraps the pipeline's hot functions only while it is active and
+restores the originals on exit, so disabled instrumentation costs nothing.
+It records per-phase wall time (inclusive and self), per-opcode counts of
+emitted operations, hit rates of the caches it sees used, and optionally
+tracemalloc allocation statistics. Results export as a JSON report and in
+Chrome trace-event format (load in chrome://tracing or Perfetto).
+
+    with Profiler(trace=True) as profiler:
+        LanguageConstruct(expression, type_system).to_ir().compile()
+    profiler.write_json("report.json")
+    profiler.write_chrome_trace("trace.json")
+
+Whole scripts can be profiled without editing them:
+
+    python -m tools.core_ir.instrument --json report.json --trace trace.json script.py [args ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import os
+import runpy
+import sys
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from . import language, type_system
+from .compile_cache import CompilationCache
+from .core_ir import CoreIR
+from .specialize import SpecializationCache
+
+# Counter attributes reported for cache objects, when present.
+CACHE_COUNTERS = ("hits", "disk_hits", "misses", "evictions", "disk_evictions", "bypasses")
+
+
+@dataclass(frozen=True)
+class Hook:
+    """One function the profiler wraps.
+
+    ``phase`` names the timed span (``None`` for untimed hooks that only
+    discover caches). ``opcode`` extracts the opcode to count from the call's
+    arguments; ``caches`` maps the bound instance to the cache objects it owns.
+    """
+
+    phase: Optional[str]
+    owner: Any
+    attribute: str
+    opcode: Optional[Callable[[tuple, dict], str]] = None
+    caches: Optional[Callable[[Any], Dict[str, Any]]] = None
+
+
+def _type_system_caches(ts: type_system.TypeSystem) -> Dict[str, Any]:
+    return {"broadcast_cache": ts.broadcast_cache, "matmul_cache": ts.matmul_cache}
+
+
+DEFAULT_HOOKS: Tuple[Hook, ...] = (
+    Hook("to_ir", language.LanguageConstruct, "to_ir"),
+    Hook("lower", language, "lower"),
+    Hook("validate_program", type_system.TypeSystem, "validate_program", caches=_type_system_caches),
+    Hook("infer_type", language.Literal, "infer_type"),
+    Hook("infer_type", language.Variable, "infer_type"),
+    Hook("infer_type", language.BinaryOperation, "infer_type"),
+    Hook("validate_binop", type_system.TypeSystem, "validate_binop"),
+    Hook("validate_matmul", type_system.TypeSystem, "validate_matmul", caches=_type_system_caches),
+    Hook("broadcast_shapes", type_system.TypeSystem, "broadcast_shapes", caches=_type_system_caches),
+    Hook(None, language.TypeCache, "begin", caches=lambda cache: {"type_cache": cache}),
+    Hook(
+        "add_operation",
+        CoreIR,
+        "add_operation",
+        opcode=lambda args, kwargs: args[1] if len(args) > 1 else kwargs["opcode"],
+    ),
+    Hook("add_operation", CoreIR, "declare_input", opcode=lambda args, kwargs: "Input"),
+    Hook("compile", CoreIR, "compile"),
+    Hook("compile_cache", CompilationCache, "get_ir", caches=lambda cache: {"compile_cache": cache}),
+    Hook("compile_cache", CompilationCache, "get_text", caches=lambda cache: {"compile_cache": cache}),
+    Hook("specialize", SpecializationCache, "specialize", caches=lambda cache: {"specialization_cache": cache}),
+)
+
+_MISSING = object()
+_active: Optional["Profiler"] = None
+
+
+def _counters(cache: Any) -> Dict[str, int]:
+    return {name: getattr(cache, name) for name in CACHE_COUNTERS if hasattr(cache, name)}
+
+
+class Profiler:
+    """Context manager that instruments ``hooks`` while active.
+
+    Only one profiler may be active at a time. Span nesting is tracked per
+    thread, so ``self_s`` excludes time spent in nested instrumented calls.
+    With ``trace`` every span becomes a Chrome trace event, up to
+    ``max_events`` (further spans are counted in ``dropped_events``). With
+    ``memory`` tracemalloc runs for the profile (if it was not already) and
+    each phase also reports its net allocated bytes; ``memory_top`` limits the
+    per-file allocation table in the report.
+    """
+
+    def __init__(
+        self,
+        hooks: Sequence[Hook] = DEFAULT_HOOKS,
+        trace: bool = False,
+        memory: bool = False,
+        max_events: int = 1_000_000,
+        memory_top: int = 20,
+    ) -> None:
+        self.hooks = tuple(hooks)
+        self.trace = trace
+        self.memory = memory
+        self.max_events = max_events
+        self.memory_top = memory_top
+        self.phases: Dict[str, List[int]] = {}
+        self.opcodes: Dict[str, int] = {}
+        self.events: List[Tuple[str, int, int, int, Optional[str]]] = []
+        self.dropped_events = 0
+        self._caches: Dict[int, Tuple[str, Any, Dict[str, int]]] = {}
+        self._final_counters: Dict[int, Dict[str, int]] = {}
+        self._saved: List[Tuple[Any, str, Any]] = []
+        self._local = threading.local()
+        self._started_tracemalloc = False
+        self._parse_cache_start: Any = None
+        self._parse_cache_stop: Any = None
+        self._memory_report: Optional[Dict[str, Any]] = None
+        self._start_ns = 0
+        self._stop_ns: Optional[int] = None
+
+    def __enter__(self) -> "Profiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        global _active
+        if _active is not None:
+            raise RuntimeError("Another Profiler is already active")
+        _active = self
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._parse_cache_start = type_system._parse_tensor_type.cache_info()
+        for hook in self.hooks:
+            original = hook.owner.__dict__.get(hook.attribute, _MISSING)
+            target = getattr(hook.owner, hook.attribute)
+            self._saved.append((hook.owner, hook.attribute, original))
+            setattr(hook.owner, hook.attribute, self._wrap(hook, target))
+        self._start_ns = time.perf_counter_ns()
+        self._stop_ns = None
+
+    def stop(self) -> None:
+        global _active
+        if _active is not self:
+            return
+        self._stop_ns = time.perf_counter_ns()
+        for owner, attribute, original in reversed(self._saved):
+            if original is _MISSING:
+                delattr(owner, attribute)
+            else:
+                setattr(owner, attribute, original)
+        self._saved.clear()
+        self._parse_cache_stop = type_system._parse_tensor_type.cache_info()
+        for key, (_, cache, _) in self._caches.items():
+            self._final_counters[key] = _counters(cache)
+        if self.memory:
+            self._memory_report = self._snapshot_memory()
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+        _active = None
+
+    def _wrap(self, hook: Hook, fn: Callable[..., Any]) -> Callable[..., Any]:
+        phase = hook.phase
+        opcode_of = hook.opcode
+        caches_of = hook.caches
+        opcodes = self.opcodes
+        local = self._local
+        memory = self.memory
+        stats = self.phases.setdefault(phase, [0, 0, 0, 0]) if phase is not None else None
+        clock = time.perf_counter_ns
+        traced = tracemalloc.get_traced_memory
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if caches_of is not None:
+                self._watch(caches_of(args[0]))
+            if opcode_of is not None:
+                opcode = opcode_of(args, kwargs)
+                opcodes[opcode] = opcodes.get(opcode, 0) + 1
+            else:
+                opcode = None
+            if stats is None:
+                return fn(*args, **kwargs)
+
+            stack = getattr(local, "stack", None)
+            if stack is None:
+                stack = local.stack = []
+            stack.append(0)
+            allocated = traced()[0] if memory else 0
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                children = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                stats[0] += 1
+                stats[1] += elapsed
+                stats[2] += elapsed - children
+                if memory:
+                    stats[3] += traced()[0] - allocated
+                if self.trace:
+                    self._record(phase, start, elapsed, opcode)
+
+        return wrapper
+
+    def _record(self, phase: str, start: int, elapsed: int, opcode: Optional[str]) -> None:
+        if len(self.events) < self.max_events:
+            self.events.append((phase, start, elapsed, threading.get_ident(), opcode))
+        else:
+            self.dropped_events += 1
+
+    def _watch(self, caches: Dict[str, Any]) -> None:
+        for label, cache in caches.items():
+            if id(cache) not in self._caches:
+                self._caches[id(cache)] = (label, cache, _counters(cache))
+
+    def _snapshot_memory(self) -> Dict[str, Any]:
+        current, peak = tracemalloc.get_traced_memory()
+        by_file: Dict[str, Dict[str, int]] = {}
+        statistics = tracemalloc.take_snapshot().statistics("filename")
+        for stat in statistics[: self.memory_top]:
+            filename = stat.traceback[0].filename
+            by_file[filename] = {"blocks": stat.count, "bytes": stat.size}
+        return {
+            "current_bytes": current,
+            "peak_bytes": peak,
+            "blocks": sum(stat.count for stat in statistics),
+            "by_file": by_file,
+        }
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Counter deltas over the profile, summed per cache label."""
+
+        totals: Dict[str, Dict[str, Any]] = {}
+        for key, (label, cache, baseline) in self._caches.items():
+            final = self._final_counters.get(key) or _counters(cache)
+            entry = totals.setdefault(label, {"instances": 0})
+            entry["instances"] += 1
+            for name in CACHE_COUNTERS:
+                if name in baseline:
+                    entry[name] = entry.get(name, 0) + final[name] - baseline[name]
+        start, stop = self._parse_cache_start, self._parse_cache_stop
+        if start is not None:
+            stop = stop or type_system._parse_tensor_type.cache_info()
+            hits, misses = stop.hits - start.hits, stop.misses - start.misses
+            totals["tensor_type_parse"] = {"instances": 1, "hits": hits, "misses": misses}
+        for entry in totals.values():
+            hits = entry.get("hits", 0) + entry.get("disk_hits", 0)
+            lookups = hits + entry.get("misses", 0)
+            entry["hit_rate"] = hits / lookups if lookups else None
+        return dict(sorted(totals.items()))
+
+    def report(self) -> Dict[str, Any]:
+        stop = self._stop_ns if self._stop_ns is not None else time.perf_counter_ns()
+        phases = {}
+        for phase, (calls, total, own, allocated) in sorted(self.phases.items()):
+            if not calls:
+                continue
+            phases[phase] = {
+                "calls": calls,
+                "total_s": total / 1e9,
+                "self_s": own / 1e9,
+                "mean_us": total / calls / 1e3,
+            }
+            if self.memory:
+                phases[phase]["allocated_bytes"] = allocated
+        report: Dict[str, Any] = {
+            "wall_time_s": (stop - self._start_ns) / 1e9,
+            "phases": phases,
+            "opcodes": dict(sorted(self.opcodes.items())),
+            "caches": self.cache_stats(),
+        }
+        if self.trace:
+            report["trace_events"] = len(self.events)
+            report["dropped_events"] = self.dropped_events
+        if self.memory:
+            report["memory"] = self._memory_report or self._snapshot_memory()
+        return report
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Spans as Chrome trace-event ``X`` (complete) events, in microseconds."""
+
+        pid = os.getpid()
+        events = []
+        for phase, start, elapsed, tid, opcode in self.events:
+            event: Dict[str, Any] = {
+                "name": phase,
+                "cat": "core_ir",
+                "ph": "X",
+                "ts": (start - self._start_ns) / 1e3,
+                "dur": elapsed / 1e3,
+                "pid": pid,
+                "tid": tid,
+            }
+            if opcode is not None:
+                event["args"] = {"opcode": opcode}
+            events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_json(self, destination: Union[str, Path, IO[str]]) -> None:
+        _dump(self.report(), destination)
+
+    def write_chrome_trace(self, destination: Union[str, Path, IO[str]]) -> None:
+        _dump(self.chrome_trace(), destination)
+
+
+def _dump(payload: Dict[str, Any], destination: Union[str, Path, IO[str]]) -> None:
+    if isinstance(destination, (str, Path)):
+        with open(destination, "w", encoding="utf-8") as fp:
+            json.dump(payload, fp, indent=2)
+            fp.write("\n")
+    else:
+        json.dump(payload, destination, indent=2)
+        destination.write("\n")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--json", type=Path, help="write the JSON report here (default: stdout)")
+    parser.add_argument("--trace", type=Path, help="write a Chrome trace-event file here")
+    parser.add_argument("--memory", action="store_true", help="record allocations with tracemalloc")
+    parser.add_argument("--max-events", type=int, default=1_000_000)
+    parser.add_argument("script", help="Python script to run under the profiler")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="arguments passed to the script")
+    args = parser.parse_args(argv)
+
+    saved_argv = sys.argv
+    sys.argv = [args.script, *args.args]
+    profiler = Profiler(trace=args.trace is not None, memory=args.memory, max_events=args.max_events)
+    try:
+        with profiler:
+            runpy.run_path(args.script, run_name="__main__")
+    finally:
+        sys.argv = saved_argv
+        profiler.write_json(args.json or sys.stdout)
+        if args.trace is not None:
+            profiler.write_chrome_trace(args.trace)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
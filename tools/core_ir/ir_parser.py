@@ -0,0 +1,495 @@
+from __future__ import annotations
+
+import mmap
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .core_ir import CoreIR, CoreOperation
+from .type_system import TensorType
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+# One instruction, alias, output declaration, comment or blank line per match.
+# The scanner runs directly over the (possibly memory-mapped) bytes; only the
+# captured groups are decoded.
+_STRING = rb'"(?:[^"\\\n]+|\\.)*"'
+_LINE = re.compile(
+    rb"[ \t]*(?:"
+    rb"%(?P<id>\w+)[ \t]*=[ \t]*(?:"
+    rb"%(?P<alias>\w+)"
+    rb"|(?P<op>\w+)[ \t]*\((?P<args>(?:[^()\"\n]+|" + _STRING + rb"|\((?:[^()\"\n]+|" + _STRING + rb")*\))*)\)"
+    rb"(?:[ \t]*\{(?P<attrs>(?:[^{}\"\n]+|" + _STRING + rb")*)\})?"
+    rb"[ \t]*:[ \t]*(?P<type>[Tt]ensor<[^<>\n]*>)"
+    rb")"
+    rb"|outputs[ \t]*:(?P<outputs>[^#\n]*)"
+    rb")?[ \t]*(?:#[^\n]*)?\r?(?:\n|\Z)"
+)
+_FLAT_ARG = r"\s*(?:%\w+|[A-Za-z_]\w*|-?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?)\s*"
+_FLAT_ARGS = re.compile(_FLAT_ARG + "(?:," + _FLAT_ARG + ")*")
+_OPERAND_ARGS = re.compile(rb"[ \t]*(?:([A-Za-z_]\w*)[ \t]*,[ \t]*)?%(\w+)(?:[ \t]*,[ \t]*%(\w+))?[ \t]*")
+_NAME_ATTRIBUTE = re.compile(r'\s*name\s*:\s*"([^"\\]*)"\s*,?\s*')
+_ARG_TOKEN = re.compile(
+    r'\s*(?:(%\w+)|("(?:[^"\\]|\\.)*")|(-?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?)|([A-Za-z_]\w*)|([\[\](),:]))'
+)
+_OUTPUT_REF = re.compile(r"\s*%(\w+)\s*(?:,|$)")
+_ESCAPES = {"n": "\n", "r": "\r", "t": "\t", "\\": "\\", '"': '"'}
+_ESCAPE = re.compile(r"\\(.)")
+
+OPERAND = None
+
+# Positional signature of each operation in grammar-ir.ebnf: ``OPERAND``
+# marks a value operand, any other entry names the attribute the argument
+# is stored under. Opcodes not listed take value operands only.
+SIGNATURES: Dict[str, Tuple[Optional[str], ...]] = {
+    "Input": (),
+    "ConstI64": ("value",),
+    "ConstF32": ("value",),
+    "ConstF64": ("value",),
+    "ConstTensor": ("value",),
+    "Sum": (OPERAND, "axes", "keepdims"),
+    "Mean": (OPERAND, "axes", "keepdims"),
+    "Max": (OPERAND, "axes", "keepdims"),
+    "Reshape": (OPERAND, "new_shape"),
+    "Transpose": (OPERAND, "permutation"),
+    "ExpandDims": (OPERAND, "axes"),
+    "Squeeze": (OPERAND, "axes"),
+    "Index": (OPERAND, "indices"),
+    "Slice": (OPERAND, "ranges"),
+    "Conv2d": (OPERAND, OPERAND, "strides", "padding"),
+}
+
+
+class IRParseError(ValueError):
+    """Malformed reference IR text, located by source name and line."""
+
+    def __init__(self, code: str, message: str, source: str, line: int) -> None:
+        super().__init__(f"{code}: {source}:{line}: {message}")
+        self.code = code
+        self.message = message
+        self.source = source
+        self.line = line
+
+
+class _Ref(str):
+    """A ``%name`` argument, kept distinct from string literals."""
+
+
+class _Range(tuple):
+    """A ``start:end[:step]`` slice range."""
+
+
+class _Call(tuple):
+    """A ``Name(args)`` argument such as ``Custom([[0, 1], [1, 0]])``."""
+
+
+def _unescape(literal: str) -> str:
+    body = literal[1:-1]
+    if "\\" not in body:
+        return body
+
+    def replace(match: "re.Match[str]") -> str:
+        escaped = _ESCAPES.get(match.group(1))
+        if escaped is None:
+            raise ValueError(f"Invalid escape sequence '\\{match.group(1)}'")
+        return escaped
+
+    return _ESCAPE.sub(replace, body)
+
+
+class _ArgReader:
+    """Recursive-descent reader over the pre-tokenised argument list."""
+
+    def __init__(self, text: str) -> None:
+        self.tokens: List[Tuple[str, str, str, str, str]] = []
+        pos = 0
+        match = _ARG_TOKEN.match(text)
+        while match is not None and match.end() > pos:
+            self.tokens.append(match.groups())
+            pos = match.end()
+            match = _ARG_TOKEN.match(text, pos)
+        if text[pos:].strip():
+            raise ValueError(f"Unexpected character '{text[pos:].strip()[0]}' in '{text.strip()}'")
+        self.pos = 0
+
+    def peek(self) -> Optional[str]:
+        """The punctuation at the cursor, ``None`` for other tokens, ``""`` at the end."""
+
+        return self.tokens[self.pos][4] if self.pos < len(self.tokens) else ""
+
+    def expect(self, punct: str) -> None:
+        if self.peek() != punct:
+            raise ValueError(f"Expected '{punct}'")
+        self.pos += 1
+
+    def sequence(self, closer: str) -> List[Any]:
+        items: List[Any] = []
+        while self.pos < len(self.tokens) and self.peek() != closer:
+            items.append(self.value())
+            if self.peek() != ",":
+                break
+            self.pos += 1
+        return items
+
+    def value(self) -> Any:
+        value = self.atom()
+        if type(value) is not int or self.peek() != ":":
+            return value
+        bounds = [value]
+        while self.peek() == ":" and len(bounds) < 3:
+            self.pos += 1
+            bound = self.atom() if self.pos < len(self.tokens) else None
+            if type(bound) is not int:
+                raise ValueError("Slice bounds must be integers")
+            bounds.append(bound)
+        return _Range(bounds)
+
+    def atom(self) -> Any:
+        if self.pos >= len(self.tokens):
+            raise ValueError("Unexpected end of arguments")
+        ref, string, number, ident, punct = self.tokens[self.pos]
+        self.pos += 1
+        if ref:
+            return _Ref(ref[1:])
+        if string:
+            return _unescape(string)
+        if number:
+            return float(number) if any(c in number for c in ".eE") else int(number)
+        if ident:
+            if ident in ("true", "false"):
+                return ident == "true"
+            if self.peek() != "(":
+                return ident
+            self.pos += 1
+            call = _Call((ident, *self.sequence(")")))
+            self.expect(")")
+            return call
+        if punct == "[":
+            items = self.sequence("]")
+            self.expect("]")
+            return items
+        raise ValueError(f"Unexpected '{punct}'")
+
+
+def _parse_args(text: str) -> List[Any]:
+    if not text.strip():
+        return []
+    if _FLAT_ARGS.fullmatch(text):
+        # Fast path for flat argument lists such as ``Add, %0, %1``.
+        args: List[Any] = []
+        for part in text.split(","):
+            part = part.strip()
+            if part[0] == "%":
+                args.append(_Ref(part[1:]))
+            elif part in ("true", "false"):
+                args.append(part == "true")
+            elif not part[0].isdigit() and part[0] != "-":
+                args.append(part)
+            else:
+                args.append(float(part) if any(c in part for c in ".eE") else int(part))
+        return args
+    reader = _ArgReader(text)
+    args = reader.sequence("")
+    if reader.pos != len(reader.tokens):
+        raise ValueError(f"Unexpected '{''.join(filter(None, reader.tokens[reader.pos]))}'")
+    return args
+
+
+def _parse_attributes(text: str) -> Dict[str, Any]:
+    attributes: Dict[str, Any] = {}
+    if not text.strip():
+        return attributes
+    match = _NAME_ATTRIBUTE.fullmatch(text)
+    if match is not None:
+        attributes["name"] = match.group(1)
+        return attributes
+    reader = _ArgReader(text)
+    while reader.pos < len(reader.tokens):
+        key = reader.value()
+        if not isinstance(key, str) or isinstance(key, _Ref) or reader.peek() != ":":
+            raise ValueError("Attributes must be 'name: value' pairs")
+        reader.pos += 1
+        if key in attributes:
+            raise ValueError(f"Duplicate attribute '{key}'")
+        attributes[key] = _plain(reader.value())
+        if reader.peek() == ",":
+            reader.pos += 1
+        elif reader.pos < len(reader.tokens):
+            raise ValueError("Expected ',' between attributes")
+    return attributes
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, _Ref):
+        raise ValueError(f"Value reference %{value} is not allowed here")
+    if isinstance(value, (_Range, _Call)):
+        raise ValueError("Unexpected slice range or call")
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+
+class _Parser:
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.line = 0
+        self.ir = CoreIR()
+        self.ids: Dict[str, int] = {}
+        self.defined: set = set()
+        self.outputs: Optional[List[int]] = None
+        self._opcodes: Dict[bytes, str] = {}
+        self._types: Dict[bytes, Tuple[str, TensorType]] = {}
+        self._canonical: Dict[TensorType, str] = {}
+
+    def error(self, message: str, code: str = "E1001") -> IRParseError:
+        return IRParseError(code, message, self.source, self.line)
+
+    def run(self, buffer: Buffer) -> CoreIR:
+        match_line = _LINE.match
+        end = len(buffer)
+        pos = 0
+        while pos < end:
+            self.line += 1
+            match = match_line(buffer, pos)
+            if match is None or match.end() == pos:
+                raise self.error("Unexpected token")
+            pos = match.end()
+            value_id, alias, opcode, args, attrs, result_type, outputs = match.groups()
+            if value_id is None and outputs is None:
+                continue
+            if self.outputs is not None:
+                raise self.error("Instruction after the outputs declaration")
+            try:
+                if opcode is not None:
+                    self.instruction(value_id, opcode, args, attrs, result_type)
+                elif alias is not None:
+                    self.define(value_id, self.resolve(alias.decode("utf-8")))
+                else:
+                    self.outputs = [self.resolve(name) for name in self._output_names(outputs.decode("utf-8"))]
+            except IRParseError:
+                raise
+            except (ValueError, UnicodeDecodeError) as exc:
+                raise self.error(str(exc)) from exc
+        if self.outputs is None:
+            self.line += 1
+            raise self.error("Missing outputs declaration")
+        self.ir.outputs = self.outputs
+        return self.ir
+
+    def _output_names(self, text: str) -> Iterator[str]:
+        pos = 0
+        text = text.rstrip().rstrip(",")
+        while pos < len(text):
+            match = _OUTPUT_REF.match(text, pos)
+            if match is None or match.end() == pos:
+                raise ValueError(f"Malformed output list '{text.strip()}'")
+            yield match.group(1)
+            pos = match.end()
+
+    def resolve(self, name: str) -> int:
+        value_id = self.ids.get(name)
+        if value_id is None:
+            raise self.error(f"Use of %{name} before definition", "E4001")
+        return value_id
+
+    def define(self, raw: bytes, value_id: Optional[int] = None) -> int:
+        name = raw.decode("utf-8")
+        if name in self.ids:
+            raise self.error(f"ValueId %{name} defined multiple times", "E4002")
+        if value_id is None:
+            value_id = int(name) if name.isdigit() else self.ir._next_value_id
+            if value_id in self.defined:
+                raise self.error(f"ValueId %{name} defined multiple times", "E4002")
+            self.defined.add(value_id)
+            self.ir._next_value_id = max(self.ir._next_value_id, value_id + 1)
+        self.ids[name] = value_id
+        return value_id
+
+    def result_type(self, raw: bytes) -> str:
+        """Intern ``raw`` so every equal type shares one string and ``TensorType``."""
+
+        cached = self._types.get(raw)
+        if cached is not None:
+            return cached[0]
+        tensor_type = TensorType.parse(raw.decode("utf-8"))
+        canonical = self._canonical.get(tensor_type)
+        if canonical is None:
+            canonical = self._canonical[tensor_type] = sys.intern(str(tensor_type))
+        cached = (canonical, tensor_type)
+        self._types[raw] = cached
+        return cached[0]
+
+    def instruction(
+        self, raw_id: bytes, raw_opcode: bytes, raw_args: bytes, raw_attrs: Optional[bytes], raw_type: bytes
+    ) -> None:
+        opcode = self._opcodes.get(raw_opcode)
+        if opcode is None:
+            opcode = self._opcodes[raw_opcode] = sys.intern(raw_opcode.decode("utf-8"))
+        fast = _OPERAND_ARGS.fullmatch(raw_args) if raw_attrs is None else None
+        if fast is not None:
+            # Operand-only instructions (``BinOp(Add, %0, %1)``, ``Relu(%3)``) skip
+            # the general argument reader entirely.
+            operator, first, second = fast.groups()
+            binop = opcode == "BinOp"
+            # Only BinOp takes a leading operator name; anything else goes to the general reader.
+            if (operator is not None) == binop and (second is not None if binop else opcode not in SIGNATURES):
+                if operator is not None:
+                    opcode = self._opcodes.get(operator) or self._opcodes.setdefault(
+                        operator, sys.intern(operator.decode("utf-8"))
+                    )
+                operands = [self.resolve(first.decode("utf-8"))]
+                if second is not None:
+                    operands.append(self.resolve(second.decode("utf-8")))
+                result_type = self.result_type(raw_type)
+                self.ir.operations.append(CoreOperation(self.define(raw_id), opcode, operands, {}, result_type))
+                return
+        args = _parse_args(raw_args.decode("utf-8"))
+        if opcode == "BinOp":
+            if not args or not isinstance(args[0], str) or isinstance(args[0], _Ref) or not args[0].isidentifier():
+                raise ValueError("BinOp expects an operator name first")
+            opcode = sys.intern(args[0])
+            args = args[1:]
+            signature: Optional[Sequence[Optional[str]]] = (OPERAND, OPERAND)
+        else:
+            signature = SIGNATURES.get(opcode)
+
+        operands: List[int] = []
+        attributes: Dict[str, Any] = {}
+        if signature is None:
+            for arg in args:
+                if not isinstance(arg, _Ref):
+                    raise ValueError(f"{opcode} expects value operands only")
+                operands.append(self.resolve(arg))
+        else:
+            if len(args) != len(signature):
+                raise ValueError(f"{opcode} expects {len(signature)} arguments, got {len(args)}")
+            for slot, arg in zip(signature, args):
+                if slot is OPERAND:
+                    if not isinstance(arg, _Ref):
+                        raise ValueError(f"{opcode} expects a value operand, got {arg!r}")
+                    operands.append(self.resolve(arg))
+                elif slot == "ranges":
+                    self._slice(arg, attributes)
+                elif slot == "padding" and isinstance(arg, _Call):
+                    if arg[0] != "Custom" or len(arg) != 2:
+                        raise ValueError(f"Unknown padding '{arg[0]}'")
+                    attributes["padding"] = _plain(arg[1])
+                else:
+                    attributes[slot] = _plain(arg)  # type: ignore[index]
+
+        if raw_attrs is not None:
+            for key, value in _parse_attributes(raw_attrs.decode("utf-8")).items():
+                if key in attributes:
+                    raise ValueError(f"Duplicate attribute '{key}'")
+                attributes[key] = value
+
+        result_type = self.result_type(raw_type)
+        if opcode == "ConstTensor":
+            tensor_type = self._types[raw_type][1]
+            attributes.setdefault("shape", tensor_type.shape)
+            attributes.setdefault("dtype", tensor_type.dtype)
+
+        value_id = self.define(raw_id)
+        self.ir.operations.append(CoreOperation(value_id, opcode, operands, attributes, result_type))
+
+    @staticmethod
+    def _slice(arg: Any, attributes: Dict[str, Any]) -> None:
+        if not isinstance(arg, list) or not all(isinstance(item, _Range) for item in arg):
+            raise ValueError("Slice expects a list of start:end[:step] ranges")
+        attributes["starts"] = [item[0] for item in arg]
+        attributes["ends"] = [item[1] for item in arg]
+        attributes["steps"] = [item[2] if len(item) == 3 else 1 for item in arg]
+
+
+def parse_ir(buffer: Union[str, Buffer], source: str = "<ir>") -> CoreIR:
+    """Parse the reference text encoding (``grammar-ir.ebnf``) into ``CoreIR``.
+
+    ``buffer`` may be ``str`` or any bytes-like object, including an
+    ``mmap``; the precompiled line scanner matches the raw bytes in place.
+    Operations map onto the CoreIR opcodes and attribute names used
+    throughout ``tools.core_ir``: ``BinOp(Add, %0, %1)`` becomes ``Add``,
+    ``Sum(%0, [1], false)`` becomes ``Sum`` with ``axes``/``keepdims``, and
+    ``%8 = %7`` aliases resolve to the aliased value without an operation.
+    Result types are normalised to ``tensor<dtype[dims]>`` and interned, so
+    operations with equal types share one string and ``TensorType.parse``
+    returns one shared instance for it. Failures raise ``IRParseError``
+    with E1001 (syntax), E4001 (use before definition) or E4002 (duplicate
+    definition).
+    """
+
+    if isinstance(buffer, str):
+        buffer = buffer.encode("utf-8")
+    return _Parser(source).run(buffer)
+
+
+def load_ir(path: Union[str, Path]) -> CoreIR:
+    """Parse a ``.ir`` file by memory-mapping it rather than reading it."""
+
+    with open(path, "rb") as fp:
+        if fp.seek(0, 2) == 0:
+            return parse_ir(b"", str(path))
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return parse_ir(mapped, str(path))
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, str):
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        return '"' + escaped.replace("\r", "\\r").replace("\t", "\\t") + '"'
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(_format_value(item) for item in value) + "]"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _format_type(result_type: Optional[str]) -> str:
+    if result_type is None:
+        raise ValueError("The reference encoding requires a result type on every instruction")
+    tensor_type = TensorType.parse(result_type)
+    return f"Tensor<{tensor_type.dtype}, [{', '.join(map(str, tensor_type.shape))}]>"
+
+
+def format_operation(op: CoreOperation) -> str:
+    """Render one operation in the reference encoding accepted by ``parse_ir``."""
+
+    attributes = dict(op.attributes)
+    if op.opcode in ("Add", "Sub", "Mul", "Div"):
+        args = [op.opcode] + [f"%{operand}" for operand in op.operands]
+        opcode = "BinOp"
+    else:
+        opcode = op.opcode
+        operands = iter(op.operands)
+        args = []
+        signature = SIGNATURES.get(op.opcode, (OPERAND,) * len(op.operands))
+        for slot in signature:
+            if slot is OPERAND:
+                args.append(f"%{next(operands)}")
+            elif slot == "ranges":
+                bounds = zip(attributes.pop("starts"), attributes.pop("ends"), attributes.pop("steps", None) or [])
+                args.append("[" + ", ".join(f"{s}:{e}:{st}" for s, e, st in bounds) + "]")
+            elif slot == "padding" and not isinstance(attributes.get(slot), str):
+                args.append(f"Custom({_format_value(attributes.pop(slot))})")
+            elif slot == "padding":
+                args.append(attributes.pop(slot))
+            else:
+                args.append(_format_value(attributes.pop(slot)))
+    if op.opcode == "ConstTensor":
+        tensor_type = TensorType.parse(op.result_type) if op.result_type else None
+        if tensor_type is not None and tuple(attributes.get("shape", ())) == tensor_type.shape:
+            attributes.pop("shape", None)
+        if tensor_type is not None and attributes.get("dtype") == tensor_type.dtype:
+            attributes.pop("dtype", None)
+    attr_suffix = ""
+    if attributes:
+        attr_suffix = " {" + ", ".join(f"{k}: {_format_value(v)}" for k, v in sorted(attributes.items())) + "}"
+    return f"%{op.value_id} = {opcode}({', '.join(args)}){attr_suffix} : {_format_type(op.result_type)}"
+
+
+def format_ir(ir: CoreIR) -> str:
+    """Render ``ir`` in the reference encoding used by ``examples/ir``."""
+
+    lines = [format_operation(op) for op in ir.operations]
+    lines.append("outputs: " + ", ".join(f"%{output}" for output in ir.outputs))
+    return "\n".join(lines) + "\n"
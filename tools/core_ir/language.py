@@ -1,34 +1,166 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import TYPE_CHECKING, Dict, Hashable, List, Optional, Sequence, Tuple
 
 from .core_ir import CoreIR
 from .type_system import TensorType, TypeSystem
 
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .compile_cache import CompilationCache
+    from .specialize import SpecializationCache
+
 
 class Expression:
     """Base class for surface language expressions."""
 
-    def emit(self, ir: CoreIR, type_system: TypeSystem) -> int:  # pragma: no cover - abstract
+    def emit(self, ir: CoreIR, type_system: TypeSystem, cache: Optional["TypeCache"] = None) -> int:
+        operand_ids = [child.emit(ir, type_system, cache) for child in self.children()]
+        return self.emit_node(ir, type_system, operand_ids, cache)
+
+    def children(self) -> Tuple["Expression", ...]:
+        return ()
+
+    def emit_node(
+        self,
+        ir: CoreIR,
+        type_system: TypeSystem,
+        operand_ids: Sequence[int],
+        cache: Optional["TypeCache"] = None,
+    ) -> int:  # pragma: no cover - abstract
+        """Emit this node alone, given the value ids its children lowered to."""
+        raise NotImplementedError
+
+    def infer_type(self, type_system: TypeSystem, cache: Optional["TypeCache"] = None) -> TensorType:  # pragma: no cover - abstract
+        raise NotImplementedError
+
+    def type_key(self, type_system: TypeSystem, cache: "TypeCache") -> Hashable:  # pragma: no cover - abstract
+        """Return everything this node's type depends on, given cached child types."""
         raise NotImplementedError
 
-    def infer_type(self, type_system: TypeSystem) -> TensorType:  # pragma: no cover - abstract
+    def structure_key(self) -> Optional[str]:  # pragma: no cover - abstract
+        """Return this node's own fields as text for ``compile_cache.structural_key``.
+
+        Children are keyed separately. ``None`` marks the node as uncacheable.
+        """
         raise NotImplementedError
 
 
+class TypeCache:
+    """Memoized type inference keyed by expression node identity.
+
+    Each compilation calls ``begin`` to open a new generation; within a
+    generation every node's type is resolved at most once. Entries survive
+    across generations: a node whose ``type_key`` (its own fields plus the
+    identities and types of its children) is unchanged reuses its previous
+    type without re-running validation, so recompiling an edited expression
+    only re-infers the dirty nodes. ``hits`` and ``misses`` count reused and
+    recomputed nodes. The cache is bound to one ``TypeSystem`` and resets when
+    used with another.
+    """
+
+    def __init__(self) -> None:
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._type_system: Optional[TypeSystem] = None
+        self._entries: Dict[int, Tuple[Expression, int, Hashable, TensorType]] = {}
+
+    def begin(self, type_system: TypeSystem) -> None:
+        if type_system is not self._type_system:
+            self._type_system = type_system
+            self._entries.clear()
+        self.generation += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def infer(self, node: Expression, type_system: TypeSystem) -> TensorType:
+        """Return the type of ``node``, resolving its subtree in post-order with an explicit stack.
+
+        Children are resolved before their parent, so the ``type_key`` and
+        ``infer_type`` calls of each node find their children already cached
+        in this generation and never recurse more than one level. Depth is
+        therefore not bounded by the interpreter's recursion limit.
+        """
+
+        current = self._current(node)
+        if current is not None:
+            return current
+        in_progress = set()
+        stack: List[Tuple[Expression, bool]] = [(node, False)]
+        while stack:
+            item, expanded = stack.pop()
+            if self._current(item) is not None:
+                continue
+            children = item.children()
+            if expanded or not children:
+                in_progress.discard(id(item))
+                self._resolve(item, type_system)
+                continue
+            if id(item) in in_progress:
+                raise ValueError("Expression graph contains a cycle")
+            in_progress.add(id(item))
+            stack.append((item, True))
+            for child in reversed(children):
+                stack.append((child, False))
+        return self._entries[id(node)][3]
+
+    def _current(self, node: Expression) -> Optional[TensorType]:
+        entry = self._entries.get(id(node))
+        if entry is not None and entry[0] is node and entry[1] == self.generation:
+            return entry[3]
+        return None
+
+    def _resolve(self, node: Expression, type_system: TypeSystem) -> TensorType:
+        entry = self._entries.get(id(node))
+        if entry is not None and entry[0] is not node:
+            entry = None
+
+        key = node.type_key(type_system, self)
+        if entry is not None and entry[2] == key:
+            self.hits += 1
+            tensor_type = entry[3]
+        else:
+            self.misses += 1
+            tensor_type = node.infer_type(type_system, self)
+        self._entries[id(node)] = (node, self.generation, key, tensor_type)
+        return tensor_type
+
+
+def _infer(node: Expression, type_system: TypeSystem, cache: Optional[TypeCache]) -> TensorType:
+    return cache.infer(node, type_system) if cache is not None else node.infer_type(type_system)
+
+
 @dataclass
 class Literal(Expression):
     value: object
     dtype: str
     shape: tuple[int, ...] = ()
 
-    def infer_type(self, type_system: TypeSystem) -> TensorType:
+    def infer_type(self, type_system: TypeSystem, cache: Optional[TypeCache] = None) -> TensorType:
         tensor_type = TensorType(self.dtype, self.shape)
         return type_system.validate_tensor(tensor_type)
 
-    def emit(self, ir: CoreIR, type_system: TypeSystem) -> int:
-        result_type = str(self.infer_type(type_system))
+    def type_key(self, type_system: TypeSystem, cache: TypeCache) -> Hashable:
+        return (self.dtype, self.shape)
+
+    def structure_key(self) -> Optional[str]:
+        from .mic import format_literal  # keeps the MIC codec out of ``import language``
+
+        try:
+            return f"{format_literal(self.value)} {self.dtype!r} {self.shape!r}"
+        except ValueError:
+            return None
+
+    def emit_node(
+        self,
+        ir: CoreIR,
+        type_system: TypeSystem,
+        operand_ids: Sequence[int],
+        cache: Optional[TypeCache] = None,
+    ) -> int:
+        result_type = str(_infer(self, type_system, cache))
         return ir.add_operation(
             "ConstTensor",
             operands=[],
@@ -41,11 +173,23 @@ class Literal(Expression):
 class Variable(Expression):
     name: str
 
-    def infer_type(self, type_system: TypeSystem) -> TensorType:
+    def infer_type(self, type_system: TypeSystem, cache: Optional[TypeCache] = None) -> TensorType:
         return type_system.resolve_symbol(self.name)
 
-    def emit(self, ir: CoreIR, type_system: TypeSystem) -> int:
-        symbol_type = self.infer_type(type_system)
+    def type_key(self, type_system: TypeSystem, cache: TypeCache) -> Hashable:
+        return (self.name, type_system.symbols.get(self.name))
+
+    def structure_key(self) -> Optional[str]:
+        return repr(self.name)
+
+    def emit_node(
+        self,
+        ir: CoreIR,
+        type_system: TypeSystem,
+        operand_ids: Sequence[int],
+        cache: Optional[TypeCache] = None,
+    ) -> int:
+        symbol_type = _infer(self, type_system, cache)
         return type_system.materialize_symbol(ir, self.name, symbol_type)
 
 
@@ -55,31 +199,134 @@ class BinaryOperation(Expression):
     lhs: Expression
     rhs: Expression
 
-    def infer_type(self, type_system: TypeSystem) -> TensorType:
-        lhs_type = self.lhs.infer_type(type_system)
-        rhs_type = self.rhs.infer_type(type_system)
+    def infer_type(self, type_system: TypeSystem, cache: Optional[TypeCache] = None) -> TensorType:
+        lhs_type = _infer(self.lhs, type_system, cache)
+        rhs_type = _infer(self.rhs, type_system, cache)
         if self.op == "MatMul":
             return type_system.validate_matmul(lhs_type, rhs_type)
         return type_system.validate_binop(self.op, lhs_type, rhs_type)
 
-    def emit(self, ir: CoreIR, type_system: TypeSystem) -> int:
-        lhs_id = self.lhs.emit(ir, type_system)
-        rhs_id = self.rhs.emit(ir, type_system)
-        result_type = str(self.infer_type(type_system))
-        return ir.add_operation(self.op, operands=[lhs_id, rhs_id], result_type=result_type)
+    def type_key(self, type_system: TypeSystem, cache: TypeCache) -> Hashable:
+        return (
+            self.op,
+            id(self.lhs),
+            id(self.rhs),
+            cache.infer(self.lhs, type_system),
+            cache.infer(self.rhs, type_system),
+        )
+
+    def structure_key(self) -> Optional[str]:
+        return repr(self.op)
+
+    def children(self) -> Tuple[Expression, ...]:
+        return (self.lhs, self.rhs)
+
+    def emit_node(
+        self,
+        ir: CoreIR,
+        type_system: TypeSystem,
+        operand_ids: Sequence[int],
+        cache: Optional[TypeCache] = None,
+    ) -> int:
+        result_type = str(_infer(self, type_system, cache))
+        return ir.add_operation(self.op, operands=list(operand_ids), result_type=result_type)
+
+
+def lower(
+    expression: Expression,
+    ir: CoreIR,
+    type_system: TypeSystem,
+    cache: Optional[TypeCache] = None,
+) -> int:
+    """Lower ``expression`` into ``ir`` with an explicit stack instead of recursion.
+
+    Nodes are emitted in the same post-order (left subtree, right subtree,
+    node) as ``Expression.emit``, so trees receive identical value ids. Shared
+    subexpressions in DAG-shaped expressions are emitted once and reused.
+    Types are resolved through ``cache`` (a fresh ``TypeCache`` when omitted)
+    so inference stays linear in the number of nodes.
+    """
+
+    if cache is None:
+        cache = TypeCache()
+        cache.begin(type_system)
+
+    lowered: Dict[int, int] = {}
+    in_progress = set()
+    stack: List[Tuple[Expression, bool]] = [(expression, False)]
+    while stack:
+        node, expanded = stack.pop()
+        node_id = id(node)
+        if node_id in lowered:
+            continue
+        children = node.children()
+        if expanded or not children:
+            in_progress.discard(node_id)
+            operand_ids = [lowered[id(child)] for child in children]
+            lowered[node_id] = node.emit_node(ir, type_system, operand_ids, cache)
+            continue
+        if node_id in in_progress:
+            raise ValueError("Expression graph contains a cycle")
+        in_progress.add(node_id)
+        stack.append((node, True))
+        for child in reversed(children):
+            stack.append((child, False))
+    return lowered[id(expression)]
 
 
 class LanguageConstruct:
-    """Entry point for compiling expressions to the Core IR prototype."""
+    """Entry point for compiling expressions to the Core IR prototype.
+
+    Lowering is iterative (see ``lower``), so expression depth is not bounded
+    by the interpreter's recursion limit. Inferred types are memoized in
+    ``type_cache`` across calls to ``to_ir`` so recompiling after editing part
+    of ``expression`` only re-infers the edited subtrees.
 
-    def __init__(self, expression: Expression, type_system: Optional[TypeSystem] = None) -> None:
+    With a ``compile_cache``, structurally equal expressions compiled against
+    equal symbol tables reuse one lowered module (see ``CompilationCache``);
+    the cache may be shared between constructs.
+    """
+
+    def __init__(
+        self,
+        expression: Expression,
+        type_system: Optional[TypeSystem] = None,
+        compile_cache: Optional["CompilationCache"] = None,
+    ) -> None:
         self.expression = expression
         self.type_system = type_system or TypeSystem()
+        self.type_cache = TypeCache()
+        self.compile_cache = compile_cache
 
     def to_ir(self) -> CoreIR:
+        if self.compile_cache is not None:
+            return self.compile_cache.get_ir(self.expression, self.type_system, self._lower)
+        return self._lower()
+
+    def to_text(self) -> str:
+        """Return the reference encoding of ``to_ir()``, cached when possible."""
+
+        if self.compile_cache is not None:
+            return self.compile_cache.get_text(self.expression, self.type_system, self._lower)
+        return self._lower().compile()
+
+    def specialize(self, maxsize: int = 64) -> "SpecializationCache":
+        """Compile once with symbolic dimensions and return a specialisation cache.
+
+        ``specialize().specialize({"N": 8})`` yields the module for batch size 8;
+        bindings are checked against the equations recorded while compiling.
+        """
+
+        from .specialize import SpecializationCache
+
+        ir = self.to_ir()
+        return SpecializationCache(ir, self.type_system.dims.copy(), maxsize)
+
+    def _lower(self) -> CoreIR:
         self.type_system.validate_program()
 
         ir = CoreIR()
-        result_value = self.expression.emit(ir, self.type_system)
+        self.type_cache.begin(self.type_system)
+        result_value = lower(self.expression, ir, self.type_system, self.type_cache)
         ir.mark_output(result_value)
         return ir
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from .core_ir import CoreIR
+from .type_system import TensorType
+
+# Opcodes whose result may overwrite an operand buffer that dies at the same
+# instruction: each output element depends only on the matching input element.
+ELEMENTWISE_OPCODES = frozenset({"Add", "Sub", "Mul", "Div", "Relu", "ReluGrad", "Neg", "Exp", "Log", "Fused"})
+
+
+@dataclass(frozen=True)
+class LiveRange:
+    """Instruction indices over which a value's buffer must stay allocated.
+
+    ``start`` is the defining instruction and ``end`` the last instruction
+    reading it; module outputs stay live until the end of the module.
+    """
+
+    value_id: int
+    start: int
+    end: int
+    nbytes: int
+
+
+@dataclass
+class MemoryPlan:
+    """Buffer assignment produced by ``plan_memory``.
+
+    ``assignment`` maps each value to a slot index and ``slot_sizes`` gives the
+    size of every slot, so ``reuse_bytes`` is the arena size needed with
+    buffer reuse. ``no_reuse_bytes`` is the cost of one buffer per value and
+    ``peak_live_bytes`` the largest simultaneously live total, a lower bound
+    for any allocator. ``in_place`` lists values written over a dying operand.
+    """
+
+    live_ranges: Dict[int, LiveRange]
+    assignment: Dict[int, int] = field(default_factory=dict)
+    slot_sizes: List[int] = field(default_factory=list)
+    in_place: List[int] = field(default_factory=list)
+    peak_live_bytes: int = 0
+
+    @property
+    def reuse_bytes(self) -> int:
+        return sum(self.slot_sizes)
+
+    @property
+    def no_reuse_bytes(self) -> int:
+        return sum(r.nbytes for r in self.live_ranges.values())
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "values": len(self.live_ranges),
+            "slots": len(self.slot_sizes),
+            "in_place": len(self.in_place),
+            "no_reuse_bytes": self.no_reuse_bytes,
+            "reuse_bytes": self.reuse_bytes,
+            "peak_live_bytes": self.peak_live_bytes,
+        }
+
+
+def analyze_liveness(ir: CoreIR, include_inputs: bool = True) -> Dict[int, LiveRange]:
+    """Compute the live range of every value from its definition and uses.
+
+    Buffer sizes come from each operation's ``result_type``. Values that are
+    never read die at their own definition. With ``include_inputs=False``,
+    ``Input`` values are treated as caller-owned and omitted.
+    """
+
+    end_index = len(ir.operations) - 1
+    starts: Dict[int, int] = {}
+    ends: Dict[int, int] = {}
+    sizes: Dict[int, int] = {}
+    for index, op in enumerate(ir.operations):
+        for operand in op.operands:
+            ends[operand] = index
+        if op.opcode == "Input" and not include_inputs:
+            continue
+        if op.result_type is None:
+            raise ValueError(f"Value %{op.value_id} has no result type to size its buffer")
+        starts[op.value_id] = index
+        ends.setdefault(op.value_id, index)
+        sizes[op.value_id] = TensorType.parse(op.result_type).nbytes
+    for output in ir.outputs:
+        ends[output] = end_index
+
+    return {
+        value_id: LiveRange(value_id, start, max(ends[value_id], start), sizes[value_id])
+        for value_id, start in starts.items()
+    }
+
+
+def plan_memory(ir: CoreIR, include_inputs: bool = True, in_place: bool = True) -> MemoryPlan:
+    """Assign buffers to values with greedy interval colouring.
+
+    Values are visited in definition order. An elementwise result whose
+    operand dies at the same instruction takes over that operand's slot when
+    the operand has exactly the result's type (in-place update), so a
+    broadcast operand is never aliased; inputs and outputs are never
+    overwritten.
+    Otherwise the smallest free slot that fits is
+    reused, else the largest free slot is grown, else a new slot is opened;
+    ties break on the lowest slot index, so the plan is deterministic. Slots
+    are released after the last instruction reading their value.
+    """
+
+    ranges = analyze_liveness(ir, include_inputs)
+    plan = MemoryPlan(live_ranges=ranges)
+    # Outputs and caller-owned inputs must never be overwritten in place.
+    protected = set(ir.outputs) | {op.value_id for op in ir.operations if op.opcode == "Input"}
+    types = {op.value_id: op.result_type for op in ir.operations}
+    free_slots: List[int] = []
+    dying: Dict[int, List[int]] = {}
+    for live_range in ranges.values():
+        dying.setdefault(live_range.end, []).append(live_range.value_id)
+
+    live_bytes = 0
+    for index, op in enumerate(ir.operations):
+        live_range = ranges.get(op.value_id)
+        handed_over: Optional[int] = None
+        if live_range is not None:
+            slot: Optional[int] = None
+            if in_place and op.opcode in ELEMENTWISE_OPCODES:
+                for operand in op.operands:
+                    operand_range = ranges.get(operand)
+                    if (
+                        operand_range is not None
+                        and operand_range.end == index
+                        and operand not in protected
+                        and operand_range.nbytes == live_range.nbytes
+                        and TensorType.parse(types[operand]) == TensorType.parse(op.result_type)
+                        and plan.slot_sizes[plan.assignment[operand]] >= live_range.nbytes
+                    ):
+                        handed_over = operand
+                        slot = plan.assignment[operand]
+                        plan.in_place.append(op.value_id)
+                        break
+            if slot is None:
+                slot = _take_free_slot(plan, free_slots, live_range.nbytes)
+            plan.assignment[op.value_id] = slot
+            live_bytes += live_range.nbytes
+            if handed_over is not None:
+                live_bytes -= ranges[handed_over].nbytes
+            plan.peak_live_bytes = max(plan.peak_live_bytes, live_bytes)
+
+        for value_id in dying.get(index, ()):
+            if value_id == handed_over:
+                continue
+            live_bytes -= ranges[value_id].nbytes
+            free_slots.append(plan.assignment[value_id])
+
+    return plan
+
+
+def _take_free_slot(plan: MemoryPlan, free_slots: List[int], nbytes: int) -> int:
+    best: Optional[int] = None
+    for slot in free_slots:
+        size = plan.slot_sizes[slot]
+        if size >= nbytes and (best is None or (size, slot) < (plan.slot_sizes[best], best)):
+            best = slot
+    if best is None and free_slots:
+        best = max(free_slots, key=lambda slot: (plan.slot_sizes[slot], -slot))
+        plan.slot_sizes[best] = nbytes
+    if best is None:
+        plan.slot_sizes.append(nbytes)
+        return len(plan.slot_sizes) - 1
+    free_slots.remove(best)
+    return best
@@ -0,0 +1,871 @@
+from __future__ import annotations
+
+import json
+import re
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .core_ir import CoreIR, CoreOperation
+from .micb import DTYPE_CODES, KEY_ATTRIBUTES, KEY_OUTPUTS, KEY_RESULT_TYPES, OPCODE_PARAMS
+
+HEADER_V1 = "mic@1"
+HEADER_V2 = "mic@2"
+
+# mic@1 node kinds (RFC-0001) for the Core v1 opcodes. Any other opcode is
+# written with its own name as the kind.
+MIC1_KINDS: Dict[str, str] = {
+    "Input": "input",
+    "ConstI64": "const.i64",
+    "ConstF32": "const.f32",
+    "ConstF64": "const.f64",
+    "ConstTensor": "const.tensor",
+    "Add": "add",
+    "Sub": "sub",
+    "Mul": "mul",
+    "Div": "div",
+    "Relu": "relu",
+    "Neg": "neg",
+    "Exp": "exp",
+    "Log": "log",
+    "Sum": "sum",
+    "Mean": "mean",
+    "Max": "max",
+    "Reshape": "reshape",
+    "Transpose": "transpose",
+    "ExpandDims": "expand",
+    "Squeeze": "squeeze",
+    "Dot": "dot",
+    "MatMul": "matmul",
+    "Conv2d": "conv2d",
+    "Index": "index",
+    "Slice": "slice",
+    "Gather": "gather",
+}
+MIC1_OPCODES = {kind: opcode for opcode, kind in MIC1_KINDS.items()}
+
+# Attribute written as the bare literal after the operands (``sum N7 [1,2]``).
+MIC1_POSITIONAL: Dict[str, str] = {
+    "ConstI64": "value",
+    "ConstF32": "value",
+    "ConstF64": "value",
+    "ConstTensor": "value",
+    "Sum": "axes",
+    "Mean": "axes",
+    "Max": "axes",
+    "Reshape": "new_shape",
+    "Transpose": "permutation",
+    "ExpandDims": "axes",
+    "Squeeze": "axes",
+    "Index": "indices",
+}
+
+# RFC-0001 short attribute keys. ``kd`` carries a bool as 0/1.
+MIC1_KEYS = {"keepdims": "kd", "strides": "s", "padding": "p", "axis": "ax"}
+MIC1_ATTRIBUTES = {key: name for name, key in MIC1_KEYS.items()}
+
+# mic@2 opcode tokens and input counts (``None`` is variadic). Native opcode
+# parameters follow the inputs and are shared with MIC-B (``OPCODE_PARAMS``).
+MIC2_TOKENS: Dict[str, str] = {
+    "MatMul": "m",
+    "Add": "+",
+    "Sub": "-",
+    "Mul": "*",
+    "Div": "/",
+    "Relu": "r",
+    "Softmax": "s",
+    "Sigmoid": "sig",
+    "Tanh": "th",
+    "GELU": "gelu",
+    "LayerNorm": "ln",
+    "Transpose": "t",
+    "Reshape": "rshp",
+    "Sum": "sum",
+    "Mean": "mean",
+    "Max": "max",
+    "Concat": "cat",
+    "Split": "split",
+    "Gather": "gth",
+}
+MIC2_OPCODES = {token: opcode for opcode, token in MIC2_TOKENS.items()}
+MIC2_ARITY: Dict[str, Optional[int]] = {opcode: 1 for opcode in MIC2_TOKENS}
+MIC2_ARITY.update({"MatMul": 2, "Add": 2, "Sub": 2, "Mul": 2, "Div": 2, "Gather": 2, "Concat": None})
+
+# Line heads with a fixed meaning in mic@2; custom opcodes may not use them.
+_MIC2_RESERVED = frozenset({"a", "p", "S", "O", "map", "}"}) | frozenset(MIC2_OPCODES)
+
+_IDENT = re.compile(r"[A-Za-z_]\w*")
+_MAP_KEY = re.compile(r"[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*")
+_REF = re.compile(r"[NST]\d+")
+_DIM = re.compile(r"\d+|[A-Za-z_]\w*|\?")
+_INT = re.compile(r"-?\d+")
+_INT_LIST = re.compile(r"\[-?\d+(?:,-?\d+)*\]")
+_FLOAT = re.compile(r"-?(?:\d+\.\d*(?:[eE][-+]?\d+)?|\d+[eE][-+]?\d+|inf)|nan")
+_TENSOR_TYPE = re.compile(r"tensor<(\w+)\[([^\]]*)\]>")
+_TOKEN = re.compile(r'(?:"(?:[^"\\]|\\.)*"|[^\s"])+')
+_LITERAL_PIECE = re.compile(r'"(?:[^"\\]|\\.)*"|[\[\](){},:]|[^\[\](){},:"\s]+')
+_RESERVED_WORDS = frozenset({"true", "false", "none", "inf", "nan"})
+
+
+@dataclass(frozen=True)
+class MicLimits:
+    """Parser security limits; defaults follow the mic@2 specification."""
+
+    max_input_size: int = 10 * 1024 * 1024
+    max_line_count: int = 1_000_000
+    max_value_count: int = 100_000
+    max_rank: int = 32
+    max_literal_depth: int = 32
+    max_map_depth: int = 4
+
+
+DEFAULT_LIMITS = MicLimits()
+
+
+class MicParseError(ValueError):
+    """Raised for malformed MIC text; ``line`` is the 1-based failing line."""
+
+    def __init__(self, message: str, line: int) -> None:
+        super().__init__(f"mic:{line}: error: {message}")
+        self.line = line
+
+
+# ---------------------------------------------------------------------------
+# Attribute literals
+# ---------------------------------------------------------------------------
+
+
+def format_literal(value: Any) -> str:
+    """Render an attribute value as a whitespace-free MIC literal.
+
+    Numbers, ``[lists]`` and identifier-like strings use the RFC-0001 forms;
+    tuples, bools, ``None`` and quoted strings are additions that keep the
+    encoding type-exact, so ``parse_literal(format_literal(v)) == v``.
+    """
+
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if value is None:
+        return "none"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        # float() so subclasses such as np.float64 render as plain literals.
+        return repr(float(value))
+    if isinstance(value, str):
+        if _IDENT.fullmatch(value) and value not in _RESERVED_WORDS and not _REF.fullmatch(value):
+            return value
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, list):
+        return "[" + ",".join(format_literal(item) for item in value) + "]"
+    if isinstance(value, tuple):
+        return "(" + ",".join(format_literal(item) for item in value) + ("," if len(value) == 1 else "") + ")"
+    if isinstance(value, dict):
+        return "{" + ",".join(f"{format_literal(k)}:{format_literal(v)}" for k, v in value.items()) + "}"
+    raise ValueError(f"Attribute value {value!r} is not representable in MIC")
+
+
+def parse_literal(text: str, max_depth: int = DEFAULT_LIMITS.max_literal_depth) -> Any:
+    """Inverse of ``format_literal``; raises ``ValueError`` on malformed input."""
+
+    if _INT.fullmatch(text):
+        return int(text)
+    if _INT_LIST.fullmatch(text):
+        return [int(item) for item in text[1:-1].split(",")]
+    pieces = _LITERAL_PIECE.findall(text)
+    if "".join(pieces) != text:
+        raise ValueError(f"malformed literal {text!r}")
+    value, end = _parse_piece(pieces, 0, max_depth)
+    if end != len(pieces):
+        raise ValueError(f"trailing characters in literal {text!r}")
+    return value
+
+
+_CLOSERS = {"[": "]", "(": ")", "{": "}"}
+
+
+def _parse_piece(pieces: Sequence[str], pos: int, depth: int) -> Tuple[Any, int]:
+    if pos >= len(pieces):
+        raise ValueError("unexpected end of literal")
+    piece = pieces[pos]
+    closer = _CLOSERS.get(piece)
+    if closer is None:
+        return _parse_atom(piece), pos + 1
+    if depth <= 0:
+        raise ValueError("literal nesting too deep")
+    items: List[Any] = []
+    pos += 1
+    trailing_comma = False
+    while pos < len(pieces) and pieces[pos] != closer:
+        key, pos = _parse_piece(pieces, pos, depth - 1)
+        if piece == "{":
+            if pos >= len(pieces) or pieces[pos] != ":":
+                raise ValueError("expected ':' in literal mapping")
+            value, pos = _parse_piece(pieces, pos + 1, depth - 1)
+            key = (key, value)
+        items.append(key)
+        trailing_comma = pos < len(pieces) and pieces[pos] == ","
+        if trailing_comma:
+            pos += 1
+        elif pos < len(pieces) and pieces[pos] != closer:
+            raise ValueError("expected ',' in literal")
+    if pos >= len(pieces):
+        raise ValueError(f"unterminated literal, expected '{closer}'")
+    if piece == "[":
+        return items, pos + 1
+    if piece == "{":
+        return dict(items), pos + 1
+    if len(items) == 1 and not trailing_comma:
+        raise ValueError("parenthesised literal is not a tuple")
+    return tuple(items), pos + 1
+
+
+def _parse_atom(piece: str) -> Any:
+    if piece[0] == '"':
+        return json.loads(piece)
+    if _INT.fullmatch(piece):
+        return int(piece)
+    if _FLOAT.fullmatch(piece):
+        return float(piece)
+    if piece in ("true", "false", "none"):
+        return {"true": True, "false": False, "none": None}[piece]
+    if _IDENT.fullmatch(piece):
+        return sys.intern(piece)
+    raise ValueError(f"malformed literal {piece!r}")
+
+
+def _tokens(line: str) -> List[str]:
+    return _TOKEN.findall(line) if '"' in line else line.split()
+
+
+def _format_attributes(attributes: Dict[str, Any], skip: Iterable[str] = ()) -> List[str]:
+    """``key=literal`` tokens in key order, using the RFC-0001 short keys."""
+
+    skipped = set(skip)
+    items: List[Tuple[str, str]] = []
+    for name, value in attributes.items():
+        if name in skipped:
+            continue
+        if name in MIC1_ATTRIBUTES or not _IDENT.fullmatch(name):
+            raise ValueError(f"Attribute name '{name}' is not representable in MIC")
+        if name == "keepdims" and isinstance(value, bool):
+            items.append(("kd", "1" if value else "0"))
+        elif name == "keepdims":
+            items.append((name, format_literal(value)))
+        else:
+            items.append((MIC1_KEYS.get(name, name), format_literal(value)))
+    return [f"{key}={literal}" for key, literal in sorted(items)]
+
+
+def _parse_attribute(token: str, attributes: Dict[str, Any], max_depth: int) -> None:
+    key, _, literal = token.partition("=")
+    if key == "kd":
+        if literal not in ("0", "1"):
+            raise ValueError(f"kd must be 0 or 1, got {literal!r}")
+        attributes["keepdims"] = literal == "1"
+        return
+    name = MIC1_ATTRIBUTES.get(key, key)
+    if name in attributes:
+        raise ValueError(f"duplicate attribute '{name}'")
+    attributes[name] = parse_literal(literal, max_depth)
+
+
+def _is_attribute(token: str) -> bool:
+    key, eq, _ = token.partition("=")
+    return bool(eq) and _IDENT.fullmatch(key) is not None
+
+
+def _split_type(result_type: str) -> Optional[Tuple[str, List[str]]]:
+    """Split a canonical ``tensor<dtype[dims]>`` string, or return ``None``."""
+
+    match = _TENSOR_TYPE.fullmatch(result_type)
+    if match is None:
+        return None
+    dtype, dims_text = match.groups()
+    dims = [d.strip() for d in dims_text.split(",")] if dims_text.strip() else []
+    if _join_type(dtype, dims) != result_type or not all(_DIM.fullmatch(d) for d in dims):
+        return None
+    return dtype, dims
+
+
+def _join_type(dtype: str, dims: Sequence[str]) -> str:
+    return f"tensor<{dtype}[{', '.join(dims)}]>"
+
+
+def _check_order(ir: CoreIR) -> Dict[int, int]:
+    index_of: Dict[int, int] = {}
+    for index, op in enumerate(ir.operations):
+        if op.value_id in index_of:
+            raise ValueError(f"Value %{op.value_id} is defined more than once")
+        for operand in op.operands:
+            if operand not in index_of:
+                raise ValueError(f"Operand %{operand} of %{op.value_id} is not defined before use")
+        index_of[op.value_id] = index
+    for output in ir.outputs:
+        if output not in index_of:
+            raise ValueError(f"Output %{output} is not defined")
+    return index_of
+
+
+# ---------------------------------------------------------------------------
+# Emitters
+# ---------------------------------------------------------------------------
+
+
+def _mic1_type(result_type: str) -> str:
+    split = _split_type(result_type)
+    if split is None:
+        return json.dumps(result_type, ensure_ascii=False)
+    dtype, dims = split
+    return f"[{dtype};{','.join(dims)}]" if dims else dtype
+
+
+def _mic1_node(op: CoreOperation, kind: str, symbol: Optional[str], type_ref: Optional[str]) -> str:
+    parts = [f"N{op.value_id}", kind]
+    if symbol is not None:
+        parts.append(symbol)
+    parts.extend(f"N{operand}" for operand in op.operands)
+    skip: Tuple[str, ...] = ("name",) if symbol is not None else ()
+    positional = MIC1_POSITIONAL.get(op.opcode)
+    if positional is not None and positional in op.attributes:
+        parts.append(format_literal(op.attributes[positional]))
+        skip += (positional,)
+    elif op.opcode == "Slice":
+        bounds = [op.attributes.get(name) for name in ("starts", "ends", "steps")]
+        if all(isinstance(b, list) and all(type(i) is int for i in b) for b in bounds) and (
+            len(bounds[0]) == len(bounds[1]) == len(bounds[2]) > 0  # type: ignore[arg-type]
+        ):
+            parts.append(",".join(f"{s}:{e}:{st}" for s, e, st in zip(*bounds)))
+            skip += ("starts", "ends", "steps")
+    parts.extend(_format_attributes(op.attributes, skip))
+    if type_ref is not None:
+        parts.append(type_ref)
+    return " ".join(parts)
+
+
+def _iter_mic1(ir: CoreIR) -> Iterator[str]:
+    _check_order(ir)
+    yield HEADER_V1
+    symbols: Dict[str, str] = {}
+    types: Dict[str, str] = {}
+    for op in ir.operations:
+        kind = MIC1_KINDS.get(op.opcode)
+        if kind is None:
+            if op.opcode in MIC1_OPCODES or not _MAP_KEY.fullmatch(op.opcode) or _REF.fullmatch(op.opcode):
+                raise ValueError(f"Opcode '{op.opcode}' is not representable in mic@1")
+            kind = op.opcode
+
+        symbol = None
+        name = op.attributes.get("name") if op.opcode == "Input" else None
+        if isinstance(name, str):
+            symbol = symbols.get(name)
+            if symbol is None:
+                symbol = symbols[name] = f"S{len(symbols)}"
+                yield f"{symbol} {json.dumps(name, ensure_ascii=False)}"
+
+        type_ref = None
+        if op.result_type is not None:
+            type_ref = types.get(op.result_type)
+            if type_ref is None:
+                type_ref = types[op.result_type] = f"T{len(types)}"
+                yield f"{type_ref} {_mic1_type(op.result_type)}"
+
+        yield _mic1_node(op, kind, symbol, type_ref)
+    for output in ir.outputs:
+        yield f"O N{output}"
+
+
+def _mic2_params(op: CoreOperation) -> Tuple[List[str], Tuple[str, ...]]:
+    """Native parameter tokens and the attributes they carry.
+
+    Parameters are emitted only when they decode back to the same value:
+    list parameters must be non-empty ``list``s of ints and scalar parameters
+    must all be present as ints. Everything else travels in the MAP block.
+    """
+
+    spec = OPCODE_PARAMS.get(op.opcode, ())
+    if len(spec) == 1 and spec[0][1] == "list":
+        name = spec[0][0]
+        value = op.attributes.get(name)
+        if isinstance(value, list) and value and all(type(item) is int for item in value):
+            return [str(item) for item in value], (name,)
+        return [], ()
+    values = [op.attributes.get(name) for name, _ in spec]
+    if spec and all(type(value) is int and (kind == "int" or value >= 0) for value, (_, kind) in zip(values, spec)):
+        return [str(value) for value in values], tuple(name for name, _ in spec)
+    return [], ()
+
+
+def _format_map(entries: Dict[str, Any], indent: str) -> Iterator[str]:
+    for key in sorted(entries):
+        value = entries[key]
+        if isinstance(value, dict):
+            yield f"{indent}{key} = {{"
+            yield from _format_map(value, indent + "  ")
+            yield f"{indent}}}"
+        elif isinstance(value, bool) or not isinstance(value, (int, str, bytes)):
+            raise ValueError(f"MAP value for '{key}' must be a string, int, bytes or mapping")
+        elif isinstance(value, int):
+            yield f"{indent}{key} = {value}"
+        elif isinstance(value, bytes):
+            yield f"{indent}{key} = bytes(0x{value.hex()})"
+        else:
+            yield f"{indent}{key} = {json.dumps(value)}"
+
+
+def _iter_mic2(ir: CoreIR, metadata: Optional[Dict[str, Any]]) -> Iterator[str]:
+    index_of = _check_order(ir)
+    if not ir.outputs:
+        raise ValueError("mic@2 modules require at least one output")
+    if metadata and any(key.startswith("core_ir.") for key in metadata):
+        raise ValueError("MAP keys under 'core_ir.' are reserved for the CoreIR encoding")
+    yield HEADER_V2
+
+    types: Dict[str, int] = {}
+    for op in ir.operations:
+        if op.result_type is None:
+            if op.opcode == "Input":
+                raise ValueError(f"Input %{op.value_id} requires a result type")
+            continue
+        if op.result_type not in types:
+            split = _split_type(op.result_type)
+            if split is None or split[0] not in DTYPE_CODES:
+                raise ValueError(f"Result type '{op.result_type}' is not representable in mic@2")
+            types[op.result_type] = len(types)
+            yield " ".join([f"T{len(types) - 1}", split[0], *split[1]])
+
+    residual: Dict[str, str] = {}
+    node_types: List[str] = []
+    for index, op in enumerate(ir.operations):
+        if op.opcode == "Input":
+            name = op.attributes.get("name")
+            native: Tuple[str, ...] = ()
+            if isinstance(name, str) and _IDENT.fullmatch(name):
+                native = ("name",)
+            yield f"a {name if native else '_'} T{types[op.result_type]}"  # type: ignore[index]
+        else:
+            params, native = _mic2_params(op)
+            token = MIC2_TOKENS.get(op.opcode)
+            if token is None or (MIC2_ARITY[op.opcode] is None and not params):
+                if op.opcode in _MIC2_RESERVED or not _IDENT.fullmatch(op.opcode) or _REF.fullmatch(op.opcode):
+                    raise ValueError(f"Opcode '{op.opcode}' is not representable in mic@2")
+                token, params, native = op.opcode, [], ()
+            yield " ".join([token, *(str(index_of[operand]) for operand in op.operands), *params])
+            node_types.append("0" if op.result_type is None else str(types[op.result_type] + 1))
+        extra = _format_attributes(op.attributes, native)
+        if extra:
+            residual[f"n{index}"] = " ".join(extra)
+
+    outputs = [index_of[output] for output in ir.outputs]
+    yield f"O {outputs[0]}"
+
+    entries: Dict[str, Any] = dict(metadata or {})
+    if residual:
+        entries[KEY_ATTRIBUTES] = residual
+    if len(outputs) > 1:
+        entries[KEY_OUTPUTS] = " ".join(map(str, outputs))
+    if any(t != "0" for t in node_types):
+        entries[KEY_RESULT_TYPES] = " ".join(node_types)
+    if entries:
+        yield "map {"
+        yield from _format_map(entries, "  ")
+        yield "}"
+
+
+def iter_emit(ir: CoreIR, version: int = 2, metadata: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+    """Yield the MIC encoding of ``ir`` one line at a time, without newlines.
+
+    mic@1 keeps explicit ``N<value_id>`` ids and writes each symbol and type
+    entry just before its first use, so it streams in a single pass. mic@2
+    writes the type table first and renumbers values densely in instruction
+    order; node result types, attributes without a native parameter slot and
+    outputs beyond the first travel in a trailing mic@2.1 ``map`` block under
+    the ``core_ir.*`` keys, together with any extra ``metadata`` entries.
+    """
+
+    if version == 1:
+        if metadata:
+            raise ValueError("mic@1 has no metadata section")
+        return _iter_mic1(ir)
+    if version == 2:
+        return _iter_mic2(ir, metadata)
+    raise ValueError(f"Unsupported MIC version {version}")
+
+
+def emit(ir: CoreIR, version: int = 2, metadata: Optional[Dict[str, Any]] = None) -> str:
+    """Serialise ``ir`` to canonical mic@1 or mic@2 text (no trailing newline)."""
+
+    return "\n".join(iter_emit(ir, version, metadata))
+
+
+# ---------------------------------------------------------------------------
+# Streaming parser
+# ---------------------------------------------------------------------------
+
+
+class MicParser:
+    """Incremental mic@1 / mic@2 parser.
+
+    ``feed`` consumes one line at a time and does work proportional to that
+    line only, so a module can be rebuilt directly from a pipe or socket as
+    it arrives. Symbol names, types and custom opcodes are interned: every
+    operation with the same type shares one ``result_type`` string. ``close``
+    validates the outputs, applies the mic@2.1 ``core_ir.*`` MAP entries and
+    returns the ``CoreIR``; other MAP entries are kept in ``metadata``.
+    """
+
+    def __init__(self, limits: MicLimits = DEFAULT_LIMITS) -> None:
+        self.limits = limits
+        self.version: Optional[int] = None
+        self.metadata: Dict[str, Any] = {}
+        self.ir = CoreIR()
+        self.line_number = 0
+        self._size = 0
+        self._symbols: List[str] = []
+        self._types: List[str] = []
+        self._defined: set = set()
+        self._outputs: List[int] = []
+        self._map_stack: List[Dict[str, Any]] = []
+        self._map_seen = False
+        self._closed = False
+
+    def error(self, message: str) -> MicParseError:
+        return MicParseError(message, self.line_number)
+
+    def feed(self, line: Union[str, bytes]) -> None:
+        self.line_number += 1
+        self._size += len(line)
+        if self.line_number > self.limits.max_line_count:
+            raise self.error(f"line count exceeds limit {self.limits.max_line_count}")
+        if self._size > self.limits.max_input_size:
+            raise self.error(f"input size exceeds limit {self.limits.max_input_size}")
+        if isinstance(line, bytes):
+            try:
+                line = line.decode("utf-8")
+            except UnicodeDecodeError as exc:
+                raise self.error("line is not valid UTF-8") from exc
+        line = line.rstrip("\r\n")
+        if self._map_stack:
+            self._feed_map(line)
+            return
+        stripped = line.strip()
+        if not stripped or stripped[0] == "#":
+            return
+        if self._closed:
+            raise self.error("content after the end of the module")
+        try:
+            if self.version == 1:
+                self._feed_v1(stripped)
+            elif self.version == 2:
+                self._feed_v2(stripped)
+            else:
+                self._feed_header(stripped)
+        except MicParseError:
+            raise
+        except (ValueError, IndexError) as exc:
+            raise self.error(str(exc)) from exc
+
+    def _feed_header(self, line: str) -> None:
+        if line == HEADER_V1:
+            self.version = 1
+        elif line == HEADER_V2:
+            self.version = 2
+        elif line.startswith("mic@"):
+            raise self.error(f"unsupported version {line}")
+        else:
+            raise self.error("missing version header")
+
+    def _symbol(self, token: str) -> str:
+        index = int(token[1:])
+        if index >= len(self._symbols):
+            raise self.error(f"undefined reference {token}")
+        return self._symbols[index]
+
+    def _type(self, token: str) -> str:
+        index = int(token[1:])
+        if index >= len(self._types):
+            raise self.error(f"undefined reference {token}")
+        return self._types[index]
+
+    def _check_value_count(self) -> None:
+        if len(self.ir.operations) >= self.limits.max_value_count:
+            raise self.error(f"value count exceeds limit {self.limits.max_value_count}")
+
+    def _add_type(self, head: str, text: str) -> None:
+        if head[1:] != str(len(self._types)):
+            raise self.error(f"type {head} out of sequence, expected T{len(self._types)}")
+        self._types.append(sys.intern(text))
+
+    def _check_rank(self, dims: Sequence[str]) -> None:
+        if len(dims) > self.limits.max_rank:
+            raise self.error(f"rank {len(dims)} exceeds limit {self.limits.max_rank}")
+        for dim in dims:
+            if not _DIM.fullmatch(dim):
+                raise self.error(f"malformed dimension {dim!r}")
+
+    # -- mic@1 -------------------------------------------------------------
+
+    def _feed_v1(self, line: str) -> None:
+        head, _, rest = line.partition(" ")
+        tag = head[0]
+        if tag == "N" and head[1:].isdigit():
+            self._node_v1(int(head[1:]), _tokens(rest))
+        elif tag == "T" and head[1:].isdigit():
+            self._add_type(head, self._parse_type_v1(rest.strip()))
+        elif tag == "S" and head[1:].isdigit():
+            if head[1:] != str(len(self._symbols)):
+                raise self.error(f"symbol {head} out of sequence, expected S{len(self._symbols)}")
+            name = json.loads(rest.strip())
+            if not isinstance(name, str):
+                raise self.error("symbol name must be a quoted string")
+            self._symbols.append(sys.intern(name))
+        elif head == "O":
+            ref = rest.strip()
+            if not ref.startswith("N") or not ref[1:].isdigit() or int(ref[1:]) not in self._defined:
+                raise self.error(f"undefined reference {ref}")
+            self._outputs.append(int(ref[1:]))
+        else:
+            raise self.error(f"unknown entry '{head}'")
+
+    def _parse_type_v1(self, text: str) -> str:
+        if text.startswith('"'):
+            result = json.loads(text)
+            if not isinstance(result, str):
+                raise self.error("quoted type must be a string")
+            return result
+        if text.startswith("[") and text.endswith("]") and ";" in text:
+            dtype, _, shape = text[1:-1].partition(";")
+            dims = shape.split(",") if shape else []
+        else:
+            dtype, dims = text, []
+        if not _IDENT.fullmatch(dtype):
+            raise self.error(f"malformed type {text!r}")
+        self._check_rank(dims)
+        return _join_type(dtype, dims)
+
+    def _node_v1(self, value_id: int, tokens: List[str]) -> None:
+        if not tokens:
+            raise self.error("node without a kind")
+        self._check_value_count()
+        if self._defined and value_id <= self.ir._next_value_id - 1:
+            raise self.error(f"node N{value_id} is not monotonic")
+        kind = tokens[0]
+        opcode = MIC1_OPCODES.get(kind)
+        if opcode is None:
+            if not _MAP_KEY.fullmatch(kind):
+                raise self.error(f"malformed node kind {kind!r}")
+            opcode = sys.intern(kind)
+
+        result_type = None
+        end = len(tokens)
+        last = tokens[-1]
+        if end > 1 and last[0] == "T" and last[1:].isdigit():
+            result_type = self._type(last)
+            end -= 1
+
+        operands: List[int] = []
+        attributes: Dict[str, Any] = {}
+        depth = self.limits.max_literal_depth
+        for token in tokens[1:end]:
+            first = token[0]
+            if first == "N" and token[1:].isdigit():
+                operand = int(token[1:])
+                if operand not in self._defined:
+                    raise self.error(f"undefined reference {token}")
+                operands.append(operand)
+            elif first == "S" and token[1:].isdigit():
+                attributes["name"] = self._symbol(token)
+            elif _is_attribute(token):
+                _parse_attribute(token, attributes, depth)
+            elif opcode == "Slice" and ":" in token and first != '"':
+                bounds = [[int(part) for part in item.split(":")] for item in token.split(",")]
+                if any(len(bound) != 3 for bound in bounds):
+                    raise self.error(f"malformed slice {token!r}")
+                attributes["starts"], attributes["ends"], attributes["steps"] = (list(col) for col in zip(*bounds))
+            else:
+                positional = MIC1_POSITIONAL.get(opcode)
+                if positional is None or positional in attributes:
+                    raise self.error(f"unexpected argument {token!r} for {kind}")
+                attributes[positional] = parse_literal(token, depth)
+
+        self.ir.operations.append(CoreOperation(value_id, opcode, operands, attributes, result_type))
+        self.ir._next_value_id = value_id + 1
+        self._defined.add(value_id)
+
+    # -- mic@2 -------------------------------------------------------------
+
+    def _feed_v2(self, line: str) -> None:
+        tokens = line.split()
+        head = tokens[0]
+        if head == "a" or head == "p":
+            if len(tokens) != 3 or not _IDENT.fullmatch(tokens[1]) or tokens[2][:1] != "T":
+                raise self.error(f"malformed {'argument' if head == 'a' else 'parameter'}")
+            self._check_value_count()
+            self.ir.declare_input(sys.intern(tokens[1]), self._type(tokens[2]))
+        elif head == "O":
+            if self._outputs:
+                raise self.error("duplicate output line")
+            if len(tokens) != 2:
+                raise self.error("malformed output")
+            output = int(tokens[1])
+            if not 0 <= output < len(self.ir.operations):
+                raise self.error(f"undefined reference {output}")
+            self._outputs.append(output)
+        elif head == "map" and tokens[1:] == ["{"]:
+            if not self._outputs or self._map_seen:
+                raise self.error("map block must follow the output line")
+            self._map_seen = True
+            self._map_stack.append(self.metadata)
+        elif head[0] == "T" and head[1:].isdigit():
+            if len(tokens) < 2 or tokens[1] not in DTYPE_CODES:
+                raise self.error(f"unknown dtype in {head}")
+            self._check_rank(tokens[2:])
+            self._add_type(head, _join_type(tokens[1], tokens[2:]))
+        elif head == "S":
+            if len(tokens) != 2 or not _IDENT.fullmatch(tokens[1]):
+                raise self.error("malformed symbol")
+            self._symbols.append(sys.intern(tokens[1]))
+        elif self._outputs:
+            raise self.error("values must precede the output line")
+        else:
+            self._node_v2(head, tokens)
+
+    def _node_v2(self, head: str, tokens: List[str]) -> None:
+        self._check_value_count()
+        opcode = MIC2_OPCODES.get(head)
+        if opcode is None:
+            if not _IDENT.fullmatch(head):
+                raise self.error(f"unknown opcode {head!r}")
+            opcode, arity, spec = sys.intern(head), None, ()
+        else:
+            arity, spec = MIC2_ARITY[opcode], OPCODE_PARAMS.get(opcode, ())
+        numbers = [int(token) for token in tokens[1:]]
+        if arity is None:
+            split = len(numbers) - len(spec)
+            if split < 0:
+                raise self.error(f"{head} expects {len(spec)} parameters")
+        else:
+            split = arity
+            if len(numbers) < arity:
+                raise self.error(f"{head} expects {arity} inputs, got {len(numbers)}")
+        inputs, params = numbers[:split], numbers[split:]
+        count = len(self.ir.operations)
+        for value in inputs:
+            if not 0 <= value < count:
+                raise self.error(f"undefined reference {value}")
+
+        attributes: Dict[str, Any] = {}
+        if params:
+            if len(spec) == 1 and spec[0][1] == "list":
+                attributes[spec[0][0]] = params
+            elif len(params) == len(spec):
+                attributes.update((name, value) for (name, _), value in zip(spec, params))
+            else:
+                raise self.error(f"{head} expects {len(spec)} parameters, got {len(params)}")
+        self.ir.add_operation(opcode, inputs, attributes)
+
+    def _feed_map(self, line: str) -> None:
+        stripped = line.strip()
+        if not stripped:
+            return
+        if stripped == "}":
+            self._map_stack.pop()
+            if not self._map_stack:
+                self._closed = True
+            return
+        key, eq, value = stripped.partition("=")
+        key, value = key.strip(), value.strip()
+        if not eq or not _MAP_KEY.fullmatch(key):
+            raise self.error(f"malformed MAP entry {stripped!r}")
+        current = self._map_stack[-1]
+        if key in current:
+            raise self.error(f"duplicate MAP key '{key}'")
+        if value == "{":
+            if len(self._map_stack) >= self.limits.max_map_depth:
+                raise self.error(f"MAP nesting exceeds depth {self.limits.max_map_depth}")
+            current[key] = nested = {}
+            self._map_stack.append(nested)
+        elif value.startswith('"'):
+            try:
+                current[key] = json.loads(value)
+            except ValueError as exc:
+                raise self.error(f"malformed MAP string for '{key}'") from exc
+        elif value.startswith("bytes(0x") and value.endswith(")"):
+            try:
+                current[key] = bytes.fromhex(value[8:-1])
+            except ValueError as exc:
+                raise self.error(f"malformed MAP bytes for '{key}'") from exc
+        elif _INT.fullmatch(value):
+            current[key] = int(value)
+        else:
+            raise self.error(f"malformed MAP value for '{key}'")
+
+    def _apply_map(self) -> None:
+        operations = self.ir.operations
+        result_types = self.metadata.pop(KEY_RESULT_TYPES, None)
+        if result_types is not None:
+            nodes = [op for op in operations if op.opcode != "Input"]
+            refs = str(result_types).split()
+            if len(refs) != len(nodes):
+                raise self.error(f"{KEY_RESULT_TYPES} lists {len(refs)} types for {len(nodes)} nodes")
+            for op, ref in zip(nodes, refs):
+                op.result_type = self._type(f"T{int(ref) - 1}") if ref != "0" else None
+
+        outputs = self.metadata.pop(KEY_OUTPUTS, None)
+        if outputs is not None:
+            self._outputs = [int(output) for output in str(outputs).split()]
+            for output in self._outputs:
+                if not 0 <= output < len(operations):
+                    raise self.error(f"undefined reference {output}")
+
+        attributes = self.metadata.pop(KEY_ATTRIBUTES, None)
+        if attributes is not None:
+            if not isinstance(attributes, dict):
+                raise self.error(f"{KEY_ATTRIBUTES} must be a nested MAP")
+            for key, text in attributes.items():
+                index = int(key[1:]) if key[:1] == "n" and key[1:].isdigit() else -1
+                if not 0 <= index < len(operations) or not isinstance(text, str):
+                    raise self.error(f"malformed attribute entry '{key}'")
+                extra: Dict[str, Any] = {}
+                try:
+                    for token in _tokens(text):
+                        _parse_attribute(token, extra, self.limits.max_literal_depth)
+                except ValueError as exc:
+                    raise self.error(f"malformed attributes for %{index}: {exc}") from exc
+                operations[index].attributes.update(extra)
+
+    def close(self) -> CoreIR:
+        if self.version is None:
+            raise self.error("missing version header")
+        if self._map_stack:
+            raise self.error("unterminated map block")
+        if self.version == 2:
+            if not self._outputs:
+                raise self.error("missing output line")
+            try:
+                self._apply_map()
+            except MicParseError:
+                raise
+            except ValueError as exc:
+                raise self.error(str(exc)) from exc
+        self.ir.outputs = self._outputs
+        return self.ir
+
+
+def parse(lines: Iterable[Union[str, bytes]], limits: MicLimits = DEFAULT_LIMITS) -> CoreIR:
+    """Build a ``CoreIR`` from any iterable of mic@1 or mic@2 lines.
+
+    ``lines`` may be a text or binary file, a socket's ``makefile()`` or a
+    list of strings; the version is taken from the header line.
+    """
+
+    parser = MicParser(limits)
+    for line in lines:
+        parser.feed(line)
+    return parser.close()
+
+
+def loads(text: str, limits: MicLimits = DEFAULT_LIMITS) -> CoreIR:
+    return parse(text.split("\n"), limits)
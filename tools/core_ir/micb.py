@@ -0,0 +1,623 @@
+from __future__ import annotations
+
+import mmap
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .core_ir import CoreIR, CoreOperation
+
+MAGIC = b"MICB"
+VERSION = 0x02
+MAP_MARKER = 0x4D
+
+TAG_ARG = 0
+TAG_PARAM = 1
+TAG_NODE = 2
+
+MAP_STRING = 0
+MAP_INT = 1
+MAP_BYTES = 2
+MAP_NESTED = 3
+
+# MAP keys carrying the CoreIR metadata that the MIC-B value table cannot
+# express: node result types, attributes beyond the opcode parameters, opcode
+# parameters the original operation did not have, and outputs beyond the
+# single output varint.
+KEY_ABSENT_PARAMS = "core_ir.absent_params"
+KEY_ATTRIBUTES = "core_ir.attributes"
+KEY_OUTPUTS = "core_ir.outputs"
+KEY_RESULT_TYPES = "core_ir.result_types"
+
+DTYPE_CODES: Dict[str, int] = {
+    "f16": 0,
+    "f32": 1,
+    "f64": 2,
+    "bf16": 3,
+    "i8": 4,
+    "i16": 5,
+    "i32": 6,
+    "i64": 7,
+    "u8": 8,
+    "u16": 9,
+    "u32": 10,
+    "u64": 11,
+    "bool": 12,
+}
+DTYPE_NAMES = {code: name for name, code in DTYPE_CODES.items()}
+
+OPCODE_CODES: Dict[str, int] = {
+    "MatMul": 0,
+    "Add": 1,
+    "Sub": 2,
+    "Mul": 3,
+    "Div": 4,
+    "Relu": 5,
+    "Softmax": 6,
+    "Sigmoid": 7,
+    "Tanh": 8,
+    "GELU": 9,
+    "LayerNorm": 10,
+    "Transpose": 11,
+    "Reshape": 12,
+    "Sum": 13,
+    "Mean": 14,
+    "Max": 15,
+    "Concat": 16,
+    "Split": 17,
+    "Gather": 18,
+}
+OPCODE_NAMES = {code: name for name, code in OPCODE_CODES.items()}
+OPCODE_CUSTOM = 255
+
+# Opcode parameters encoded natively in the node payload, as
+# ``(attribute, kind)`` pairs where kind is ``"list"`` (uleb128 n, n x sleb128),
+# ``"int"`` (sleb128) or ``"uint"`` (uleb128).
+OPCODE_PARAMS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "Softmax": (("axis", "int"),),
+    "Transpose": (("permutation", "list"),),
+    "Sum": (("axes", "list"),),
+    "Mean": (("axes", "list"),),
+    "Max": (("axes", "list"),),
+    "Concat": (("axis", "int"),),
+    "Split": (("axis", "int"), ("count", "uint")),
+    "Gather": (("axis", "int"),),
+}
+
+_TENSOR_TYPE = re.compile(r"tensor<(\w+)\[([^\]]*)\]>")
+
+
+@dataclass(frozen=True)
+class MicbLimits:
+    """Decoder security limits; defaults follow the MIC-B specification."""
+
+    max_input_size: int = 10 * 1024 * 1024
+    max_string_count: int = 1_000_000
+    max_value_count: int = 100_000
+    max_string_length: int = 64 * 1024
+    max_map_entries: int = 4096
+    max_map_bytes: int = 1024 * 1024
+    max_map_depth: int = 4
+    max_rank: int = 32
+
+
+DEFAULT_LIMITS = MicbLimits()
+
+
+@dataclass(frozen=True)
+class _MapBytes:
+    """A MAP byte payload, copied out of the input, and the file offset it starts at."""
+
+    offset: int
+    data: bytes
+
+
+class MicbDecodeError(ValueError):
+    """Raised for malformed MIC-B input; ``offset`` locates the failing byte."""
+
+    def __init__(self, message: str, offset: int) -> None:
+        super().__init__(f"micb:{offset}: {message}")
+        self.offset = offset
+
+
+def write_uleb128(out: bytearray, value: int) -> None:
+    if value < 0:
+        raise ValueError(f"ULEB128 cannot encode negative value {value}")
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def write_sleb128(out: bytearray, value: int) -> None:
+    """Write ``value`` zigzag-encoded as ULEB128."""
+
+    write_uleb128(out, (value << 1) ^ (value >> 63))
+
+
+def _split_type(result_type: str) -> Tuple[str, List[str]]:
+    match = _TENSOR_TYPE.fullmatch(result_type)
+    if match is None or match.group(1) not in DTYPE_CODES:
+        raise ValueError(f"Result type '{result_type}' is not representable in MIC-B")
+    dims = match.group(2)
+    return match.group(1), [d.strip() for d in dims.split(",")] if dims.strip() else []
+
+
+def _join_type(dtype: str, dims: Sequence[str]) -> str:
+    return f"tensor<{dtype}[{', '.join(dims)}]>"
+
+
+class _Tables:
+    """First-seen interning for the string and type tables."""
+
+    def __init__(self) -> None:
+        self.strings: List[str] = []
+        self.types: List[Tuple[str, Tuple[int, ...]]] = []
+        self._string_index: Dict[str, int] = {}
+        self._type_index: Dict[str, int] = {}
+
+    def string(self, text: str) -> int:
+        index = self._string_index.get(text)
+        if index is None:
+            index = len(self.strings)
+            self.strings.append(text)
+            self._string_index[text] = index
+        return index
+
+    def type(self, result_type: str) -> int:
+        index = self._type_index.get(result_type)
+        if index is None:
+            dtype, dims = _split_type(result_type)
+            index = len(self.types)
+            self.types.append((dtype, tuple(self.string(d) for d in dims)))
+            self._type_index[result_type] = index
+        return index
+
+
+def _is_native(kind: str, value: Any) -> bool:
+    """Whether ``value`` decodes back unchanged from a ``kind`` parameter slot."""
+
+    if kind == "list":
+        return isinstance(value, list) and all(type(item) is int for item in value)
+    return type(value) is int and (kind == "int" or value >= 0)
+
+
+def _residual_attributes(op: CoreOperation, native: Sequence[str]) -> Dict[str, Any]:
+    return {k: op.attributes[k] for k in sorted(op.attributes) if k not in native}
+
+
+def encode(ir: CoreIR) -> bytes:
+    """Serialise ``ir`` to MIC-B v2 bytes.
+
+    The graph maps onto the specification's tables directly: ``Input``
+    operations become ``Arg`` values, known opcodes use their opcode byte and
+    native parameters, and any other opcode is written as ``Custom``. Node
+    result types, remaining attributes and additional outputs travel in a
+    trailing MAP section (mic@2.1) under the ``core_ir.*`` keys, so decoding is
+    lossless. A native parameter the operation lacks is written as zero (or
+    an empty list) and recorded in a per-node bitmask so decoding leaves it
+    out; one whose value would not decode back unchanged, such as a tuple,
+    travels with the remaining attributes, which override the native slot.
+    Attributes are written as MIC literals; values ``format_literal`` cannot represent
+    (arrays, NumPy integers, ...) raise ``ValueError``. Value ids are
+    renumbered densely in instruction order.
+    """
+
+    from .mic import format_literal  # mic imports this module's tables
+
+    if not ir.outputs:
+        raise ValueError("MIC-B modules require at least one output")
+
+    index_of: Dict[int, int] = {}
+    for index, op in enumerate(ir.operations):
+        if op.value_id in index_of:
+            raise ValueError(f"Value %{op.value_id} is defined more than once")
+        for operand in op.operands:
+            if operand not in index_of:
+                raise ValueError(f"Operand %{operand} of %{op.value_id} is not defined before use")
+        index_of[op.value_id] = index
+
+    tables = _Tables()
+    # Deterministic string order: type dimension tokens, value names, custom
+    # opcode names, then MAP keys.
+    for op in ir.operations:
+        if op.result_type is not None:
+            tables.type(op.result_type)
+        elif op.opcode == "Input":
+            raise ValueError(f"Input %{op.value_id} requires a result type")
+    for op in ir.operations:
+        if op.opcode == "Input":
+            tables.string(str(op.attributes.get("name", "")))
+    for op in ir.operations:
+        if op.opcode != "Input" and op.opcode not in OPCODE_CODES:
+            tables.string(op.opcode)
+
+    values = bytearray()
+    write_uleb128(values, len(ir.operations))
+    node_types = bytearray()
+    attribute_entries = bytearray()
+    attribute_count = 0
+    absent_entries = bytearray()
+    absent_count = 0
+    has_node_types = False
+
+    for index, op in enumerate(ir.operations):
+        native: List[str] = ["name"] if op.opcode == "Input" else []
+        if op.opcode == "Input":
+            values.append(TAG_ARG)
+            write_uleb128(values, tables.string(str(op.attributes.get("name", ""))))
+            write_uleb128(values, tables.type(op.result_type))  # type: ignore[arg-type]
+        else:
+            values.append(TAG_NODE)
+            code = OPCODE_CODES.get(op.opcode, OPCODE_CUSTOM)
+            values.append(code)
+            if code == OPCODE_CUSTOM:
+                write_uleb128(values, tables.string(op.opcode))
+            absent = 0
+            for bit, (name, kind) in enumerate(OPCODE_PARAMS.get(op.opcode, ())):
+                param = op.attributes.get(name)
+                if name not in op.attributes:
+                    absent |= 1 << bit
+                if name in op.attributes and _is_native(kind, param):
+                    native.append(name)
+                else:
+                    param = None
+                if kind == "list":
+                    items = param or []
+                    write_uleb128(values, len(items))
+                    for item in items:
+                        write_sleb128(values, item)
+                elif kind == "int":
+                    write_sleb128(values, param or 0)
+                else:
+                    write_uleb128(values, param or 0)
+            if absent:
+                write_uleb128(absent_entries, index)
+                write_uleb128(absent_entries, absent)
+                absent_count += 1
+            write_uleb128(values, len(op.operands))
+            for operand in op.operands:
+                write_uleb128(values, index_of[operand])
+            if op.result_type is not None:
+                has_node_types = True
+                write_uleb128(node_types, tables.type(op.result_type) + 1)
+            else:
+                write_uleb128(node_types, 0)
+
+        residual = _residual_attributes(op, native)
+        if residual:
+            try:
+                payload = format_literal(residual).encode("utf-8")
+            except ValueError as exc:
+                raise ValueError(f"Attributes of %{op.value_id} are not representable in MIC-B: {exc}") from exc
+            write_uleb128(attribute_entries, index)
+            write_uleb128(attribute_entries, len(payload))
+            attribute_entries += payload
+            attribute_count += 1
+
+    map_entries: Dict[str, bytes] = {}
+    if absent_count:
+        counted = bytearray()
+        write_uleb128(counted, absent_count)
+        map_entries[KEY_ABSENT_PARAMS] = bytes(counted + absent_entries)
+    if attribute_count:
+        counted = bytearray()
+        write_uleb128(counted, attribute_count)
+        map_entries[KEY_ATTRIBUTES] = bytes(counted + attribute_entries)
+    if len(ir.outputs) > 1:
+        outputs = bytearray()
+        write_uleb128(outputs, len(ir.outputs))
+        for output in ir.outputs:
+            write_uleb128(outputs, index_of[output])
+        map_entries[KEY_OUTPUTS] = bytes(outputs)
+    if has_node_types:
+        map_entries[KEY_RESULT_TYPES] = bytes(node_types)
+    for key in sorted(map_entries):
+        tables.string(key)
+
+    out = bytearray(MAGIC)
+    out.append(VERSION)
+    write_uleb128(out, len(tables.strings))
+    for text in tables.strings:
+        data = text.encode("utf-8")
+        write_uleb128(out, len(data))
+        out += data
+    write_uleb128(out, 0)  # symbol table
+    write_uleb128(out, len(tables.types))
+    for dtype, dims in tables.types:
+        out.append(DTYPE_CODES[dtype])
+        write_uleb128(out, len(dims))
+        for dim in dims:
+            write_uleb128(out, dim)
+    out += values
+    if ir.outputs[0] not in index_of:
+        raise ValueError(f"Output %{ir.outputs[0]} is not defined")
+    write_uleb128(out, index_of[ir.outputs[0]])
+
+    if map_entries:
+        write_uleb128(out, MAP_MARKER)
+        write_uleb128(out, len(map_entries))
+        for key in sorted(map_entries):
+            payload = map_entries[key]
+            if len(payload) > DEFAULT_LIMITS.max_map_bytes:
+                raise ValueError(f"MAP entry '{key}' exceeds {DEFAULT_LIMITS.max_map_bytes} bytes")
+            write_uleb128(out, tables.string(key))
+            out.append(MAP_BYTES)
+            write_uleb128(out, len(payload))
+            out += payload
+    return bytes(out)
+
+
+class _Reader:
+    """Cursor over a ``memoryview``; never copies more than one field.
+
+    ``base`` is the file offset of ``view[0]``, so errors inside a MAP payload
+    report where they are in the file.
+    """
+
+    def __init__(self, view: memoryview, limits: MicbLimits, base: int = 0) -> None:
+        self.view = view
+        self.pos = 0
+        self.limits = limits
+        self.base = base
+
+    def error(self, message: str, offset: Optional[int] = None) -> MicbDecodeError:
+        return MicbDecodeError(message, self.base + (self.pos if offset is None else offset))
+
+    def at_end(self) -> bool:
+        return self.pos >= len(self.view)
+
+    def u8(self) -> int:
+        if self.pos >= len(self.view):
+            raise self.error("unexpected end of input")
+        value = self.view[self.pos]
+        self.pos += 1
+        return value
+
+    def uleb128(self) -> int:
+        start = self.pos
+        if start < len(self.view):
+            byte = self.view[start]
+            if byte < 0x80:
+                # Single-byte fast path: most ids, counts and indices are < 128.
+                self.pos = start + 1
+                return byte
+        result = 0
+        shift = 0
+        view = self.view
+        end = len(view)
+        pos = self.pos
+        while True:
+            if pos >= end:
+                raise self.error("unexpected end of input", start)
+            byte = view[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                break
+            shift += 7
+            if shift >= 70:
+                raise self.error("ULEB128 value exceeds 10 bytes", start)
+        self.pos = pos
+        return result
+
+    def sleb128(self) -> int:
+        value = self.uleb128()
+        return (value >> 1) ^ -(value & 1)
+
+    def index(self, bound: int, what: str) -> int:
+        start = self.pos
+        value = self.uleb128()
+        if value >= bound:
+            raise self.error(f"{what} index {value} out of bounds ({bound})", start)
+        return value
+
+    def count(self, limit: int, what: str) -> int:
+        start = self.pos
+        value = self.uleb128()
+        if value > limit:
+            raise self.error(f"{what} count {value} exceeds limit {limit}", start)
+        return value
+
+    def raw(self, length: int) -> memoryview:
+        if self.pos + length > len(self.view):
+            raise self.error("unexpected end of input")
+        chunk = self.view[self.pos : self.pos + length]
+        self.pos += length
+        return chunk
+
+
+def _read_map(reader: _Reader, strings: List[str], depth: int, budget: List[int]) -> Dict[str, Any]:
+    limits = reader.limits
+    if depth > limits.max_map_depth:
+        raise reader.error(f"MAP nesting exceeds depth {limits.max_map_depth}")
+    entries: Dict[str, Any] = {}
+    for _ in range(reader.count(limits.max_map_entries, "MAP entry")):
+        budget[0] -= 1
+        if budget[0] < 0:
+            raise reader.error(f"MAP exceeds {limits.max_map_entries} entries")
+        key_offset = reader.pos
+        key = strings[reader.index(len(strings), "string")]
+        if key in entries:
+            raise reader.error(f"duplicate MAP key '{key}'", key_offset)
+        tag = reader.u8()
+        if tag == MAP_STRING:
+            entries[key] = strings[reader.index(len(strings), "string")]
+        elif tag == MAP_INT:
+            entries[key] = reader.sleb128()
+        elif tag == MAP_BYTES:
+            # Copied, so no view into an mmap outlives decoding (closing it would raise BufferError).
+            length = reader.count(limits.max_map_bytes, "MAP byte")
+            entries[key] = _MapBytes(reader.pos, bytes(reader.raw(length)))
+        elif tag == MAP_NESTED:
+            entries[key] = _read_map(reader, strings, depth + 1, budget)
+        else:
+            raise reader.error(f"unknown MAP value tag {tag}", reader.pos - 1)
+    return entries
+
+
+def decode(buffer: Union[bytes, bytearray, memoryview, mmap.mmap], limits: MicbLimits = DEFAULT_LIMITS) -> CoreIR:
+    """Deserialise MIC-B v2 bytes into a ``CoreIR``.
+
+    ``buffer`` is read through a ``memoryview``, so ``mmap`` objects and
+    shared buffers are decoded in place; only individual strings and MAP
+    payloads are copied out. All validation rules and security ``limits``
+    from the specification are enforced and failures raise
+    ``MicbDecodeError`` carrying the byte offset.
+    """
+
+    with memoryview(buffer) as view:
+        if view.ndim != 1 or view.itemsize != 1:
+            view = view.cast("B")
+        if len(view) > limits.max_input_size:
+            raise MicbDecodeError(f"input size {len(view)} exceeds limit {limits.max_input_size}", 0)
+        return _decode_view(view, limits)
+
+
+def _decode_view(view: memoryview, limits: MicbLimits) -> CoreIR:
+    reader = _Reader(view, limits)
+    if bytes(reader.raw(4)) != MAGIC:
+        raise MicbDecodeError("bad magic, expected 'MICB'", 0)
+    version = reader.u8()
+    if version != VERSION:
+        raise MicbDecodeError(f"unsupported version {version}", 4)
+
+    strings: List[str] = []
+    for _ in range(reader.count(limits.max_string_count, "string")):
+        length = reader.count(limits.max_string_length, "string byte")
+        start = reader.pos
+        try:
+            strings.append(str(reader.raw(length), "utf-8"))
+        except UnicodeDecodeError as exc:
+            raise MicbDecodeError("string is not valid UTF-8", start) from exc
+
+    for _ in range(reader.count(limits.max_string_count, "symbol")):
+        reader.index(len(strings), "string")
+
+    types: List[str] = []
+    for _ in range(reader.count(limits.max_value_count, "type")):
+        offset = reader.pos
+        dtype = DTYPE_NAMES.get(reader.u8())
+        if dtype is None:
+            raise reader.error("unknown dtype code", offset)
+        rank = reader.count(limits.max_rank, "dimension")
+        types.append(_join_type(dtype, [strings[reader.index(len(strings), "string")] for _ in range(rank)]))
+
+    ir = CoreIR()
+    value_count = reader.count(limits.max_value_count, "value")
+    node_indices: List[int] = []
+    for value_id in range(value_count):
+        offset = reader.pos
+        tag = reader.u8()
+        if tag in (TAG_ARG, TAG_PARAM):
+            name = strings[reader.index(len(strings), "string")]
+            ir.declare_input(name, result_type=types[reader.index(len(types), "type")])
+            continue
+        if tag != TAG_NODE:
+            raise reader.error(f"unknown value tag {tag}", offset)
+
+        code_offset = reader.pos
+        code = reader.u8()
+        if code == OPCODE_CUSTOM:
+            opcode = strings[reader.index(len(strings), "string")]
+        elif code in OPCODE_NAMES:
+            opcode = OPCODE_NAMES[code]
+        else:
+            raise reader.error(f"unknown opcode byte {code}", code_offset)
+        attributes: Dict[str, Any] = {}
+        for name, kind in OPCODE_PARAMS.get(opcode, ()):
+            if kind == "list":
+                attributes[name] = [reader.sleb128() for _ in range(reader.count(limits.max_rank, "parameter"))]
+            elif kind == "int":
+                attributes[name] = reader.sleb128()
+            else:
+                attributes[name] = reader.uleb128()
+        operands = [reader.index(value_id, "input") for _ in range(reader.count(value_count, "input"))]
+        ir.add_operation(opcode, operands, attributes)
+        node_indices.append(value_id)
+
+    outputs = [reader.index(value_count, "output")]
+
+    if not reader.at_end():
+        offset = reader.pos
+        if reader.uleb128() != MAP_MARKER:
+            raise reader.error("trailing bytes after output", offset)
+        entries = _read_map(reader, strings, 1, [limits.max_map_entries])
+        if not reader.at_end():
+            raise reader.error("trailing bytes after MAP section")
+        _apply_map(ir, entries, types, node_indices, outputs)
+
+    ir.outputs = outputs
+    return ir
+
+
+def _apply_map(
+    ir: CoreIR,
+    entries: Dict[str, Any],
+    types: List[str],
+    node_indices: List[int],
+    outputs: List[int],
+) -> None:
+    from .mic import parse_literal  # mic imports this module's tables
+
+    value_count = len(ir.operations)
+
+    payload = entries.get(KEY_RESULT_TYPES)
+    if isinstance(payload, _MapBytes):
+        sub = _Reader(memoryview(payload.data), DEFAULT_LIMITS, payload.offset)
+        for index in node_indices:
+            type_index = sub.index(len(types) + 1, "type")
+            ir.operations[index].result_type = types[type_index - 1] if type_index else None
+
+    payload = entries.get(KEY_OUTPUTS)
+    if isinstance(payload, _MapBytes):
+        sub = _Reader(memoryview(payload.data), DEFAULT_LIMITS, payload.offset)
+        outputs[:] = [sub.index(value_count, "output") for _ in range(sub.count(value_count, "output"))]
+
+    payload = entries.get(KEY_ABSENT_PARAMS)
+    if isinstance(payload, _MapBytes):
+        sub = _Reader(memoryview(payload.data), DEFAULT_LIMITS, payload.offset)
+        for _ in range(sub.count(value_count, "absent parameter")):
+            op = ir.operations[sub.index(value_count, "value")]
+            offset = sub.pos
+            mask = sub.uleb128()
+            params = OPCODE_PARAMS.get(op.opcode, ()) if op.opcode != "Input" else ()
+            if mask >> len(params):
+                raise sub.error(f"malformed absent parameters for %{op.value_id}", offset)
+            for bit, (name, _) in enumerate(params):
+                if mask >> bit & 1:
+                    op.attributes.pop(name, None)
+
+    payload = entries.get(KEY_ATTRIBUTES)
+    if isinstance(payload, _MapBytes):
+        sub = _Reader(memoryview(payload.data), DEFAULT_LIMITS, payload.offset)
+        for _ in range(sub.count(value_count, "attribute")):
+            op = ir.operations[sub.index(value_count, "value")]
+            text = sub.raw(sub.uleb128())
+            offset = sub.pos - len(text)
+            try:
+                extra = parse_literal(str(text, "utf-8"))
+            except ValueError as exc:  # includes UnicodeDecodeError
+                raise sub.error(f"malformed attributes for %{op.value_id}", offset) from exc
+            if not isinstance(extra, dict):
+                raise sub.error(f"malformed attributes for %{op.value_id}", offset)
+            op.attributes.update(extra)
+
+
+def dump(ir: CoreIR, path: Union[str, Path]) -> None:
+    Path(path).write_bytes(encode(ir))
+
+
+def load(path: Union[str, Path], limits: MicbLimits = DEFAULT_LIMITS) -> CoreIR:
+    """Decode a MIC-B file by memory-mapping it rather than reading it."""
+
+    with open(path, "rb") as fp:
+        if fp.seek(0, 2) == 0:
+            raise MicbDecodeError("unexpected end of input", 0)
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return decode(mapped, limits)
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .core_ir import COMMUTATIVE_OPCODES, CoreIR, CoreOperation
+from .type_system import FLOAT_DTYPES, TensorType
+
+CONSTANT_OPCODES = frozenset({"ConstI64", "ConstF32", "ConstF64", "ConstTensor"})
+
+# Elementwise opcodes (with broadcasting) that ``fuse_elementwise`` may merge.
+FUSIBLE_OPCODES = frozenset({"Add", "Sub", "Mul", "Div", "Relu", "Neg", "Exp", "Log"})
+
+Pass = Callable[[CoreIR], int]
+
+
+def canonicalize_operands(ir: CoreIR) -> int:
+    """Order operands of commutative ops by ascending ``ValueId``.
+
+    Returns the number of operations whose operands were reordered.
+    """
+
+    changed = 0
+    for op in ir.operations:
+        if op.opcode in COMMUTATIVE_OPCODES and op.operands != sorted(op.operands):
+            op.operands.sort()
+            changed += 1
+    return changed
+
+
+def fold_constants(ir: CoreIR) -> int:
+    """Replace operations whose operands are all constants by ``ConstTensor``.
+
+    Values are computed with the NumPy reference kernels. Because the module
+    is topologically ordered, a single forward sweep reaches the fixed point:
+    a folded operation is already constant when its users are visited.
+    Operations whose evaluation raises a floating-point error (division by
+    zero, overflow, invalid logarithm) are left unfolded as the specification
+    requires. Returns the number of folded operations.
+    """
+
+    import numpy as np
+
+    from .executor import DTYPES, KERNELS
+
+    constants: Dict[int, np.ndarray] = {}
+    folded = 0
+    for op in ir.operations:
+        if op.opcode in CONSTANT_OPCODES:
+            try:
+                constants[op.value_id] = np.asarray(KERNELS[op.opcode](op, []))
+            except (TypeError, ValueError, KeyError):
+                pass
+            continue
+        kernel = KERNELS.get(op.opcode)
+        if kernel is None or not op.operands or any(operand not in constants for operand in op.operands):
+            continue
+        try:
+            with np.errstate(all="raise"):
+                value = np.asarray(kernel(op, [constants[operand] for operand in op.operands]))
+        except (ArithmeticError, TypeError, ValueError, IndexError):
+            continue
+        dtype = TensorType.parse(op.result_type).dtype if op.result_type else None
+        if dtype is None:
+            dtype = next((name for name, np_type in DTYPES.items() if np.dtype(np_type) == value.dtype), None)
+            if dtype is None:
+                continue
+        value = value.astype(DTYPES[dtype], copy=False)
+
+        op.opcode = "ConstTensor"
+        op.operands = []
+        op.attributes = {"value": value.tolist(), "shape": tuple(value.shape), "dtype": dtype}
+        constants[op.value_id] = value
+        folded += 1
+    return folded
+
+
+def eliminate_dead_code(ir: CoreIR, keep_inputs: bool = True) -> int:
+    """Remove operations whose results are never used and are not outputs.
+
+    Use counts are built once; every operation with no uses seeds a worklist,
+    and removing it decrements its operands' counts, enqueuing any that drop
+    to zero. ``Input`` operations are kept by default since they form the
+    module interface. Returns the number of removed operations.
+    """
+
+    definitions = {op.value_id: op for op in ir.operations}
+    uses: Dict[int, int] = {value_id: 0 for value_id in definitions}
+    for op in ir.operations:
+        for operand in op.operands:
+            uses[operand] = uses.get(operand, 0) + 1
+    for output in ir.outputs:
+        uses[output] = uses.get(output, 0) + 1
+
+    def removable(value_id: int) -> bool:
+        op = definitions.get(value_id)
+        return op is not None and uses[value_id] == 0 and not (keep_inputs and op.opcode == "Input")
+
+    worklist = [value_id for value_id in definitions if removable(value_id)]
+    dead = set()
+    while worklist:
+        value_id = worklist.pop()
+        if value_id in dead:
+            continue
+        dead.add(value_id)
+        for operand in definitions[value_id].operands:
+            uses[operand] -= 1
+            if removable(operand):
+                worklist.append(operand)
+
+    if dead:
+        ir.remove_operations(dead)
+    return len(dead)
+
+
+def _fusible(op: CoreOperation) -> bool:
+    if op.opcode not in FUSIBLE_OPCODES or op.result_type is None:
+        return False
+    # Integer Div truncates after a true division, which no single ufunc does.
+    return op.opcode != "Div" or TensorType.parse(op.result_type).dtype in FLOAT_DTYPES
+
+
+def fuse_elementwise(ir: CoreIR) -> int:
+    """Merge single-consumer elementwise regions into ``Fused`` operations.
+
+    Operations are visited from the end of the module. An unabsorbed
+    fusible operation roots a region, which then absorbs every fusible
+    producer whose only use is inside the region and which is not a module
+    output. A region replaces its root in place, keeping the root's
+    ``ValueId`` and result type, and its absorbed operations are removed.
+
+    The ``body`` attribute lists the region's steps in execution order as
+    ``[opcode, operands, result_type]``. Operand ``i`` below the ``Fused``
+    operation's operand count refers to that operand, and larger indices
+    refer to earlier steps. Regions are trees, so every step result is read
+    exactly once. Returns the number of regions formed.
+    """
+
+    uses: Dict[int, int] = {}
+    for op in ir.operations:
+        for operand in op.operands:
+            uses[operand] = uses.get(operand, 0) + 1
+    for output in ir.outputs:
+        uses[output] = uses.get(output, 0) + 1
+    position = {op.value_id: index for index, op in enumerate(ir.operations)}
+
+    absorbed = set()
+    regions = 0
+    for index in range(len(ir.operations) - 1, -1, -1):
+        root = ir.operations[index]
+        if root.value_id in absorbed or not _fusible(root):
+            continue
+
+        members = [root]
+        stack = [root]
+        while stack:
+            for operand in stack.pop().operands:
+                producer = ir.operations[position[operand]] if operand in position else None
+                if producer is not None and uses[operand] == 1 and _fusible(producer):
+                    members.append(producer)
+                    stack.append(producer)
+        if len(members) == 1:
+            continue
+        members.sort(key=lambda op: position[op.value_id])
+
+        member_ids = {op.value_id for op in members}
+        inputs: List[int] = []
+        for op in members:
+            for operand in op.operands:
+                if operand not in member_ids and operand not in inputs:
+                    inputs.append(operand)
+        slots = {value_id: slot for slot, value_id in enumerate(inputs)}
+        slots.update({op.value_id: len(inputs) + step for step, op in enumerate(members)})
+        body = [[op.opcode, [slots[operand] for operand in op.operands], op.result_type] for op in members]
+
+        ir.operations[index] = CoreOperation(
+            value_id=root.value_id,
+            opcode="Fused",
+            operands=inputs,
+            attributes={"body": body},
+            result_type=root.result_type,
+        )
+        absorbed.update(member_ids - {root.value_id})
+        regions += 1
+
+    if absorbed:
+        ir.remove_operations(absorbed)
+    return regions
+
+
+@dataclass(frozen=True)
+class PassStats:
+    """Timing and size change recorded for one pass run."""
+
+    name: str
+    seconds: float
+    ops_before: int
+    ops_after: int
+    changes: int
+
+    @property
+    def ops_delta(self) -> int:
+        return self.ops_after - self.ops_before
+
+
+DEFAULT_PIPELINE: Tuple[Tuple[str, Pass], ...] = (
+    ("canonicalize", canonicalize_operands),
+    ("constant-fold", fold_constants),
+    ("dce", eliminate_dead_code),
+)
+
+
+class PassManager:
+    """Runs a sequence of in-place ``CoreIR`` passes and records per-pass stats.
+
+    A pass is any callable taking the module and returning the number of
+    changes it made. The default pipeline follows the specification's
+    canonicalisation order: commutative operand ordering, constant folding,
+    then dead instruction pruning.
+    """
+
+    def __init__(self, passes: Optional[Iterable[Tuple[str, Pass]]] = None) -> None:
+        self.passes: List[Tuple[str, Pass]] = list(DEFAULT_PIPELINE if passes is None else passes)
+        self.stats: List[PassStats] = []
+
+    def add(self, name: str, pass_: Pass) -> None:
+        self.passes.append((name, pass_))
+
+    def run(self, ir: CoreIR) -> List[PassStats]:
+        stats: List[PassStats] = []
+        for name, pass_ in self.passes:
+            before = len(ir.operations)
+            start = time.perf_counter()
+            changes = pass_(ir)
+            elapsed = time.perf_counter() - start
+            stats.append(PassStats(name, elapsed, before, len(ir.operations), changes))
+        self.stats.extend(stats)
+        return stats
+
+    def report(self) -> str:
+        lines = [f"{'pass':<16} {'ms':>9} {'ops':>9} {'delta':>7} {'changes':>8}"]
+        for stat in self.stats:
+            lines.append(
+                f"{stat.name:<16} {stat.seconds * 1e3:>9.3f} {stat.ops_after:>9} {stat.ops_delta:>7} {stat.changes:>8}"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import heapq
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from .core_ir import CoreIR
+from .executor import Executor, Kernel
+
+
+@dataclass(frozen=True)
+class OpTiming:
+    """Execution of one operation. Times are seconds since the start of the run."""
+
+    index: int
+    value_id: int
+    opcode: str
+    start_s: float
+    end_s: float
+    thread: int
+
+    @property
+    def duration_s(self) -> float:
+        return self.end_s - self.start_s
+
+
+class ParallelExecutor(Executor):
+    """Runs independent operations of a ``CoreIR`` module concurrently.
+
+    The dependency DAG is built from ``CoreOperation.operands`` once, when the
+    executor is constructed. ``run`` dispatches every operation whose operands
+    are available to a thread pool of ``max_workers`` threads (NumPy releases
+    the GIL inside its kernels). Ready operations are submitted in program
+    order and completions are processed in program order too.
+
+    Every operation runs the same kernel on the same operand arrays as in
+    ``Executor.run``, and kernels never write to their inputs. The outputs are
+    therefore bit-for-bit identical to serial execution, whatever order the
+    threads finish in (determinism.md, Tier 2). Buffers are released once
+    their last consumer has finished. ``peak_live_bytes`` depends on how
+    operations overlapped, so it can exceed the serial figure.
+
+    ``timings`` holds an ``OpTiming`` for every executed operation of the most
+    recent run, ``None`` for inputs. ``critical_path`` and ``levels`` describe
+    how much parallelism the module offers. Multithreaded BLAS builds already
+    parallelise large MatMuls, so limit their thread count (for example
+    ``OPENBLAS_NUM_THREADS``) when the module's own width is the parallelism
+    to exploit.
+    """
+
+    def __init__(
+        self, ir: CoreIR, kernels: Optional[Mapping[str, Kernel]] = None, max_workers: Optional[int] = None
+    ) -> None:
+        super().__init__(ir, kernels)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.timings: List[Optional[OpTiming]] = []
+
+        index_of: Dict[int, int] = {}
+        self.dependencies: List[Tuple[int, ...]] = []
+        self.dependents: List[List[int]] = [[] for _ in ir.operations]
+        self.level: List[int] = []
+        for index, op in enumerate(ir.operations):
+            producers = []
+            for operand in op.operands:
+                producer = index_of.get(operand)
+                if producer is None:
+                    raise ValueError(f"Operand %{operand} of %{op.value_id} is not defined before use")
+                if producer not in producers:
+                    producers.append(producer)
+                    self.dependents[producer].append(index)
+            self.dependencies.append(tuple(producers))
+            self.level.append(1 + max((self.level[p] for p in producers), default=-1))
+            index_of[op.value_id] = index
+
+    @property
+    def levels(self) -> List[List[int]]:
+        """Operation indices grouped by dependency level; level 0 has no operands."""
+
+        grouped: List[List[int]] = [[] for _ in range(max(self.level, default=-1) + 1)]
+        for index, level in enumerate(self.level):
+            grouped[level].append(index)
+        return grouped
+
+    def run(self, inputs: Mapping[str, Any]) -> List[np.ndarray]:
+        """Execute the module and return the output arrays in declaration order."""
+
+        values = self.bind_inputs(inputs)
+        live_bytes = sum(v.nbytes for v in values.values())
+        peak = live_bytes
+        operations = self.ir.operations
+        kernels = self.kernels
+        outputs = set(self.ir.outputs)
+        waiting = [len(producers) for producers in self.dependencies]
+        consumers = [len(dependents) for dependents in self.dependents]
+        timings: List[Optional[OpTiming]] = [None] * len(operations)
+        origin = time.perf_counter()
+
+        def execute(index: int) -> Tuple[np.ndarray, float, float, int]:
+            op = operations[index]
+            args = [values[operand] for operand in op.operands]
+            start = time.perf_counter()
+            result = np.asarray(kernels[op.opcode](op, args))
+            return result, start - origin, time.perf_counter() - origin, threading.get_ident()
+
+        def release(index: int) -> None:
+            nonlocal live_bytes
+            value_id = operations[index].value_id
+            if value_id not in outputs:
+                live_bytes -= values.pop(value_id).nbytes
+
+        ready: List[int] = []
+
+        def complete(index: int) -> None:
+            for producer in self.dependencies[index]:
+                consumers[producer] -= 1
+                if consumers[producer] == 0:
+                    release(producer)
+            if consumers[index] == 0:
+                release(index)
+            for dependent in self.dependents[index]:
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    heapq.heappush(ready, dependent)
+
+        for index, op in enumerate(operations):
+            if op.opcode == "Input":
+                complete(index)
+            elif not self.dependencies[index]:
+                heapq.heappush(ready, index)
+
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="core-ir")
+        running: Dict[Future, int] = {}
+        try:
+            while ready or running:
+                while ready:
+                    index = heapq.heappop(ready)
+                    running[pool.submit(execute, index)] = index
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in sorted(done, key=running.__getitem__):
+                    index = running.pop(future)
+                    result, start, end, thread = future.result()
+                    op = operations[index]
+                    values[op.value_id] = result
+                    timings[index] = OpTiming(index, op.value_id, op.opcode, start, end, thread)
+                    live_bytes += result.nbytes
+                    peak = max(peak, live_bytes)
+                    complete(index)
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+        self.timings = timings
+        self.peak_live_bytes = peak
+        return [values[output] for output in self.ir.outputs]
+
+    def critical_path(self) -> Tuple[float, List[int]]:
+        """Longest chain of dependent operations in the last run, weighted by measured time.
+
+        Returns the chain's total kernel time in seconds and its operation
+        indices in execution order. No run with enough workers can finish
+        faster than this. The sum of all ``timings`` divided by it bounds the
+        achievable speed-up.
+        """
+
+        if not self.timings:
+            raise RuntimeError("critical_path() needs a completed run()")
+        finish: List[float] = []
+        parent: List[Optional[int]] = []
+        for index, producers in enumerate(self.dependencies):
+            timing = self.timings[index]
+            before = max(producers, key=finish.__getitem__, default=None)
+            parent.append(before)
+            finish.append((finish[before] if before is not None else 0.0) + (timing.duration_s if timing else 0.0))
+        if not finish:
+            return 0.0, []
+        index: Optional[int] = max(range(len(finish)), key=finish.__getitem__)
+        total = finish[index]
+        path: List[int] = []
+        while index is not None:
+            path.append(index)
+            index = parent[index]
+        return total, path[::-1]
+
+
+def execute_parallel(
+    ir: CoreIR, inputs: Optional[Mapping[str, Any]] = None, max_workers: Optional[int] = None
+) -> List[np.ndarray]:
+    return ParallelExecutor(ir, max_workers=max_workers).run(inputs or {})
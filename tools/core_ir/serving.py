@@ -0,0 +1,649 @@
+"""
+Serve a Core IR module over HTTP with dynamic batching (spec/v1.0/runtime.md, "Model serving").
+
+The module is loaded and verified once. Concurrent ``/v1/infer`` requests are
+stacked along the leading batch dimension into batches of at most
+``max_batch_size`` rows, waiting at most ``max_wait_ms`` for a batch to fill,
+and run through the NumPy reference executor on a worker thread while the
+event loop keeps accepting requests. The server listens on TCP or on a Unix
+domain socket and speaks plain HTTP/1.1 with keep-alive:
+
+    POST /v1/infer        {"inputs": {"x": [[...], ...]}}  ->  {"outputs": [{"dtype", "shape", "values"}, ...]}
+    GET  /metrics         Prometheus text: request counters, latency quantiles, batch-size histogram
+    GET  /v1/metrics      the same as JSON
+    GET  /health/live     always 200 while the process runs
+    GET  /health/ready    200 when running and healthy, 503 otherwise
+
+Inputs may also be given as ``{"dtype", "shape", "values"}`` objects, the
+form outputs use.
+
+    python -m tools.core_ir.serving model.ir --port 8080 --max-batch-size 32 --max-wait-ms 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import signal
+import time
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .core_ir import CoreIR
+from .executor import DTYPES, Executor, _constant
+from .ir_parser import load_ir
+from .specialize import specialize_ir
+from .type_system import DYNAMIC_DIM, TensorType
+
+MAX_BODY_BYTES = 64 * 2**20
+
+CONSTANT_OPCODES = frozenset({"ConstI64", "ConstF32", "ConstF64", "ConstTensor"})
+
+STARTING, RUNNING, DRAINING, STOPPED = "Starting", "Running", "Draining", "Stopped"
+
+# Error rates above which readiness reports Degraded and Unhealthy.
+DEGRADED_ERROR_RATE = 0.10
+UNHEALTHY_ERROR_RATE = 0.50
+
+_DTYPE_NAMES = {np.dtype(dtype): name for name, dtype in DTYPES.items()}
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class RequestError(ValueError):
+    """A request the model cannot serve; answered with HTTP 400."""
+
+
+class Overloaded(RuntimeError):
+    """The batch queue is full or the server is draining; answered with HTTP 503."""
+
+
+def encode_array(array: np.ndarray) -> Dict[str, Any]:
+    return {"dtype": _DTYPE_NAMES[array.dtype], "shape": list(array.shape), "values": array.ravel().tolist()}
+
+
+def decode_array(value: Any, dtype: Optional[np.dtype] = None) -> np.ndarray:
+    if isinstance(value, Mapping):
+        dtype = dtype or np.dtype(DTYPES[value["dtype"]])
+        return np.asarray(value["values"], dtype=dtype).reshape(value["shape"])
+    return np.asarray(value, dtype=dtype)
+
+
+class BatchedModel:
+    """A ``CoreIR`` module evaluated on batches stacked along the leading dimension.
+
+    Every input and output must share the same leading dimension and all other
+    dimensions must be static. A symbolic leading dimension
+    (``tensor<f32[N, 4]>``) is bound to each batch's row count with
+    ``specialize_ir``. The ``max_cached_shapes`` most recent specialisations
+    keep their executors. A static leading dimension ``B`` caps batches at
+    ``B`` rows; smaller batches are zero-padded and the padding is dropped from
+    the outputs. Constants are converted to arrays once, when the model is
+    built, rather than on every run.
+    """
+
+    def __init__(self, ir: CoreIR, max_cached_shapes: int = 64) -> None:
+        ir.verify()
+        ir = ir.copy()
+        for op in ir.operations:
+            if op.opcode in CONSTANT_OPCODES:
+                op.attributes["value"] = _constant(op, [])
+        self.ir = ir
+        self.max_cached_shapes = max_cached_shapes
+        self.inputs: List[Tuple[str, np.dtype, Tuple[int, ...]]] = []
+        leading = set()
+        for op in ir.operations:
+            if op.opcode != "Input":
+                continue
+            name = op.attributes.get("name")
+            tensor_type = TensorType.parse(op.result_type) if op.result_type else None
+            if tensor_type is None or not tensor_type.shape:
+                raise ValueError(f"Input '{name}' needs a declared type with a leading batch dimension")
+            rest = tensor_type.shape[1:]
+            if not all(isinstance(dim, int) for dim in rest):
+                raise ValueError(f"Input '{name}' has symbolic dimensions after the batch dimension")
+            leading.add(tensor_type.shape[0])
+            self.inputs.append((name, np.dtype(DTYPES[tensor_type.dtype]), rest))
+        if len(leading) != 1:
+            raise ValueError(f"Inputs must share one leading batch dimension, found {sorted(map(str, leading))}")
+        (self.batch_dim,) = leading
+        if self.batch_dim == DYNAMIC_DIM:
+            raise ValueError("The batch dimension must be named or static, not '?'")
+
+        result_types = {op.value_id: op.result_type for op in ir.operations}
+        for output in ir.outputs:
+            shape = TensorType.parse(result_types[output]).shape if result_types[output] else ()
+            if not shape or shape[0] != self.batch_dim:
+                raise ValueError(f"Output %{output} does not keep the batch dimension {self.batch_dim}")
+
+        self.max_batch_size: Optional[int] = self.batch_dim if isinstance(self.batch_dim, int) else None
+        self._executors: "OrderedDict[int, Executor]" = OrderedDict()
+        if self.max_batch_size is not None:
+            self._executors[self.max_batch_size] = Executor(ir)
+
+    def prepare(self, payload: Any) -> Tuple[Dict[str, np.ndarray], int]:
+        """Convert a request's ``inputs`` to arrays and return them with their row count."""
+
+        if not isinstance(payload, Mapping):
+            raise RequestError("'inputs' must map input names to arrays")
+        unknown = set(payload) - {name for name, _, _ in self.inputs}
+        if unknown:
+            raise RequestError(f"Unknown inputs: {', '.join(sorted(unknown))}")
+        arrays: Dict[str, np.ndarray] = {}
+        rows: Optional[int] = None
+        for name, dtype, rest in self.inputs:
+            if name not in payload:
+                raise RequestError(f"Missing value for input '{name}'")
+            try:
+                array = decode_array(payload[name], dtype)
+            except (KeyError, TypeError, ValueError) as e:
+                raise RequestError(f"Input '{name}': {e}") from None
+            if array.ndim != len(rest) + 1 or array.shape[1:] != rest:
+                expected = ", ".join(["rows", *map(str, rest)])
+                raise RequestError(f"Input '{name}' has shape {array.shape}, expected ({expected})")
+            if rows is not None and array.shape[0] != rows:
+                raise RequestError(f"Input '{name}' has {array.shape[0]} rows, other inputs have {rows}")
+            rows = array.shape[0]
+            arrays[name] = array
+        if not rows:
+            raise RequestError("Requests need at least one row")
+        if self.max_batch_size is not None and rows > self.max_batch_size:
+            raise RequestError(f"Requests are limited to {self.max_batch_size} rows, got {rows}")
+        return arrays, rows
+
+    def _executor(self, rows: int) -> Executor:
+        executor = self._executors.get(rows)
+        if executor is not None:
+            self._executors.move_to_end(rows)
+            return executor
+        executor = self._executors[rows] = Executor(specialize_ir(self.ir, {self.batch_dim: rows}))
+        if len(self._executors) > self.max_cached_shapes:
+            self._executors.popitem(last=False)
+        return executor
+
+    def run(self, batch: Mapping[str, np.ndarray], rows: int) -> List[np.ndarray]:
+        """Evaluate a batch of ``rows`` rows and return the outputs trimmed to ``rows``."""
+
+        if self.max_batch_size is None:
+            return self._executor(rows).run(batch)
+        padding = self.max_batch_size - rows
+        if padding:
+            batch = {name: np.pad(array, [(0, padding)] + [(0, 0)] * (array.ndim - 1)) for name, array in batch.items()}
+        return [output[:rows] for output in self._executors[self.max_batch_size].run(batch)]
+
+
+class ServingMetrics:
+    """Request counters, a latency window and the batch-size histogram of one server.
+
+    Latency quantiles are computed over the most recent ``latency_window``
+    successful requests. Throughput is successful requests per second of
+    uptime.
+    """
+
+    def __init__(self, latency_window: int = 10_000) -> None:
+        self.started = time.monotonic()
+        self.requests_total = 0
+        self.requests_success = 0
+        self.requests_failed = 0
+        self.requests_active = 0
+        self.batches_total = 0
+        self.rows_total = 0
+        self.batch_sizes: Counter = Counter()
+        self.latencies: Deque[float] = deque(maxlen=latency_window)
+
+    def record_request(self, seconds: float, ok: bool) -> None:
+        if ok:
+            self.requests_success += 1
+            self.latencies.append(seconds)
+        else:
+            self.requests_failed += 1
+
+    def record_batch(self, requests: int, rows: int) -> None:
+        self.batches_total += 1
+        self.rows_total += rows
+        self.batch_sizes[requests] += 1
+
+    def latency_quantiles(self) -> Dict[str, float]:
+        ordered = sorted(self.latencies)
+        if not ordered:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+        return {f"p{q}": ordered[max(1, math.ceil(q / 100 * len(ordered))) - 1] for q in (50, 95, 99)}
+
+    def health(self) -> str:
+        finished = self.requests_success + self.requests_failed
+        error_rate = self.requests_failed / finished if finished else 0.0
+        if error_rate > UNHEALTHY_ERROR_RATE:
+            return "Unhealthy"
+        if error_rate > DEGRADED_ERROR_RATE:
+            return "Degraded"
+        return "Healthy"
+
+    def snapshot(self) -> Dict[str, Any]:
+        uptime = time.monotonic() - self.started
+        return {
+            "uptime_s": uptime,
+            "requests_total": self.requests_total,
+            "requests_success_total": self.requests_success,
+            "requests_failed_total": self.requests_failed,
+            "requests_active": self.requests_active,
+            "throughput_rps": self.requests_success / uptime if uptime > 0 else 0.0,
+            "latency_s": self.latency_quantiles(),
+            "batches_total": self.batches_total,
+            "rows_total": self.rows_total,
+            "mean_batch_size": self.requests_success / self.batches_total if self.batches_total else 0.0,
+            "batch_size_histogram": {str(size): count for size, count in sorted(self.batch_sizes.items())},
+        }
+
+    def prometheus(self) -> str:
+        snapshot = self.snapshot()
+        lines = [
+            "# TYPE mind_requests_total counter",
+            f"mind_requests_total {self.requests_total}",
+            "# TYPE mind_requests_success_total counter",
+            f"mind_requests_success_total {self.requests_success}",
+            "# TYPE mind_requests_failed_total counter",
+            f"mind_requests_failed_total {self.requests_failed}",
+            "# TYPE mind_requests_active gauge",
+            f"mind_requests_active {self.requests_active}",
+            "# TYPE mind_request_latency_us summary",
+        ]
+        for name, seconds in snapshot["latency_s"].items():
+            lines.append(f'mind_request_latency_us{{quantile="0.{name[1:]}"}} {seconds * 1e6:.1f}')
+        lines += [
+            f"mind_request_latency_us_count {len(self.latencies)}",
+            f"mind_request_latency_us_sum {sum(self.latencies) * 1e6:.1f}",
+            "# TYPE mind_batch_size histogram",
+        ]
+        cumulative = 0
+        largest = max(self.batch_sizes, default=1)
+        bound = 1
+        while True:
+            cumulative += sum(count for size, count in self.batch_sizes.items() if bound // 2 < size <= bound)
+            lines.append(f'mind_batch_size_bucket{{le="{bound}"}} {cumulative}')
+            if bound >= largest:
+                break
+            bound *= 2
+        lines += [
+            f'mind_batch_size_bucket{{le="+Inf"}} {self.batches_total}',
+            f"mind_batch_size_count {self.batches_total}",
+            f"mind_batch_size_sum {sum(size * count for size, count in self.batch_sizes.items())}",
+            "# TYPE mind_throughput_rps gauge",
+            f"mind_throughput_rps {snapshot['throughput_rps']:.3f}",
+            "# TYPE mind_uptime_seconds gauge",
+            f"mind_uptime_seconds {snapshot['uptime_s']:.3f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+_Pending = Tuple[Dict[str, np.ndarray], int, "asyncio.Future[List[np.ndarray]]"]
+
+
+class DynamicBatcher:
+    """Coalesces concurrent requests into batches along the leading dimension.
+
+    A batch opens with the oldest queued request and closes when it holds
+    ``max_batch_size`` rows, when the next request would not fit, or
+    ``max_wait_ms`` after it opened. Batches run one at a time on a worker
+    thread; requests arriving meanwhile queue up for the next batch. At most
+    ``max_queue`` requests may wait; beyond that ``submit`` raises
+    ``Overloaded``. ``close`` stops intake and drains the queue.
+
+    Results are deterministic for a given batch, but BLAS chooses kernels by
+    matrix size. The same request can therefore differ in the last bits
+    depending on the batch it lands in. Serve with ``max_batch_size=1`` when
+    results must not depend on concurrent traffic.
+    """
+
+    def __init__(
+        self,
+        model: BatchedModel,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 2.0,
+        max_queue: int = 1000,
+        metrics: Optional[ServingMetrics] = None,
+    ) -> None:
+        if model.max_batch_size is not None:
+            max_batch_size = min(max_batch_size, model.max_batch_size)
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1e3
+        self.max_queue = max_queue
+        self.metrics = metrics or ServingMetrics()
+        self._queue: "asyncio.Queue[Optional[_Pending]]" = asyncio.Queue()
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="core-ir-batch")
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, inputs: Any) -> List[np.ndarray]:
+        """Queue one request's inputs and return its rows of every output."""
+
+        if self._closing:
+            raise Overloaded("The server is draining")
+        arrays, rows = self.model.prepare(inputs)
+        if rows > self.max_batch_size:
+            raise RequestError(f"Requests are limited to {self.max_batch_size} rows, got {rows}")
+        if self._queue.qsize() >= self.max_queue:
+            raise Overloaded(f"More than {self.max_queue} requests are queued")
+        future: "asyncio.Future[List[np.ndarray]]" = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((arrays, rows, future))
+        return await future
+
+    async def close(self) -> None:
+        """Finish every queued request, then stop the batching task."""
+
+        self._closing = True
+        if self._task is not None:
+            self._queue.put_nowait(None)
+            await self._task
+        self._pool.shutdown(wait=True)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        carry: Optional[_Pending] = None
+        stopping = False
+        while not stopping:
+            first = carry if carry is not None else await self._queue.get()
+            carry = None
+            if first is None:
+                break
+            batch = [first]
+            rows = first[1]
+            deadline = loop.time() + self.max_wait
+            while rows < self.max_batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if item is None:
+                    stopping = True
+                    break
+                if rows + item[1] > self.max_batch_size:
+                    carry = item
+                    break
+                batch.append(item)
+                rows += item[1]
+            await self._execute(batch, rows)
+
+    async def _execute(self, batch: Sequence[_Pending], rows: int) -> None:
+        names = [name for name, _, _ in self.model.inputs]
+        if len(batch) == 1:
+            stacked = batch[0][0]
+        else:
+            stacked = {name: np.concatenate([arrays[name] for arrays, _, _ in batch]) for name in names}
+        try:
+            outputs = await asyncio.get_running_loop().run_in_executor(self._pool, self.model.run, stacked, rows)
+        except Exception as e:  # noqa: BLE001 - the failure belongs to every request of the batch
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self.metrics.record_batch(len(batch), rows)
+        offset = 0
+        for _, count, future in batch:
+            if not future.done():
+                future.set_result([output[offset : offset + count] for output in outputs])
+            offset += count
+
+
+class InferenceServer:
+    """HTTP front end for a ``DynamicBatcher``; see the module docstring for the routes.
+
+    ``state`` moves through Starting, Running, Draining and Stopped. ``stop``
+    closes the listener, answers requests already queued and then closes the
+    remaining connections.
+    """
+
+    def __init__(
+        self, model: BatchedModel, max_batch_size: int = 32, max_wait_ms: float = 2.0, max_queue: int = 1000
+    ) -> None:
+        self.model = model
+        self.metrics = ServingMetrics()
+        self.batcher_options = {"max_batch_size": max_batch_size, "max_wait_ms": max_wait_ms, "max_queue": max_queue}
+        self.batcher: Optional[DynamicBatcher] = None
+        self.state = STARTING
+        self.address: Union[Tuple[str, int], str, None] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Dict[asyncio.StreamWriter, asyncio.Task] = {}
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, unix_path: Optional[str] = None) -> None:
+        self.batcher = DynamicBatcher(self.model, metrics=self.metrics, **self.batcher_options)
+        self.batcher.start()
+        if unix_path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path=unix_path)
+            self.address = unix_path
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port)
+            self.address = self._server.sockets[0].getsockname()[:2]
+        self.state = RUNNING
+
+    async def stop(self) -> None:
+        if self.state in (DRAINING, STOPPED):
+            return
+        self.state = DRAINING
+        if self._server is not None:
+            self._server.close()
+        if self.batcher is not None:
+            await self.batcher.close()
+        for writer in list(self._connections):
+            writer.close()
+        await asyncio.gather(*self._connections.values(), return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+        self.state = STOPPED
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except ValueError as e:
+                    status, body, content_type = _json(400, {"error": str(e)})
+                    writer.write(_response(status, body, content_type, keep_alive=False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                status, body, content_type = await self._dispatch(method, path, body)
+                keep_alive = headers.get("connection", "").lower() != "close" and self.state == RUNNING
+                writer.write(_response(status, body, content_type, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, bytes, str]:
+        path = path.split("?", 1)[0]
+        if path == "/v1/infer":
+            if method != "POST":
+                return _json(405, {"error": "use POST"})
+            return await self._infer(body)
+        if method != "GET":
+            return _json(405 if path in ("/metrics", "/v1/metrics", "/health/live", "/health/ready") else 404, {})
+        if path == "/metrics":
+            return 200, self.metrics.prometheus().encode(), "text/plain; version=0.0.4"
+        if path == "/v1/metrics":
+            return _json(200, self.metrics.snapshot())
+        if path == "/health/live":
+            return _json(200, {"status": "alive"})
+        if path == "/health/ready":
+            health = self.metrics.health() if self.state == RUNNING else "Unhealthy"
+            return _json(200 if health != "Unhealthy" else 503, {"status": health, "state": self.state})
+        return _json(404, {"error": f"no route for {path}"})
+
+    async def _infer(self, body: bytes) -> Tuple[int, bytes, str]:
+        metrics = self.metrics
+        metrics.requests_total += 1
+        metrics.requests_active += 1
+        start = time.perf_counter()
+        try:
+            try:
+                inputs = json.loads(body)["inputs"]
+            except (ValueError, KeyError, TypeError):
+                raise RequestError("The body must be a JSON object with an 'inputs' member") from None
+            outputs = await self.batcher.submit(inputs)
+            response = _json(200, {"outputs": [encode_array(output) for output in outputs]})
+        except RequestError as e:
+            response = _json(400, {"error": str(e)})
+        except Overloaded as e:
+            response = _json(503, {"error": str(e)})
+        except Exception as e:  # noqa: BLE001 - kernel failures are reported to the client
+            response = _json(500, {"error": f"{type(e).__name__}: {e}"})
+        finally:
+            metrics.requests_active -= 1
+        metrics.record_request(time.perf_counter() - start, response[0] == 200)
+        return response
+
+
+def _json(status: int, payload: Any) -> Tuple[int, bytes, str]:
+    return status, json.dumps(payload).encode(), "application/json"
+
+
+def _response(status: int, body: bytes, content_type: str, keep_alive: bool) -> bytes:
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+async def _read_head(reader: asyncio.StreamReader) -> Optional[Tuple[str, Dict[str, str]]]:
+    line = await reader.readline()
+    if not line:
+        return None
+    headers: Dict[str, str] = {}
+    while True:
+        header = await reader.readline()
+        if header in (b"\r\n", b"\n", b""):
+            break
+        name, sep, value = header.decode("latin-1").partition(":")
+        if not sep:
+            raise ValueError(f"Malformed header line {header!r}")
+        headers[name.strip().lower()] = value.strip()
+    return line.decode("latin-1").rstrip("\r\n"), headers
+
+
+async def _read_body(reader: asyncio.StreamReader, headers: Mapping[str, str]) -> bytes:
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        raise ValueError("Malformed Content-Length") from None
+    if length < 0 or length > MAX_BODY_BYTES:
+        raise ValueError(f"Bodies are limited to {MAX_BODY_BYTES} bytes")
+    return await reader.readexactly(length) if length else b""
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+    head = await _read_head(reader)
+    if head is None:
+        return None
+    request_line, headers = head
+    parts = request_line.split(" ")
+    if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+        raise ValueError(f"Malformed request line {request_line!r}")
+    return parts[0], parts[1], headers, await _read_body(reader, headers)
+
+
+class Client:
+    """Minimal keep-alive HTTP client for an ``InferenceServer``, used by tests and the load generator."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, address: Union[Tuple[str, int], str]) -> "Client":
+        if isinstance(address, str):
+            reader, writer = await asyncio.open_unix_connection(address)
+        else:
+            reader, writer = await asyncio.open_connection(*address)
+        return cls(reader, writer)
+
+    async def request(self, method: str, path: str, payload: Any = None) -> Tuple[int, bytes]:
+        body = b"" if payload is None else json.dumps(payload).encode()
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1")
+            + body
+        )
+        await self.writer.drain()
+        head = await _read_head(self.reader)
+        if head is None:
+            raise ConnectionError("The server closed the connection")
+        status_line, headers = head
+        return int(status_line.split(" ")[1]), await _read_body(self.reader, headers)
+
+    async def infer(self, inputs: Mapping[str, Any]) -> List[np.ndarray]:
+        encoded = {name: encode_array(np.asarray(value)) for name, value in inputs.items()}
+        status, body = await self.request("POST", "/v1/infer", {"inputs": encoded})
+        payload = json.loads(body)
+        if status != 200:
+            raise RuntimeError(f"HTTP {status}: {payload.get('error')}")
+        return [decode_array(output) for output in payload["outputs"]]
+
+    async def close(self) -> None:
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def serve(model: BatchedModel, host: str, port: int, unix_path: Optional[str], **options: Any) -> None:
+    server = InferenceServer(model, **options)
+    await server.start(host, port, unix_path)
+    print(f"Serving on {server.address}", flush=True)
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stopped.set)
+    await stopped.wait()
+    await server.stop()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("module", help="Core IR module (.ir)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--unix", help="listen on this Unix domain socket instead of TCP")
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--max-queue", type=int, default=1000)
+    args = parser.parse_args(argv)
+    model = BatchedModel(load_ir(args.module))
+    options = {"max_batch_size": args.max_batch_size, "max_wait_ms": args.max_wait_ms, "max_queue": args.max_queue}
+    asyncio.run(serve(model, args.host, args.port, args.unix, **options))
+
+
+if __name__ == "__main__":
+    main()
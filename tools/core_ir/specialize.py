@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Dict, Mapping, Optional, Tuple
+
+from .core_ir import CoreIR, CoreOperation
+from .type_system import DimConstraints, TensorType
+
+# Attributes holding shapes that may mention symbolic dimensions.
+SHAPE_ATTRIBUTES = ("shape", "new_shape")
+
+
+def _specialize_shape(shape: object, extents: Mapping[str, int]) -> object:
+    if not isinstance(shape, (list, tuple)) or not any(isinstance(dim, str) for dim in shape):
+        return shape
+    return type(shape)(extents.get(dim, dim) if isinstance(dim, str) else dim for dim in shape)
+
+
+def specialize_ir(ir: CoreIR, extents: Mapping[str, int]) -> CoreIR:
+    """Return a copy of ``ir`` with symbolic dimensions replaced by ``extents``.
+
+    Result types are rewritten once per distinct type string, so the cost is
+    one pass over the operations plus one parse per distinct type. Shape-like
+    attributes (``SHAPE_ATTRIBUTES``) are substituted too; ``?`` dimensions and
+    names missing from ``extents`` are left as they are.
+    """
+
+    rewritten: Dict[str, str] = {}
+    specialized = CoreIR()
+    for op in ir.operations:
+        result_type = op.result_type
+        if result_type is not None:
+            new_type = rewritten.get(result_type)
+            if new_type is None:
+                tensor_type = TensorType.parse(result_type)
+                new_type = rewritten[result_type] = (
+                    result_type if tensor_type.is_static else str(tensor_type.specialize(extents))
+                )
+            result_type = new_type
+        attributes = op.attributes
+        if any(name in attributes for name in SHAPE_ATTRIBUTES):
+            attributes = dict(attributes)
+            for name in SHAPE_ATTRIBUTES:
+                if name in attributes:
+                    attributes[name] = _specialize_shape(attributes[name], extents)
+        specialized.operations.append(
+            CoreOperation(op.value_id, op.opcode, list(op.operands), attributes, result_type)
+        )
+    specialized.outputs = list(ir.outputs)
+    specialized._next_value_id = ir._next_value_id
+    return specialized
+
+
+class SpecializationCache:
+    """Concrete specialisations of one batch-polymorphic module.
+
+    ``ir`` is type-checked once with symbolic dimensions; ``specialize`` binds
+    them (``{"N": 32}``), solves the bindings against ``constraints`` (the
+    equations recorded while checking ``ir``) and returns the module with
+    concrete shapes. Results are kept in an LRU of ``maxsize`` entries keyed by
+    the solved extents, so a batch size seen before costs a lookup and a new
+    one a single substitution pass instead of a recompile. Returned modules are
+    shared between callers; copy them (``CoreIR.copy``) before mutating.
+
+    ``hits``, ``misses`` and ``evictions`` count lookups served from the LRU,
+    specialisations built and entries dropped.
+    """
+
+    def __init__(self, ir: CoreIR, constraints: Optional[DimConstraints] = None, maxsize: int = 64) -> None:
+        self.ir = ir
+        self.constraints = constraints or DimConstraints()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Tuple[Tuple[str, int], ...], CoreIR]" = OrderedDict()
+        types = {op.result_type for op in ir.operations if op.result_type is not None}
+        self.symbols = frozenset().union(*(TensorType.parse(text).symbols for text in types))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def specialize(self, bindings: Mapping[str, int]) -> CoreIR:
+        """Return ``ir`` with every symbolic dimension bound; see ``DimConstraints.solve``."""
+
+        extents = self.constraints.solve(bindings, self.symbols)
+        key = tuple(extents.items())
+        specialized = self._entries.get(key)
+        if specialized is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return specialized
+
+        self.misses += 1
+        specialized = specialize_ir(self.ir, extents)
+        if self.maxsize > 0:
+            self._entries[key] = specialized
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return specialized
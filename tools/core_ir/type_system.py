@@ -1,15 +1,47 @@
 from __future__ import annotations
 
+import re
+import sys
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Dict, Iterable, Sequence
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
 
 from .core_ir import CoreIR
 
 
+# Storage size in bytes of one element of each dtype.
+DTYPE_SIZES: Dict[str, int] = {
+    "bool": 1,
+    "i8": 1,
+    "u8": 1,
+    "i16": 2,
+    "u16": 2,
+    "f16": 2,
+    "bf16": 2,
+    "i32": 4,
+    "u32": 4,
+    "f32": 4,
+    "i64": 8,
+    "u64": 8,
+    "f64": 8,
+}
+
+FLOAT_DTYPES = frozenset({"f16", "bf16", "f32", "f64"})
+
+# A dimension is a concrete extent, a symbolic name such as ``N`` (equal
+# wherever it appears) or the anonymous dynamic dimension ``?``.
+Dim = Union[int, str]
+DYNAMIC_DIM = "?"
+
+# Shape dimensions paired by broadcasting or matmul that must be equal.
+Equations = Tuple[Tuple[Dim, Dim], ...]
+
+
 @dataclass(frozen=True)
 class TensorType:
     dtype: str
-    shape: tuple[int, ...] = ()
+    shape: tuple[Dim, ...] = ()
 
     def __str__(self) -> str:  # pragma: no cover - simple representation
         shape_suffix = f"[{', '.join(map(str, self.shape))}]" if self.shape else "[]"
@@ -18,10 +50,235 @@ class TensorType:
     def is_scalar(self) -> bool:
         return not self.shape
 
+    @property
+    def is_static(self) -> bool:
+        return all(isinstance(dim, int) for dim in self.shape)
+
+    @property
+    def symbols(self) -> frozenset[str]:
+        """Named symbolic dimensions in the shape (``?`` excluded)."""
+
+        return frozenset(dim for dim in self.shape if isinstance(dim, str) and dim != DYNAMIC_DIM)
+
+    def specialize(self, extents: Mapping[str, int]) -> "TensorType":
+        """Substitute bound symbolic dimensions; unbound names and ``?`` are kept."""
+
+        if self.is_static:
+            return self
+        shape = tuple(extents.get(dim, dim) if isinstance(dim, str) else dim for dim in self.shape)
+        return TensorType(self.dtype, shape)
+
+    @classmethod
+    def parse(cls, text: str) -> "TensorType":
+        """Parse a ``tensor<f32[2, 3]>`` or spec-style ``Tensor<f32, [2, 3]>`` string.
+
+        Dimensions may be integers, symbolic names (``N``) or ``?``. Results
+        are interned, so equal strings share one ``TensorType``.
+        """
+
+        return _parse_tensor_type(text)
+
     @property
     def rank(self) -> int:
         return len(self.shape)
 
+    @property
+    def num_elements(self) -> int:
+        if not self.is_static:
+            raise TypeError(f"Tensor type {self} has symbolic dimensions")
+        count = 1
+        for dim in self.shape:
+            count *= dim
+        return count
+
+    @property
+    def nbytes(self) -> int:
+        try:
+            return self.num_elements * DTYPE_SIZES[self.dtype]
+        except KeyError as exc:
+            raise TypeError(f"Unknown dtype '{self.dtype}'") from exc
+
+
+_TENSOR_TYPE_PATTERN = re.compile(r"\s*[Tt]ensor<\s*(\w+)\s*,?\s*\[([^\]]*)\]\s*>\s*")
+
+
+@lru_cache(maxsize=4096)
+def _parse_tensor_type(text: str) -> TensorType:
+    match = _TENSOR_TYPE_PATTERN.fullmatch(text)
+    if match is None:
+        raise ValueError(f"Malformed tensor type '{text}'")
+    dims = match.group(2).strip()
+    shape: List[Dim] = []
+    for dim in dims.split(",") if dims else ():
+        dim = dim.strip()
+        if dim == DYNAMIC_DIM or dim.isidentifier():
+            shape.append(sys.intern(dim))
+            continue
+        try:
+            shape.append(int(dim))
+        except ValueError as exc:
+            raise ValueError(f"Malformed tensor type '{text}'") from exc
+    return TensorType(match.group(1), tuple(shape))
+
+
+class DimConstraints:
+    """Equalities between symbolic dimensions, solved by union-find.
+
+    Broadcasting and matmul record an equation whenever they pair two
+    different named dimensions, or a named dimension with an extent other than
+    1. Each class of equal names is represented by its alphabetically first
+    member and may be bound to one concrete extent; a conflicting equation
+    raises ``ValueError``. ``?`` dimensions are anonymous and never
+    constrained.
+    """
+
+    def __init__(self) -> None:
+        self._parent: Dict[str, str] = {}
+        self._extent: Dict[str, int] = {}
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, DimConstraints) and self.equations() == other.equations()
+
+    def __repr__(self) -> str:
+        return f"DimConstraints({list(self.equations())})"
+
+    def copy(self) -> "DimConstraints":
+        clone = DimConstraints()
+        clone._parent = dict(self._parent)
+        clone._extent = dict(self._extent)
+        return clone
+
+    def find(self, name: str) -> str:
+        root = name
+        while root in self._parent:
+            root = self._parent[root]
+        while name != root:
+            parent = self._parent[name]
+            self._parent[name] = root
+            name = parent
+        return root
+
+    def resolve(self, dim: Dim) -> Dim:
+        """Return ``dim``'s extent if known, else its class representative."""
+
+        if not isinstance(dim, str) or dim == DYNAMIC_DIM:
+            return dim
+        root = self.find(dim)
+        return self._extent.get(root, root)
+
+    def resolve_shape(self, shape: Sequence[Dim]) -> tuple[Dim, ...]:
+        if not self._parent and not self._extent:
+            return tuple(shape)
+        return tuple(self.resolve(dim) for dim in shape)
+
+    def unify(self, lhs: Dim, rhs: Dim) -> None:
+        left, right = self.resolve(lhs), self.resolve(rhs)
+        if left == right or DYNAMIC_DIM in (left, right):
+            return
+        if isinstance(left, int) and isinstance(right, int):
+            raise ValueError(f"Dimension {lhs} = {left} conflicts with {rhs} = {right}")
+        if isinstance(left, int):
+            left, right = right, left
+        if isinstance(right, int):
+            self._extent[left] = right
+        else:
+            first, second = sorted((left, right))
+            self._parent[second] = first
+
+    def equations(self) -> Equations:
+        """Every constrained name with what it resolves to, in sorted order."""
+
+        names = set(self._parent) | set(self._extent)
+        return tuple((name, self.resolve(name)) for name in sorted(names) if self.resolve(name) != name)
+
+    def solve(self, bindings: Mapping[str, int], names: Iterable[str]) -> Dict[str, int]:
+        """Extend ``bindings`` to an extent for every name in ``names``.
+
+        Raises ``ValueError`` if a binding is not a positive integer, names an
+        unknown dimension, contradicts a recorded equation or another binding
+        of the same class, or if some name is left unbound.
+        """
+
+        names = set(names)
+        known = names.union(self._parent, self._parent.values(), self._extent)
+        extents: Dict[str, int] = {}
+        for name, extent in bindings.items():
+            if isinstance(extent, bool) or not isinstance(extent, int) or extent <= 0:
+                raise ValueError(f"Dimension {name} must be bound to a positive integer, got {extent!r}")
+            if name not in known:
+                raise ValueError(f"Unknown symbolic dimension '{name}'")
+            root = self.resolve(name)
+            if isinstance(root, int):
+                if root != extent:
+                    raise ValueError(f"Dimension {name} is constrained to {root}, cannot bind {extent}")
+                continue
+            if extents.setdefault(root, extent) != extent:
+                raise ValueError(f"Dimension {name} is bound to both {extents[root]} and {extent}")
+
+        solved: Dict[str, int] = {}
+        for name in sorted(names):
+            root = self.resolve(name)
+            extent = root if isinstance(root, int) else extents.get(root)
+            if extent is None:
+                raise ValueError(f"Symbolic dimension '{name}' is not bound")
+            solved[name] = extent
+        return solved
+
+
+class ShapeCache:
+    """Bounded LRU memo for pure shape computations.
+
+    Failures are memoized too: the exception type and arguments are stored and
+    a fresh exception is raised on every hit, so repeated invalid candidates
+    cost a lookup rather than a recomputation. ``maxsize=0`` disables caching.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[bool, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def lookup(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        else:
+            self.misses += 1
+            try:
+                entry = (True, compute())
+            except (TypeError, ValueError) as exc:
+                entry = (False, (type(exc), exc.args))
+            if self.maxsize > 0:
+                self._entries[key] = entry
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+
+        ok, value = entry
+        if ok:
+            return value
+        exc_type, args = value
+        raise exc_type(*args)
+
+
+@dataclass(frozen=True)
+class TypeCheckResult:
+    """Outcome of checking one expression in ``TypeSystem.check_batch``."""
+
+    tensor_type: Optional[TensorType] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
 
 class TypeSystem:
     """Minimal type environment for static validation.
@@ -31,20 +288,36 @@ class TypeSystem:
     dimensions, broadcasting for elementwise operations, and batched matmul
     validation. Inputs are materialised directly into the Core IR module to keep
     value numbering deterministic.
+
+    Shapes may contain symbolic dimensions (``N``) and ``?``. Broadcasting and
+    matmul resolve them through ``dims`` and record the equations they imply
+    there, so a batch-polymorphic program is checked once and later bound to
+    concrete extents with ``DimConstraints.solve``.
+
+    Broadcast and matmul shape results are memoized by resolved shape tuple in
+    bounded LRU caches of ``shape_cache_size`` entries each.
     """
 
-    def __init__(self, known_dtypes: Iterable[str] | None = None) -> None:
+    def __init__(self, known_dtypes: Iterable[str] | None = None, shape_cache_size: int = 1024) -> None:
         self.known_dtypes = set(known_dtypes or {"i32", "i64", "f32", "f64"})
         self.symbols: Dict[str, TensorType] = {}
+        self.broadcast_cache = ShapeCache(shape_cache_size)
+        self.matmul_cache = ShapeCache(shape_cache_size)
+        self.dims = DimConstraints()
         self._materialized_symbols: Dict[str, int] = {}
+        self._materialized_ir: CoreIR | None = None
 
     def ensure_known_dtype(self, dtype: str) -> None:
         if dtype not in self.known_dtypes:
             raise TypeError(f"Unknown dtype '{dtype}'")
 
-    def validate_shape(self, shape: Sequence[int]) -> None:
-        if any(d <= 0 for d in shape):
-            raise ValueError("Shape dimensions must be positive integers")
+    def validate_shape(self, shape: Sequence[Dim]) -> None:
+        for d in shape:
+            if isinstance(d, str):
+                if d != DYNAMIC_DIM and not d.isidentifier():
+                    raise ValueError(f"Invalid symbolic dimension '{d}'")
+            elif d <= 0:
+                raise ValueError("Shape dimensions must be positive integers")
 
     def validate_tensor(self, tensor: TensorType) -> TensorType:
         self.ensure_known_dtype(tensor.dtype)
@@ -61,30 +334,27 @@ class TypeSystem:
             raise TypeError(f"Symbol '{name}' is not declared") from exc
 
     def materialize_symbol(self, ir: CoreIR, name: str, tensor_type: TensorType) -> int:
+        if ir is not self._materialized_ir:
+            # Value ids are only meaningful within one module; recompiling
+            # into a fresh module must declare its inputs again.
+            self._materialized_ir = ir
+            self._materialized_symbols = {}
         if name not in self._materialized_symbols:
             value_id = ir.declare_input(name, result_type=str(tensor_type))
             self._materialized_symbols[name] = value_id
         return self._materialized_symbols[name]
 
-    def broadcast_shapes(self, lhs: Sequence[int], rhs: Sequence[int]) -> tuple[int, ...]:
-        lhs_rev = list(reversed(lhs))
-        rhs_rev = list(reversed(rhs))
-        result: list[int] = []
-
-        for i in range(max(len(lhs_rev), len(rhs_rev))):
-            ldim = lhs_rev[i] if i < len(lhs_rev) else 1
-            rdim = rhs_rev[i] if i < len(rhs_rev) else 1
-
-            if ldim == rdim:
-                result.append(ldim)
-            elif ldim == 1:
-                result.append(rdim)
-            elif rdim == 1:
-                result.append(ldim)
-            else:
-                raise ValueError(f"Shapes are not broadcastable: {tuple(lhs)} vs {tuple(rhs)}")
+    def broadcast_shapes(self, lhs: Sequence[Dim], rhs: Sequence[Dim]) -> tuple[Dim, ...]:
+        lhs, rhs = self.dims.resolve_shape(lhs), self.dims.resolve_shape(rhs)
+        shape, equations = self.broadcast_cache.lookup((lhs, rhs), lambda: _broadcast_dims(lhs, rhs))
+        return self._apply(shape, equations)
 
-        return tuple(reversed(result))
+    def _apply(self, shape: tuple[Dim, ...], equations: Equations) -> tuple[Dim, ...]:
+        if not equations:
+            return shape
+        for lhs, rhs in equations:
+            self.dims.unify(lhs, rhs)
+        return self.dims.resolve_shape(shape)
 
     def validate_binop(self, op: str, lhs: TensorType, rhs: TensorType) -> TensorType:
         lhs = self.validate_tensor(lhs)
@@ -99,17 +369,99 @@ class TypeSystem:
     def validate_matmul(self, lhs: TensorType, rhs: TensorType) -> TensorType:
         lhs = self.validate_tensor(lhs)
         rhs = self.validate_tensor(rhs)
-
-        if lhs.rank < 2 or rhs.rank < 2:
-            raise ValueError("MatMul requires tensors of rank 2 or greater")
-
-        if lhs.shape[-1] != rhs.shape[-2]:
-            raise ValueError(f"Matmul dimension mismatch: {lhs.shape[-1]} != {rhs.shape[-2]}")
-
-        batch_shape = self.broadcast_shapes(lhs.shape[:-2], rhs.shape[:-2])
-        return TensorType(lhs.dtype, batch_shape + (lhs.shape[-2], rhs.shape[-1]))
+        lhs_shape, rhs_shape = self.dims.resolve_shape(lhs.shape), self.dims.resolve_shape(rhs.shape)
+        shape, equations = self.matmul_cache.lookup(
+            (lhs_shape, rhs_shape), lambda: _matmul_dims(lhs_shape, rhs_shape)
+        )
+        return TensorType(lhs.dtype, self._apply(shape, equations))
 
     def validate_program(self) -> None:
         for name, tensor_type in self.symbols.items():
             self.validate_tensor(tensor_type)
 
+    def check_batch(self, expressions: Iterable[Any], cache: Any = None) -> List[TypeCheckResult]:
+        """Type-check many expressions against this environment without raising.
+
+        The symbol table is validated once for the whole batch. Each expression
+        yields a ``TypeCheckResult`` holding either its inferred type or the
+        ``TypeError``/``ValueError`` that rejected it. Passing a
+        ``language.TypeCache`` shares inferred types between candidates that
+        reuse expression nodes; without one, each call uses a private cache, so
+        inference is iterative and deep expressions cannot exhaust the
+        recursion limit. Dimension equations recorded by a rejected candidate
+        are rolled back (clearing ``cache`` if there were any).
+        """
+
+        try:
+            self.validate_program()
+        except (TypeError, ValueError) as exc:
+            return [TypeCheckResult(error=exc) for _ in expressions]
+
+        if cache is None:
+            from .language import TypeCache  # language imports this module
+
+            cache = TypeCache()
+        cache.begin(self)
+        results: List[TypeCheckResult] = []
+        for expression in expressions:
+            dims = self.dims.copy()
+            try:
+                tensor_type = cache.infer(expression, self)
+            except (TypeError, ValueError) as exc:
+                if dims != self.dims:
+                    # Cached subexpression types may depend on the discarded
+                    # equations without recording them again on a hit.
+                    self.dims = dims
+                    cache.clear()
+                results.append(TypeCheckResult(error=exc))
+            else:
+                results.append(TypeCheckResult(tensor_type=tensor_type))
+        return results
+
+
+def _broadcast_dims(lhs: Sequence[Dim], rhs: Sequence[Dim]) -> Tuple[tuple[Dim, ...], Equations]:
+    """Broadcast two resolved shapes, returning the shape and implied equations.
+
+    A named dimension paired with an extent other than 1 is taken to equal it
+    (it is not assumed to broadcast), and two different names are equated.
+    ``?`` adopts whatever it is paired with.
+    """
+
+    lhs_rev = list(reversed(lhs))
+    rhs_rev = list(reversed(rhs))
+    result: list[Dim] = []
+    equations: list[Tuple[Dim, Dim]] = []
+
+    for i in range(max(len(lhs_rev), len(rhs_rev))):
+        ldim = lhs_rev[i] if i < len(lhs_rev) else 1
+        rdim = rhs_rev[i] if i < len(rhs_rev) else 1
+
+        if ldim == rdim or rdim == 1:
+            result.append(ldim)
+        elif ldim == 1:
+            result.append(rdim)
+        elif rdim == DYNAMIC_DIM:
+            result.append(ldim)
+        elif ldim == DYNAMIC_DIM:
+            result.append(rdim)
+        elif isinstance(ldim, int) and isinstance(rdim, int):
+            raise ValueError(f"Shapes are not broadcastable: {tuple(lhs)} vs {tuple(rhs)}")
+        else:
+            equations.append((ldim, rdim))
+            result.append(rdim if isinstance(rdim, int) else ldim)
+
+    return tuple(reversed(result)), tuple(equations)
+
+
+def _matmul_dims(lhs: tuple[Dim, ...], rhs: tuple[Dim, ...]) -> Tuple[tuple[Dim, ...], Equations]:
+    if len(lhs) < 2 or len(rhs) < 2:
+        raise ValueError("MatMul requires tensors of rank 2 or greater")
+
+    equations: Equations = ()
+    if lhs[-1] != rhs[-2] and DYNAMIC_DIM not in (lhs[-1], rhs[-2]):
+        if isinstance(lhs[-1], int) and isinstance(rhs[-2], int):
+            raise ValueError(f"Matmul dimension mismatch: {lhs[-1]} != {rhs[-2]}")
+        equations = ((lhs[-1], rhs[-2]),)
+
+    batch_shape, batch_equations = _broadcast_dims(lhs[:-2], rhs[:-2])
+    return batch_shape + (lhs[-2], rhs[-1]), equations + batch_equations
@@ -0,0 +1,597 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .core_ir import CoreIR, CoreOperation
+from .type_system import DTYPE_SIZES, FLOAT_DTYPES, TensorType, TypeSystem
+
+INDEX_DTYPES = frozenset({"i32", "i64"})
+
+
+@dataclass(frozen=True)
+class Diagnostic:
+    """One verification failure, formatted as ``E<code>: <message>``.
+
+    ``index`` is the offending instruction's position in the module, or
+    ``None`` for module-level failures such as undefined outputs.
+    """
+
+    code: str
+    message: str
+    index: Optional[int] = None
+    value_id: Optional[int] = None
+
+    def __str__(self) -> str:
+        return f"{self.code}: {self.message}"
+
+
+class VerificationError(ValueError):
+    """Raised by ``verify`` with every diagnostic it collected."""
+
+    def __init__(self, diagnostics: Sequence[Diagnostic]) -> None:
+        self.diagnostics = list(diagnostics)
+        super().__init__("\n".join(str(d) for d in self.diagnostics))
+
+
+class RuleViolation(Exception):
+    """Raised by an opcode rule; converted to a ``Diagnostic`` by the verifier."""
+
+    def __init__(self, code: str, message: str) -> None:
+        super().__init__(code, message)
+        self.code = code
+        self.message = message
+
+
+# A rule receives the operation, its operand types and a ``TypeSystem`` for
+# memoized broadcasting, and returns the result type the operation must have.
+Rule = Callable[[CoreOperation, Sequence[TensorType], TypeSystem], TensorType]
+
+
+def _same_dtype(op: CoreOperation, lhs: TensorType, rhs: TensorType) -> None:
+    if lhs.dtype != rhs.dtype:
+        raise RuleViolation("E2004", f"Dtype mismatch in {op.opcode} %{op.value_id}: {lhs.dtype} and {rhs.dtype}")
+
+
+def _broadcast(op: CoreOperation, lhs: Sequence[int], rhs: Sequence[int], ts: TypeSystem) -> Tuple[int, ...]:
+    try:
+        return ts.broadcast_shapes(lhs, rhs)
+    except ValueError:
+        raise RuleViolation(
+            "E3001",
+            f"Broadcasting failed in {op.opcode} %{op.value_id}: shape {list(lhs)} incompatible with {list(rhs)}",
+        ) from None
+
+
+def _is_int(value: object) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _int_list(op: CoreOperation, name: str, value: Any, code: str) -> List[int]:
+    """``value`` of attribute ``name`` as a list of integers; anything else is a ``code`` violation."""
+
+    if not isinstance(value, (list, tuple)) or not all(_is_int(item) for item in value):
+        raise RuleViolation(
+            code, f"{op.opcode} %{op.value_id} has invalid {name} {value!r}: must be a list of integers"
+        )
+    return list(value)
+
+
+def _normalize_axes(op: CoreOperation, axes: Sequence[int], rank: int) -> List[int]:
+    axes = _int_list(op, "axes", axes, "E3004")
+    normalized: List[int] = []
+    for axis in axes:
+        if not -rank <= axis < rank:
+            raise RuleViolation("E3004", f"{op.opcode} %{op.value_id} axis {axis} out of range for rank-{rank} tensor")
+        axis = axis + rank if axis < 0 else axis
+        if axis in normalized:
+            raise RuleViolation("E3005", f"{op.opcode} %{op.value_id} has duplicate axis {axis} in axes {list(axes)}")
+        normalized.append(axis)
+    return normalized
+
+
+def _constant(dtype: str) -> Rule:
+    return lambda op, args, ts: TensorType(dtype, ())
+
+
+def _literal_shape(value: Any) -> Optional[Tuple[int, ...]]:
+    """Shape of a nested-list literal, or ``None`` if it is ragged."""
+
+    shape = getattr(value, "shape", None)
+    if shape is not None:
+        return tuple(shape)
+    dims: List[int] = []
+    level = [value]
+    while level and isinstance(level[0], (list, tuple)):
+        extent = len(level[0])
+        if any(not isinstance(item, (list, tuple)) or len(item) != extent for item in level):
+            return None
+        dims.append(extent)
+        level = [child for item in level for child in item]
+    if any(isinstance(item, (list, tuple)) for item in level):
+        return None
+    return tuple(dims)
+
+
+def _const_tensor(op: CoreOperation, args: Sequence[TensorType], ts: TypeSystem) -> TensorType:
+    dtype = op.attributes.get("dtype")
+    shape = op.attributes.get("shape", ())
+    if dtype not in DTYPE_SIZES:
+        raise RuleViolation("E4005", f"ConstTensor %{op.value_id} has invalid dtype {dtype!r}")
+    if not isinstance(shape, (list, tuple)) or not all(_is_int(dim) or isinstance(dim, str) for dim in shape):
+        raise RuleViolation("E4005", f"ConstTensor %{op.value_id} has invalid shape {shape!r}")
+    shape = tuple(shape)
+    # Symbolic dimensions are bound at run time; only the static ones are checked here.
+    if any(_is_int(dim) and dim <= 0 for dim in shape):
+        raise RuleViolation("E4005", f"ConstTensor %{op.value_id} has non-positive dimension in shape {list(shape)}")
+    literal = _literal_shape(op.attributes.get("value"))
+    if literal is None:
+        raise RuleViolation("E4005", f"ConstTensor %{op.value_id} literal is ragged")
+    # A scalar literal splats over the declared shape; any other literal is
+    # reshaped, so only its element count has to match. With symbolic
+    # dimensions the count must be a multiple of the static extents.
+    if literal:
+        static = all(_is_int(dim) for dim in shape)
+        found = TensorType(dtype, literal).num_elements
+        expected = TensorType(dtype, tuple(dim for dim in shape if _is_int(dim))).num_elements
+        if found != expected if static else found % expected:
+            raise RuleViolation(
+                "E4005",
+                f"ConstTensor %{op.value_id} element count mismatch: shape {list(shape)} requires "
+                f"{'' if static else 'a multiple of '}{expected} elements, "
+                f"found literal of shape {list(literal)} ({found} elements)",
+            )
+    return TensorType(dtype, shape)
+
+
+def _binary(op: CoreOperation, args: Sequence[TensorType], ts: TypeSystem) -> TensorType:
+    lhs, rhs = args
+    _same_dtype(op, lhs, rhs)
+    return TensorType(lhs.dtype, _broadcast(op, lhs.shape, rhs.shape, ts))
+
+
+def _reduction(op: CoreOperation, args: Sequence[TensorType], ts: TypeSystem) -> TensorType:
+    (x,) = args
+    axes = _normalize_axes(op, op.attributes.get("axes") or (), x.rank)
+    if not axes:
+        return TensorType(x.dtype, ())
+    if op.attributes.get("keepdims", False):
+        return TensorType(x.dtype, tuple(1 if i in axes else d for i, d in enumerate(x.shape)))
+    return TensorType(x.dtype, tuple(d for i, d in enumerate(x.shape) if i not in axes))
+
+
+def _reshape(op: CoreOperation, args: Sequence[TensorType], ts: TypeSystem) -> TensorType:
+    (x,) = args
+    new_shape = _int_list(op, "new_shape", op.attributes.get("new_shape", ()), "E3006")
+    if new_shape.count(-1) > 1:
+        raise RuleViolation("E3006", f"Reshape %{op.value_id} has more than one inferred dimension in {new_shape}")
+    known = 1
+    for i, dim in enumerate(new_shape):
+        if dim == -1:
+            continue
+        if dim <= 0:
+            raise RuleViolation("E3006", f"Invalid dimension {dim} in shape {new_shape} at index {i}")
+        known *= dim
+    count = x.num_elements
+    inferred = -1 in new_shape
+    if inferred and count % known == 0:
+        new_shape[new_shape.index(-1)] = count // known
+    elif known != count:
+        raise RuleViolation(
+            "E3007",
+            f"Element count mismatch in Reshape %{op.value_id}: {list(x.shape)} ({count} elements) "
+            f"to {new_shape} ({'a multiple of ' if inferred else ''}{known} elements)",
+        )
+    return TensorType(x.dtype, tuple(new_shape))
+
+
+def _transpose(op: CoreOperation, args: Sequence[TensorType], ts: TypeSystem) -> TensorType:
+    (x,) = args
+    permutation = op.attributes.get("permutation")
+    if permutation is None:
+        return TensorType(x.dtype, tuple(reversed(x.shape)))
+    permutation = _int_list(op, "permutation", permutation, "E3008")
+    if len(permutation) != x.rank:
+        raise RuleViolation(
+            "E3008", f"Transpose permutation {permutation} has length {len(permutation)} for rank-{x.rank} tensor"
+        )
+    seen = [False] * x.rank
+    for axis in permutation:
+        if not 0 <= axis < x.rank:
+            raise RuleViolation("E3008", f"Transpose permutation {permutation} has out-of-range axis {axis}")
+        if seen[axis]:
+            raise RuleViolation(
+                "E3008", f"Transpose permutation {permutation} has duplicate axis {axis} for rank-{x.rank} tensor"
+            )
+        seen[axis] = True
+    return TensorType(x.dtype, tuple(x.shape[axis] for axis in permutation))
+
+
+def _expand_dims(op: CoreOperation, args: Sequence[TensorType], ts: TypeSystem) -> TensorType:
+    (x,) = args
+    shape = list(x.shape)
+    axes = _int_list(op, "axes", op.attributes.get("axes", ()), "E3004")
+    for axis in sorted(axes):
+        if not 0 <= axis <= len(shape):
+            raise RuleViolation(
+                "E3004", f"ExpandDims %{op.value_id} axis {axis} out of range for rank-{len(shape)} tensor"
+            )
+        shape.insert(axis, 1)
+    return TensorType(x.dtype, tuple(shape))
+
+
+def _squeeze(op: CoreOperation, args: Sequence[TensorType], ts: TypeSystem) -> TensorType:
+    (x,) = args
+    axes = _int_list(op, "axes", op.attributes.get("axes", ()), "E3004")
+    for axis in axes:
+        if not 0 <= axis < x.rank:
+            raise RuleViolation("E3004", f"Squeeze %{op.value_id} axis {axis} out of range for rank-{x.rank} tensor")
+    axes = _normalize_axes(op, axes, x.rank)
+    for axis in axes:
+        if x.shape[axis] != 1:
+            raise RuleViolation(
+                "E3009", f"Squeeze axis {axis} has extent {x.shape[axis]}, must be 1 in shape {list(x.shape)}"
+            )
+    return TensorType(x.dtype, tuple(d for i, d in enumerate(x.shape) if i not in axes))
+
+
+def _index(op: CoreOperation, args: Sequence[TensorType], ts: TypeSystem) -> TensorType:
+    (x,) = args
+    indices = _int_list(op, "indices", op.attributes.get("indices", ()), "E4006")
+    if len(indices) != x.rank:
+        raise RuleViolation("E4006", f"Index %{op.value_id} has {len(indices)} indices for rank-{x.rank} tensor")
+    return TensorType(x.dtype, ())
+
+
+def _slice(op: CoreOperation, args: Sequence[TensorType], ts: TypeSystem) -> TensorType:
+    (x,) = args
+    starts = _int_list(op, "starts", op.attributes.get("starts", ()), "E4007")
+    ends = _int_list(op, "ends", op.attributes.get("ends", ()), "E4007")
+    steps = _int_list(op, "steps", op.attributes.get("steps") or [1] * len(starts), "E4008")
+    if not len(starts) == len(ends) == len(steps) == x.rank:
+        raise RuleViolation(
+            "E4007",
+            f"Slice %{op.value_id} starts/ends/steps length mismatch: "
+            f"{len(starts)}/{len(ends)}/{len(steps)} for rank-{x.rank} tensor",
+        )
+    for dim, step in enumerate(steps):
+        if step <= 0:
+            reason = "zero" if step == 0 else "negative"
+            raise RuleViolation("E4008", f"Slice %{op.value_id} has {reason} step at dimension {dim}")
+    # Negative starts/ends clamp to zero; ends beyond the extent clamp to it.
+    shape = tuple(
+        len(range(min(max(s, 0), d), min(max(e, 0), d), st)) for s, e, st, d in zip(starts, ends, steps, x.shape)
+    )
+    return TensorType(x.dtype, shape)
+
+
+def _gather(op: CoreOperation, args: Sequence[TensorType], ts: TypeSystem) -> TensorType:
+    x, indices = args
+    if indices.dtype not in INDEX_DTYPES:
+        raise RuleViolation(
+            "E4011", f"Gather %{op.value_id} indices have dtype {indices.dtype}, must be i32 or i64"
+        )
+    if x.rank < 1:
+        raise RuleViolation("E3002", f"Gather requires rank >= 1, found rank {x.rank} at %{op.value_id}")
+    return TensorType(x.dtype, indices.shape + x.shape[1:])
+
+
+def _dot(op: CoreOperation, args: Sequence[TensorType], ts: TypeSystem) -> TensorType:
+    lhs, rhs = args
+    _same_dtype(op, lhs, rhs)
+    if lhs.rank not in (1, 2) or rhs.rank not in (1, 2):
+        raise RuleViolation(
+            "E3002", f"Dot requires rank 1 or 2, found ranks {lhs.rank} and {rhs.rank} at %{op.value_id}"
+        )
+    inner = 0 if rhs.rank == 1 else -2
+    if lhs.shape[-1] != rhs.shape[inner]:
+        raise RuleViolation(
+            "E3003",
+            f"Dot contracting dimension mismatch: lhs[-1]={lhs.shape[-1]}, rhs[{inner}]={rhs.shape[inner]} "
+            f"at %{op.value_id}",
+        )
+    return TensorType(lhs.dtype, lhs.shape[:-1] + rhs.shape[:inner] + rhs.shape[inner + 1 :])
+
+
+def _matmul(op: CoreOperation, args: Sequence[TensorType], ts: TypeSystem) -> TensorType:
+    lhs, rhs = args
+    _same_dtype(op, lhs, rhs)
+    if lhs.rank < 2 or rhs.rank < 2:
+        rank = min(lhs.rank, rhs.rank)
+        raise RuleViolation("E3002", f"MatMul requires rank >= 2, found rank {rank} at %{op.value_id}")
+    if lhs.shape[-1] != rhs.shape[-2]:
+        raise RuleViolation(
+            "E3003",
+            f"MatMul contracting dimension mismatch: lhs[-1]={lhs.shape[-1]}, rhs[-2]={rhs.shape[-2]} "
+            f"at %{op.value_id}",
+        )
+    batch = _broadcast(op, lhs.shape[:-2], rhs.shape[:-2], ts)
+    return TensorType(lhs.dtype, batch + (lhs.shape[-2], rhs.shape[-1]))
+
+
+def _conv2d(op: CoreOperation, args: Sequence[TensorType], ts: TypeSystem) -> TensorType:
+    x, w = args
+    _same_dtype(op, x, w)
+    if x.rank != 4 or w.rank != 4:
+        raise RuleViolation(
+            "E3002", f"Conv2d requires rank-4 input and filter, found ranks {x.rank} and {w.rank} at %{op.value_id}"
+        )
+    n, height, width, channels = x.shape
+    k_h, k_w, filter_channels, out_channels = w.shape
+    if channels != filter_channels:
+        raise RuleViolation(
+            "E4009",
+            f"Conv2d %{op.value_id} channel mismatch: input.shape[3]={channels}, filter.shape[2]={filter_channels}",
+        )
+    strides = _int_list(op, "strides", op.attributes.get("strides", (1, 1)), "E4010")
+    if len(strides) != 2 or any(s <= 0 for s in strides):
+        raise RuleViolation(
+            "E4010", f"Conv2d %{op.value_id} invalid strides {list(strides)}: must be length 2 with positive values"
+        )
+    stride_h, stride_w = strides
+    padding = op.attributes.get("padding", "Valid")
+    if padding == "Same":
+        out_h, out_w = -(-height // stride_h), -(-width // stride_w)
+    else:
+        if padding == "Valid":
+            pads = ((0, 0), (0, 0))
+        else:
+            pads = tuple(padding) if isinstance(padding, (list, tuple)) else ()
+            if len(pads) != 2 or any(
+                not isinstance(pair, (list, tuple)) or len(pair) != 2 or not all(_is_int(p) and p >= 0 for p in pair)
+                for pair in pads
+            ):
+                raise RuleViolation(
+                    "E4010",
+                    f"Conv2d %{op.value_id} invalid padding {padding!r}: must be Valid, Same or two non-negative pairs",
+                )
+        out_h = (height + sum(pads[0]) - k_h) // stride_h + 1
+        out_w = (width + sum(pads[1]) - k_w) // stride_w + 1
+    if out_h <= 0 or out_w <= 0:
+        raise RuleViolation(
+            "E3006", f"Conv2d %{op.value_id} filter [{k_h}, {k_w}] exceeds padded input [{height}, {width}]"
+        )
+    return TensorType(x.dtype, (n, out_h, out_w, out_channels))
+
+
+def _relu_grad(op: CoreOperation, args: Sequence[TensorType], ts: TypeSystem) -> TensorType:
+    gradient, x = args
+    _same_dtype(op, gradient, x)
+    if gradient.shape != x.shape:
+        raise RuleViolation(
+            "E3003", f"ReluGrad %{op.value_id} gradient shape {list(gradient.shape)} differs from input {list(x.shape)}"
+        )
+    return x
+
+
+def _fused(op: CoreOperation, args: Sequence[TensorType], ts: TypeSystem) -> TensorType:
+    values = list(args)
+    body = op.attributes.get("body", ())
+    if not isinstance(body, (list, tuple)):
+        raise RuleViolation("E4005", f"Fused %{op.value_id} has invalid body {body!r}")
+    for entry in body:
+        if not isinstance(entry, (list, tuple)) or len(entry) != 3:
+            raise RuleViolation("E4005", f"Fused %{op.value_id} has invalid step {entry!r}")
+        opcode, operands, result_type = entry
+        if (
+            not isinstance(opcode, str)
+            or opcode not in FUSIBLE_RULES
+            or not isinstance(operands, (list, tuple))
+            or len(operands) != ARITY[opcode]
+            or not all(_is_int(i) and 0 <= i < len(values) for i in operands)
+        ):
+            raise RuleViolation("E4005", f"Fused %{op.value_id} has invalid step {entry!r}")
+        step = CoreOperation(op.value_id, opcode, list(operands), {}, result_type)
+        values.append(FUSIBLE_RULES[opcode](step, [values[i] for i in operands], ts))
+    if len(values) == len(args):
+        raise RuleViolation("E4005", f"Fused %{op.value_id} has an empty body")
+    return values[-1]
+
+
+def _unary(allowed: Optional[frozenset], description: str) -> Rule:
+    def rule(op: CoreOperation, args: Sequence[TensorType], ts: TypeSystem) -> TensorType:
+        (x,) = args
+        if (allowed is not None and x.dtype not in allowed) or x.dtype == "bool":
+            raise RuleViolation("E2005", f"{op.opcode} requires {description} dtype, found {x.dtype} at %{op.value_id}")
+        return x
+
+    return rule
+
+
+# Relu accepts integer dtypes as a documented extension; Exp and Log are
+# floating-point only as the specification requires.
+RULES: Dict[str, Rule] = {
+    "ConstI64": _constant("i64"),
+    "ConstF32": _constant("f32"),
+    "ConstF64": _constant("f64"),
+    "ConstTensor": _const_tensor,
+    "Add": _binary,
+    "Sub": _binary,
+    "Mul": _binary,
+    "Div": _binary,
+    "Sum": _reduction,
+    "Mean": _reduction,
+    "Max": _reduction,
+    "Reshape": _reshape,
+    "Transpose": _transpose,
+    "ExpandDims": _expand_dims,
+    "Squeeze": _squeeze,
+    "Index": _index,
+    "Slice": _slice,
+    "Gather": _gather,
+    "Dot": _dot,
+    "MatMul": _matmul,
+    "Conv2d": _conv2d,
+    "Relu": _unary(None, "numeric"),
+    "Neg": _unary(None, "numeric"),
+    "Exp": _unary(FLOAT_DTYPES, "floating-point"),
+    "Log": _unary(FLOAT_DTYPES, "floating-point"),
+    # Emitted by autodiff: the upstream gradient masked by ``input > 0``.
+    "ReluGrad": _relu_grad,
+}
+
+FUSIBLE_RULES = {opcode: RULES[opcode] for opcode in ("Add", "Sub", "Mul", "Div", "Relu", "Neg", "Exp", "Log")}
+# Produced by ``passes.fuse_elementwise``: an elementwise region whose steps
+# are checked with the rules of their own opcodes.
+RULES["Fused"] = _fused
+
+ARITY: Dict[str, int] = {opcode: 0 for opcode in ("Input", "ConstI64", "ConstF32", "ConstF64", "ConstTensor")}
+ARITY.update({opcode: 2 for opcode in ("Add", "Sub", "Mul", "Div", "Gather", "Dot", "MatMul", "Conv2d", "ReluGrad")})
+ARITY.update(
+    {
+        opcode: 1
+        for opcode in ("Sum", "Mean", "Max", "Reshape", "Transpose", "ExpandDims", "Squeeze", "Index", "Slice")
+        + ("Relu", "Neg", "Exp", "Log")
+    }
+)
+
+
+def _declared_type(op: CoreOperation) -> Tuple[Optional[TensorType], Optional[Tuple[str, str]]]:
+    if op.result_type is None:
+        return None, None
+    try:
+        declared = TensorType.parse(op.result_type)
+    except ValueError:
+        return None, ("E2003", f"%{op.value_id} has malformed result type '{op.result_type}'")
+    if declared.dtype not in DTYPE_SIZES:
+        return None, ("E2005", f"%{op.value_id} has unknown dtype '{declared.dtype}'")
+    for i, dim in enumerate(declared.shape):
+        if isinstance(dim, int) and dim <= 0:
+            return None, ("E3006", f"Invalid dimension {dim} in shape {list(declared.shape)} at index {i}")
+    if not declared.is_static:
+        # Shape rules need concrete extents; symbolic values are only
+        # checked for def/use until specialised.
+        return None, None
+    return declared, None
+
+
+def diagnose(
+    ir: CoreIR,
+    collect_all: bool = True,
+    type_system: Optional[TypeSystem] = None,
+) -> List[Diagnostic]:
+    """Check ``ir`` against the specification's verification rules.
+
+    Runs in one forward pass. ``index_of`` is a dense list mapping each
+    ``ValueId`` to its defining instruction (ids beyond the module's value
+    counter fall back to a dict), so every def/use check is a constant-time
+    lookup. Result types are parsed once per distinct string and recorded per
+    instruction; each opcode's rule in ``RULES`` derives the expected result
+    type from its operand types and it is compared with the declared one.
+    Operations whose operand types are unknown are only checked for def/use.
+    Opcodes without a rule are accepted as extensions.
+
+    Diagnostics are reported in instruction order, then output order, at most
+    one per rule per instruction. With ``collect_all=False`` the first one
+    is returned alone.
+    """
+
+    ts = type_system or TypeSystem()
+    operations = ir.operations
+    index_of: List[int] = [-1] * max(len(operations), getattr(ir, "_next_value_id", 0))
+    overflow: Dict[int, int] = {}
+    types: List[Optional[TensorType]] = [None] * len(operations)
+    diagnostics: List[Diagnostic] = []
+    dense = len(index_of)
+
+    def report(code: str, message: str, index: Optional[int] = None, value_id: Optional[int] = None) -> bool:
+        diagnostics.append(Diagnostic(code, message, index, value_id))
+        return not collect_all
+
+    def lookup(value_id: int) -> int:
+        if 0 <= value_id < dense:
+            return index_of[value_id]
+        return overflow.get(value_id, -1)
+
+    for index, op in enumerate(operations):
+        value_id = op.value_id
+        opcode = op.opcode
+
+        operand_types: List[TensorType] = []
+        for operand in op.operands:
+            definition = lookup(operand)
+            if definition < 0:
+                if report("E4001", f"Instruction {index} uses %{operand} before definition", index, value_id):
+                    return diagnostics
+            else:
+                operand_type = types[definition]
+                if operand_type is not None:
+                    operand_types.append(operand_type)
+
+        previous = lookup(value_id)
+        if previous >= 0:
+            if report(
+                "E4002",
+                f"ValueId %{value_id} defined multiple times: instruction {previous} and instruction {index}",
+                index,
+                value_id,
+            ):
+                return diagnostics
+        elif 0 <= value_id < dense:
+            index_of[value_id] = index
+        else:
+            overflow[value_id] = index
+
+        declared, problem = _declared_type(op)
+        if problem is not None:
+            code, message = problem
+            if opcode == "Input":
+                code, message = "E4004", f"Input %{value_id} has invalid type: {message}"
+            if report(code, message, index, value_id):
+                return diagnostics
+        types[index] = declared
+
+        if opcode == "Input":
+            if not op.attributes.get("name"):
+                if report("E4004", f"Input %{value_id} missing required 'name' attribute", index, value_id):
+                    return diagnostics
+            if op.result_type is None:
+                if report("E4004", f"Input %{value_id} missing declared tensor type", index, value_id):
+                    return diagnostics
+
+        arity = ARITY.get(opcode)
+        if arity is not None and arity != len(op.operands):
+            if report(
+                "E2007", f"{opcode} %{value_id} expects {arity} operands, found {len(op.operands)}", index, value_id
+            ):
+                return diagnostics
+            continue
+
+        rule = RULES.get(opcode)
+        if rule is None or len(operand_types) != len(op.operands):
+            continue
+        try:
+            inferred = rule(op, operand_types, ts)
+        except RuleViolation as violation:
+            if report(violation.code, violation.message, index, value_id):
+                return diagnostics
+            continue
+        if declared is None:
+            types[index] = inferred if op.result_type is None else None
+        elif declared.dtype != inferred.dtype or declared.shape != inferred.shape:
+            if report(
+                "E2001",
+                f"Type mismatch at %{value_id}: {opcode} produces {inferred}, declared {op.result_type}",
+                index,
+                value_id,
+            ):
+                return diagnostics
+
+    for position, output in enumerate(ir.outputs):
+        if lookup(output) < 0:
+            if report("E4003", f"Output {position} references undefined ValueId %{output}", value_id=output):
+                return diagnostics
+
+    return diagnostics
+
+
+def verify(ir: CoreIR, collect_all: bool = False, type_system: Optional[TypeSystem] = None) -> None:
+    """Raise ``VerificationError`` if ``ir`` violates any verification rule.
+
+    By default verification stops at the first failure; ``collect_all=True``
+    reports every diagnostic at once.
+    """
+
+    diagnostics = diagnose(ir, collect_all=collect_all, type_system=type_system)
+    if diagnostics:
+        raise VerificationError(diagnostics)
@@ -0,0 +1,359 @@
+"""
+Memory-mapped SafeTensors weights for Core IR modules (spec/v1.0/model-artifact.md).
+
+``open_checkpoint`` maps a ``.safetensors`` file, a sharded checkpoint's
+``model.safetensors.index.json`` or a model directory. Opening parses only the
+JSON headers. Tensors are NumPy views into the read-only mapping, so the
+resident set grows only as pages are touched.
+
+``bind_weights`` checks every named tensor against the ``TensorType`` declared
+by the ``Input`` or ``ConstTensor`` operation that names it before anything
+is bound. ``Input`` values come back as a dict for ``Executor.run``;
+``ConstTensor`` operations whose ``name`` attribute names a tensor get the
+view as their ``value``. A bound module can be executed but not serialised:
+``compile()``, ``mic.emit`` and ``micb.encode`` reject array attributes, so
+write the module out before binding and bind again after loading it.
+
+    checkpoint = open_checkpoint("models/llama")
+    inputs = bind_weights(ir, checkpoint)
+    outputs = Executor(ir).run({**inputs, "tokens": tokens})
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .core_ir import CoreIR
+from .type_system import DYNAMIC_DIM, TensorType
+
+# SafeTensors dtype -> (Core IR dtype, little-endian NumPy dtype). BF16 has no
+# Core IR or NumPy counterpart and is rejected when bound or read.
+DTYPES: Dict[str, Tuple[str, str]] = {
+    "F64": ("f64", "<f8"),
+    "F32": ("f32", "<f4"),
+    "F16": ("f16", "<f2"),
+    "I64": ("i64", "<i8"),
+    "I32": ("i32", "<i4"),
+    "I16": ("i16", "<i2"),
+    "I8": ("i8", "i1"),
+    "U64": ("u64", "<u8"),
+    "U32": ("u32", "<u4"),
+    "U16": ("u16", "<u2"),
+    "U8": ("u8", "u1"),
+    "BOOL": ("bool", "?"),
+}
+ITEMSIZES: Dict[str, int] = {name: np.dtype(numpy_dtype).itemsize for name, (_, numpy_dtype) in DTYPES.items()}
+ITEMSIZES["BF16"] = 2
+
+_NUMPY_TO_SAFETENSORS = {np.dtype(numpy_dtype): name for name, (_, numpy_dtype) in DTYPES.items()}
+
+# The SafeTensors format caps headers at 100 MB.
+MAX_HEADER_BYTES = 100_000_000
+INDEX_NAME = "model.safetensors.index.json"
+
+
+class SafeTensorsError(ValueError):
+    """A malformed checkpoint, or a tensor that does not match its declaration."""
+
+
+@dataclass(frozen=True)
+class TensorInfo:
+    """Header entry of one tensor; ``start``/``end`` are absolute file offsets."""
+
+    name: str
+    dtype: str
+    shape: Tuple[int, ...]
+    start: int
+    end: int
+
+    @property
+    def tensor_type(self) -> TensorType:
+        if self.dtype not in DTYPES:
+            raise SafeTensorsError(f"Tensor '{self.name}' has dtype {self.dtype}, which Core IR cannot represent")
+        return TensorType(DTYPES[self.dtype][0], self.shape)
+
+
+class SafeTensorsFile:
+    """One ``.safetensors`` file mapped read-only.
+
+    The header is parsed and validated on open: known dtypes, byte ranges that
+    match each shape, lie inside the file and do not overlap. ``tensor``
+    returns read-only views into the mapping. ``close`` unmaps the file unless
+    views are still alive; those keep the mapping until they are collected.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            if size < 8:
+                raise SafeTensorsError(f"{self.path}: too short for a SafeTensors header")
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.metadata, self._infos = self._parse_header(size)
+        except BaseException:
+            self._mmap.close()
+            raise
+
+    def _parse_header(self, size: int) -> Tuple[Dict[str, str], Dict[str, TensorInfo]]:
+        header_size = int.from_bytes(self._mmap[:8], "little")
+        if header_size > MAX_HEADER_BYTES or 8 + header_size > size:
+            raise SafeTensorsError(f"{self.path}: header of {header_size} bytes does not fit the file")
+        try:
+            header = json.loads(self._mmap[8 : 8 + header_size])
+        except ValueError as e:
+            raise SafeTensorsError(f"{self.path}: header is not valid JSON: {e}") from None
+        if not isinstance(header, dict):
+            raise SafeTensorsError(f"{self.path}: header must be a JSON object")
+
+        metadata = header.pop("__metadata__", None) or {}
+        if not isinstance(metadata, dict) or not all(isinstance(v, str) for v in metadata.values()):
+            raise SafeTensorsError(f"{self.path}: __metadata__ must map strings to strings")
+        base = 8 + header_size
+        infos: Dict[str, TensorInfo] = {}
+        for name, entry in header.items():
+            try:
+                dtype = entry["dtype"]
+                shape = tuple(int(dim) for dim in entry["shape"])
+                begin, end = (int(offset) for offset in entry["data_offsets"])
+            except (KeyError, TypeError, ValueError):
+                raise SafeTensorsError(f"{self.path}: malformed header entry for '{name}'") from None
+            if dtype not in ITEMSIZES:
+                raise SafeTensorsError(f"{self.path}: tensor '{name}' has unknown dtype {dtype!r}")
+            if any(dim < 0 for dim in shape):
+                raise SafeTensorsError(f"{self.path}: tensor '{name}' has a negative dimension")
+            expected = ITEMSIZES[dtype] * int(np.prod(shape, dtype=np.int64))
+            if not 0 <= begin <= end or end - begin != expected or base + end > size:
+                raise SafeTensorsError(
+                    f"{self.path}: tensor '{name}' has data_offsets [{begin}, {end}], expected {expected} bytes "
+                    f"within the {size - base} data bytes"
+                )
+            infos[name] = TensorInfo(name, dtype, shape, base + begin, base + end)
+
+        ranges = sorted((info.start, info.end, info.name) for info in infos.values() if info.end > info.start)
+        for (_, end, first), (start, _, second) in zip(ranges, ranges[1:]):
+            if start < end:
+                raise SafeTensorsError(f"{self.path}: tensors '{first}' and '{second}' overlap")
+        return metadata, infos
+
+    def __enter__(self) -> "SafeTensorsFile":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._infos
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._infos)
+
+    def __len__(self) -> int:
+        return len(self._infos)
+
+    def info(self, name: str) -> TensorInfo:
+        try:
+            return self._infos[name]
+        except KeyError:
+            raise KeyError(f"No tensor named '{name}' in {self.path}") from None
+
+    def tensor(self, name: str) -> np.ndarray:
+        """Read-only, zero-copy view of tensor ``name``."""
+
+        info = self.info(name)
+        if info.dtype not in DTYPES:
+            raise SafeTensorsError(f"Tensor '{name}' has dtype {info.dtype}, which NumPy cannot represent")
+        dtype = np.dtype(DTYPES[info.dtype][1])
+        count = (info.end - info.start) // dtype.itemsize
+        return np.frombuffer(self._mmap, dtype=dtype, count=count, offset=info.start).reshape(info.shape)
+
+    def close(self) -> None:
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Views still export the buffer; the mapping lives until they are gone.
+            pass
+
+
+class Checkpoint:
+    """Tensors of one or more SafeTensors files, looked up by name."""
+
+    def __init__(self, files: Sequence[SafeTensorsFile], weight_map: Optional[Mapping[str, str]] = None) -> None:
+        self.files = list(files)
+        by_path = {file.path.name: file for file in self.files}
+        self._owners: Dict[str, SafeTensorsFile] = {}
+        if weight_map is not None:
+            for name, filename in weight_map.items():
+                owner = by_path.get(filename)
+                if owner is None or name not in owner:
+                    raise SafeTensorsError(f"Index maps '{name}' to {filename}, which does not contain it")
+                self._owners[name] = owner
+        for file in self.files:
+            for name in file:
+                if self._owners.setdefault(name, file) is not file and weight_map is None:
+                    raise SafeTensorsError(f"Tensor '{name}' appears in {self._owners[name].path} and {file.path}")
+
+    @property
+    def metadata(self) -> Dict[str, str]:
+        merged: Dict[str, str] = {}
+        for file in self.files:
+            merged.update(file.metadata)
+        return merged
+
+    def __enter__(self) -> "Checkpoint":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._owners
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._owners)
+
+    def __len__(self) -> int:
+        return len(self._owners)
+
+    def info(self, name: str) -> TensorInfo:
+        if name not in self._owners:
+            raise KeyError(f"No tensor named '{name}' in the checkpoint")
+        return self._owners[name].info(name)
+
+    def tensor(self, name: str) -> np.ndarray:
+        if name not in self._owners:
+            raise KeyError(f"No tensor named '{name}' in the checkpoint")
+        return self._owners[name].tensor(name)
+
+    def close(self) -> None:
+        for file in self.files:
+            file.close()
+
+
+def open_checkpoint(path: Union[str, Path]) -> Checkpoint:
+    """Open a ``.safetensors`` file, a shard index or a model directory holding either."""
+
+    path = Path(path)
+    if path.is_dir():
+        path = path / INDEX_NAME if (path / INDEX_NAME).exists() else path / "model.safetensors"
+    if path.name.endswith(".index.json"):
+        try:
+            weight_map = json.loads(path.read_text(encoding="utf-8"))["weight_map"]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            raise SafeTensorsError(f"{path}: not a SafeTensors shard index: {e}") from None
+        files: List[SafeTensorsFile] = []
+        try:
+            for filename in sorted(set(weight_map.values())):
+                files.append(SafeTensorsFile(path.parent / filename))
+            return Checkpoint(files, weight_map)
+        except BaseException:
+            for file in files:
+                file.close()
+            raise
+    return Checkpoint([SafeTensorsFile(path)])
+
+
+def _check(info: TensorInfo, declared: TensorType, op_label: str, symbols: Dict[str, int]) -> None:
+    actual = info.tensor_type
+    mismatch = actual.dtype != declared.dtype or len(actual.shape) != len(declared.shape)
+    for dim, extent in zip(declared.shape, actual.shape):
+        if isinstance(dim, int):
+            mismatch = mismatch or dim != extent
+        elif dim != DYNAMIC_DIM:
+            mismatch = mismatch or symbols.setdefault(dim, extent) != extent
+    if mismatch:
+        raise SafeTensorsError(f"Tensor '{info.name}' is {actual} but {op_label} declares {declared}")
+
+
+def bind_weights(ir: CoreIR, checkpoint: Checkpoint, require_inputs: bool = False) -> Dict[str, np.ndarray]:
+    """Bind checkpoint tensors to ``ir`` by name and return the views for its inputs.
+
+    ``Input`` operations whose ``name`` is in the checkpoint are returned in
+    the dict. The rest, such as activations, are left to the caller unless
+    ``require_inputs`` is set. ``ConstTensor`` operations with a ``name``
+    attribute must find their tensor; their ``value`` becomes the view and
+    ``shape``/``dtype`` are filled in. Every dtype and shape is checked against
+    the declared result type before the module is touched. A symbolic
+    dimension must take the same extent wherever it appears.
+    """
+
+    symbols: Dict[str, int] = {}
+    inputs: List[Tuple[str, TensorInfo]] = []
+    constants: List[Tuple[Any, TensorInfo]] = []
+    for op in ir.operations:
+        name = op.attributes.get("name")
+        if op.opcode not in ("Input", "ConstTensor") or name is None:
+            continue
+        if name not in checkpoint:
+            if op.opcode == "ConstTensor" or require_inputs:
+                raise SafeTensorsError(f"No tensor named '{name}' for %{op.value_id} = {op.opcode}")
+            continue
+        info = checkpoint.info(name)
+        if op.result_type is not None:
+            _check(info, TensorType.parse(op.result_type), f"%{op.value_id} = {op.opcode}", symbols)
+        else:
+            info.tensor_type  # reject dtypes Core IR cannot represent
+        if op.opcode == "Input":
+            inputs.append((name, info))
+        else:
+            constants.append((op, info))
+
+    for op, info in constants:
+        op.attributes["value"] = checkpoint.tensor(info.name)
+        op.attributes["shape"] = info.shape
+        op.attributes["dtype"] = DTYPES[info.dtype][0]
+    return {name: checkpoint.tensor(info.name) for name, info in inputs}
+
+
+def encode_header(
+    layout: Mapping[str, Tuple[str, Sequence[int]]], metadata: Optional[Mapping[str, str]] = None
+) -> Tuple[bytes, Dict[str, Tuple[int, int]]]:
+    """Return the length prefix and header for tensors laid out in ``layout`` order.
+
+    ``layout`` maps names to (SafeTensors dtype, shape). The header is padded
+    with spaces so the data section starts 8-byte aligned. The second value
+    maps each name to its data offsets.
+    """
+
+    header: Dict[str, Any] = {"__metadata__": dict(metadata)} if metadata else {}
+    offsets: Dict[str, Tuple[int, int]] = {}
+    position = 0
+    for name, (dtype, shape) in layout.items():
+        if dtype not in ITEMSIZES:
+            raise SafeTensorsError(f"Unknown SafeTensors dtype {dtype!r}")
+        end = position + ITEMSIZES[dtype] * int(np.prod(shape, dtype=np.int64))
+        header[name] = {"dtype": dtype, "shape": list(shape), "data_offsets": [position, end]}
+        offsets[name] = (position, end)
+        position = end
+    encoded = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    encoded += b" " * (-len(encoded) % 8)
+    return len(encoded).to_bytes(8, "little") + encoded, offsets
+
+
+def save_safetensors(
+    path: Union[str, Path], tensors: Mapping[str, np.ndarray], metadata: Optional[Mapping[str, str]] = None
+) -> None:
+    """Write ``tensors`` as a SafeTensors file, streaming each array's bytes."""
+
+    arrays: Dict[str, np.ndarray] = {}
+    layout: Dict[str, Tuple[str, Sequence[int]]] = {}
+    for name, array in tensors.items():
+        array = np.asarray(array)
+        dtype_name = _NUMPY_TO_SAFETENSORS.get(array.dtype.newbyteorder("<"))
+        if dtype_name is None:
+            raise SafeTensorsError(f"Tensor '{name}' has dtype {array.dtype}, which SafeTensors cannot store")
+        arrays[name] = np.ascontiguousarray(array, dtype=np.dtype(DTYPES[dtype_name][1]))
+        layout[name] = (dtype_name, array.shape)
+    prefix, _ = encode_header(layout, metadata)
+    with open(path, "wb") as handle:
+        handle.write(prefix)
+        for array in arrays.values():
+            if array.size:
+                handle.write(memoryview(array.reshape(-1)).cast("B"))
@@ -0,0 +1,80 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from tools import add_spec_headers
+from tools.add_spec_headers import HEADER, MANIFEST_NAME, add_header_to_file, load_manifest
+
+LEGACY = """<!--
+MIND Language Specification — Community Edition
+Permission is hereby granted, free of charge
+-->
+
+# Legacy
+"""
+
+
+class TestAddSpecHeaders(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        (self.root / "plain.md").write_text("# Plain\n", encoding="utf-8")
+        (self.root / "legacy.md").write_text(LEGACY, encoding="utf-8")
+        (self.root / "current.md").write_text(HEADER + "# Current\n", encoding="utf-8")
+        (self.root / "README.md").write_text("# Readme\n", encoding="utf-8")
+        (self.root / "node_modules" / "pkg").mkdir(parents=True)
+        (self.root / "node_modules" / "pkg" / "dep.md").write_text("# Dep\n", encoding="utf-8")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def run_main(self, *args: str) -> int:
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            return add_spec_headers.main([str(self.root), *args])
+
+    def test_check_reports_without_writing(self) -> None:
+        self.assertEqual(self.run_main("--check"), 1)
+
+        self.assertEqual((self.root / "plain.md").read_text(encoding="utf-8"), "# Plain\n")
+        self.assertFalse((self.root / MANIFEST_NAME).exists())
+
+    def test_headers_are_added_and_legacy_headers_replaced(self) -> None:
+        self.assertEqual(self.run_main("--jobs", "2"), 0)
+
+        self.assertEqual((self.root / "plain.md").read_text(encoding="utf-8"), HEADER + "# Plain\n")
+        self.assertEqual((self.root / "legacy.md").read_text(encoding="utf-8"), HEADER + "# Legacy\n")
+        self.assertEqual((self.root / "current.md").read_text(encoding="utf-8"), HEADER + "# Current\n")
+        self.assertEqual((self.root / "README.md").read_text(encoding="utf-8"), "# Readme\n")
+        self.assertEqual((self.root / "node_modules" / "pkg" / "dep.md").read_text(encoding="utf-8"), "# Dep\n")
+        self.assertEqual(self.run_main("--check"), 0)
+        self.assertEqual([p.name for p in self.root.iterdir() if p.name.endswith(".tmp")], [])
+
+    def test_manifest_skips_unchanged_files(self) -> None:
+        self.run_main()
+        manifest = load_manifest(self.root / MANIFEST_NAME)
+        self.assertEqual(sorted(manifest), ["current.md", "legacy.md", "plain.md"])
+
+        plain = self.root / "plain.md"
+        self.assertEqual(add_header_to_file(plain, manifest["plain.md"]).status, "unchanged")
+        stat = plain.stat()
+        os.utime(plain, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertEqual(add_header_to_file(plain, manifest["plain.md"]).status, "unchanged")
+        plain.write_text("# Edited\n", encoding="utf-8")
+        self.assertEqual(add_header_to_file(plain, manifest["plain.md"]).status, "updated")
+
+    def test_long_and_undecodable_files(self) -> None:
+        body = HEADER + "x" * (4 * add_spec_headers.HEAD_BYTES) + "\n"
+        (self.root / "long.md").write_text(body, encoding="utf-8")
+        (self.root / "bad.md").write_bytes(b"\xff\xfe not utf-8")
+
+        self.assertEqual(add_header_to_file(self.root / "long.md").status, "current")
+        result = add_header_to_file(self.root / "bad.md")
+        self.assertEqual(result.status, "error")
+        self.assertIn("Error reading", result.message)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+import unittest
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from tools.core_ir.autodiff import AutodiffError, checkpoint_savings, differentiate
+from tools.core_ir.core_ir import CoreIR
+
+if np is not None:
+    from tools.core_ir.executor import execute
+
+F32_23 = "tensor<f32[2, 3]>"
+
+
+def sum_of_products() -> CoreIR:
+    # examples/ir/autodiff_output.ir: f(x, y) = sum((x * y) + x)
+    ir = CoreIR()
+    x = ir.declare_input("x", F32_23)
+    y = ir.declare_input("y", F32_23)
+    product = ir.add_operation("Mul", [x, y], result_type=F32_23)
+    total = ir.add_operation("Add", [x, product], result_type=F32_23)
+    ir.mark_output(ir.add_operation("Sum", [total], {"axes": []}, "tensor<f32[]>"))
+    return ir
+
+
+def mlp(layers: int, width: int = 32, batch: int = 16) -> CoreIR:
+    """Relu MLP with broadcast biases, mean-reduced to a scalar loss."""
+
+    ir = CoreIR()
+    hidden = f"tensor<f32[{batch}, {width}]>"
+    h = ir.declare_input("x", hidden)
+    for layer in range(layers):
+        w = ir.declare_input(f"w{layer}", f"tensor<f32[{width}, {width}]>")
+        b = ir.declare_input(f"b{layer}", f"tensor<f32[{width}]>")
+        z = ir.add_operation("MatMul", [h, w], result_type=hidden)
+        z = ir.add_operation("Add", [z, b], result_type=hidden)
+        h = ir.add_operation("Relu", [z], result_type=hidden)
+        h = ir.add_operation("Exp", [ir.add_operation("Neg", [h], result_type=hidden)], result_type=hidden)
+    ir.mark_output(ir.add_operation("Mean", [h], {"axes": [0, 1]}, "tensor<f32[]>"))
+    return ir
+
+
+class TestAutodiff(unittest.TestCase):
+    def test_appends_gradients_as_outputs(self) -> None:
+        ir = sum_of_products()
+        result = differentiate(ir)
+
+        self.assertEqual(ir.outputs, [4] + result.outputs)
+        self.assertEqual(sorted(result.gradients), [0, 1, 2, 3, 4])
+        self.assertEqual(ir.operations[5].opcode, "ConstTensor")
+
+    def test_div_is_unsupported(self) -> None:
+        ir = CoreIR()
+        x = ir.declare_input("x", F32_23)
+        two = ir.add_operation("ConstTensor", [], {"value": 2.0, "shape": (), "dtype": "f32"}, "tensor<f32[]>")
+        half = ir.add_operation("Div", [two, two], result_type="tensor<f32[]>")
+        scaled = ir.add_operation("Mul", [x, half], result_type=F32_23)
+        ir.mark_output(ir.add_operation("Div", [scaled, x], result_type=F32_23))
+
+        with self.assertRaises(AutodiffError) as ctx:
+            differentiate(ir)
+        self.assertEqual(ctx.exception.code, "E5001")
+        self.assertIn("'Div' at %4", str(ctx.exception))
+
+        ir.outputs = [scaled]
+        differentiate(ir)
+
+    def test_integer_input_is_rejected(self) -> None:
+        ir = CoreIR()
+        x = ir.declare_input("x", "tensor<i32[2]>")
+        ir.mark_output(ir.add_operation("Neg", [x], result_type="tensor<i32[2]>"))
+
+        with self.assertRaises(AutodiffError) as ctx:
+            differentiate(ir)
+        self.assertEqual(ctx.exception.code, "E5005")
+
+    def test_checkpointing_lowers_peak_memory(self) -> None:
+        report = checkpoint_savings(mlp(4))
+
+        self.assertGreater(report["recomputed_ops"], 0)
+        self.assertGreater(report["checkpoint_ops"], report["ops"])
+        self.assertGreater(report["saved_bytes"], 0)
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestAutodiffNumerics(unittest.TestCase):
+    def test_sum_of_products(self) -> None:
+        ir = sum_of_products()
+        differentiate(ir)
+        x = np.arange(6, dtype=np.float32).reshape(2, 3)
+        y = np.linspace(-1, 1, 6, dtype=np.float32).reshape(2, 3)
+
+        loss, grad_x, grad_y = execute(ir, {"x": x, "y": y})
+        np.testing.assert_allclose(loss, np.sum(x * y + x), rtol=1e-6)
+        np.testing.assert_allclose(grad_x, y + 1)
+        np.testing.assert_allclose(grad_y, x)
+
+    def test_matches_finite_differences(self) -> None:
+        rng = np.random.default_rng(0)
+        ir = CoreIR()
+        a = ir.declare_input("a", "tensor<f64[2, 3, 4]>")
+        w = ir.declare_input("w", "tensor<f64[4, 5]>")
+        b = ir.declare_input("b", "tensor<f64[1, 5]>")
+        z = ir.add_operation("MatMul", [a, w], result_type="tensor<f64[2, 3, 5]>")
+        z = ir.add_operation("Sub", [z, b], result_type="tensor<f64[2, 3, 5]>")
+        z = ir.add_operation("Transpose", [z], {"permutation": [2, 0, 1]}, "tensor<f64[5, 2, 3]>")
+        z = ir.add_operation("Reshape", [z], {"new_shape": [10, 3]}, "tensor<f64[10, 3]>")
+        z = ir.add_operation("Mul", [z, z], result_type="tensor<f64[10, 3]>")
+        z = ir.add_operation("Exp", [z], result_type="tensor<f64[10, 3]>")
+        z = ir.add_operation("Log", [z], result_type="tensor<f64[10, 3]>")
+        z = ir.add_operation("Sum", [z], {"axes": [1], "keepdims": True}, "tensor<f64[10, 1]>")
+        z = ir.add_operation("Squeeze", [z], {"axes": [1]}, "tensor<f64[10]>")
+        z = ir.add_operation("Relu", [z], result_type="tensor<f64[10]>")
+        ir.mark_output(ir.add_operation("Mean", [z], {}, "tensor<f64[]>"))
+        inputs = {"a": rng.normal(size=(2, 3, 4)), "w": rng.normal(size=(4, 5)), "b": rng.normal(size=(1, 5))}
+
+        forward = CoreIR()
+        forward.operations, forward.outputs = list(ir.operations), list(ir.outputs)
+        differentiate(ir)
+        _, *gradients = execute(ir, inputs)
+
+        eps = 1e-6
+        for (name, value), gradient in zip(inputs.items(), gradients):
+            numeric = np.zeros_like(value)
+            for index in np.ndindex(value.shape):
+                shifted = {k: v.copy() for k, v in inputs.items()}
+                shifted[name][index] += eps
+                up = execute(forward, shifted)[0]
+                shifted[name][index] -= 2 * eps
+                numeric[index] = (up - execute(forward, shifted)[0]) / (2 * eps)
+            np.testing.assert_allclose(gradient, numeric, rtol=1e-5, atol=1e-7)
+
+    def test_checkpointing_preserves_gradients(self) -> None:
+        rng = np.random.default_rng(1)
+        inputs = {"x": rng.normal(size=(16, 32)).astype(np.float32)}
+        for layer in range(3):
+            inputs[f"w{layer}"] = rng.normal(size=(32, 32)).astype(np.float32) / 6
+            inputs[f"b{layer}"] = rng.normal(size=(32,)).astype(np.float32)
+
+        plain, checkpointed = mlp(3), mlp(3)
+        differentiate(plain)
+        differentiate(checkpointed, checkpoint=True)
+
+        for expected, actual in zip(execute(plain, inputs), execute(checkpointed, inputs)):
+            np.testing.assert_array_equal(actual, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+from tools.core_ir.compact import CompactCoreIR
+from tools.core_ir.language import BinaryOperation, LanguageConstruct, Literal, Variable
+from tools.core_ir.type_system import TensorType, TypeSystem
+
+
+class TestCompactCoreIR(unittest.TestCase):
+    def setUp(self) -> None:
+        type_system = TypeSystem()
+        type_system.add_symbol("x", TensorType("f32", (2, 2)))
+        type_system.add_symbol("y", TensorType("f32", (2, 2)))
+        expression = BinaryOperation(
+            "Mul",
+            BinaryOperation("Add", Variable("x"), Variable("y")),
+            Literal([1.0, 2.0], "f32", (2,)),
+        )
+        self.ir = LanguageConstruct(expression, type_system=type_system).to_ir()
+
+    def test_round_trip_is_lossless(self) -> None:
+        compact = CompactCoreIR.from_core_ir(self.ir)
+        restored = compact.to_core_ir()
+
+        self.assertEqual(restored.operations, self.ir.operations)
+        self.assertEqual(restored.outputs, self.ir.outputs)
+        self.assertEqual(restored.compile(), self.ir.compile())
+        self.assertEqual(restored.add_operation("Relu", [4]), 5)
+
+    def test_tables_are_interned(self) -> None:
+        compact = CompactCoreIR.from_core_ir(self.ir)
+
+        self.assertEqual(len(compact), 5)
+        self.assertEqual(compact.opcode_table, ["Input", "Add", "ConstTensor", "Mul"])
+        self.assertEqual(compact.type_table, ["tensor<f32[2, 2]>", "tensor<f32[2]>"])
+        self.assertEqual(compact.operands(2).tolist(), [0, 1])
+        self.assertEqual(compact.operands(0).tolist(), [])
+        self.assertEqual(sorted(compact.attributes), [0, 1, 3])
+        self.assertEqual(compact.result_types.itemsize, 8)
+
+    def test_attributes_are_not_shared_with_the_source(self) -> None:
+        compact = CompactCoreIR.from_core_ir(self.ir)
+        compact.attributes[0]["name"] = "renamed"
+        restored = compact.to_core_ir()
+        restored.operations[1].attributes["name"] = "again"
+
+        self.assertEqual(self.ir.operations[0].attributes["name"], "x")
+        self.assertEqual(compact.attributes[0]["name"], "renamed")
+        self.assertEqual(compact.attributes[1]["name"], "y")
+
+
+if __name__ == "__main__":
+    unittest.main()
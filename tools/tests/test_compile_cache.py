@@ -0,0 +1,137 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from tools.core_ir.compile_cache import CompilationCache, structural_key
+from tools.core_ir.language import BinaryOperation, Expression, LanguageConstruct, Literal, Variable
+from tools.core_ir.type_system import TensorType, TypeSystem
+
+
+def make_type_system(width: int = 2) -> TypeSystem:
+    type_system = TypeSystem()
+    type_system.add_symbol("x", TensorType("f32", (2, width)))
+    type_system.add_symbol("y", TensorType("f32", (width,)))
+    return type_system
+
+
+def build(scale: float = 2.0) -> Expression:
+    scaled = BinaryOperation("Mul", Variable("x"), Literal(scale, "f32"))
+    return BinaryOperation("Add", scaled, Variable("y"))
+
+
+class TestCompilationCache(unittest.TestCase):
+    def test_memory_hits_return_independent_copies(self) -> None:
+        cache = CompilationCache()
+        first = LanguageConstruct(build(), make_type_system(), compile_cache=cache).to_ir()
+        first.add_operation("Relu", [first.outputs[0]], result_type="tensor<f32[2, 2]>")
+        second = LanguageConstruct(build(), make_type_system(), compile_cache=cache).to_ir()
+
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(second.compile(), LanguageConstruct(build(), make_type_system()).to_ir().compile())
+        self.assertEqual(
+            LanguageConstruct(build(), make_type_system(), compile_cache=cache).to_text(), second.compile()
+        )
+        self.assertEqual(cache.hits, 2)
+
+    def test_key_covers_structure_sharing_and_symbols(self) -> None:
+        type_system = make_type_system()
+        shared = Literal(1, "i32")
+        keys = {
+            structural_key(build(), type_system),
+            structural_key(build(3.0), type_system),
+            structural_key(build(), make_type_system(width=4)),
+            structural_key(BinaryOperation("Add", shared, shared), type_system),
+            structural_key(BinaryOperation("Add", Literal(1, "i32"), Literal(1, "i32")), type_system),
+            structural_key(BinaryOperation("Add", Literal(True, "i32"), Literal(1, "i32")), type_system),
+        }
+        self.assertEqual(len(keys), 6)
+        self.assertEqual(structural_key(build(), make_type_system()), structural_key(build(), type_system))
+
+    def test_lru_eviction_and_bypass(self) -> None:
+        cache = CompilationCache(maxsize=1)
+        for scale in (1.0, 2.0, 1.0):
+            LanguageConstruct(build(scale), make_type_system(), compile_cache=cache).to_ir()
+        self.assertEqual((cache.hits, cache.misses, cache.evictions, len(cache)), (0, 3, 2, 1))
+
+        opaque = LanguageConstruct(build(object()), make_type_system(), compile_cache=cache)  # type: ignore[arg-type]
+        self.assertIn("Mul", opaque.to_text())
+        self.assertEqual(cache.bypasses, 1)
+
+    def test_equations_implied_by_the_expression_do_not_change_the_key(self) -> None:
+        cache = CompilationCache()
+        type_system = TypeSystem()
+        type_system.add_symbol("x", TensorType("f32", ("N", 4)))
+        type_system.add_symbol("y", TensorType("f32", ("M", 4)))
+        expression = BinaryOperation("Add", Variable("x"), Variable("y"))
+        first = LanguageConstruct(expression, type_system, compile_cache=cache).to_ir()
+        self.assertEqual(type_system.dims.equations(), (("N", "M"),))
+
+        second = LanguageConstruct(expression, type_system, compile_cache=cache).to_ir()
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (1, 1, 1))
+        self.assertEqual(second.compile(), first.compile())
+
+    def test_failed_compilations_are_not_cached(self) -> None:
+        cache = CompilationCache()
+        type_system = make_type_system()
+        expression = BinaryOperation("Add", Variable("x"), Variable("missing"))
+        for _ in range(2):
+            with self.assertRaises(TypeError):
+                LanguageConstruct(expression, type_system, compile_cache=cache).to_ir()
+        self.assertEqual((cache.misses, len(cache)), (2, 0))
+
+    def test_disk_tier_persists_and_trims_by_size(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            warm = CompilationCache(directory=directory)
+            expected = LanguageConstruct(build(), make_type_system(), compile_cache=warm).to_ir()
+
+            cold = CompilationCache(directory=directory)
+            restored = LanguageConstruct(build(), make_type_system(), compile_cache=cold).to_ir()
+            self.assertEqual((cold.disk_hits, cold.misses), (1, 0))
+            self.assertEqual(restored.operations, expected.operations)
+            self.assertEqual(restored.outputs, expected.outputs)
+
+            entry_size = next(Path(directory).glob("*.mic")).stat().st_size
+            small = CompilationCache(maxsize=0, directory=directory, max_disk_bytes=entry_size * 2)
+            for scale in (3.0, 4.0):
+                LanguageConstruct(build(scale), make_type_system(), compile_cache=small).to_ir()
+            self.assertEqual(small.disk_evictions, 1)
+            self.assertEqual(len(list(Path(directory).glob("*.mic"))), 2)
+
+    def test_corrupt_disk_entry_is_recompiled(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            LanguageConstruct(build(), make_type_system(), compile_cache=CompilationCache(directory=directory)).to_ir()
+            path = next(Path(directory).glob("*.mic"))
+            path.write_text("mic@1\nN0 bogus\n", encoding="utf-8")
+
+            cache = CompilationCache(directory=directory)
+            ir = LanguageConstruct(build(), make_type_system(), compile_cache=cache).to_ir()
+            self.assertEqual((cache.disk_hits, cache.misses), (0, 1))
+            self.assertEqual(ir.compile(), LanguageConstruct(build(), make_type_system()).to_ir().compile())
+
+    def test_disk_tier_sees_entries_written_after_construction(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            writer, reader = CompilationCache(directory=directory), CompilationCache(directory=directory)
+            expected = LanguageConstruct(build(), make_type_system(), compile_cache=writer).to_ir()
+            restored = LanguageConstruct(build(), make_type_system(), compile_cache=reader).to_ir()
+            self.assertEqual((reader.disk_hits, reader.misses), (1, 0))
+            self.assertEqual(restored.compile(), expected.compile())
+
+    def test_disk_write_failures_bypass_the_disk_tier(self) -> None:
+        expected = LanguageConstruct(build(), make_type_system()).to_ir().compile()
+        failures = [
+            mock.patch("tempfile.mkstemp", side_effect=PermissionError(13, "Permission denied")),
+            mock.patch("os.replace", side_effect=OSError(28, "No space left on device")),
+        ]
+        for failure in failures:
+            with self.subTest(failure.attribute), tempfile.TemporaryDirectory() as directory:
+                cache = CompilationCache(directory=directory)
+                with failure:
+                    ir = LanguageConstruct(build(), make_type_system(), compile_cache=cache).to_ir()
+                self.assertEqual(ir.compile(), expected)
+                self.assertEqual((cache.misses, cache.bypasses, len(cache)), (1, 1, 1))
+                self.assertEqual(list(Path(directory).iterdir()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
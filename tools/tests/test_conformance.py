@@ -0,0 +1,103 @@
+import io
+import json
+import unittest
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from tools import conformance
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover - exercised only without PyYAML
+    yaml = None
+
+ROOT = Path(__file__).resolve().parents[2]
+CORPUS = ROOT / "tests" / "conformance"
+
+
+def echo_expected(case):
+    """Implementation that reproduces each case's expectation exactly."""
+
+    expected = case["expected"]
+    if expected["status"] == "error":
+        error = dict(expected["error"])
+        error["message"] = error.pop("message_contains")
+        return {"status": "error", "error": error}
+    result = dict(expected["output"]["result"])
+    if result.pop("values_pattern", None) == "all_zeros":
+        count = 1
+        for dim in result["shape"]:
+            count *= dim
+        result["values"] = [0.0] * count
+    return {"status": "success", "result": result}
+
+
+def reject_everything(case):
+    if case["category"] == "lexical":
+        raise NotImplementedError("no lexer")
+    return {"status": "error", "error": {"code": "E9999", "message": "nope"}}
+
+
+class TestCompare(unittest.TestCase):
+    def test_values_within_tolerance(self) -> None:
+        expected = {
+            "status": "success",
+            "output": {"result": {"dtype": "f32", "shape": [2], "values": [1.0, 2.0], "tolerance": "1e-6"}},
+        }
+        ok = {"status": "success", "result": {"dtype": "f32", "shape": [2], "values": [1.0, 2.0000005]}}
+        off = {"status": "success", "result": {"dtype": "f64", "shape": [2], "values": [1.0, 2.1]}}
+
+        self.assertEqual(conformance.compare(expected, ok), [])
+        self.assertEqual(
+            conformance.compare(expected, off),
+            ["dtype: expected f32, got f64", "values[1]: expected 2.0, got 2.1 (tolerance 1e-06)"],
+        )
+
+    def test_error_expectations(self) -> None:
+        expected = {"status": "error", "error": {"code": "E3001", "message_contains": "Broadcasting failed"}}
+
+        self.assertEqual(
+            conformance.compare(expected, {"status": "error", "error": {"code": "E3001", "message": "x"}}),
+            ["error message: 'x' lacks 'Broadcasting failed'"],
+        )
+        self.assertEqual(
+            conformance.compare(expected, {"status": "success"}),
+            ["status: expected error, got success"],
+        )
+
+
+@unittest.skipIf(yaml is None, "PyYAML is not installed")
+class TestRunner(unittest.TestCase):
+    def test_parallel_run_matches_serial(self) -> None:
+        paths = conformance.discover([CORPUS])
+        serial = conformance.run(paths, echo_expected, root=ROOT, workers=1)
+        parallel = conformance.run(paths, echo_expected, root=ROOT, workers=2)
+
+        self.assertTrue(paths)
+        self.assertEqual([(r.name, r.status, r.failures) for r in serial], [(r.name, "passed", []) for r in serial])
+        self.assertEqual([(r.name, r.status) for r in parallel], [(r.name, r.status) for r in serial])
+
+    def test_reports(self) -> None:
+        paths = conformance.discover([CORPUS])
+        results = conformance.run(paths, reject_everything, root=ROOT, workers=1)
+        lexical = sum(result.category == "lexical" for result in results)
+        total, failed = len(paths), len(paths) - lexical
+        counts = conformance.summarize(results)
+        self.assertEqual((counts["failed"], counts["skipped"]), (failed, lexical))
+
+        junit = io.BytesIO()
+        conformance.write_junit(results, junit)
+        suites = ET.fromstring(junit.getvalue())
+        counts = (suites.get("tests"), suites.get("failures"), suites.get("skipped"))
+        self.assertEqual(counts, (str(total), str(failed), str(lexical)))
+        self.assertEqual(len(suites.findall("./testsuite/testcase/failure")), failed)
+
+        report = io.StringIO()
+        conformance.write_json(results, report)
+        data = json.loads(report.getvalue())
+        self.assertEqual(data["summary"]["total"], total)
+        self.assertTrue(all(case["seconds"] >= 0 for case in data["cases"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,11 @@
+import io
+import subprocess
+import sys
 import unittest
+from pathlib import Path
 
-from tools.core_ir.language import BinaryOperation, LanguageConstruct, Variable
+from tools.core_ir.core_ir import CoreIR
+from tools.core_ir.language import BinaryOperation, LanguageConstruct, Literal, TypeCache, Variable, lower
 from tools.core_ir.type_system import TensorType, TypeSystem
 
 
@@ -65,6 +70,243 @@ class TestCoreIRPipeline(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.type_system.add_symbol("bad", TensorType("f32", (2, 0)))
 
+    def test_import_does_not_load_codecs(self) -> None:
+        code = "import sys, tools.core_ir.language; print(sorted(sys.modules))"
+        root = Path(__file__).resolve().parents[2]
+        result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+        for name in ("mic", "micb", "compile_cache", "specialize"):
+            self.assertNotIn(repr(f"tools.core_ir.{name}"), result.stdout)
+
+
+class TestTypeCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.type_system = TypeSystem()
+        self.type_system.add_symbol("x", TensorType("f32", (2, 2)))
+
+    def test_each_node_inferred_once_per_compilation(self) -> None:
+        calls = []
+        original = self.type_system.validate_binop
+
+        def counting_validate_binop(op, lhs, rhs):
+            calls.append(op)
+            return original(op, lhs, rhs)
+
+        self.type_system.validate_binop = counting_validate_binop  # type: ignore[method-assign]
+        expression: object = Variable("x")
+        for _ in range(200):
+            expression = BinaryOperation("Add", expression, Variable("x"))
+
+        construct = LanguageConstruct(expression, type_system=self.type_system)
+        construct.to_ir()
+        self.assertEqual(len(calls), 200)
+
+    def test_recompile_only_reinfers_dirty_nodes(self) -> None:
+        leaf = Literal(1.0, "f32")
+        inner = BinaryOperation("Add", Variable("x"), leaf)
+        expression = BinaryOperation("Mul", inner, Variable("x"))
+        construct = LanguageConstruct(expression, type_system=self.type_system)
+
+        first = construct.to_ir().compile()
+        self.assertEqual(construct.type_cache.misses, 5)
+
+        second = construct.to_ir().compile()
+        self.assertEqual(second, first)
+        self.assertEqual(construct.type_cache.misses, 5)
+
+        inner.rhs = Literal(2.0, "f32", (2, 1))
+        third = construct.to_ir().compile()
+        self.assertIn("%0 = Input", third)
+        self.assertIn("%1 = ConstTensor", third)
+        # Only the new literal and its parent are re-inferred: the parent's
+        # type is unchanged, so the root and both variables are reused.
+        self.assertEqual(construct.type_cache.misses, 5 + 2)
+
+
+class TestIterativeLowering(unittest.TestCase):
+    def setUp(self) -> None:
+        self.type_system = TypeSystem()
+        self.type_system.add_symbol("x", TensorType("f32", (2, 2)))
+        self.type_system.add_symbol("y", TensorType("f32", (2, 2)))
+
+    def test_matches_recursive_numbering(self) -> None:
+        expression = BinaryOperation(
+            "Mul",
+            BinaryOperation("Add", Variable("x"), Literal(1.0, "f32")),
+            BinaryOperation("Sub", Variable("y"), BinaryOperation("Add", Variable("x"), Variable("y"))),
+        )
+        recursive = CoreIR()
+        recursive.mark_output(expression.emit(recursive, self.type_system))
+        iterative = LanguageConstruct(expression, type_system=self.type_system).to_ir()
+
+        self.assertEqual(iterative.compile(), recursive.compile())
+
+    def test_shared_subexpressions_emit_once(self) -> None:
+        shared = BinaryOperation("Add", Variable("x"), Variable("y"))
+        expression = BinaryOperation("Mul", shared, shared)
+
+        ir = CoreIR()
+        result = lower(expression, ir, self.type_system)
+
+        self.assertEqual([op.opcode for op in ir.operations], ["Input", "Input", "Add", "Mul"])
+        self.assertEqual(ir.operations[result].operands, [2, 2])
+
+    def test_depth_beyond_recursion_limit(self) -> None:
+        expression: object = Variable("x")
+        for _ in range(20_000):
+            expression = BinaryOperation("Add", expression, Variable("y"))
+
+        ir = LanguageConstruct(expression, type_system=self.type_system).to_ir()
+        self.assertEqual(len(ir.operations), 20_002)
+        self.assertEqual(ir.outputs, [20_001])
+
+
+class TestBatchTypeChecking(unittest.TestCase):
+    def setUp(self) -> None:
+        self.type_system = TypeSystem(shape_cache_size=4)
+        self.type_system.add_symbol("a", TensorType("f32", (2, 3)))
+        self.type_system.add_symbol("b", TensorType("f32", (3, 4)))
+        self.type_system.add_symbol("c", TensorType("i32", (3, 4)))
+
+    def test_reports_per_expression_results(self) -> None:
+        results = self.type_system.check_batch(
+            [
+                BinaryOperation("MatMul", Variable("a"), Variable("b")),
+                BinaryOperation("Add", Variable("b"), Variable("c")),
+                BinaryOperation("MatMul", Variable("b"), Variable("a")),
+                Variable("missing"),
+            ]
+        )
+
+        self.assertEqual([r.ok for r in results], [True, False, False, False])
+        self.assertEqual(results[0].tensor_type, TensorType("f32", (2, 4)))
+        self.assertIsInstance(results[1].error, TypeError)
+        self.assertIsInstance(results[2].error, ValueError)
+        self.assertIsInstance(results[3].error, TypeError)
+
+    def test_shape_results_are_memoized(self) -> None:
+        candidates = [BinaryOperation("MatMul", Variable("a"), Variable("b")) for _ in range(10)]
+        candidates += [BinaryOperation("MatMul", Variable("b"), Variable("a")) for _ in range(10)]
+
+        results = self.type_system.check_batch(candidates, cache=TypeCache())
+
+        self.assertEqual(sum(r.ok for r in results), 10)
+        self.assertEqual(self.type_system.matmul_cache.misses, 2)
+        self.assertEqual(self.type_system.matmul_cache.hits, 18)
+        self.assertIn("dimension mismatch", str(results[-1].error))
+
+    def test_deep_expressions_do_not_raise(self) -> None:
+        deep: object = Variable("b")
+        for _ in range(5000):
+            deep = BinaryOperation("Add", deep, Variable("b"))
+        rejected = BinaryOperation("Add", deep, Variable("c"))
+
+        for cache in (None, TypeCache()):
+            with self.subTest(cache=cache):
+                results = self.type_system.check_batch([deep, rejected], cache=cache)
+                self.assertEqual(results[0].tensor_type, TensorType("f32", (3, 4)))
+                self.assertIsInstance(results[1].error, TypeError)
+
+    def test_lru_is_bounded(self) -> None:
+        for n in range(1, 10):
+            self.type_system.broadcast_shapes((n, 1), (1, n))
+        self.assertEqual(len(self.type_system.broadcast_cache), 4)
+        self.assertEqual(self.type_system.broadcast_shapes([9, 1], [1, 9]), (9, 9))
+        self.assertEqual(self.type_system.broadcast_cache.hits, 1)
+
+
+class TestCoreIRInterning(unittest.TestCase):
+    def test_duplicate_pure_ops_share_value_ids(self) -> None:
+        ir = CoreIR(intern=True)
+        x = ir.declare_input("x", result_type="tensor<f32[2]>")
+        y = ir.declare_input("y", result_type="tensor<f32[2]>")
+
+        first = ir.add_operation("Add", [y, x], result_type="tensor<f32[2]>")
+        second = ir.add_operation("Add", [x, y], result_type="tensor<f32[2]>")
+        diff = ir.add_operation("Sub", [y, x], result_type="tensor<f32[2]>")
+        flipped = ir.add_operation("Sub", [x, y], result_type="tensor<f32[2]>")
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(diff, flipped)
+        self.assertEqual(ir.deduplicated, 1)
+        self.assertIn("%2 = Add (%0, %1)", ir.compile())
+
+    def test_attributes_participate_in_key(self) -> None:
+        ir = CoreIR(intern=True)
+        one = ir.add_operation("ConstTensor", attributes={"value": [1.0], "shape": (1,)})
+        same = ir.add_operation("ConstTensor", attributes={"shape": (1,), "value": [1.0]})
+        other = ir.add_operation("ConstTensor", attributes={"value": [2.0], "shape": (1,)})
+
+        self.assertEqual(one, same)
+        self.assertNotEqual(one, other)
+        self.assertEqual(len(ir.operations), 2)
+
+    def test_signed_zeros_are_not_merged(self) -> None:
+        ir = CoreIR(intern=True)
+        zero = ir.add_operation("ConstF32", attributes={"value": 0.0}, result_type="tensor<f32[]>")
+        negative = ir.add_operation("ConstF32", attributes={"value": -0.0}, result_type="tensor<f32[]>")
+        nested = [ir.add_operation("ConstTensor", attributes={"value": [v]}) for v in (0.0, -0.0, -0.0)]
+
+        self.assertNotEqual(zero, negative)
+        self.assertEqual(len(set(nested)), 2)
+
+    def test_inputs_are_never_merged(self) -> None:
+        ir = CoreIR(intern=True)
+        self.assertNotEqual(ir.declare_input("x"), ir.declare_input("x"))
+
+    def test_copies_keep_interning(self) -> None:
+        ir = CoreIR(intern=True)
+        x = ir.declare_input("x", result_type="tensor<f32[2]>")
+        relu = ir.add_operation("Relu", [x], result_type="tensor<f32[2]>")
+        copy = ir.copy()
+
+        self.assertTrue(copy.intern)
+        self.assertEqual(copy.add_operation("Relu", [x], result_type="tensor<f32[2]>"), relu)
+        neg = copy.add_operation("Neg", [x], result_type="tensor<f32[2]>")
+        self.assertEqual(copy.add_operation("Neg", [x], result_type="tensor<f32[2]>"), neg)
+        self.assertEqual(len(copy.operations), 3)
+
+        # The tables are independent: the original has not seen the copy's Neg.
+        ir.add_operation("Neg", [x], result_type="tensor<f32[2]>")
+        self.assertEqual(len(ir.operations), 3)
+        self.assertEqual(copy.deduplicated, 2)
+
+    def test_interning_is_opt_in(self) -> None:
+        ir = CoreIR()
+        ir.add_operation("Add", [1, 0])
+        ir.add_operation("Add", [1, 0])
+
+        self.assertEqual(len(ir.operations), 2)
+        self.assertEqual(ir.operations[0].operands, [1, 0])
+        self.assertEqual(ir.deduplicated, 0)
+
+
+class TestCoreIRStreaming(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ir = CoreIR()
+        x = self.ir.declare_input("x", result_type="tensor<f32[2]>")
+        for _ in range(50):
+            x = self.ir.add_operation("Relu", [x], result_type="tensor<f32[2]>")
+        self.ir.mark_output(x)
+
+    def test_text_sink_matches_compile(self) -> None:
+        sink = io.StringIO()
+        written = self.ir.write_to(sink, buffer_size=64)
+
+        self.assertEqual(sink.getvalue(), self.ir.compile())
+        self.assertEqual(written, len(self.ir.compile()))
+
+    def test_binary_sink_receives_utf8(self) -> None:
+        sink = io.BytesIO()
+        self.ir.write_to(sink, buffer_size=1)
+
+        self.assertEqual(sink.getvalue(), self.ir.compile().encode("utf-8"))
+
+    def test_outputs_without_operations(self) -> None:
+        ir = CoreIR()
+        ir.mark_output(0)
+        self.assertEqual(ir.compile(), "\noutputs: %0")
+        self.assertEqual("".join(CoreIR().iter_compiled()), "")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from tools.core_ir.core_ir import CoreIR
+
+if np is not None:
+    from tools.core_ir.executor import Executor, execute
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestExecutor(unittest.TestCase):
+    def test_relu_execution_conformance(self) -> None:
+        # tests/conformance/runtime/relu_execution.yaml
+        ir = CoreIR()
+        x = ir.add_operation(
+            "ConstTensor",
+            attributes={"value": [[-1.0, 0.0, 1.0], [-2.0, 3.0, -0.5]], "shape": (2, 3), "dtype": "f32"},
+            result_type="tensor<f32[2, 3]>",
+        )
+        ir.mark_output(ir.add_operation("Relu", [x], result_type="tensor<f32[2, 3]>"))
+
+        (result,) = execute(ir)
+        self.assertEqual(result.dtype, np.float32)
+        np.testing.assert_allclose(result, [[0.0, 0.0, 1.0], [0.0, 3.0, 0.0]], atol=1e-6)
+
+    def test_broadcast_success_conformance(self) -> None:
+        # tests/conformance/shapes/broadcast_success.yaml
+        ir = CoreIR()
+        matrix = ir.declare_input("matrix", "tensor<f32[2, 3]>")
+        scalar = ir.declare_input("scalar", "tensor<f32[]>")
+        ir.mark_output(ir.add_operation("Add", [matrix, scalar], result_type="tensor<f32[2, 3]>"))
+
+        (result,) = execute(ir, {"matrix": [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]], "scalar": 10.0})
+        np.testing.assert_allclose(result, [[11.0, 12.0, 13.0], [14.0, 15.0, 16.0]], atol=1e-6)
+
+    def test_reductions_and_shape_ops(self) -> None:
+        ir = CoreIR()
+        x = ir.declare_input("x", "tensor<f32[4, 5, 6]>")
+        outputs = [
+            ir.add_operation("Sum", [x], {"axes": [], "keepdims": True}),
+            ir.add_operation("Sum", [x], {"axes": [1], "keepdims": True}),
+            ir.add_operation("Mean", [x], {"axes": [0, -1], "keepdims": False}),
+            ir.add_operation("Transpose", [x], {"permutation": [2, 0, 1]}),
+            ir.add_operation("Reshape", [x], {"new_shape": [20, -1]}),
+            ir.add_operation("ExpandDims", [x], {"axes": [0, 2]}),
+        ]
+        for value_id in outputs:
+            ir.mark_output(value_id)
+
+        data = np.arange(120, dtype=np.float32).reshape(4, 5, 6)
+        results = execute(ir, {"x": data})
+
+        self.assertEqual([r.shape for r in results], [(), (4, 1, 6), (5,), (6, 4, 5), (20, 6), (1, 4, 1, 5, 6)])
+        np.testing.assert_allclose(results[0], data.sum())
+        np.testing.assert_allclose(results[2], data.mean(axis=(0, 2)), rtol=1e-6)
+
+    def test_matmul_and_conv2d(self) -> None:
+        ir = CoreIR()
+        a = ir.declare_input("a", "tensor<f32[2, 3, 4]>")
+        b = ir.declare_input("b", "tensor<f32[4, 5]>")
+        image = ir.declare_input("image", "tensor<f32[1, 5, 5, 2]>")
+        kernel = ir.declare_input("kernel", "tensor<f32[3, 3, 2, 4]>")
+        ir.mark_output(ir.add_operation("MatMul", [a, b]))
+        ir.mark_output(ir.add_operation("Conv2d", [image, kernel], {"strides": [2, 2], "padding": "Same"}))
+
+        rng = np.random.default_rng(0)
+        inputs = {
+            "a": rng.standard_normal((2, 3, 4)),
+            "b": rng.standard_normal((4, 5)),
+            "image": rng.standard_normal((1, 5, 5, 2)),
+            "kernel": rng.standard_normal((3, 3, 2, 4)),
+        }
+        product, conv = execute(ir, inputs)
+
+        np.testing.assert_allclose(product, np.asarray(inputs["a"], np.float32) @ np.asarray(inputs["b"], np.float32), rtol=1e-5)
+        self.assertEqual(conv.shape, (1, 3, 3, 4))
+        padded = np.pad(inputs["image"], ((0, 0), (1, 1), (1, 1), (0, 0)))
+        expected = np.einsum("hwc,hwcf->f", padded[0, 2:5, 2:5], inputs["kernel"])
+        np.testing.assert_allclose(conv[0, 1, 1], expected, rtol=1e-4)
+
+    def test_buffers_released_after_last_use(self) -> None:
+        ir = CoreIR()
+        value = ir.declare_input("x", "tensor<f64[1024]>")
+        for _ in range(20):
+            value = ir.add_operation("Neg", [value], result_type="tensor<f64[1024]>")
+        ir.mark_output(value)
+
+        executor = Executor(ir)
+        executor.run({"x": np.zeros(1024)})
+
+        # Only the current input and output of each step are ever live.
+        self.assertEqual(executor.peak_live_bytes, 2 * 1024 * 8)
+
+    def test_input_shape_is_checked(self) -> None:
+        ir = CoreIR()
+        ir.mark_output(ir.declare_input("x", "tensor<f32[2]>"))
+        with self.assertRaises(ValueError):
+            execute(ir, {"x": [1.0, 2.0, 3.0]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import unittest
+from pathlib import Path
+from unittest import mock
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from tools.core_ir.core_ir import CoreIR
+from tools.core_ir.ir_parser import load_ir
+
+if np is not None:
+    from tools.core_ir import fixed_point
+    from tools.core_ir.fixed_point import ONE, Q16Executor, from_q16, random_inputs, to_q16, wrap
+
+EXAMPLES = Path(__file__).resolve().parents[2] / "examples" / "ir"
+
+
+def wrap32(value: int) -> int:
+    return (value + 2**31) % 2**32 - 2**31
+
+
+def scalar_matmul(a, b):
+    """The per-element ``dot_q16`` loop on Python integers."""
+
+    return [[wrap32(sum((x * b[k][j]) >> 16 for k, x in enumerate(row))) for j in range(len(b[0]))] for row in a]
+
+
+def make_module() -> CoreIR:
+    """h = (relu(x @ w + b) ** 2 - b) / d and its row means and total, all on the Q16.16 path."""
+
+    ir = CoreIR()
+    x = ir.declare_input("x", "tensor<f32[3, 5]>")
+    w = ir.declare_input("w", "tensor<f32[5, 4]>")
+    bias = ir.add_operation("ConstTensor", [], {"value": [0.5, -0.25, 1.0, 0.0], "shape": (4,)}, "tensor<f32[4]>")
+    d = ir.add_operation("ConstF32", [], {"value": 1.5}, "tensor<f32[]>")
+    h = ir.add_operation("MatMul", [x, w], result_type="tensor<f32[3, 4]>")
+    h = ir.add_operation("Add", [h, bias], result_type="tensor<f32[3, 4]>")
+    h = ir.add_operation("Relu", [h], result_type="tensor<f32[3, 4]>")
+    h = ir.add_operation("Mul", [h, h], result_type="tensor<f32[3, 4]>")
+    h = ir.add_operation("Sub", [h, bias], result_type="tensor<f32[3, 4]>")
+    h = ir.add_operation("Div", [h, d], result_type="tensor<f32[3, 4]>")
+    ir.mark_output(h)
+    ir.mark_output(ir.add_operation("Mean", [h], {"axes": [1], "keepdims": False}, "tensor<f32[3]>"))
+    ir.mark_output(ir.add_operation("Sum", [h], {"axes": []}, "tensor<f32[]>"))
+    return ir
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestQ16Executor(unittest.TestCase):
+    def test_matches_scalar_reference(self) -> None:
+        ir = make_module()
+        inputs = random_inputs(ir, seed=3)
+        x, w = inputs["x"].tolist(), inputs["w"].tolist()
+        bias, d = [int(v * ONE) for v in (0.5, -0.25, 1.0, 0.0)], int(1.5 * ONE)
+
+        h = [[max(wrap32(v + bias[j]), 0) for j, v in enumerate(row)] for row in scalar_matmul(x, w)]
+        h = [[wrap32(wrap32((v * v) >> 16) - bias[j]) for j, v in enumerate(row)] for row in h]
+        h = [[wrap32((v << 16) // d) for v in row] for row in h]
+        means = [sum(row) // len(row) for row in h]
+
+        executor = Q16Executor(ir)
+        result, mean, total = executor.run(inputs)
+        self.assertEqual(result.dtype, np.int32)
+        self.assertEqual(result.tolist(), h)
+        self.assertEqual(mean.tolist(), means)
+        self.assertEqual(int(total), wrap32(sum(map(sum, h))))
+
+        # The same values given as floats convert exactly and produce the same digest.
+        digest = executor.digest
+        executor.run({name: from_q16(value) for name, value in inputs.items()})
+        self.assertEqual(executor.digest, digest)
+
+    def test_blocked_matmul_and_dot_match_scalar_loop(self) -> None:
+        rng = np.random.default_rng(0)
+        a = rng.integers(-(2**31), 2**31, (2, 3, 700), dtype=np.int32)
+        b = rng.integers(-(2**31), 2**31, (700, 2), dtype=np.int32)
+        ir = CoreIR()
+        lhs = ir.declare_input("a", "tensor<f32[2, 3, 700]>")
+        rhs = ir.declare_input("b", "tensor<f32[700, 2]>")
+        ir.mark_output(ir.add_operation("MatMul", [lhs, rhs], result_type="tensor<f32[2, 3, 2]>"))
+        vector = ir.add_operation("Index", [lhs], {"indices": [0, 0]}, "tensor<f32[700]>")
+        ir.mark_output(ir.add_operation("Dot", [vector, rhs], result_type="tensor<f32[2]>"))
+
+        # A tiny block forces the contracting dimension through many partial sums.
+        with mock.patch.object(fixed_point, "MATMUL_BLOCK_ELEMENTS", 64):
+            matmul, dot = Q16Executor(ir).run({"a": a, "b": b})
+        expected = [scalar_matmul(batch, b.tolist()) for batch in a.tolist()]
+        self.assertEqual(matmul.tolist(), expected)
+        self.assertEqual(dot.tolist(), expected[0][0])
+
+    def test_conversion_rounding_and_wrapping(self) -> None:
+        self.assertEqual(to_q16([0.5 / ONE, 1.5 / ONE, -0.5 / ONE, -1.0]).tolist(), [0, 2, 0, -ONE])
+        self.assertEqual(to_q16([1e12, -1e12]).tolist(), [2**31 - 1, -(2**31)])
+        wrapped = wrap(np.array([2**31, -(2**31) - 1, 2**40 + 5], dtype=np.int64))
+        self.assertEqual(wrapped.tolist(), [-(2**31), 2**31 - 1, 5])
+        with self.assertRaisesRegex(ValueError, "NaN"):
+            to_q16(float("nan"))
+
+        ir = CoreIR()
+        x = ir.declare_input("x", "tensor<f32[2]>")
+        zero = ir.add_operation("ConstF32", [], {"value": 0.0}, "tensor<f32[]>")
+        ir.mark_output(ir.add_operation("Div", [x, zero], result_type="tensor<f32[2]>"))
+        with self.assertRaisesRegex(ZeroDivisionError, "%2 = Div"):
+            Q16Executor(ir).run({"x": [1.0, 2.0]})
+
+        ir.mark_output(ir.add_operation("Exp", [x], result_type="tensor<f32[2]>"))
+        with self.assertRaisesRegex(NotImplementedError, "No Q16.16 kernel for opcode 'Exp'"):
+            Q16Executor(ir)
+
+    def test_digest_tracks_every_operation(self) -> None:
+        for path in sorted(EXAMPLES.glob("*.ir")):
+            with self.subTest(path.name):
+                ir = load_ir(path)
+                inputs = random_inputs(ir, seed=1)
+                first, second = Q16Executor(ir), Q16Executor(ir)
+                outputs = first.run(inputs)
+                second.run({name: value.copy() for name, value in inputs.items()})
+                self.assertEqual(first.digest, second.digest)
+                self.assertTrue(all(output.dtype == np.int32 for output in outputs))
+
+                name, value = next(iter(inputs.items()))
+                value = value.copy()
+                value.flat[0] ^= 1
+                second.run({**inputs, name: value})
+                self.assertNotEqual(first.digest, second.digest)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import io
+import json
+import unittest
+
+from tools.core_ir import language
+from tools.core_ir.compile_cache import CompilationCache
+from tools.core_ir.core_ir import CoreIR
+from tools.core_ir.instrument import Profiler
+from tools.core_ir.language import BinaryOperation, LanguageConstruct, Literal, Variable
+from tools.core_ir.type_system import TensorType, TypeSystem
+
+
+def make_construct(cache: CompilationCache = None) -> LanguageConstruct:
+    type_system = TypeSystem()
+    type_system.add_symbol("x", TensorType("f32", (2, 3)))
+    type_system.add_symbol("w", TensorType("f32", (3, 3)))
+    product = BinaryOperation("MatMul", Variable("x"), Variable("w"))
+    expression = BinaryOperation("Add", product, Literal(1.0, "f32"))
+    return LanguageConstruct(expression, type_system, compile_cache=cache)
+
+
+class TestProfiler(unittest.TestCase):
+    def test_originals_are_restored(self) -> None:
+        originals = (CoreIR.add_operation, language.lower, language.Literal.infer_type, TypeSystem.broadcast_shapes)
+        with Profiler():
+            self.assertIsNot(CoreIR.add_operation, originals[0])
+            self.assertIsNot(language.lower, originals[1])
+        self.assertEqual(
+            (CoreIR.add_operation, language.lower, language.Literal.infer_type, TypeSystem.broadcast_shapes), originals
+        )
+
+    def test_report_covers_phases_opcodes_and_caches(self) -> None:
+        cache = CompilationCache()
+        make_construct(cache).to_ir()
+        with Profiler() as profiler:
+            for _ in range(3):
+                make_construct(cache).to_ir().compile()
+            make_construct().to_ir()
+        report = json.loads(json.dumps(profiler.report()))
+
+        phases = report["phases"]
+        self.assertTrue({"to_ir", "lower", "validate_program", "infer_type", "add_operation", "compile"} <= set(phases))
+        self.assertEqual(phases["to_ir"]["calls"], 4)
+        self.assertEqual(phases["compile"]["calls"], 3)
+        self.assertLessEqual(phases["to_ir"]["self_s"], phases["to_ir"]["total_s"])
+        self.assertEqual(report["opcodes"], {"Add": 1, "ConstTensor": 1, "Input": 2, "MatMul": 1})
+        self.assertEqual(report["caches"]["compile_cache"]["hits"], 3)
+        self.assertEqual(report["caches"]["compile_cache"]["hit_rate"], 1.0)
+        self.assertEqual(report["caches"]["type_cache"]["misses"], 5)
+
+    def test_chrome_trace_nests_spans(self) -> None:
+        with Profiler(trace=True, max_events=6) as profiler:
+            make_construct().to_ir()
+        trace = profiler.chrome_trace()
+
+        events = trace["traceEvents"]
+        self.assertEqual(len(events), 6)
+        self.assertGreater(profiler.dropped_events, 0)
+        self.assertTrue(all(event["ph"] == "X" for event in events))
+        self.assertIn({"opcode": "Input"}, [event.get("args") for event in events])
+        buffer = io.StringIO()
+        profiler.write_chrome_trace(buffer)
+        self.assertEqual(json.loads(buffer.getvalue())["traceEvents"], events)
+
+    def test_memory_statistics(self) -> None:
+        with Profiler(memory=True, memory_top=3) as profiler:
+            make_construct().to_ir()
+        report = profiler.report()
+
+        self.assertGreater(report["memory"]["peak_bytes"], 0)
+        self.assertLessEqual(len(report["memory"]["by_file"]), 3)
+        self.assertIn("allocated_bytes", report["phases"]["lower"])
+
+    def test_only_one_profiler_at_a_time(self) -> None:
+        with Profiler():
+            with self.assertRaises(RuntimeError):
+                Profiler().start()
+
+
+if __name__ == "__main__":
+    unittest.main()
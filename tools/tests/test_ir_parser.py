@@ -0,0 +1,116 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from tools.core_ir.core_ir import CoreIR
+from tools.core_ir.ir_parser import IRParseError, format_ir, load_ir, parse_ir
+from tools.core_ir.type_system import TensorType
+
+if np is not None:
+    from tools.core_ir.executor import execute
+
+EXAMPLES = Path(__file__).resolve().parents[2] / "examples" / "ir"
+
+
+class TestIRParser(unittest.TestCase):
+    def test_examples_parse_and_verify(self) -> None:
+        for path in sorted(EXAMPLES.glob("*.ir")):
+            with self.subTest(path.name):
+                ir = load_ir(path)
+                ir.verify()
+
+        simple = load_ir(EXAMPLES / "simple_module.ir")
+        self.assertEqual(
+            simple.compile().splitlines()[3:],
+            ["%3 = Add (%0, %1) : tensor<f32[2, 3]>", "%4 = Mul (%2, %3) : tensor<f32[2, 3]>", "outputs: %4"],
+        )
+
+    def test_aliases_and_attributes(self) -> None:
+        ir = load_ir(EXAMPLES / "autodiff_output.ir")
+        by_id = {op.value_id: op for op in ir.operations}
+
+        self.assertNotIn(8, by_id)
+        self.assertEqual(by_id[12].operands, [7, 10])
+        self.assertEqual(by_id[4].attributes, {"axes": [], "keepdims": False})
+        self.assertEqual(by_id[6].attributes["shape"], (2, 3))
+        self.assertEqual(ir.outputs, [4, 12, 11])
+
+    def test_types_are_interned(self) -> None:
+        ir = parse_ir(
+            "%0 = Input() {name: \"x\"} : Tensor<f32, [2, 3]>\n%1 = Relu(%0) : tensor<f32[2, 3]>\noutputs: %1"
+        )
+
+        first, second = (op.result_type for op in ir.operations)
+        self.assertIs(first, second)
+        self.assertIs(TensorType.parse(first), TensorType.parse(second))
+
+    def test_format_round_trip(self) -> None:
+        text = (
+            "%x = Input() {name: \"x, \\\"quoted\\\"\"} : Tensor<f32, [1, 4, 4, 2]>\n"
+            "%w = Input() {name: \"w\"} : Tensor<f32, [3, 3, 2, 2]>\n"
+            "%2 = Conv2d(%x, %w, [1, 1], Custom([[1, 1], [0, 2]])) : Tensor<f32, [1, 4, 4, 2]>\n"
+            "%3 = Slice(%2, [0:1, 1:4:2]) : Tensor<f32, [1, 2, 4, 2]>\n"
+            "%4 = Reshape(%3, [2, 8]) : Tensor<f32, [2, 8]>\n"
+            "%5 = ConstI64(-3) : Tensor<i64, []>\n"
+            "outputs: %4, %5,\n"
+        )
+        ir = parse_ir(text)
+
+        self.assertEqual(ir.operations[0].attributes["name"], 'x, "quoted"')
+        self.assertEqual(ir.operations[2].attributes, {"strides": [1, 1], "padding": [[1, 1], [0, 2]]})
+        self.assertEqual(ir.operations[3].attributes, {"starts": [0, 1], "ends": [1, 4], "steps": [1, 2]})
+        reparsed = parse_ir(format_ir(ir))
+        self.assertEqual(reparsed.operations, ir.operations)
+        self.assertEqual(reparsed.outputs, [4, 5])
+
+    def test_errors_carry_code_and_line(self) -> None:
+        cases = [
+            ("%0 = Input() : Tensor<f32, [2]>\n%1 = Relu(%0 : Tensor<f32, [2]>\n", "E1001", 2),
+            ("# comment\n%1 = Relu(%0) : Tensor<f32, [2]>\noutputs: %1\n", "E4001", 2),
+            ("%0 = Input() : Tensor<f32, [2]>\n%0 = Input() : Tensor<f32, [2]>\n", "E4002", 2),
+            ("%0 = Input() : Tensor<f32, [2]>\n%1 = Sum(%0, [0]) : Tensor<f32, []>\n", "E1001", 2),
+            ("%0 = Input() : Tensor<f32, [2]>\n", "E1001", 2),
+            ("%0 = Input() : Tensor<f32, [2]>\noutputs: %0\n%1 = Relu(%0) : Tensor<f32, [2]>\n", "E1001", 3),
+            # Only BinOp takes an operator name; the operand-only fast path must not accept one elsewhere.
+            ("%0 = Input() : Tensor<f32, [2]>\n%1 = Relu(Exp, %0) : Tensor<f32, [2]>\n", "E1001", 2),
+            ("%0 = Input() : Tensor<f32, [2]>\n%1 = BinOp(Add, %0) : Tensor<f32, [2]>\n", "E1001", 2),
+        ]
+        for text, code, line in cases:
+            with self.assertRaises(IRParseError) as ctx:
+                parse_ir(text, source="case.ir")
+            self.assertEqual((ctx.exception.code, ctx.exception.line), (code, line), text)
+            self.assertTrue(str(ctx.exception).startswith(f"{code}: case.ir:{line}: "))
+
+    def test_load_uses_memory_map(self) -> None:
+        fd, path = tempfile.mkstemp(suffix=".ir")
+        os.close(fd)
+        try:
+            Path(path).write_bytes(b"%0 = Input() {name: \"a\"} : Tensor<f32, [2]>\r\noutputs: %0\r\n")
+            ir = load_ir(path)
+            self.assertIsInstance(ir, CoreIR)
+            self.assertEqual(ir.outputs, [0])
+        finally:
+            os.unlink(path)
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestIRParserExecution(unittest.TestCase):
+    def test_autodiff_example_gradients(self) -> None:
+        ir = load_ir(EXAMPLES / "autodiff_output.ir")
+        x = np.arange(6, dtype=np.float32).reshape(2, 3)
+        y = np.linspace(-1, 1, 6, dtype=np.float32).reshape(2, 3)
+
+        loss, grad_x, grad_y = execute(ir, {"x": x, "y": y})
+        np.testing.assert_allclose(loss, np.sum(x * y + x), rtol=1e-6)
+        np.testing.assert_allclose(grad_x, y + 1)
+        np.testing.assert_allclose(grad_y, x)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+
+from tools.core_ir.core_ir import CoreIR
+from tools.core_ir.liveness import analyze_liveness, plan_memory
+
+F32_1K = "tensor<f32[256]>"
+F32_2K = "tensor<f32[2, 256]>"
+
+
+class TestLiveness(unittest.TestCase):
+    def setUp(self) -> None:
+        # x -> Exp -> Neg -> Reshape (output), plus an unused Add -> Relu branch
+        ir = CoreIR()
+        x = ir.declare_input("x", F32_1K)
+        a = ir.add_operation("Exp", [x], result_type=F32_1K)
+        b = ir.add_operation("Neg", [a], result_type=F32_1K)
+        c = ir.add_operation("Reshape", [b], {"new_shape": [16, 16]}, "tensor<f32[16, 16]>")
+        d = ir.add_operation("Add", [x, x], result_type=F32_1K)
+        ir.add_operation("Relu", [d], result_type=F32_1K)
+        ir.mark_output(c)
+        self.ir = ir
+
+    def test_live_ranges(self) -> None:
+        ranges = analyze_liveness(self.ir)
+
+        self.assertEqual([(r.start, r.end) for r in ranges.values()], [(0, 4), (1, 2), (2, 3), (3, 5), (4, 5), (5, 5)])
+        self.assertEqual(ranges[0].nbytes, 1024)
+        self.assertNotIn(0, analyze_liveness(self.ir, include_inputs=False))
+
+    def test_plan_reuses_and_updates_in_place(self) -> None:
+        plan = plan_memory(self.ir)
+
+        self.assertEqual(plan.in_place, [2, 5])
+        self.assertEqual(plan.assignment[2], plan.assignment[1])
+        self.assertEqual(plan.no_reuse_bytes, 6 * 1024)
+        self.assertEqual(plan.reuse_bytes, 3 * 1024)
+        self.assertEqual(plan.peak_live_bytes, 3 * 1024)
+        self.assertEqual(plan_memory(self.ir).assignment, plan.assignment)
+
+    def test_without_in_place(self) -> None:
+        plan = plan_memory(self.ir, in_place=False)
+        self.assertEqual(plan.in_place, [])
+        self.assertGreaterEqual(plan.reuse_bytes, plan.peak_live_bytes)
+        self.assertLessEqual(plan.reuse_bytes, plan.no_reuse_bytes)
+
+    def test_grows_free_slot_when_none_fits(self) -> None:
+        ir = CoreIR()
+        x = ir.declare_input("x", F32_1K)
+        y = ir.declare_input("y", F32_2K)
+        a = ir.add_operation("Exp", [x], result_type=F32_1K)
+        total = ir.add_operation("Sum", [a], {"axes": [0]}, "tensor<f32[]>")
+        # ``a``'s slot is free once ``total`` is computed, but the broadcast result needs twice its size.
+        result = ir.add_operation("Add", [total, y], result_type=F32_2K)
+        ir.mark_output(result)
+        ir.verify()
+
+        plan = plan_memory(ir, include_inputs=False)
+        self.assertEqual(plan.assignment[result], plan.assignment[a])
+        self.assertEqual(plan.slot_sizes, [2048, 4])
+        self.assertEqual(plan.summary()["slots"], 2)
+
+    def test_broadcast_operand_is_not_overwritten(self) -> None:
+        # ``row`` lands in a freed [2, 3] slot, so its slot is large enough for the Add result.
+        ir = CoreIR()
+        x = ir.declare_input("x", "tensor<f32[2, 3]>")
+        y = ir.declare_input("y", "tensor<f32[3]>")
+        p = ir.add_operation("Exp", [x], result_type="tensor<f32[2, 3]>")
+        q = ir.add_operation("Sum", [p], {"axes": [0]}, "tensor<f32[3]>")
+        row = ir.add_operation("Neg", [y], result_type="tensor<f32[3]>")
+        ir.mark_output(q)
+        ir.mark_output(ir.add_operation("Add", [row, x], result_type="tensor<f32[2, 3]>"))
+
+        plan = plan_memory(ir)
+        self.assertEqual(plan.assignment[row], plan.assignment[p])
+        self.assertEqual(plan.in_place, [])
+        self.assertNotEqual(plan.assignment[ir.outputs[1]], plan.assignment[row])
+
+
+if __name__ == "__main__":
+    unittest.main()
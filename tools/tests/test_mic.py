@@ -0,0 +1,132 @@
+import io
+import unittest
+
+from tools.core_ir.autodiff import differentiate
+from tools.core_ir.core_ir import CoreIR
+from tools.core_ir.mic import MicLimits, MicParseError, MicParser, emit, format_literal, loads, parse, parse_literal
+from tools.core_ir.passes import fuse_elementwise
+
+# RFC-0001 "Complete Example" (mic@1) and the mic@2 residual block.
+RFC_MLP = """mic@1
+# Simple MLP forward pass
+S0 "input"
+S1 "weight1"
+S2 "bias1"
+S3 "output"
+T0 f32
+T1 [f32;784]
+T2 [f32;784,256]
+T3 [f32;256]
+T4 [f32;256]
+N1 input S0 T1
+N2 input S1 T2
+N3 input S2 T3
+N4 matmul N1 N2 T4
+N5 add N4 N3 T4
+N6 relu N5 T4
+O N6
+"""
+
+RESIDUAL_BLOCK = """mic@2
+T0 f16 128 128
+T1 f16 128
+a X T0
+p W T0
+p b T1
+m 0 1
++ 3 2
+r 4
++ 5 0
+O 6"""
+
+
+def gradient_module() -> CoreIR:
+    ir = CoreIR()
+    x = ir.declare_input("x", "tensor<f32[3, 4]>")
+    w = ir.declare_input("w", "tensor<f32[4, 4]>")
+    z = ir.add_operation("MatMul", [x, w], result_type="tensor<f32[3, 4]>")
+    z = ir.add_operation("Relu", [z], result_type="tensor<f32[3, 4]>")
+    z = ir.add_operation("Exp", [z], {}, "tensor<f32[3, 4]>")
+    ir.mark_output(ir.add_operation("Mean", [z], {"axes": [0, 1]}, "tensor<f32[]>"))
+    differentiate(ir)
+    ir.add_operation("Slice", [x], {"starts": [0, 1], "ends": [2, 4], "steps": [1, 1]}, "tensor<f32[2, 3]>")
+    ir.add_operation("Conv2d", [x, w], {"strides": (1, 1), "padding": "same", "note": "a b=c"}, None)
+    return ir
+
+
+class TestMic(unittest.TestCase):
+    def test_round_trip_is_lossless(self) -> None:
+        for version in (1, 2):
+            ir = gradient_module()
+            text = emit(ir, version)
+            restored = loads(text)
+
+            self.assertEqual(restored.operations, ir.operations)
+            self.assertEqual(restored.outputs, ir.outputs)
+            self.assertEqual(emit(restored, version), text)
+
+    def test_mic2_renumbers_values_densely(self) -> None:
+        ir = gradient_module()
+        ir.operations.pop()
+        fuse_elementwise(ir)
+        restored = loads(emit(ir, 2))
+
+        self.assertEqual([op.value_id for op in restored.operations], list(range(len(ir.operations))))
+        self.assertEqual([op.attributes for op in restored.operations], [op.attributes for op in ir.operations])
+        index_of = {op.value_id: index for index, op in enumerate(ir.operations)}
+        self.assertEqual(restored.outputs, [index_of[output] for output in ir.outputs])
+
+    def test_parses_specification_examples_from_a_stream(self) -> None:
+        mlp = parse(io.BytesIO(RFC_MLP.encode("utf-8")))
+        self.assertEqual([op.value_id for op in mlp.operations], [1, 2, 3, 4, 5, 6])
+        self.assertEqual(mlp.operations[1].attributes, {"name": "weight1"})
+        self.assertEqual(mlp.operations[3].result_type, "tensor<f32[256]>")
+        self.assertIs(mlp.operations[4].result_type, mlp.operations[3].result_type)
+        self.assertEqual(mlp.outputs, [6])
+
+        residual = loads(RESIDUAL_BLOCK)
+        self.assertEqual([op.opcode for op in residual.operations][3:], ["MatMul", "Add", "Relu", "Add"])
+        self.assertEqual(residual.operations[6].operands, [5, 0])
+        self.assertEqual(emit(residual, 2), RESIDUAL_BLOCK.replace("p ", "a "))
+
+    def test_map_metadata_is_preserved(self) -> None:
+        ir = loads(RESIDUAL_BLOCK)
+        metadata = {"evidence_chain.parent": b"\xca\xfe", "target": {"canonical_name": "cpu_avx2", "tier": 2}}
+        text = emit(ir, 2, metadata)
+        parser = MicParser()
+        for line in text.splitlines(keepends=True):
+            parser.feed(line)
+        parser.close()
+
+        self.assertEqual(parser.metadata, metadata)
+        self.assertTrue(text.endswith('    canonical_name = "cpu_avx2"\n    tier = 2\n  }\n}'))
+
+    def test_literals_keep_python_types(self) -> None:
+        values = [0, -3, 2.5, float("inf"), True, None, "same", "N3", 'a "q"', [1, [2, 3]], (), (1,), (1, 2.0), {"k": [1]}]
+        for value in values:
+            self.assertEqual(parse_literal(format_literal(value)), value)
+            self.assertEqual(type(parse_literal(format_literal(value))), type(value))
+        with self.assertRaises(ValueError):
+            parse_literal("[" * 40 + "]" * 40)
+
+    def test_errors_carry_line_numbers(self) -> None:
+        cases = [
+            ("mic@3\n", 1, "unsupported version mic@3"),
+            ("mic@1\nN1 add N0 N0\n", 2, "undefined reference N0"),
+            ("mic@1\nT1 f32\n", 2, "out of sequence"),
+            ("mic@2\nT0 f32 2\na x T0\n+ 0 1\n", 4, "undefined reference 1"),
+            ("mic@2\nT0 f32 2\na x T0\nO 0\nr 0\n", 5, "precede the output"),
+            ("mic@2\nT0 f32 2\na x T0\nO 0\nmap {\n  k = {\n", 7, "unterminated map"),
+        ]
+        for text, line, message in cases:
+            with self.assertRaises(MicParseError) as ctx:
+                loads(text)
+            self.assertEqual(ctx.exception.line, line, text)
+            self.assertIn(message, str(ctx.exception))
+
+        with self.assertRaisesRegex(MicParseError, "value count exceeds limit 2"):
+            loads(RESIDUAL_BLOCK, MicLimits(max_value_count=2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import os
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from tools.core_ir.core_ir import CoreIR
+from tools.core_ir.micb import MicbDecodeError, MicbLimits, decode, dump, encode, load, write_sleb128, write_uleb128
+
+# Residual block from spec/mic/micb-spec.md (string count 4, matching the
+# strings actually listed).
+RESIDUAL_BLOCK = bytes.fromhex(
+    "4D49434202 04 03313238 0158 0157 0162 00 02 00020000 000100"
+    " 07 000100 010200 010301 0200020001 0201020302 02050104 0201020500 06".replace(" ", "")
+)
+
+
+class TestMicbVarints(unittest.TestCase):
+    def test_uleb128_examples(self) -> None:
+        for value, expected in [(0, b"\x00"), (127, b"\x7f"), (128, b"\x80\x01"), (16384, b"\x80\x80\x01")]:
+            out = bytearray()
+            write_uleb128(out, value)
+            self.assertEqual(bytes(out), expected)
+
+    def test_zigzag_examples(self) -> None:
+        for value, expected in [(0, 0), (-1, 1), (1, 2), (-2, 3), (2, 4)]:
+            out = bytearray()
+            write_sleb128(out, value)
+            self.assertEqual(out[0], expected)
+
+
+class TestMicbCodec(unittest.TestCase):
+    def setUp(self) -> None:
+        ir = CoreIR()
+        a = ir.declare_input("a", result_type="tensor<f32[2, 3]>")
+        b = ir.declare_input("b", result_type="tensor<f32[2, 3]>")
+        total = ir.add_operation("Add", [a, b], result_type="tensor<f32[2, 3]>")
+        reduced = ir.add_operation("Sum", [total], {"axes": [-1], "keepdims": False}, "tensor<f32[2]>")
+        const = ir.add_operation("ConstTensor", [], {"value": [1.0, 2.0], "shape": (2,), "dtype": "f32"}, "tensor<f32[2]>")
+        exp = ir.add_operation("Exp", [const], result_type="tensor<f32[2]>")
+        ir.mark_output(reduced)
+        ir.mark_output(exp)
+        self.ir = ir
+
+    def test_round_trip(self) -> None:
+        data = encode(self.ir)
+        restored = decode(memoryview(data))
+
+        self.assertEqual(restored.operations, self.ir.operations)
+        self.assertEqual(restored.outputs, self.ir.outputs)
+        self.assertEqual(encode(restored), data)
+
+    def test_load_uses_memory_map(self) -> None:
+        fd, path = tempfile.mkstemp(suffix=".micb")
+        os.close(fd)
+        try:
+            dump(self.ir, path)
+            self.assertEqual(load(path).compile(), self.ir.compile())
+        finally:
+            os.unlink(path)
+
+    def test_decodes_specification_example(self) -> None:
+        ir = decode(RESIDUAL_BLOCK)
+
+        self.assertEqual([op.opcode for op in ir.operations][3:], ["MatMul", "Add", "Relu", "Add"])
+        self.assertEqual(ir.operations[2].result_type, "tensor<f16[128]>")
+        self.assertEqual(ir.operations[6].operands, [5, 0])
+        self.assertEqual(ir.outputs, [6])
+
+    def test_rejects_malformed_input(self) -> None:
+        data = encode(self.ir)
+        with self.assertRaises(MicbDecodeError):
+            decode(b"MICX" + data[4:])
+        with self.assertRaises(MicbDecodeError):
+            decode(data[:-1])
+        with self.assertRaises(MicbDecodeError) as ctx:
+            decode(data, MicbLimits(max_value_count=3))
+        self.assertIn("value count", str(ctx.exception))
+
+    def test_load_reports_malformed_files(self) -> None:
+        data = encode(self.ir)
+        start = data.index(b"{dtype:f32,")
+        corrupt = data[:start] + b"{dtype;f32," + data[start + 11 :]
+        fd, path = tempfile.mkstemp(suffix=".micb")
+        os.close(fd)
+        try:
+            # MAP payloads used to keep views into the mmap alive, so closing it raised BufferError.
+            for label, payload, offset in [("truncated", data[:-2], None), ("attributes", corrupt, start)]:
+                with self.subTest(label):
+                    with open(path, "wb") as handle:
+                        handle.write(payload)
+                    with self.assertRaises(MicbDecodeError) as ctx:
+                        load(path)
+                    if offset is not None:
+                        self.assertEqual(ctx.exception.offset, offset)
+        finally:
+            os.unlink(path)
+
+    def test_default_parameters_round_trip(self) -> None:
+        ir = CoreIR()
+        x = ir.declare_input("x", result_type="tensor<f32[2, 3]>")
+        ids = ir.declare_input("ids", result_type="tensor<i32[4]>")
+        ir.mark_output(ir.add_operation("Transpose", [x], result_type="tensor<f32[3, 2]>"))
+        ir.mark_output(ir.add_operation("Softmax", [x], result_type="tensor<f32[2, 3]>"))
+        ir.mark_output(ir.add_operation("Sum", [x], result_type="tensor<f32[]>"))
+        ir.mark_output(ir.add_operation("Gather", [x, ids], result_type="tensor<f32[4, 3]>"))
+        ir.mark_output(ir.add_operation("Transpose", [x], {"permutation": (1, 0)}, "tensor<f32[3, 2]>"))
+
+        restored = decode(encode(ir))
+        self.assertEqual(restored.operations, ir.operations)
+        restored.verify()
+
+    def test_attribute_values_round_trip_or_fail_to_encode(self) -> None:
+        ir = CoreIR()
+        x = ir.declare_input("x", result_type="tensor<f32[2]>")
+        attributes = {"low": float("-inf"), "high": float("inf"), "label": "two words", "pair": (1, None)}
+        ir.mark_output(ir.add_operation("Clip", [x], attributes, "tensor<f32[2]>"))
+        self.assertEqual(decode(encode(ir)).operations[1].attributes, attributes)
+
+        ir.operations[1].attributes = {"fill": float("nan")}
+        fill = decode(encode(ir)).operations[1].attributes["fill"]
+        self.assertNotEqual(fill, fill)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_numpy_attribute_values(self) -> None:
+        ir = CoreIR()
+        x = ir.declare_input("x", result_type="tensor<f32[2]>")
+        ir.mark_output(ir.add_operation("Scale", [x], {"factor": np.float64(0.5)}, "tensor<f32[2]>"))
+        self.assertEqual(decode(encode(ir)).operations[1].attributes, {"factor": 0.5})
+
+        for value in (np.int64(3), np.arange(3)):
+            ir.operations[1].attributes = {"factor": value}
+            with self.assertRaisesRegex(ValueError, "Attributes of %1 are not representable"):
+                encode(ir)
+
+    def test_rejects_forward_references(self) -> None:
+        forward = RESIDUAL_BLOCK.replace(bytes.fromhex("0200020001"), bytes.fromhex("0200020004"))
+        with self.assertRaises(MicbDecodeError):
+            decode(forward)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+import unittest
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from tools.core_ir.core_ir import CoreIR
+from tools.core_ir.passes import PassManager, canonicalize_operands, eliminate_dead_code, fold_constants, fuse_elementwise
+from tools.core_ir.verifier import diagnose
+
+if np is not None:
+    from tools.core_ir.executor import Executor, execute
+
+F32 = "tensor<f32[2]>"
+
+
+def const(ir: CoreIR, value: list) -> int:
+    return ir.add_operation("ConstTensor", attributes={"value": value, "shape": (2,), "dtype": "f32"}, result_type=F32)
+
+
+class TestPasses(unittest.TestCase):
+    def test_canonicalize_orders_commutative_operands_only(self) -> None:
+        ir = CoreIR()
+        x = ir.declare_input("x", F32)
+        y = ir.declare_input("y", F32)
+        ir.add_operation("Add", [y, x], result_type=F32)
+        ir.add_operation("Sub", [y, x], result_type=F32)
+
+        self.assertEqual(canonicalize_operands(ir), 1)
+        self.assertEqual([op.operands for op in ir.operations[2:]], [[0, 1], [1, 0]])
+
+    def test_dead_code_is_pruned_transitively(self) -> None:
+        ir = CoreIR()
+        x = ir.declare_input("x", F32)
+        unused_input = ir.declare_input("unused", F32)
+        dead = ir.add_operation("Exp", [x], result_type=F32)
+        ir.add_operation("Neg", [dead], result_type=F32)
+        live = ir.add_operation("Relu", [x], result_type=F32)
+        ir.mark_output(live)
+
+        self.assertEqual(eliminate_dead_code(ir), 2)
+        self.assertEqual([op.value_id for op in ir.operations], [x, unused_input, live])
+
+    def test_removed_operations_leave_the_intern_table(self) -> None:
+        ir = CoreIR(intern=True)
+        x = ir.declare_input("x", F32)
+        dead = ir.add_operation("Neg", [x], result_type=F32)
+        ir.mark_output(ir.add_operation("Relu", [x], result_type=F32))
+        eliminate_dead_code(ir)
+
+        negated = ir.add_operation("Neg", [x], result_type=F32)
+        self.assertNotEqual(negated, dead)
+        ir.mark_output(negated)
+        self.assertEqual(diagnose(ir), [])
+
+        # Fusion absorbs the inner Neg into the Exp region, removing its ValueId.
+        inner = ir.add_operation("Neg", [negated], result_type=F32)
+        ir.mark_output(ir.add_operation("Exp", [inner], result_type=F32))
+        self.assertEqual(fuse_elementwise(ir), 1)
+        again = ir.add_operation("Neg", [negated], result_type=F32)
+        self.assertNotEqual(again, inner)
+        self.assertIn(again, [op.value_id for op in ir.operations])
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_constant_folding(self) -> None:
+        ir = CoreIR()
+        a = const(ir, [1.0, 2.0])
+        b = const(ir, [3.0, 4.0])
+        total = ir.add_operation("Add", [a, b], result_type=F32)
+        x = ir.declare_input("x", F32)
+        ir.mark_output(ir.add_operation("Mul", [total, x], result_type=F32))
+        zero = const(ir, [0.0, 0.0])
+        ir.mark_output(ir.add_operation("Log", [zero], result_type=F32))
+
+        self.assertEqual(fold_constants(ir), 1)
+        folded = ir.operations[2]
+        self.assertEqual(folded.opcode, "ConstTensor")
+        self.assertEqual(folded.attributes, {"value": [4.0, 6.0], "shape": (2,), "dtype": "f32"})
+        # Log(0) is undefined and must stay unfolded.
+        self.assertEqual(ir.operations[-1].opcode, "Log")
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_pass_manager_reports_stats(self) -> None:
+        ir = CoreIR()
+        a = const(ir, [1.0, 2.0])
+        b = const(ir, [3.0, 4.0])
+        ir.mark_output(ir.add_operation("Mul", [b, a], result_type=F32))
+
+        manager = PassManager()
+        stats = manager.run(ir)
+
+        self.assertEqual([s.name for s in stats], ["canonicalize", "constant-fold", "dce"])
+        self.assertEqual([s.changes for s in stats], [1, 1, 2])
+        self.assertEqual(stats[-1].ops_delta, -2)
+        self.assertEqual(len(ir.operations), 1)
+        self.assertIn("constant-fold", manager.report())
+
+    def fusion_module(self) -> CoreIR:
+        # bias -> relu -> scale, with a side branch reading the bias sum twice
+        ir = CoreIR()
+        x = ir.declare_input("x", "tensor<f32[4, 3]>")
+        b = ir.declare_input("b", "tensor<f32[3]>")
+        s = ir.declare_input("s", "tensor<f32[4, 1]>")
+        shifted = ir.add_operation("Add", [x, b], result_type="tensor<f32[4, 3]>")
+        act = ir.add_operation("Relu", [shifted], result_type="tensor<f32[4, 3]>")
+        scaled = ir.add_operation("Mul", [act, s], result_type="tensor<f32[4, 3]>")
+        twice = ir.add_operation("Add", [scaled, scaled], result_type="tensor<f32[4, 3]>")
+        neg = ir.add_operation("Neg", [b], result_type="tensor<f32[3]>")
+        exp = ir.add_operation("Exp", [neg], result_type="tensor<f32[3]>")
+        ir.mark_output(ir.add_operation("Sub", [twice, exp], result_type="tensor<f32[4, 3]>"))
+        return ir
+
+    def test_fusion_groups_single_consumer_regions(self) -> None:
+        ir = self.fusion_module()
+
+        self.assertEqual(fuse_elementwise(ir), 2)
+        self.assertEqual([op.opcode for op in ir.operations], ["Input"] * 3 + ["Fused", "Fused"])
+        first, second = ir.operations[3:]
+        self.assertEqual(first.value_id, 5)
+        self.assertEqual(first.operands, [0, 1, 2])
+        self.assertEqual(
+            first.attributes["body"],
+            [
+                ["Add", [0, 1], "tensor<f32[4, 3]>"],
+                ["Relu", [3], "tensor<f32[4, 3]>"],
+                ["Mul", [4, 2], "tensor<f32[4, 3]>"],
+            ],
+        )
+        # ``scaled`` is read twice, so the doubling Add starts a new region.
+        self.assertEqual(second.operands, [5, 1])
+        self.assertEqual([step[0] for step in second.attributes["body"]], ["Add", "Neg", "Exp", "Sub"])
+        self.assertEqual(diagnose(ir), [])
+
+    def test_fusion_keeps_outputs_and_integer_division(self) -> None:
+        ir = CoreIR()
+        x = ir.declare_input("x", "tensor<i32[2]>")
+        quotient = ir.add_operation("Div", [x, x], result_type="tensor<i32[2]>")
+        ir.mark_output(quotient)
+        negated = ir.add_operation("Neg", [x], result_type="tensor<i32[2]>")
+        ir.mark_output(ir.add_operation("Neg", [negated], result_type="tensor<i32[2]>"))
+
+        self.assertEqual(fuse_elementwise(ir), 1)
+        self.assertEqual([op.opcode for op in ir.operations], ["Input", "Div", "Fused"])
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_fused_execution_matches_unfused(self) -> None:
+        rng = np.random.default_rng(0)
+        inputs = {"x": rng.normal(size=(4, 3)), "b": rng.normal(size=3), "s": rng.normal(size=(4, 1))}
+        ir = self.fusion_module()
+        expected = execute(ir, inputs)
+        fuse_elementwise(ir)
+
+        executor = Executor(ir)
+        np.testing.assert_array_equal(executor.run(inputs)[0], expected[0])
+        self.assertEqual(executor.run(inputs)[0].dtype, np.float32)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import random
+import unittest
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from tools.core_ir.core_ir import CoreIR
+from tools.core_ir.ir_parser import load_ir
+
+if np is not None:
+    from tools.core_ir.executor import Executor
+    from tools.core_ir.scheduler import ParallelExecutor, execute_parallel
+
+EXAMPLES = Path(__file__).resolve().parents[2] / "examples" / "ir"
+
+
+def random_dag(ops: int, seed: int) -> CoreIR:
+    """Elementwise and MatMul operations over 16x16 tensors that reuse earlier values at random."""
+
+    rng = random.Random(seed)
+    shape = "tensor<f32[16, 16]>"
+    ir = CoreIR()
+    pool = [ir.declare_input(name, shape) for name in ("a", "b", "c")]
+    for _ in range(ops):
+        opcode = rng.choice(("Add", "Sub", "Mul", "MatMul", "Relu", "Neg"))
+        if opcode in ("Relu", "Neg"):
+            operands = [rng.choice(pool)]
+        else:
+            operands = [rng.choice(pool), rng.choice(pool)]
+        pool.append(ir.add_operation(opcode, operands, result_type=shape))
+    for value in rng.sample(pool[3:], 4):
+        ir.mark_output(value)
+    return ir
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestParallelExecutor(unittest.TestCase):
+    def assert_bit_identical(self, ir: CoreIR, inputs, max_workers: int) -> ParallelExecutor:
+        expected = Executor(ir).run(inputs)
+        executor = ParallelExecutor(ir, max_workers=max_workers)
+        for _ in range(3):
+            actual = executor.run(inputs)
+            self.assertEqual(len(actual), len(expected))
+            for got, want in zip(actual, expected):
+                self.assertEqual((got.dtype, got.shape), (want.dtype, want.shape))
+                self.assertEqual(got.tobytes(), want.tobytes())
+        return executor
+
+    def test_matmul_module_matches_serial_execution(self) -> None:
+        ir = load_ir(EXAMPLES / "matmul_module.ir")
+        rng = np.random.default_rng(0)
+        inputs = {
+            "a": rng.standard_normal((3, 4)),
+            "b": rng.standard_normal((4, 5)),
+            "batch_a": rng.standard_normal((2, 3, 4)),
+            "batch_b": rng.standard_normal((2, 4, 5)),
+            "vec_a": rng.standard_normal(4),
+            "vec_b": rng.standard_normal(4),
+        }
+        executor = self.assert_bit_identical(ir, inputs, max_workers=4)
+
+        self.assertEqual(executor.levels, [[0, 1, 5, 6, 8, 9], [2, 3, 7, 10], [4]])
+        self.assertEqual([t is None for t in executor.timings], [op.opcode == "Input" for op in ir.operations])
+        seconds, path = executor.critical_path()
+        self.assertIn(path, ([0, 3, 4], [0, 2], [5, 7], [8, 10]))
+        self.assertLessEqual(seconds, sum(t.duration_s for t in executor.timings if t is not None))
+
+    def test_random_dags_match_serial_execution(self) -> None:
+        rng = np.random.default_rng(1)
+        inputs = {name: rng.standard_normal((16, 16), dtype=np.float32) for name in "abc"}
+        for seed in range(5):
+            with self.subTest(seed=seed):
+                executor = self.assert_bit_identical(random_dag(60, seed), inputs, max_workers=1 + seed)
+                self.assertLessEqual(executor.peak_live_bytes, 200 * 16 * 16 * 4)
+
+    def test_errors_propagate(self) -> None:
+        ir = CoreIR()
+        x = ir.declare_input("x", "tensor<f32[2]>")
+        ir.mark_output(ir.add_operation("Boom", [x], result_type="tensor<f32[2]>"))
+
+        def boom(op, args):
+            raise FloatingPointError("kernel failed")
+
+        with self.assertRaisesRegex(FloatingPointError, "kernel failed"):
+            ParallelExecutor(ir, kernels={"Boom": boom}).run({"x": [1.0, 2.0]})
+        ir.operations[-1].operands[0] = 99
+        with self.assertRaisesRegex(ValueError, "not defined"):
+            ParallelExecutor(ir, kernels={"Boom": boom})
+
+    def test_empty_module(self) -> None:
+        self.assertEqual(execute_parallel(CoreIR()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from tools.core_ir.core_ir import CoreIR
+
+if np is not None:
+    from tools.core_ir.serving import BatchedModel, Client, InferenceServer, RequestError
+
+WEIGHTS = [[0.5, -1.0, 2.0], [1.5, 0.25, -0.5], [-2.0, 1.0, 0.75], [0.125, -0.25, 1.0]]
+
+
+def make_module(batch="N") -> CoreIR:
+    """relu(x @ w + 1) with x: [batch, 4]."""
+
+    ir = CoreIR()
+    x = ir.declare_input("x", f"tensor<f32[{batch}, 4]>")
+    w = ir.add_operation("ConstTensor", [], {"value": WEIGHTS, "shape": (4, 3), "dtype": "f32"}, "tensor<f32[4, 3]>")
+    one = ir.add_operation("ConstF32", [], {"value": 1.0}, "tensor<f32[]>")
+    product = ir.add_operation("MatMul", [x, w], result_type=f"tensor<f32[{batch}, 3]>")
+    shifted = ir.add_operation("Add", [product, one], result_type=f"tensor<f32[{batch}, 3]>")
+    ir.mark_output(ir.add_operation("Relu", [shifted], result_type=f"tensor<f32[{batch}, 3]>"))
+    return ir
+
+
+def reference(x):
+    return np.maximum(np.asarray(x, dtype=np.float32) @ np.asarray(WEIGHTS, dtype=np.float32) + 1, 0)
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestBatchedModel(unittest.TestCase):
+    def test_symbolic_and_static_batch_dimensions(self) -> None:
+        rng = np.random.default_rng(0)
+        x = rng.standard_normal((3, 4), dtype=np.float32)
+        for model in (BatchedModel(make_module()), BatchedModel(make_module(8))):
+            arrays, rows = model.prepare({"x": x.tolist()})
+            (result,) = model.run(arrays, rows)
+            self.assertEqual(result.shape, (3, 3))
+            np.testing.assert_allclose(result, reference(x), rtol=1e-6)
+
+        with self.assertRaisesRegex(RequestError, "limited to 8 rows"):
+            BatchedModel(make_module(8)).prepare({"x": np.zeros((9, 4))})
+        with self.assertRaisesRegex(RequestError, "expected \\(rows, 4\\)"):
+            BatchedModel(make_module()).prepare({"x": np.zeros((2, 5))})
+
+    def test_modules_must_keep_the_batch_dimension(self) -> None:
+        ir = make_module()
+        ir.mark_output(ir.add_operation("Sum", [ir.outputs[0]], {"axes": []}, "tensor<f32[]>"))
+        with self.assertRaisesRegex(ValueError, "does not keep the batch dimension"):
+            BatchedModel(ir)
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestInferenceServer(unittest.IsolatedAsyncioTestCase):
+    async def start(self, **options) -> InferenceServer:
+        server = InferenceServer(BatchedModel(make_module()), **options)
+        await server.start()
+        self.addAsyncCleanup(server.stop)
+        return server
+
+    async def test_concurrent_requests_are_batched(self) -> None:
+        server = await self.start(max_batch_size=8, max_wait_ms=50)
+        clients = [await Client.connect(server.address) for _ in range(6)]
+        rng = np.random.default_rng(1)
+        requests = [rng.standard_normal((1 + i % 2, 4), dtype=np.float32) for i in range(6)]
+
+        results = await asyncio.gather(*(client.infer({"x": x}) for client, x in zip(clients, requests)))
+        for (result,), x in zip(results, requests):
+            self.assertEqual(result.dtype, np.float32)
+            np.testing.assert_allclose(result, reference(x), rtol=1e-6, atol=1e-6)
+
+        snapshot = server.metrics.snapshot()
+        self.assertEqual(snapshot["requests_success_total"], 6)
+        self.assertLess(snapshot["batches_total"], 6)
+        self.assertEqual(sum(int(k) * v for k, v in snapshot["batch_size_histogram"].items()), 6)
+        self.assertEqual(snapshot["rows_total"], 9)
+        self.assertGreater(snapshot["latency_s"]["p99"], 0)
+
+        status, body = await clients[0].request("GET", "/metrics")
+        text = body.decode()
+        self.assertEqual(status, 200)
+        self.assertIn('mind_request_latency_us{quantile="0.99"}', text)
+        self.assertIn('mind_batch_size_bucket{le="+Inf"}', text)
+        for client in clients:
+            await client.close()
+
+    async def test_errors_and_health(self) -> None:
+        server = await self.start()
+        client = await Client.connect(server.address)
+
+        self.assertEqual((await client.request("GET", "/health/live"))[0], 200)
+        status, body = await client.request("GET", "/health/ready")
+        self.assertEqual((status, json.loads(body)), (200, {"status": "Healthy", "state": "Running"}))
+        self.assertEqual((await client.request("GET", "/nowhere"))[0], 404)
+        self.assertEqual((await client.request("GET", "/v1/infer"))[0], 405)
+        status, body = await client.request("POST", "/v1/infer", {"inputs": {"y": [[1.0]]}})
+        self.assertEqual(status, 400)
+        self.assertIn("Unknown inputs: y", json.loads(body)["error"])
+        self.assertEqual((await client.request("POST", "/v1/infer", {"no": "inputs"}))[0], 400)
+
+        status, body = await client.request("GET", "/health/ready")
+        self.assertEqual((status, json.loads(body)["status"]), (503, "Unhealthy"))
+        self.assertEqual(server.metrics.requests_failed, 2)
+        await client.close()
+
+    async def test_backpressure_and_unix_socket(self) -> None:
+        server = InferenceServer(BatchedModel(make_module()), max_queue=0)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "serving.sock")
+            await server.start(unix_path=path)
+            client = await Client.connect(path)
+            status, body = await client.request("POST", "/v1/infer", {"inputs": {"x": [[1.0, 2.0, 3.0, 4.0]]}})
+            self.assertEqual((status, json.loads(body)["error"]), (503, "More than 0 requests are queued"))
+            await client.close()
+            await server.stop()
+        self.assertEqual(server.state, "Stopped")
+
+    async def test_stop_drains_queued_requests(self) -> None:
+        server = await self.start(max_batch_size=4, max_wait_ms=20)
+        client = await Client.connect(server.address)
+        pending = asyncio.ensure_future(client.infer({"x": np.ones((2, 4), dtype=np.float32)}))
+        await asyncio.sleep(0.005)
+        await server.stop()
+
+        (result,) = await pending
+        np.testing.assert_array_equal(result, reference(np.ones((2, 4))))
+        self.assertEqual(server.metrics.batches_total, 1)
+        await client.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import unittest
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from tools.core_ir.compile_cache import CompilationCache
+from tools.core_ir.language import BinaryOperation, Expression, LanguageConstruct, TypeCache, Variable
+from tools.core_ir.type_system import DimConstraints, TensorType, TypeSystem
+
+if np is not None:
+    from tools.core_ir.executor import execute
+
+
+def make_type_system() -> TypeSystem:
+    type_system = TypeSystem()
+    type_system.add_symbol("x", TensorType("f32", ("N", 4)))
+    type_system.add_symbol("w", TensorType("f32", (4, 3)))
+    type_system.add_symbol("b", TensorType("f32", (3,)))
+    type_system.add_symbol("residual", TensorType("f32", ("B", 3)))
+    return type_system
+
+
+def build() -> Expression:
+    hidden = BinaryOperation("Add", BinaryOperation("MatMul", Variable("x"), Variable("w")), Variable("b"))
+    return BinaryOperation("Add", hidden, Variable("residual"))
+
+
+class TestSymbolicDims(unittest.TestCase):
+    def test_parse_and_validate(self) -> None:
+        tensor_type = TensorType.parse("Tensor<f32, [N, ?, 3]>")
+
+        self.assertEqual(tensor_type.shape, ("N", "?", 3))
+        self.assertEqual(str(tensor_type), "tensor<f32[N, ?, 3]>")
+        self.assertEqual(tensor_type.symbols, frozenset({"N"}))
+        self.assertEqual(tensor_type.specialize({"N": 2}), TensorType("f32", (2, "?", 3)))
+        with self.assertRaises(TypeError):
+            tensor_type.nbytes
+        with self.assertRaises(ValueError):
+            TypeSystem().validate_tensor(TensorType("f32", ("N-1",)))
+
+    def test_broadcast_and_matmul_solve_constraints(self) -> None:
+        ts = TypeSystem()
+
+        self.assertEqual(ts.broadcast_shapes(("N", 3), (3,)), ("N", 3))
+        self.assertEqual(ts.broadcast_shapes(("?", 3), (1, 3)), ("?", 3))
+        self.assertEqual(ts.broadcast_shapes(("B", 3), ("A", 1)), ("A", 3))
+        self.assertEqual(ts.dims.equations(), (("B", "A"),))
+        self.assertEqual(ts.validate_matmul(TensorType("f32", ("B", "K")), TensorType("f32", (5, 2))).shape, ("A", 2))
+        self.assertEqual(ts.dims.resolve("K"), 5)
+        self.assertEqual(ts.broadcast_shapes(("K",), ("?",)), (5,))
+
+        with self.assertRaisesRegex(ValueError, "not broadcastable"):
+            ts.broadcast_shapes(("K",), (4,))
+        ts.broadcast_shapes(("A",), (7,))
+        with self.assertRaisesRegex(ValueError, "Matmul dimension mismatch: 7 != 5"):
+            ts.validate_matmul(TensorType("f32", (2, "B")), TensorType("f32", ("K", 2)))
+
+    def test_solve_reports_conflicts(self) -> None:
+        dims = DimConstraints()
+        dims.unify("N", "M")
+        dims.unify("K", 3)
+
+        self.assertEqual(dims.solve({"M": 2}, {"N", "K"}), {"K": 3, "N": 2})
+        for bindings, message in [
+            ({"N": 2, "M": 4}, "bound to both"),
+            ({"N": 2, "K": 4}, "constrained to 3"),
+            ({"N": 0}, "positive integer"),
+            ({"N": 2, "Q": 1}, "Unknown symbolic dimension"),
+            ({}, "'N' is not bound"),
+        ]:
+            with self.assertRaisesRegex(ValueError, message):
+                dims.solve(bindings, {"N", "K"})
+
+    def test_check_batch_discards_equations_of_rejected_candidates(self) -> None:
+        ts = make_type_system()
+        bad = BinaryOperation("Add", BinaryOperation("Add", Variable("x"), Variable("w")), Variable("b"))
+        results = ts.check_batch([bad, BinaryOperation("MatMul", Variable("x"), Variable("w"))], cache=TypeCache())
+
+        self.assertEqual([r.ok for r in results], [False, True])
+        self.assertEqual(ts.dims.equations(), ())
+
+
+class TestSpecializationCache(unittest.TestCase):
+    def test_specialisations_are_cached_per_binding(self) -> None:
+        ts = make_type_system()
+        construct = LanguageConstruct(build(), ts)
+        specializations = construct.specialize(maxsize=2)
+
+        self.assertEqual(construct.to_ir().operations[-1].result_type, "tensor<f32[B, 3]>")
+        first = specializations.specialize({"N": 8})
+        self.assertEqual([op.result_type for op in first.operations][-3:], ["tensor<f32[8, 3]>"] * 3)
+        self.assertIs(specializations.specialize({"B": 8}), first)
+        specializations.specialize({"N": 2})
+        specializations.specialize({"N": 4})
+        self.assertEqual((specializations.hits, specializations.misses, specializations.evictions), (1, 3, 1))
+        with self.assertRaisesRegex(ValueError, "bound to both"):
+            specializations.specialize({"N": 8, "B": 4})
+
+    def test_compile_cache_hits_replay_constraints(self) -> None:
+        cache = CompilationCache()
+        LanguageConstruct(build(), make_type_system(), compile_cache=cache).to_ir()
+        ts = make_type_system()
+        specializations = LanguageConstruct(build(), ts, compile_cache=cache).specialize()
+
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(ts.dims.equations(), (("N", "B"),))
+        self.assertEqual(specializations.symbols, frozenset({"N", "B"}))
+        with self.assertRaisesRegex(ValueError, "bound to both"):
+            specializations.specialize({"N": 8, "B": 4})
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_specialised_module_executes(self) -> None:
+        specializations = LanguageConstruct(build(), make_type_system()).specialize()
+        rng = np.random.default_rng(0)
+        inputs = {
+            "x": rng.standard_normal((5, 4)).astype(np.float32),
+            "w": rng.standard_normal((4, 3)).astype(np.float32),
+            "b": rng.standard_normal(3).astype(np.float32),
+            "residual": rng.standard_normal((5, 3)).astype(np.float32),
+        }
+
+        (result,) = execute(specializations.specialize({"N": 5}), inputs)
+        np.testing.assert_allclose(result, inputs["x"] @ inputs["w"] + inputs["b"] + inputs["residual"], rtol=1e-5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+import unittest
+
+from tools.core_ir.core_ir import CoreIR, CoreOperation
+from tools.core_ir.verifier import VerificationError, diagnose, verify
+
+F32_23 = "tensor<f32[2, 3]>"
+
+
+def codes(ir: CoreIR):
+    return [d.code for d in diagnose(ir)]
+
+
+class TestVerifier(unittest.TestCase):
+    def test_valid_module(self) -> None:
+        ir = CoreIR()
+        x = ir.declare_input("x", F32_23)
+        w = ir.declare_input("w", "tensor<f32[3, 4]>")
+        y = ir.add_operation("MatMul", [x, w], result_type="tensor<f32[2, 4]>")
+        b = ir.add_operation("ConstTensor", [], {"value": [1.0, 2.0, 3.0, 4.0], "shape": (4,), "dtype": "f32"}, "tensor<f32[4]>")
+        z = ir.add_operation("Add", [y, b], result_type="tensor<f32[2, 4]>")
+        t = ir.add_operation("Transpose", [z], {"permutation": [1, 0]}, "tensor<f32[4, 2]>")
+        r = ir.add_operation("Reshape", [t], {"new_shape": [-1]}, "tensor<f32[8]>")
+        s = ir.add_operation("Sum", [r], {"axes": [-1], "keepdims": True}, "tensor<f32[1]>")
+        ir.mark_output(s)
+
+        self.assertEqual(diagnose(ir), [])
+        ir.verify()
+
+    def test_def_use_and_outputs(self) -> None:
+        ir = CoreIR()
+        ir.operations = [
+            CoreOperation(0, "Input", [], {"name": "x"}, F32_23),
+            CoreOperation(1, "Relu", [2], {}, F32_23),
+            CoreOperation(2, "Relu", [0], {}, F32_23),
+            CoreOperation(2, "Neg", [0], {}, F32_23),
+        ]
+        ir.outputs = [1, 42]
+
+        self.assertEqual(
+            [str(d) for d in diagnose(ir)],
+            [
+                "E4001: Instruction 1 uses %2 before definition",
+                "E4002: ValueId %2 defined multiple times: instruction 2 and instruction 3",
+                "E4003: Output 1 references undefined ValueId %42",
+            ],
+        )
+
+    def test_reshape_element_count(self) -> None:
+        ir = CoreIR()
+        x = ir.declare_input("x", F32_23)
+        ir.mark_output(ir.add_operation("Reshape", [x], {"new_shape": [2, 4]}, "tensor<f32[2, 4]>"))
+
+        with self.assertRaises(VerificationError) as ctx:
+            verify(ir)
+        self.assertEqual(ctx.exception.diagnostics[0].code, "E3007")
+        self.assertIn("Element count mismatch", str(ctx.exception))
+
+    def test_shape_rules(self) -> None:
+        ir = CoreIR()
+        x = ir.declare_input("x", F32_23)
+        image = ir.declare_input("image", "tensor<f32[1, 8, 8, 3]>")
+        kernel = ir.declare_input("kernel", "tensor<f32[3, 3, 4, 16]>")
+        ints = ir.declare_input("ids", "tensor<i32[3]>")
+        ir.add_operation("Transpose", [x], {"permutation": [0, 0]}, F32_23)
+        ir.add_operation("Conv2d", [image, kernel], {"strides": [1, 1]}, "tensor<f32[1, 6, 6, 16]>")
+        ir.add_operation("Add", [x, ints], result_type=F32_23)
+        ir.add_operation("Sum", [x], {"axes": [2]}, "tensor<f32[]>")
+        ir.add_operation("Slice", [x], {"starts": [0, 0], "ends": [2, 3], "steps": [1, 0]}, F32_23)
+        ir.add_operation("Gather", [x, x], result_type="tensor<f32[2, 3, 3]>")
+        ir.add_operation("Relu", [x], result_type="tensor<f32[3, 2]>")
+        ir.add_operation("Exp", [ints], result_type="tensor<i32[3]>")
+
+        self.assertEqual(codes(ir), ["E3008", "E4009", "E2004", "E3004", "E4008", "E4011", "E2001", "E2005"])
+
+    def test_conv2d_output_shape(self) -> None:
+        ir = CoreIR()
+        image = ir.declare_input("image", "tensor<f32[1, 8, 8, 3]>")
+        kernel = ir.declare_input("kernel", "tensor<f32[3, 3, 3, 16]>")
+        ir.add_operation("Conv2d", [image, kernel], {"strides": [2, 2], "padding": "Same"}, "tensor<f32[1, 4, 4, 16]>")
+        ir.add_operation("Conv2d", [image, kernel], {"strides": [2, 2]}, "tensor<f32[1, 3, 3, 16]>")
+        ir.add_operation("Conv2d", [image, kernel], {"strides": [0, 1]}, "tensor<f32[1, 6, 6, 16]>")
+
+        self.assertEqual(codes(ir), ["E4010"])
+
+    def test_const_tensor_literals(self) -> None:
+        ir = CoreIR()
+        row = [[1.0, 2.0]]
+        ir.add_operation("ConstTensor", [], {"value": [0.0] * 6, "shape": (2, 3), "dtype": "f32"}, F32_23)
+        ir.add_operation("ConstTensor", [], {"value": row, "shape": ("N", 2), "dtype": "f32"}, "tensor<f32[N, 2]>")
+        ir.add_operation("ConstTensor", [], {"value": [0.0] * 5, "shape": (2, 3), "dtype": "f32"}, F32_23)
+        ir.add_operation("ConstTensor", [], {"value": row, "shape": ("N", 3), "dtype": "f32"}, "tensor<f32[N, 3]>")
+        ir.add_operation("ConstTensor", [], {"value": 1.0, "shape": (2.5,), "dtype": "f32"}, "tensor<f32[2]>")
+
+        diagnostics = diagnose(ir)
+        self.assertEqual([d.code for d in diagnostics], ["E4005", "E4005", "E4005"])
+        self.assertIn("requires 6 elements, found literal of shape [5] (5 elements)", diagnostics[0].message)
+        self.assertIn("requires a multiple of 3 elements", diagnostics[1].message)
+
+    def test_malformed_attributes(self) -> None:
+        image, kernel = "tensor<f32[1, 8, 8, 3]>", "tensor<f32[3, 3, 3, 16]>"
+        conv = ("Conv2d", [image, kernel], "tensor<f32[1, 6, 6, 16]>")
+        cases = [
+            (("Sum", [F32_23], "tensor<f32[]>"), [{"axes": 3}, {"axes": [True]}], "E3004"),
+            (("Reshape", [F32_23], "tensor<f32[6]>"), [{"new_shape": 6}, {"new_shape": ["M"]}], "E3006"),
+            (("Transpose", [F32_23], "tensor<f32[3, 2]>"), [{"permutation": 3}, {"permutation": [1.0, 0]}], "E3008"),
+            (("ExpandDims", [F32_23], "tensor<f32[1, 2, 3]>"), [{"axes": None}, {"axes": ["a"]}], "E3004"),
+            (("Squeeze", [F32_23], F32_23), [{"axes": None}, {"axes": 0}], "E3004"),
+            (("Index", [F32_23], "tensor<f32[]>"), [{"indices": 5}, {"indices": [0, None]}], "E4006"),
+            (
+                ("Slice", [F32_23], F32_23),
+                [{"starts": 5, "ends": [2, 3]}, {"starts": [0, None], "ends": [2, 3]}, {"starts": [0, 0], "ends": 3}],
+                "E4007",
+            ),
+            (("Slice", [F32_23], F32_23), [{"starts": [0, 0], "ends": [2, 3], "steps": ["a", 1]}], "E4008"),
+            (conv, [{"strides": 3}, {"strides": [1, "1"]}, {"padding": 5}, {"padding": [[0, 0], [0, None]]}], "E4010"),
+            (
+                ("Fused", [F32_23], F32_23),
+                [
+                    {"body": 5},
+                    {"body": [("Relu", [0])]},
+                    {"body": [(["Relu"], [0], F32_23)]},
+                    {"body": [("Relu", [0, 0], F32_23)]},
+                    {"body": [("Relu", 0, None)]},
+                ],
+                "E4005",
+            ),
+        ]
+        for (opcode, operand_types, result_type), variants, code in cases:
+            for attributes in variants:
+                with self.subTest(opcode=opcode, attributes=attributes):
+                    ir = CoreIR()
+                    operands = [ir.declare_input(f"x{i}", t) for i, t in enumerate(operand_types)]
+                    ir.mark_output(ir.add_operation(opcode, operands, attributes, result_type))
+                    self.assertEqual(codes(ir), [code])
+
+    def test_first_error_only_by_default(self) -> None:
+        ir = CoreIR()
+        ir.operations = [CoreOperation(0, "Relu", [5]), CoreOperation(1, "Neg", [6])]
+        ir.outputs = [9]
+
+        with self.assertRaises(VerificationError) as ctx:
+            ir.verify()
+        self.assertEqual(len(ctx.exception.diagnostics), 1)
+        with self.assertRaises(VerificationError) as ctx:
+            ir.verify(collect_all=True)
+        self.assertEqual([d.code for d in ctx.exception.diagnostics], ["E4001", "E4001", "E4003"])
+
+    def test_input_declaration(self) -> None:
+        ir = CoreIR()
+        ir.declare_input("", F32_23)
+        ir.declare_input("y")
+        ir.declare_input("z", "tensor<f32[2, 0]>")
+
+        self.assertEqual(codes(ir), ["E4004", "E4004", "E4004"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from tools.core_ir.core_ir import CoreIR
+
+if np is not None:
+    from tools.core_ir import mic, micb
+    from tools.core_ir.executor import Executor
+    from tools.core_ir.weights import (
+        SafeTensorsError,
+        SafeTensorsFile,
+        bind_weights,
+        encode_header,
+        open_checkpoint,
+        save_safetensors,
+    )
+
+UP = "model.layers.0.mlp.up_proj.weight"
+NORM = "model.norm.weight"
+
+
+def make_module(up_type: str = "tensor<f32[4, 8]>") -> CoreIR:
+    """norm * (x @ up) with ``up`` as an input and ``norm`` as a named constant."""
+
+    ir = CoreIR()
+    x = ir.declare_input("x", "tensor<f32[2, 4]>")
+    up = ir.declare_input(UP, up_type)
+    norm = ir.add_operation("ConstTensor", [], {"name": NORM}, "tensor<f32[8]>")
+    hidden = ir.add_operation("MatMul", [x, up], result_type="tensor<f32[2, 8]>")
+    ir.mark_output(ir.add_operation("Mul", [hidden, norm], result_type="tensor<f32[2, 8]>"))
+    return ir
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestSafeTensors(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        rng = np.random.default_rng(0)
+        self.weights = {
+            UP: rng.standard_normal((4, 8), dtype=np.float32),
+            NORM: rng.standard_normal(8, dtype=np.float32),
+            "model.embed_tokens.weight": np.arange(6, dtype=np.int64).reshape(3, 2),
+        }
+        self.path = self.root / "model.safetensors"
+        save_safetensors(self.path, self.weights, {"format": "pt"})
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_round_trip_is_zero_copy(self) -> None:
+        with open_checkpoint(self.root) as checkpoint:
+            self.assertEqual(set(checkpoint), set(self.weights))
+            self.assertEqual(checkpoint.metadata, {"format": "pt"})
+            for name, expected in self.weights.items():
+                view = checkpoint.tensor(name)
+                np.testing.assert_array_equal(view, expected)
+                self.assertEqual(view.dtype, expected.dtype)
+                self.assertFalse(view.flags.writeable)
+                self.assertFalse(view.flags.owndata)
+            self.assertEqual(checkpoint.info(UP).tensor_type.shape, (4, 8))
+            del view
+        self.assertEqual(self.path.stat().st_size % 8, 0)
+
+    def test_bind_weights_to_inputs_and_constants(self) -> None:
+        ir = make_module()
+        x = np.ones((2, 4), dtype=np.float32)
+        with open_checkpoint(self.path) as checkpoint:
+            inputs = bind_weights(ir, checkpoint)
+            self.assertEqual(list(inputs), [UP])
+            self.assertEqual(ir.operations[2].attributes["dtype"], "f32")
+            (result,) = Executor(ir).run({**inputs, "x": x})
+            np.testing.assert_allclose(result, (x @ self.weights[UP]) * self.weights[NORM], rtol=1e-6)
+            with self.assertRaisesRegex(SafeTensorsError, "No tensor named 'x'"):
+                bind_weights(make_module(), checkpoint, require_inputs=True)
+
+    def test_declarations_are_checked_before_binding(self) -> None:
+        with open_checkpoint(self.path) as checkpoint:
+            for up_type, ok in [
+                ("tensor<f32[8, 4]>", False),
+                ("tensor<f64[4, 8]>", False),
+                ("tensor<f32[4]>", False),
+                ("tensor<f32[K, ?]>", True),
+            ]:
+                with self.subTest(up_type=up_type):
+                    ir = make_module(up_type)
+                    if ok:
+                        self.assertIn(UP, bind_weights(ir, checkpoint))
+                        continue
+                    with self.assertRaisesRegex(SafeTensorsError, "is tensor<f32\\[4, 8\\]> but %1 = Input"):
+                        bind_weights(ir, checkpoint)
+                    self.assertNotIn("value", ir.operations[2].attributes)
+
+            ir = make_module("tensor<f32[K, K]>")
+            with self.assertRaisesRegex(SafeTensorsError, "declares tensor<f32\\[K, K\\]>"):
+                bind_weights(ir, checkpoint)
+            ir = make_module()
+            ir.operations[2].attributes["name"] = "missing.weight"
+            with self.assertRaisesRegex(SafeTensorsError, "No tensor named 'missing.weight'"):
+                bind_weights(ir, checkpoint)
+
+    def test_bind_then_serialise(self) -> None:
+        ir = make_module()
+        text, encoded = mic.emit(ir), micb.encode(ir)
+        x = np.ones((2, 4), dtype=np.float32)
+        with open_checkpoint(self.path) as checkpoint:
+            (expected,) = Executor(ir).run({**bind_weights(ir, checkpoint), "x": x})
+            for serialise in (CoreIR.compile, mic.emit, micb.encode):
+                with self.subTest(serialise.__qualname__):
+                    with self.assertRaisesRegex(ValueError, "array|not representable"):
+                        serialise(ir)
+
+            # Modules written before binding load back and bind the same way.
+            for loaded in (mic.loads(text), micb.decode(encoded)):
+                (result,) = Executor(loaded).run({**bind_weights(loaded, checkpoint), "x": x})
+                np.testing.assert_array_equal(result, expected)
+
+    def test_sharded_checkpoint(self) -> None:
+        save_safetensors(self.root / "model-00001-of-00002.safetensors", {UP: self.weights[UP]})
+        save_safetensors(self.root / "model-00002-of-00002.safetensors", {NORM: self.weights[NORM]})
+        weight_map = {UP: "model-00001-of-00002.safetensors", NORM: "model-00002-of-00002.safetensors"}
+        (self.root / "model.safetensors.index.json").write_text(json.dumps({"weight_map": weight_map}))
+
+        with open_checkpoint(self.root) as checkpoint:
+            self.assertEqual(len(checkpoint.files), 2)
+            np.testing.assert_array_equal(checkpoint.tensor(NORM), self.weights[NORM])
+            self.assertEqual(set(bind_weights(make_module(), checkpoint)), {UP})
+
+    def test_malformed_headers_are_rejected(self) -> None:
+        prefix, _ = encode_header({"a": ("F32", (2,)), "b": ("BF16", (4,))})
+        cases = {
+            "truncated data": prefix + b"\0" * 8,
+            "short": b"\1\0",
+            "huge header": (2**40).to_bytes(8, "little") + b"{}",
+            "bad json": (3).to_bytes(8, "little") + b"{x}",
+            "unknown dtype": self._raw({"a": {"dtype": "F8", "shape": [1], "data_offsets": [0, 1]}}, 1),
+            "size mismatch": self._raw({"a": {"dtype": "F32", "shape": [2], "data_offsets": [0, 4]}}, 8),
+            "overlap": self._raw(
+                {
+                    "a": {"dtype": "F32", "shape": [2], "data_offsets": [0, 8]},
+                    "b": {"dtype": "F32", "shape": [2], "data_offsets": [4, 12]},
+                },
+                12,
+            ),
+        }
+        for label, data in cases.items():
+            with self.subTest(label):
+                path = self.root / "bad.safetensors"
+                path.write_bytes(data)
+                with self.assertRaises(SafeTensorsError):
+                    SafeTensorsFile(path)
+
+        path = self.root / "bf16.safetensors"
+        path.write_bytes(prefix + b"\0" * 16)
+        with SafeTensorsFile(path) as file:
+            self.assertEqual(file.info("b").dtype, "BF16")
+            with self.assertRaisesRegex(SafeTensorsError, "BF16"):
+                file.tensor("b")
+
+    @staticmethod
+    def _raw(header, data_bytes: int) -> bytes:
+        encoded = json.dumps(header).encode()
+        return len(encoded).to_bytes(8, "little") + encoded + b"\0" * data_bytes
+
+
+if __name__ == "__main__":
+    unittest.main()